@@ -0,0 +1,219 @@
+"""
+batch.py - ZFMR0003 dosyalarından arayüz açmadan toplu rapor üretir.
+
+Panelin "⬇ İndir (ZIP)" ve "📄 PDF Raporu" sekmelerindeki dosyalar, JSON
+rapor tanımındaki (veya ön ayarındaki) filtre ve seçimlerle üretilir.
+--split-by verilirse sütunun her değeri (ör. her masraf yeri) için ayrı
+rapor oluşturulur; işler bir süreç havuzuna dağıtılır.
+
+Her dosya bir kez okunur ve uyarı indeksi dosya başına bir kez hesaplanır;
+işçi süreçlerine yalnızca ilgili satırlar gönderilir. Her işçi tek bir
+sıcak Kaleido işlemi açar.
+
+Çıktılar:
+    <çıktı>/<dosya adı>/rapor.zip, rapor.pdf, pivot_tablo.xlsx
+    <çıktı>/<dosya adı>/<bölme değeri>/... (--split-by ile)
+
+Kullanım:
+    python batch.py rapor.xlsx
+    python batch.py ocak.xlsx subat.xlsx --spec rapor.json --preset aylik --out cikti
+    python batch.py rapor.xlsx --split-by "Masraf Yeri Adı" --workers 4 --pdf yok
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+from streamlit.logger import set_log_level
+
+# Streamlit önbellek dekoratörlerinin "çalışma zamanı yok" uyarıları modüller yüklenirken
+# yazılır; günlük seviyesi uygulama modüllerinden önce ayarlanır (işçi süreçleri de bu
+# modülü yeniden yükler)
+set_log_level("error")
+
+from config.constants import BATCH_WORKERS, BATCH_RENDERER_POOL_SIZE
+from utils.alert_engine import compute_alert_index, query_alerts
+from utils.chart_export import get_renderer_pool
+from utils.loader import read_report
+from utils.report_bundle import PDF_SUMMARY, ReportSpec, load_report_spec, run_report
+
+# --pdf seçeneğinde PDF üretilmemesini sağlayan değer
+NO_PDF = "yok"
+
+
+class BatchJob(NamedTuple):
+    """
+    Tek bir rapor işi.
+
+    Attributes:
+        label (str): İlerleme satırında gösterilen ad
+        df (DataFrame): İşin satırları
+        spec (ReportSpec): Rapor tanımı
+        alerts (DataFrame, optional): Dosyanın uyarı indeksinden işin masraf yerlerine düşen kısım
+        out_dir (str): Çıktı klasörü
+    """
+
+    label: str
+    df: pd.DataFrame
+    spec: ReportSpec
+    alerts: Optional[pd.DataFrame]
+    out_dir: str
+
+
+def safe_name(value) -> str:
+    """Değeri klasör adı olarak kullanılabilir hale getirir."""
+    return re.sub(r"[^\w.-]+", "_", str(value)).strip("._") or "_"
+
+
+def _init_worker() -> None:
+    """İşçi sürecinin Kaleido işlemini rapor isteğinden önce ısıtır."""
+    get_renderer_pool(BATCH_RENDERER_POOL_SIZE).warm_up()
+
+
+def run_job(job: BatchJob) -> Tuple[Dict[str, float], int, List[str], float]:
+    """
+    Raporu üretir ve dosyaları işin klasörüne yazar.
+
+    Parameters:
+        job (BatchJob): Rapor işi
+
+    Returns:
+        Tuple[Dict[str, float], int, List[str], float]: (KPI metrikleri, satır sayısı,
+            yazılan dosyalar, süre)
+    """
+    start = time.perf_counter()
+    run = run_report(job.df, job.spec, alerts=job.alerts)
+    os.makedirs(job.out_dir, exist_ok=True)
+    for name, data in run.files.items():
+        with open(os.path.join(job.out_dir, name), "wb") as out_file:
+            out_file.write(data)
+    return run.kpi, run.rows, sorted(run.files), time.perf_counter() - start
+
+
+def build_jobs(paths: List[str], spec: ReportSpec, out_root: str) -> Tuple[List[BatchJob], int]:
+    """
+    Dosyaları okur ve (varsa bölme sütununa göre) rapor işlerini oluşturur.
+
+    Parameters:
+        paths (List[str]): ZFMR0003 Excel dosyaları
+        spec (ReportSpec): Rapor tanımı
+        out_root (str): Çıktı kök klasörü
+
+    Returns:
+        Tuple[List[BatchJob], int]: (işler, okunamayan dosya sayısı)
+    """
+    jobs = []
+    failed = 0
+    for path in paths:
+        try:
+            with open(path, "rb") as source:
+                df = read_report(source.read())
+        except Exception as e:
+            # Dosya bulunamadı, Excel değil veya zorunlu sütunlar eksik
+            print(f"✖ {path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+
+        # Anomali skorları tüm masraf yerlerine göre hesaplandığından indeks dosya başına bir kez kurulur
+        alerts = compute_alert_index(df) if spec.pdf == PDF_SUMMARY else None
+        file_dir = os.path.join(out_root, safe_name(os.path.splitext(os.path.basename(path))[0]))
+
+        if spec.split_by is None:
+            jobs.append(BatchJob(os.path.basename(path), df, spec, alerts, file_dir))
+            continue
+        if spec.split_by not in df.columns:
+            print(f"✖ {path}: bölme sütunu bulunamadı: {spec.split_by}", file=sys.stderr)
+            failed += 1
+            continue
+
+        for value, part in df.groupby(spec.split_by, sort=True):
+            part_spec = spec._replace(filters={**(spec.filters or {}), spec.split_by: [value]})
+            part_alerts = (
+                query_alerts(alerts, cost_centres=part["Masraf Yeri Adı"].dropna().unique())
+                if alerts is not None else None
+            )
+            jobs.append(BatchJob(
+                f"{os.path.basename(path)} · {value}",
+                part, part_spec, part_alerts,
+                os.path.join(file_dir, safe_name(value)),
+            ))
+    return jobs, failed
+
+
+def _report_progress(done: int, total: int, job: BatchJob, result) -> None:
+    kpi, rows, files, elapsed = result
+    print(
+        f"[{done}/{total}] {job.label}: {rows:,} satır · kullanım %{kpi['usage_pct']:.1f} · "
+        f"{', '.join(files)} · {elapsed:.1f} sn → {job.out_dir}",
+        flush=True,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="ZFMR0003 dosyalarından ZIP ve PDF raporlarını arayüz olmadan üretir."
+    )
+    parser.add_argument("files", nargs="+", help="ZFMR0003 Excel dosyaları")
+    parser.add_argument("--spec", help="JSON rapor tanımı (filtreler, aylar, PDF türü, pivot)")
+    parser.add_argument("--preset", help="Rapor tanımı dosyasındaki ön ayar adı")
+    parser.add_argument("--out", default="raporlar", help="Çıktı klasörü (varsayılan: raporlar)")
+    parser.add_argument("--split-by", help="Her değeri için ayrı rapor üretilecek sütun (ör. \"Masraf Yeri Adı\")")
+    parser.add_argument("--pdf", help=f"PDF türü: \"{PDF_SUMMARY}\", bölüm alanı veya \"{NO_PDF}\"")
+    parser.add_argument(
+        "--workers", type=int, default=BATCH_WORKERS,
+        help=f"İşçi süreci sayısı (varsayılan: {BATCH_WORKERS})",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_report_spec(args.spec, args.preset)
+    except (OSError, ValueError) as e:
+        print(f"✖ Rapor tanımı okunamadı: {e}", file=sys.stderr)
+        return 2
+    if args.split_by:
+        spec = spec._replace(split_by=args.split_by)
+    if args.pdf:
+        spec = spec._replace(pdf=None if args.pdf == NO_PDF else args.pdf)
+
+    start = time.perf_counter()
+    jobs, failed = build_jobs(args.files, spec, args.out)
+    workers = max(1, min(args.workers, len(jobs)))
+    completed = 0
+
+    if workers == 1:
+        for done, job in enumerate(jobs, 1):
+            try:
+                _report_progress(done, len(jobs), job, run_job(job))
+                completed += 1
+            except Exception as e:
+                print(f"✖ {job.label}: {e}", file=sys.stderr)
+                failed += 1
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as executor:
+            futures = {executor.submit(run_job, job): job for job in jobs}
+            for done, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                try:
+                    _report_progress(done, len(jobs), job, future.result())
+                    completed += 1
+                except Exception as e:
+                    print(f"✖ {job.label}: {e}", file=sys.stderr)
+                    failed += 1
+
+    print(f"{completed}/{len(jobs)} rapor · {failed} hata · "
+          f"{workers} işçi · {time.perf_counter() - start:.1f} sn")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+benchmarks - Performans ölçüm betikleri.
+
+Her betik proje kök dizininden modül olarak çalıştırılır:
+    python -m benchmarks.bench_formatting
+"""
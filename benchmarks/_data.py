@@ -0,0 +1,89 @@
+"""
+_data.py - Benchmark'lar için ZFMR0003 benzeri sentetik veri üretir.
+"""
+
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from config.constants import MONTHS, GENERAL_COLUMNS, REPORT_BASE_COLUMNS, CUMULATIVE_COLUMNS
+
+MONTHLY_METRICS = REPORT_BASE_COLUMNS + ["BE Bakiye"]
+
+
+def make_report_frame(n_rows: int, n_cost_centres: int = 500, seed: int = 0) -> pd.DataFrame:
+    """
+    ZFMR0003 raporunun sütun yapısında rastgele bir veri çerçevesi üretir.
+
+    Parameters:
+        n_rows (int): Satır sayısı
+        n_cost_centres (int): Farklı masraf yeri sayısı
+        seed (int): Rastgele sayı üreteci tohumu
+
+    Returns:
+        DataFrame: Sentetik rapor verisi
+    """
+    rng = np.random.default_rng(seed)
+    centre_ids = rng.integers(0, n_cost_centres, n_rows)
+    cost_type_ids = rng.integers(0, 200, n_rows)
+
+    data = {
+        "İlgili 1": [f"Sorumlu {i % 25}" for i in centre_ids],
+        "İlgili 2": [f"Birim {i % 40}" for i in centre_ids],
+        "İlgili 3": [f"Bölüm {i % 60}" for i in centre_ids],
+        "Masraf Yeri": [f"MY{i:05d}" for i in centre_ids],
+        "Masraf Yeri Adı": [f"Masraf Yeri {i}" for i in centre_ids],
+        "Masraf Çeşidi": [f"MC{i:04d}" for i in cost_type_ids],
+        "Masraf Çeşidi Adı": [f"Masraf Çeşidi {i}" for i in cost_type_ids],
+        "Masraf Çeşidi Grubu 1": [f"Grup {i % 12}" for i in cost_type_ids],
+        "Masraf Çeşidi Grubu 2": [f"Alt Grup {i % 30}" for i in cost_type_ids],
+        "Masraf Çeşidi Grubu 3": [f"Detay Grup {i % 60}" for i in cost_type_ids],
+    }
+    df = pd.DataFrame(data, columns=GENERAL_COLUMNS)
+
+    numeric = {}
+    for month in MONTHS:
+        budget = rng.gamma(2.0, 5000.0, n_rows).round(2)
+        actual = (budget * rng.normal(1.0, 0.25, n_rows)).round(2)
+        for metric in MONTHLY_METRICS:
+            if metric == "Bütçe":
+                values = budget
+            elif metric == "Fiili":
+                values = actual
+            elif metric == "Bütçe-Fiili Fark Bakiye":
+                values = budget - actual
+            else:
+                values = rng.gamma(2.0, 1000.0, n_rows).round(2)
+            numeric[f"{month} {metric}"] = values
+
+    for metric in CUMULATIVE_COLUMNS:
+        month_cols = [f"{month} {metric}" for month in MONTHS if f"{month} {metric}" in numeric]
+        numeric[f"Kümüle {metric}"] = (
+            np.sum([numeric[col] for col in month_cols], axis=0) if month_cols
+            else rng.gamma(2.0, 12000.0, n_rows).round(2)
+        )
+
+    return pd.concat([df, pd.DataFrame(numeric)], axis=1)
+
+
+@contextmanager
+def timer(label: str, results: dict):
+    """
+    Bloğun süresini milisaniye cinsinden `results[label]` içine yazar.
+    """
+    start = time.perf_counter()
+    yield
+    results[label] = (time.perf_counter() - start) * 1000
+
+
+def print_results(title: str, results: dict) -> None:
+    """
+    Ölçüm sonuçlarını tablo halinde yazdırır.
+    """
+    print(f"\n{title}")
+    print("-" * len(title))
+    width = max(len(label) for label in results)
+    for label, value in results.items():
+        print(f"{label:<{width}}  {value:>10.1f} ms")
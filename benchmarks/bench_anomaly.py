@@ -0,0 +1,29 @@
+"""
+bench_anomaly.py - Masraf yeri x ay anomali tespitinin süresini ölçer.
+
+Kullanım:
+    python -m benchmarks.bench_anomaly [masraf_yeri_sayısı]
+"""
+
+import sys
+
+from benchmarks._data import make_report_frame, timer, print_results
+from utils.anomaly import detect_anomalies
+
+
+def main(n_cost_centres: int = 10000) -> None:
+    df = make_report_frame(n_cost_centres, n_cost_centres=n_cost_centres)
+    # Her satır ayrı bir masraf yeri: (masraf yeri x 12 ay) matrisi tam boyutta olur
+    df["Masraf Yeri"] = [f"MY{i:06d}" for i in range(len(df))]
+    df["Masraf Yeri Adı"] = [f"Masraf Yeri {i}" for i in range(len(df))]
+
+    results = {}
+    with timer(f"detect_anomalies ({n_cost_centres} masraf yeri x 12 ay)", results):
+        anomalies = detect_anomalies(df)
+
+    print_results("Anomali tespiti", results)
+    print(anomalies["Kural"].value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
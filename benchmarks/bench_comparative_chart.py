@@ -0,0 +1,47 @@
+"""
+bench_comparative_chart.py - Karşılaştırma grafiğinin sütun ve WebGL modlarını karşılaştırır.
+
+Tarayıcıya gönderilen JSON boyutunu ve grafik oluşturma süresini ölçer.
+
+Kullanım:
+    python -m benchmarks.bench_comparative_chart [satır_sayısı] [masraf_yeri_sayısı]
+"""
+
+import sys
+
+from benchmarks._data import make_report_frame, timer, print_results
+from config.constants import MONTHS
+from utils.chart_export import chart_spec
+from utils.comparative_analysis import build_comparative_figure
+
+
+def main(n_rows: int = 100000, n_cost_centres: int = 5000) -> None:
+    df = make_report_frame(n_rows, n_cost_centres=n_cost_centres)
+    group_by_col = "Masraf Yeri"
+    budget_cols = [f"{month} Bütçe" for month in MONTHS]
+    actual_cols = [f"{month} Fiili" for month in MONTHS]
+    grouped = df.groupby(group_by_col)[budget_cols + actual_cols].sum()
+    result_df = (
+        grouped.assign(**{
+            "Toplam Bütçe": grouped[budget_cols].sum(axis=1),
+            "Toplam Fiili": grouped[actual_cols].sum(axis=1),
+        })[["Toplam Bütçe", "Toplam Fiili"]]
+        .reset_index()
+        .sort_values("Toplam Fiili", ascending=False)
+    )
+
+    results = {}
+    with timer(f"sütun grafiği ({len(result_df)} grup)", results):
+        bar_fig, bar_info = build_comparative_figure(result_df, group_by_col, threshold=len(result_df))
+    with timer(f"WebGL modu    ({len(result_df)} grup)", results):
+        gl_fig, gl_info = build_comparative_figure(result_df, group_by_col)
+
+    print_results("Karşılaştırma grafiği", results)
+    for label, fig, info in (("sütun", bar_fig, bar_info), ("WebGL", gl_fig, gl_info)):
+        payload_bytes = len(chart_spec(fig).figure_json.encode("utf-8"))
+        print(f"{label:>6}: {info['points']:>6} nokta, {payload_bytes / 1024:>10,.1f} KB")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
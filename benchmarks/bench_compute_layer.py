@@ -0,0 +1,76 @@
+"""
+bench_compute_layer.py - Panelin her yeniden çalıştırmada ihtiyaç duyduğu hesaplamaları ölçer.
+
+Her hesaplama önce Streamlit'ten bağımsız saf fonksiyonla (ilk çalıştırma),
+ardından filtre parmak izi bazlı önbellekli sürümüyle (widget etkileşimi
+sonrası yeniden çalıştırma) ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_compute_layer [satır_sayısı]
+"""
+
+import sys
+
+from benchmarks._data import make_report_frame, timer, print_results
+from config.constants import FIXED_METRICS, GENERAL_COLUMNS, MONTHS
+from utils.cache import filter_fingerprint
+from utils.comparative_analysis import comparative_totals, load_comparative_totals
+from utils.data_preview import (
+    column_totals,
+    compute_group_totals,
+    grouped_summary,
+    load_column_totals,
+    load_group_totals,
+    load_grouped_summary,
+)
+from utils.insight_generator import generate_insights, run_insight_rules
+from utils.kpi import calculate_kpi_metrics, load_kpi_metrics
+from utils.pivot_table import build_pivot
+from utils.trend_engine import compute_trend_series, load_trend_series
+
+GROUP_FIELD = "Masraf Çeşidi Grubu 1"
+
+
+def main(n_rows: int = 200_000) -> None:
+    df = make_report_frame(n_rows)
+    key = filter_fingerprint(df, {"months": MONTHS})
+    targets = [col for col in df.columns if col not in GENERAL_COLUMNS and not col.startswith("Kümüle")]
+    metrics = FIXED_METRICS[:-1]
+
+    steps = [
+        ("KPI", lambda: calculate_kpi_metrics(df, MONTHS),
+         lambda: load_kpi_metrics(df, MONTHS, cache_key=key)),
+        ("grup özeti", lambda: grouped_summary(df, GROUP_FIELD, targets),
+         lambda: load_grouped_summary(df, GROUP_FIELD, targets, cache_key=key)),
+        ("grup toplamları", lambda: compute_group_totals(df, GROUP_FIELD, MONTHS, metrics),
+         lambda: load_group_totals(df, GROUP_FIELD, MONTHS, metrics, cache_key=key)),
+        ("sütun toplamları", lambda: column_totals(df),
+         lambda: load_column_totals(df, cache_key=key)),
+        ("karşılaştırma", lambda: comparative_totals(df, "İlgili 1", MONTHS),
+         lambda: load_comparative_totals(df, "İlgili 1", MONTHS, cache_key=key)),
+        ("trend", lambda: compute_trend_series(df, MONTHS),
+         lambda: load_trend_series(df, MONTHS, cache_key=key)),
+        ("öngörüler", lambda: run_insight_rules(df),
+         lambda: generate_insights(df, cache_key=key)),
+        ("pivot", lambda: build_pivot(df, ["İlgili 1"], selected_months=MONTHS),
+         lambda: build_pivot(df, ["İlgili 1"], selected_months=MONTHS, cache_key=key)),
+    ]
+
+    results = {}
+    total_cold = total_warm = 0.0
+    for label, compute, load in steps:
+        with timer(f"{label} (saf)", results):
+            compute()
+        load()  # önbelleği doldur
+        with timer(f"{label} (önbellekli)", results):
+            load()
+        total_cold += results[f"{label} (saf)"]
+        total_warm += results[f"{label} (önbellekli)"]
+    results["toplam (saf)"] = total_cold
+    results["toplam (önbellekli)"] = total_warm
+
+    print_results(f"Hesaplama katmanı ({n_rows:,} satır)", results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,53 @@
+"""
+bench_formatting.py - Hücre bazlı ve vektörel para birimi formatlamasını karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.bench_formatting [satır_sayısı]
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._data import make_report_frame, timer, print_results
+from config.constants import GENERAL_COLUMNS
+from utils.formatting import format_currency, format_currency_columns, format_number_array
+
+
+def legacy_format_currency_columns(df: pd.DataFrame, general_columns: list) -> pd.DataFrame:
+    """Önceki hücre bazlı uygulama (karşılaştırma için)."""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    for col in numeric_cols:
+        if col not in general_columns:
+            df[col] = df[col].apply(lambda x: format_currency(x) if pd.notnull(x) else x)
+    return df
+
+
+def main(n_rows: int = 20000) -> None:
+    df = make_report_frame(n_rows)
+    totals = pd.DataFrame(df.select_dtypes(include=[np.number]).sum()).T
+    results = {}
+
+    with timer(f"hücre bazlı  ({n_rows} satır)", results):
+        legacy = legacy_format_currency_columns(df.copy(), GENERAL_COLUMNS)
+    with timer(f"vektörel     ({n_rows} satır)", results):
+        vectorized = format_currency_columns(df, GENERAL_COLUMNS)
+
+    with timer("hücre bazlı  (toplam satırı)", results):
+        legacy_format_currency_columns(totals.copy(), GENERAL_COLUMNS)
+    with timer("vektörel     (toplam satırı)", results):
+        format_currency_columns(totals, GENERAL_COLUMNS)
+
+    assert legacy.equals(vectorized), "Vektörel formatlama farklı sonuç üretti"
+    # Ondalıklı formatlar (ör. yüzde sütunları) Python'un tam yuvarlamasıyla aynı olmalı
+    values = df[[col for col in totals.columns if col not in GENERAL_COLUMNS]].to_numpy(dtype=np.float64).ravel()
+    for decimal_places in (1, 2):
+        expected = np.array([f"{value:,.{decimal_places}f}" for value in values], dtype=object)
+        assert (format_number_array(values, decimal_places) == expected).all(), \
+            f"{decimal_places} ondalıklı vektörel formatlama farklı sonuç üretti"
+    print_results("Para birimi formatlama", results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,57 @@
+"""
+bench_insights.py - Önceki çok geçişli öngörü üretimi ile tek geçişli motoru karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.bench_insights [en_büyük_satır_sayısı]
+"""
+
+import sys
+
+import pandas as pd
+
+from benchmarks._data import make_report_frame, timer, print_results
+from config.constants import GENERAL_COLUMNS
+from utils.insight_generator import run_insight_rules
+
+
+def legacy_insights(df: pd.DataFrame) -> list:
+    """Önceki uygulamanın hesaplama adımları (karşılaştırma için, metin üretimi hariç)."""
+    df = df.copy()
+    numeric_cols = df.select_dtypes(include=["number"]).columns
+    df[numeric_cols] = df[numeric_cols].fillna(0)
+    results = [df.groupby("Masraf Yeri Adı")["Kümüle Fiili"].sum().idxmax()]
+    df["Fark"] = df["Kümüle Bütçe"] - df["Kümüle Fiili"]
+    results.append(df.groupby("Masraf Yeri Adı")["Fark"].sum().idxmin())
+    df = df.copy()
+    df["Kullanım Oranı"] = df["Kümüle Fiili"] / df["Kümüle Bütçe"].replace(0, pd.NA)
+    results.append(df[df["Kümüle Fiili"] == 0]["Masraf Yeri Adı"].dropna().unique()[:5])
+    active = df[df["Kümüle Fiili"] > 0]
+    results.append(active.groupby("Masraf Yeri Adı")["Kümüle Fiili"].sum().nsmallest(1))
+    results.append(df[df["Kullanım Oranı"] < 0.5]["Masraf Yeri Adı"].dropna().unique()[:5])
+    kullanim_df = df[df["Kümüle Bütçe"] > 0]
+    results.append(kullanim_df.loc[kullanim_df["Kullanım Oranı"].idxmax()])
+    results.append(df.groupby("Masraf Çeşidi Grubu 1")["Kümüle Fiili"].sum().nlargest(1))
+    return results
+
+
+def main(max_rows: int = 1_000_000) -> None:
+    base = make_report_frame(100_000, n_cost_centres=5000)
+    base = base[GENERAL_COLUMNS + ["Kümüle Bütçe", "Kümüle Fiili"]]
+    results = {}
+
+    sizes = sorted({n for n in (10_000, 100_000, 1_000_000) if n < max_rows} | {max_rows})
+    for n_rows in sizes:
+        repeats = -(-n_rows // len(base))
+        df = pd.concat([base] * repeats, ignore_index=True).iloc[:n_rows]
+        with timer(f"çok geçişli   ({n_rows:>9,} satır)", results):
+            legacy_insights(df)
+        with timer(f"tek geçişli   ({n_rows:>9,} satır)", results):
+            _, timings = run_insight_rules(df)
+
+    print_results("Öngörü üretimi", results)
+    print(f"\nKural süreleri ({sizes[-1]:,} satır)")
+    print(timings.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,77 @@
+"""
+bench_pdf_report.py - PDF raporunun oluşturulma süresini ölçer.
+
+Eski yol (her PDF için font ölçülerini yeniden yükleme, grafikleri geçici
+dosyaya yazıp fpdf'in saf Python PNG ayrıştırıcısıyla okuma) ile
+generate_pdf_report'un bellekten görüntü gömen yolu karşılaştırılır.
+Grafikler kaleido çıktısına benzer alfa kanallı yüksek çözünürlüklü PNG'lerdir.
+
+Kullanım:
+    python -m benchmarks.bench_pdf_report [tekrar_sayısı]
+"""
+
+import os
+import sys
+import tempfile
+from io import BytesIO
+
+from fpdf import FPDF
+from PIL import Image, ImageDraw
+
+from benchmarks._data import timer, print_results
+from utils.report import FONT_PATH_BOLD, FONT_PATH_REGULAR, generate_pdf_report
+
+CHART_SIZE = (2800, 1800)
+
+
+def make_chart_png(seed: int) -> bytes:
+    """Şeffaf zeminli, çubuk grafiğe benzeyen bir RGBA PNG üretir."""
+    image = Image.new("RGBA", CHART_SIZE, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for i in range(24):
+        height = 200 + (i * 97 + seed * 53) % 1400
+        left = 100 + i * 110
+        draw.rectangle([left, CHART_SIZE[1] - height, left + 80, CHART_SIZE[1] - 50],
+                       fill=(31, 119, 180, 255) if i % 2 else (255, 127, 14, 200))
+    draw.line([(100, 200), (2700, 1500)], fill=(44, 160, 44, 255), width=8)
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def legacy_pdf(images) -> bytes:
+    """Eski yol: fontlar her seferinde yüklenir, görüntüler geçici dosyadan okunur."""
+    pdf = FPDF()
+    pdf.add_font("DejaVu", "", FONT_PATH_REGULAR, uni=True)
+    pdf.add_font("DejaVu", "B", FONT_PATH_BOLD, uni=True)
+    pdf.add_page()
+    pdf.set_font("DejaVu", "", 10)
+    for data in images:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_img:
+            tmp_img.write(data)
+            tmp_img.flush()
+            pdf.image(tmp_img.name, w=pdf.w - 40)
+        os.unlink(tmp_img.name)
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def main(n_runs: int = 3) -> None:
+    images = [make_chart_png(1), make_chart_png(2)]
+
+    results = {}
+    with timer(f"eski yol (x{n_runs})", results):
+        for _ in range(n_runs):
+            legacy = legacy_pdf(images)
+    with timer(f"generate_pdf_report (x{n_runs})", results):
+        for _ in range(n_runs):
+            current = generate_pdf_report(
+                1_000_000, 1_100_000, 100_000, 10.0,
+                BytesIO(images[0]), BytesIO(images[1]),
+            )
+
+    print_results(f"PDF raporu (2 grafik, {CHART_SIZE[0]}x{CHART_SIZE[1]} RGBA)", results)
+    print(f"Çıktı boyutu: eski {len(legacy) / 1024:.0f} KB, yeni {len(current) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,65 @@
+"""
+bench_pivot_crosstab.py - Masraf yeri x masraf çeşidi çapraz pivotunun süresini ve belleğini ölçer.
+
+pd.pivot_table(columns=...) ile kurulan yoğun tablo, pivot motorunun seyrek
+(CSR) çapraz tablosuyla karşılaştırılır. Bellek, tracemalloc ile ölçülen
+en yüksek ayırma ve sonucun kendi boyutu olarak raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_pivot_crosstab [satır_sayısı] [masraf_yeri_sayısı]
+"""
+
+import sys
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks._data import make_report_frame, timer, print_results
+from config.constants import MONTHS
+from utils.pivot_engine import compute_group_stats, crosstab_from_frame, pivot_from_stats, rollup_stats
+
+ROW_FIELD = "Masraf Yeri Adı"
+COL_FIELD = "Masraf Çeşidi"
+
+
+def _peak_mb(func):
+    """Fonksiyonu çalıştırır; (sonuç, en yüksek bellek ayırması (MB)) döndürür."""
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1024 ** 2
+
+
+def main(n_rows: int = 200000, n_cost_centres: int = 5000) -> None:
+    df = make_report_frame(n_rows, n_cost_centres=n_cost_centres)
+    value_columns = [f"{month} Fiili" for month in MONTHS]
+
+    results = {}
+    with timer("pd.pivot_table (yoğun)", results):
+        dense, dense_peak = _peak_mb(lambda: pd.pivot_table(
+            df, index=ROW_FIELD, columns=COL_FIELD, values=value_columns,
+            aggfunc="sum", fill_value=0, sort=False,
+        ))
+    with timer("pivot motoru (seyrek)", results):
+        crosstab, sparse_peak = _peak_mb(lambda: crosstab_from_frame(
+            pivot_from_stats(
+                rollup_stats(compute_group_stats(df, [ROW_FIELD, COL_FIELD], value_columns), [ROW_FIELD, COL_FIELD]),
+                "sum", value_columns,
+            ),
+            [ROW_FIELD], COL_FIELD,
+        ))
+
+    matrix = crosstab.matrix
+    sparse_mb = (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 1024 ** 2
+    print_results(f"Çapraz pivot ({n_rows} satır, {ROW_FIELD} x {COL_FIELD} x 12 ay)", results)
+    print(f"Boyut: {matrix.shape[0]} x {matrix.shape[1]}, dolu hücre: {matrix.nnz}")
+    print(f"Sonuç belleği: yoğun {dense.memory_usage(deep=False).sum() / 1024 ** 2:.1f} MB, seyrek {sparse_mb:.1f} MB")
+    print(f"En yüksek ayırma: yoğun {dense_peak:.1f} MB, seyrek {sparse_peak:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5000,
+    )
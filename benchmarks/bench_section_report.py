@@ -0,0 +1,78 @@
+"""
+bench_section_report.py - Grup bazlı ayrıntılı PDF raporunun aşama sürelerini ölçer.
+
+Bölüm verisi, Kaleido rasterleştirme, bölüm hazırlığı (sırayla / süreç
+havuzunda) ve binlerce satırlık tablonun yazımı ayrı ayrı raporlanır. Tablo
+ölçümü fpdf'in düz glif listesiyle GlyphSubset'i karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.bench_section_report [satır_sayısı] [bölüm_sayısı] [tablo_satırı]
+"""
+
+import os
+import sys
+
+from benchmarks._data import make_report_frame, timer, print_results
+from config.constants import MONTHS
+from utils.chart_export import chart_spec, get_renderer_pool, render_specs
+from utils.report import PDF
+from utils.report_sections import (
+    SECTION_CHART_HEIGHT,
+    SECTION_CHART_SCALE,
+    SECTION_CHART_WIDTH,
+    compute_report_sections,
+    prepare_sections,
+    section_figure,
+)
+
+GROUP_FIELD = "İlgili 1"
+
+
+def _table_pdf(n_rows: int, plain_subset: bool) -> bytes:
+    pdf = PDF()
+    if plain_subset:
+        for entry in pdf.fonts.values():
+            entry["subset"] = list(entry["subset"])
+    pdf.add_page()
+    rows = [[f"Masraf Yeri {i}", "Ocak", f"{i * 1234.5:,.0f} ₺", f"{i % 130:.1f} %"] for i in range(n_rows)]
+    pdf.add_table(["Masraf Yeri", "Ay", "Tutar", "Kullanım"], rows, [70, 30, 40, 30], row_height=7, font_size=8)
+    return pdf.output(dest="S")
+
+
+def main(n_rows: int = 200000, n_sections: int = 100, table_rows: int = 5000) -> None:
+    df = make_report_frame(n_rows)
+    # Bölüm sayısını ayarlamak için grup alanı masraf yerlerinden türetilir
+    centre_numbers = df["Masraf Yeri Adı"].str.extract(r"(\d+)")[0].astype(int)
+    df[GROUP_FIELD] = "Sorumlu " + (centre_numbers % n_sections).astype(str)
+    get_renderer_pool().warm_up()
+    workers = min(4, os.cpu_count() or 1)
+
+    results = {}
+    with timer("bölüm verisi", results):
+        sections = compute_report_sections(df, GROUP_FIELD, MONTHS, max_sections=n_sections)
+    with timer("grafik rasterleştirme (Kaleido havuzu)", results):
+        images, _ = render_specs({
+            str(i): chart_spec(section_figure(section), SECTION_CHART_WIDTH, SECTION_CHART_HEIGHT, SECTION_CHART_SCALE)
+            for i, section in enumerate(sections)
+        })
+    image_list = [images[str(i)] for i in range(len(sections))]
+    with timer("bölüm hazırlığı (sırayla)", results):
+        prepare_sections(sections, image_list, workers=1)
+    if workers > 1:
+        prepare_sections(sections, image_list, workers=workers)  # havuzu ısıt
+        with timer(f"bölüm hazırlığı ({workers} süreç)", results):
+            prepare_sections(sections, image_list, workers=workers)
+    with timer(f"{table_rows} satırlık tablo (düz glif listesi)", results):
+        _table_pdf(table_rows, plain_subset=True)
+    with timer(f"{table_rows} satırlık tablo (GlyphSubset)", results):
+        _table_pdf(table_rows, plain_subset=False)
+
+    print_results(f"Ayrıntılı PDF raporu ({len(sections)} bölüm, {n_rows} satır)", results)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 5000,
+    )
@@ -0,0 +1,46 @@
+"""
+bench_table_store.py - Veri sekmesi tablolarının oturum başına bellek maliyetini ölçer.
+
+Aynı veriyle çalışan N oturum simüle edilir: önce her oturumun hazırlanmış
+tablonun kopyasını session_state'te tuttuğu eski düzen, ardından oturumların
+yalnızca TableRef tuttuğu paylaşılan depo ölçülür. Yeniden çalıştırma süresi
+(tablo hazırlığı / depodan okuma) da raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_table_store [satır_sayısı] [oturum_sayısı]
+"""
+
+import sys
+
+from benchmarks._data import make_report_frame, timer, print_results
+from config.constants import MONTHS
+from utils.cache import filter_fingerprint
+from utils.data_preview import prepare_table
+from utils.table_store import load_table, session_memory, table_nbytes
+
+
+def main(n_rows: int = 20_000, n_sessions: int = 10) -> None:
+    df = make_report_frame(n_rows)
+    key = filter_fingerprint(df, {"months": MONTHS})
+    recipe = ("table", tuple(df.columns))
+
+    results = {}
+    with timer("hazırlık (her yeniden çalıştırmada)", results):
+        copies = [{"ham_veri": prepare_table(df)[0]} for _ in range(n_sessions)]
+    load_table(key, recipe, lambda: prepare_table(df)[0])  # depoyu doldur
+    with timer("depodan okuma (her yeniden çalıştırmada)", results):
+        sessions = [{"ham_veri": load_table(key, recipe, lambda: prepare_table(df)[0])[1]} for _ in range(n_sessions)]
+
+    print_results(f"Tablo deposu ({n_rows:,} satır x {df.shape[1]} sütun, {n_sessions} oturum)", results)
+    copy_bytes = sum(table_nbytes(state["ham_veri"]) for state in copies)
+    memory = [session_memory(state) for state in sessions]
+    print(f"  kopyalar (oturum başına)    {copy_bytes / n_sessions / 1e6:8.1f} MB  toplam {copy_bytes / 1e6:8.1f} MB")
+    print(f"  başvurular (oturum başına)  {memory[0].ref_bytes / 1e3:8.2f} KB  "
+          f"paylaşılan depo {memory[0].store_bytes / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
@@ -0,0 +1,60 @@
+"""
+bench_zip_report.py - ZIP raporundaki Excel dosyalarının üretim süresini ölçer.
+
+"Ham Veri" sayfası önce pandas `to_excel` (xlsxwriter) ile, ardından
+değerleri sütun bazında çevirip xlsxwriter'ın sabit bellek modunda write_row
+ile yazan yazıcıyla yazılır. Son olarak tüm ZIP (üç Excel dosyası) sıralı ve
+süreç havuzuyla oluşturulur.
+
+Kullanım:
+    python -m benchmarks.bench_zip_report [satır_sayısı]
+"""
+
+import sys
+from io import BytesIO
+
+import pandas as pd
+
+from benchmarks._data import make_report_frame, timer, print_results
+from config.constants import GENERAL_COLUMNS, REPORT_ZIP_WORKERS
+from utils.data_preview import column_totals, grouped_summary
+from utils.formatting import get_column_formats, write_excel_sheet
+from utils.report_bundle import build_report_zip
+from utils.xlsx_export import WorkbookSheet, workbook_bytes
+
+
+def main(n_rows: int = 20_000) -> None:
+    df = make_report_frame(n_rows)
+    formats = get_column_formats(df, GENERAL_COLUMNS)
+    targets = [col for col in df.columns if col not in GENERAL_COLUMNS]
+    tables = {
+        "ham_veri": df,
+        "ham_veri_toplam_sayisal": column_totals(df),
+        "masraf_grubu_ozet": grouped_summary(df, "Masraf Çeşidi Grubu 1", targets),
+        "ilgili1_ozet": grouped_summary(df, "İlgili 1", targets),
+    }
+
+    results = {}
+    with timer("Ham Veri to_excel (xlsxwriter)", results):
+        buffer = BytesIO()
+        with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+            write_excel_sheet(writer, df, "Ham Veri", formats)
+    sizes = {"to_excel": len(buffer.getvalue())}
+
+    with timer("Ham Veri write_row (constant_memory)", results):
+        data = workbook_bytes([WorkbookSheet("Ham Veri", df, formats)])
+    sizes["write_row"] = len(data)
+
+    with timer("ZIP sıralı", results):
+        build_report_zip(tables, {}, workers=1)
+    build_report_zip(tables, {}, workers=REPORT_ZIP_WORKERS)  # havuzu başlat
+    with timer(f"ZIP süreç havuzu ({REPORT_ZIP_WORKERS})", results):
+        build_report_zip(tables, {}, workers=REPORT_ZIP_WORKERS)
+
+    print_results(f"ZIP raporu Excel dosyaları ({n_rows:,} satır x {df.shape[1]} sütun)", results)
+    for label, size in sizes.items():
+        print(f"  {label:<30} {size / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
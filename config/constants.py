@@ -62,4 +62,111 @@ FIXED_METRICS = [
     "BE-Fiili Fark Bakiye",
     "BE Bakiye"
 ]
- 
\ No newline at end of file
+
+
+# Stil uygulanacak en fazla hücre sayısı (sayfa başına); aşılırsa tablo stilsiz gösterilir
+STYLE_MAX_CELLS = 100_000
+
+# Sayfa bazlı stil önbelleğinde tutulacak en fazla kayıt sayısı
+STYLE_CACHE_ENTRIES = 128
+
+# Bütçe aşım kuralları (kullanım oranı = fiili / bütçe * 100, eşik aşılırsa tetiklenir).
+# Kurallar en yüksek eşikten başlayarak değerlendirilir; her hücre yalnızca ilk eşleşen kurala düşer.
+ALERT_RULES = [
+    {
+        "rule": "Kritik Aşım",
+        "min_usage": 110.0,
+        "level": "error",
+        "message": "🚨 Bütçe %110'dan fazla aşıldı! Acil müdahale gerekebilir.",
+    },
+    {
+        "rule": "Bütçe Aşımı",
+        "min_usage": 100.0,
+        "level": "warning",
+        "message": "⚠️ Bütçe aşıldı (%100 üzeri).",
+    },
+    {
+        "rule": "Bütçeye Yaklaşma",
+        "min_usage": 90.0,
+        "level": "warning",
+        "message": "⚠️ Bütçeye çok yaklaşıldı (%90 üzeri).",
+    },
+]
+
+# Grafik PNG dışa aktarımı için sıcak tutulan Kaleido işlem sayısı
+CHART_RENDERER_POOL_SIZE = 3
+
+# Render edilmiş grafik görüntüleri için önbellek kapasitesi (kayıt sayısı)
+CHART_IMAGE_CACHE_ENTRIES = 64
+
+# Karşılaştırma grafiğinde WebGL moduna geçilen grup sayısı ve bu modda çizilecek en fazla nokta
+COMPARATIVE_WEBGL_THRESHOLD = 300
+COMPARATIVE_MAX_POINTS = 1000
+
+# Filtre parmak izi başına önbelleğe alınan trend hesaplaması sayısı
+TREND_CACHE_ENTRIES = 32
+
+# İstatistiksel anomali tespiti: robust z-skoru eşiği ve skorlama için gereken en az ay sayısı
+ANOMALY_Z_THRESHOLD = 3.5
+ANOMALY_MIN_MONTHS = 4
+ANOMALY_LEVEL = "anomaly"
+ANOMALY_SPEND_RULE = "Harcama Anomalisi"
+ANOMALY_BUDGET_RULE = "Bütçe Sapma Anomalisi"
+
+# Filtre parmak izi başına önbelleğe alınan öngörü listesi sayısı
+INSIGHT_CACHE_ENTRIES = 32
+
+# Öngörü kuralı başına varsayılan süre bütçesi (ms); aşan kurallar sonraki çalıştırmalarda atlanır
+INSIGHT_RULE_BUDGET_MS = 250.0
+
+# Bütçesini aşan kuralın aynı veri için atlanacağı çalıştırma sayısı; sonra kural yeniden denenir
+INSIGHT_RULE_SKIP_RUNS = 5
+
+# Pivot motorunda önbelleğe alınan grup istatistiği ve pivot tablo sayısı
+PIVOT_CACHE_ENTRIES = 32
+
+# Daha kaba pivotlar için saklanan en ayrıntılı toplamın satır sayısına oranla en fazla grup sayısı
+PIVOT_AGGREGATE_MAX_RATIO = 0.5
+
+# Çapraz pivot tabloda ekranda yoğun olarak gösterilecek en fazla hücre ve sütun sayısı
+PIVOT_DISPLAY_MAX_CELLS = 50_000
+PIVOT_DISPLAY_MAX_COLUMNS = 300
+
+# Çapraz pivot tablonun Excel'e geniş (yoğun) biçimde yazılacağı en fazla hücre sayısı;
+# daha büyük tablolar dolu hücrelerin uzun listesi olarak yazılır
+PIVOT_EXCEL_MAX_CELLS = 2_000_000
+
+# Pivot medyan/p90 özetlerinin göreli doğruluğu ve farklı değer sayısı (HyperLogLog) ayarları
+PIVOT_QUANTILE_ACCURACY = 0.01
+PIVOT_HLL_PRECISION = 12
+PIVOT_DISTINCT_FIELD = "Masraf Çeşidi"
+
+# PDF'e gömülen görüntülerin PNG (zlib) sıkıştırma seviyesi ve önbellekte tutulan görüntü sayısı
+PDF_IMAGE_COMPRESSION_LEVEL = 6
+PDF_IMAGE_CACHE_ENTRIES = 32
+
+# Grup bazlı ayrıntılı PDF raporu: en fazla bölüm sayısı, bölüm başına listelenen en büyük aşım sayısı,
+# düzen hazırlığı için süreç havuzu boyutu ve havuzun devreye girdiği en az bölüm sayısı
+REPORT_SECTION_FIELDS = ["Masraf Çeşidi Grubu 1", "İlgili 1"]
+REPORT_MAX_SECTIONS = 100
+REPORT_TOP_OVERRUNS = 10
+REPORT_LAYOUT_WORKERS = 4
+REPORT_PARALLEL_MIN_SECTIONS = 8
+
+# ZIP raporu: arşivin sıkıştırma seviyesi (0 = sıkıştırmadan sakla, 1-9 = deflate; Excel ve PNG
+# dosyaları zaten sıkıştırılmış olduğundan varsayılan 0) ve Excel dosyalarını üreten süreç
+# havuzunun boyutu (tek işlemcide havuz kullanılmaz)
+REPORT_ZIP_COMPRESSION_LEVEL = 0
+REPORT_ZIP_WORKERS = 3
+
+# Komut satırı toplu raporlama: varsayılan işçi süreci sayısı ve işçi başına Kaleido işlemi sayısı
+BATCH_WORKERS = 2
+BATCH_RENDERER_POOL_SIZE = 1
+
+# Veri sekmesi tabloları, KPI ve karşılaştırma toplamları için önbellekte tutulan sonuç sayısı
+SUMMARY_CACHE_ENTRIES = 64
+
+# Veri sekmesi tablolarının (ZIP raporu için) oturumlar arasında paylaşılan deposu:
+# en fazla kayıt sayısı ve toplam boyut sınırı (MB)
+TABLE_STORE_ENTRIES = 64
+TABLE_STORE_MAX_MB = 512
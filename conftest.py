@@ -0,0 +1,3 @@
+"""
+conftest.py - pytest'in proje kökündeki modülleri (config, utils) bulmasını sağlar.
+"""
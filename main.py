@@ -9,6 +9,8 @@ Modüller:
     - filters: Veri filtreleme işlemleri
     - metrics: Performans metriklerinin hesaplanması
     - report: PDF rapor oluşturma
+    - report_sections: Grup bazlı ayrıntılı PDF raporu
+    - report_bundle: ZIP/PDF rapor dosyaları (panel ve komut satırı ortak)
     - kpi: KPI paneli görüntüleme
     - category_analysis: Kategori bazlı analizler
     - comparative_analysis: Karşılaştırmalı analizler
@@ -16,7 +18,9 @@ Modüller:
     - pivot_table: Pivot tablo görüntüleme
     - insight_generator: Veri içgörüleri oluşturma
     - data_preview: Veri önizleme
+    - table_store: ZIP raporu tablolarının oturumlar arasında paylaşılan deposu
     - warning_system: Uyarı sistemi
+    - alert_engine: Bütçe aşım uyarı indeksi
     - error_handler: Hata yönetimi
 
 Kullanım:
@@ -25,30 +29,36 @@ Kullanım:
 
 import streamlit as st
 from io import BytesIO
-import zipfile
 from PIL import Image
 import pandas as pd
 import numpy as np
 
 from utils.loader import load_data
-from utils.filters import apply_filters
+from utils.filters import apply_filters, apply_saved_filters, saved_filter_selections
 from utils.metrics import calculate_metrics
 from utils.report import generate_pdf_report
+from utils.report_sections import generate_section_report
+from utils.report_bundle import prepare_final_dataframe, build_report_zip, ZIP_EXCEL_FILES
 from config.constants import (
     MONTHS,
     GENERAL_COLUMNS,
     REPORT_BASE_COLUMNS,
     CUMULATIVE_COLUMNS, FIXED_METRICS,
+    REPORT_SECTION_FIELDS,
 )
 from utils.kpi import show_kpi_panel
 from utils.category_analysis import show_category_charts
 from utils.comparative_analysis import show_comparative_analysis
-from utils.trend_analysis import show_trend_analysis
+from utils.trend_analysis import show_trend_analysis, show_group_trends
 from utils.pivot_table import show_pivot_table
 from utils.insight_generator import generate_insights
 from utils.data_preview import show_filtered_data, show_grouped_summary, calculate_group_totals, show_column_totals
-from utils.warning_system import style_negatives_red, style_warning_rows
+from utils.table_store import resolve_tables, session_memory, format_session_memory
+from utils.warning_system import style_negatives_red, style_warning_rows, show_alert_summary
+from utils.alert_engine import load_alert_index, query_alerts, diff_alerts, split_anomalies, CUMULATIVE_PERIOD
 from utils.error_handler import handle_critical_error, display_friendly_error
+from utils.chart_export import render_spec
+from utils.cache import filter_fingerprint
 
 
 def setup_page_config():
@@ -106,6 +116,24 @@ def load_and_validate_data():
         return None
 
 
+def load_previous_period():
+    """
+    Karşılaştırma için isteğe bağlı önceki dönem dosyasını yükler.
+    
+    Returns:
+        DataFrame or None: Önceki dönemin veri çerçevesi veya yüklenmediyse None
+    """
+    with st.expander("🔁 Önceki Dönem (isteğe bağlı)", expanded=False):
+        previous_file = st.file_uploader(
+            "Önceki dönemin ZFMR0003 Excel dosyası",
+            type=["xlsx", "xls"],
+            key="previous_period_file",
+        )
+    if previous_file:
+        return load_data(previous_file)
+    return None
+
+
 def setup_sidebar_filters(df):
     """
     Kenar çubuğundaki filtreleri ayarlar.
@@ -226,41 +254,6 @@ def clear_all_filters():
         )
 
 
-def prepare_final_dataframe(df, filtered_df, selected_months, selected_report_bases, selected_cumulative):
-    """
-    Son veri çerçevesini hazırlar.
-    """
-    # Veri çerçevesini optimize et
-    filtered_df = filtered_df.copy()
-    numeric_cols = filtered_df.select_dtypes(include=[np.number]).columns
-    filtered_df[numeric_cols] = filtered_df[numeric_cols].fillna(0)
-
-    # Sütun seçimi için mapping oluştur
-    column_mapping = {
-        'general': GENERAL_COLUMNS.copy(),
-        'monthly': [
-            f"{month} {base_col}"
-            for month in selected_months
-            for base_col in selected_report_bases
-            if f"{month} {base_col}" in filtered_df.columns
-        ],
-        'cumulative': [
-            cum_col for cum_col in selected_cumulative
-            if cum_col in filtered_df.columns
-        ]
-    }
-
-    # Tüm sütunları birleştir
-    selected_columns = (
-        column_mapping['general'] +
-        column_mapping['monthly'] +
-        column_mapping['cumulative']
-    )
-
-    return filtered_df[selected_columns]
-
-
-
 @handle_critical_error
 def main():
     """
@@ -277,6 +270,11 @@ def main():
     if df is None:
         return
 
+    # Bütçe aşım uyarıları yükleme anında tüm masraf yerleri için bir kez hesaplanır
+    alerts = load_alert_index(df)
+    previous_df = load_previous_period()
+    new_alerts = diff_alerts(load_alert_index(previous_df), alerts) if previous_df is not None else None
+
     # Filtreler
     filtered_df, selected_months, selected_report_bases, selected_cumulative = setup_sidebar_filters(df)
 
@@ -293,10 +291,27 @@ def main():
         )
         return
 
+    # Uyarı indeksini görünen masraf yerleri ve aylar için sorgula
+    alert_scope = {
+        "months": list(selected_months) + [CUMULATIVE_PERIOD],
+        "cost_centres": final_df["Masraf Yeri Adı"].dropna().unique(),
+    }
+    visible_alerts = query_alerts(alerts, **alert_scope)
+    visible_new_alerts = query_alerts(new_alerts, **alert_scope) if new_alerts is not None else None
+
+    # Filtre parmak izi: yüklenen dosya + tüm filtre seçimleri (hesaplama önbelleklerinin anahtarı)
+    filter_key = filter_fingerprint(df, {
+        "filters": saved_filter_selections("filter"),
+        "months": list(selected_months),
+        "report_bases": list(selected_report_bases),
+        "cumulative": list(selected_cumulative),
+    })
+    previous_scope = apply_saved_filters(previous_df, "filter") if previous_df is not None else None
+
     st.markdown("---")
 
     # KPI paneli gösterimi
-    show_kpi_panel(final_df)
+    show_kpi_panel(final_df, selected_months, cache_key=filter_key)
 
     # Analiz sekmeleri tanımlamaları
     tab_config = {
@@ -368,13 +383,15 @@ def main():
                 title="#### 📊 Grup Bazında Detaylar",
                 style_func=style_negatives_red,
                 sticky_column="Masraf Çeşidi Grubu 1",
-                page_size=301
+                page_size=301,
+                cache_key=filter_key,
             )
 
             show_column_totals(
                 table_filtered_df,
                 filename="masraf_grubu_toplam_sayisal.xlsx",
-                title="#### ➕ Sayısal Sütun Toplamları"
+                title="#### ➕ Sayısal Sütun Toplamları",
+                cache_key=filter_key,
             )
 
         # ➕ Masraf Çeşidi Toplamları
@@ -390,7 +407,8 @@ def main():
                 final_df,
                 group_column="Masraf Çeşidi Grubu 1",
                 selected_months=selected_months,
-                metrics=selected_metrics
+                metrics=selected_metrics,
+                cache_key=filter_key,
             )
 
             show_filtered_data(
@@ -460,13 +478,15 @@ def main():
                 title="#### 📊 İlgili 1 Bazında Detaylar",
                 style_func=style_negatives_red,
                 sticky_column="İlgili 1",
-                page_size=301
+                page_size=301,
+                cache_key=filter_key,
             )
 
             show_column_totals(
                 ilgili1_filtered_df,
                 filename="ilgili1_toplam_sayisal.xlsx",
-                title="#### ➕ Sayısal Sütun Toplamları"
+                title="#### ➕ Sayısal Sütun Toplamları",
+                cache_key=filter_key,
             )
 
         with st.container():
@@ -480,7 +500,8 @@ def main():
                 final_df,
                 group_column="İlgili 1",
                 selected_months=selected_months,
-                metrics=selected_metrics
+                metrics=selected_metrics,
+                cache_key=filter_key,
             )
 
             show_filtered_data(
@@ -524,13 +545,15 @@ def main():
                 style_func=style_warning_rows,
                 filename="ham_veri.xlsx",
                 sticky_column=0,
-                page_size=301
+                page_size=301,
+                cache_key=filter_key,
             )
 
             show_column_totals(
                 visible_df,
                 filename="ham_veri_toplam_sayisal.xlsx",
-                title="#### ➕ Ham Verideki Sayısal Sütun Toplamları"
+                title="#### ➕ Ham Verideki Sayısal Sütun Toplamları",
+                cache_key=filter_key,
             )
 
 
@@ -543,94 +566,117 @@ def main():
         with col3:
             difference_color = st.color_picker("Fark Rengi", "#00CC96")
 
-        trend_img_buffer = show_trend_analysis(
+        trend_spec = show_trend_analysis(
             final_df,
             selected_months=selected_months,
             budget_color=budget_color,
             actual_color=actual_color,
             difference_color=difference_color,
+            previous_df=previous_scope,
+            cache_key=filter_key,
         )
 
+        st.markdown("---")
+        if st.toggle("🔲 Grup Bazında Trend (Küçük Çoklu)", key="group_trend_mode"):
+            show_group_trends(
+                final_df,
+                selected_months=selected_months,
+                budget_color=budget_color,
+                actual_color=actual_color,
+                cache_key=filter_key,
+            )
+
     with tabs_analiz[2]:
-        combined_img_buffer = show_category_charts(final_df)
+        category_specs = show_category_charts(final_df, selected_months, cache_key=filter_key)
 
     with tabs_analiz[3]:
         group_by_option = st.selectbox("Gruplama Kriteri", GENERAL_COLUMNS)
-        comparative_excel_buffer, comperative_img_buffer = show_comparative_analysis(
-            final_df, group_by_col=group_by_option
+        comparative_excel_buffer, comparative_spec = show_comparative_analysis(
+            final_df, group_by_col=group_by_option, selected_months=selected_months, cache_key=filter_key
         )
 
     with tabs_analiz[4]:
-        pivot_excel_buffer = show_pivot_table(final_df)
+        show_pivot_table(
+            final_df,
+            selected_months=selected_months,
+            # "Hepsi" seçiliyse tüm metrikler (BE Bakiye dahil) pivotlanabilir
+            selected_report_bases=(
+                None if selected_report_bases == REPORT_BASE_COLUMNS else selected_report_bases
+            ),
+            cache_key=filter_key,
+        )
 
     with tabs_analiz[5]:
-        insights = generate_insights(final_df)
+        _, visible_anomalies = split_anomalies(visible_alerts)
+        insights, rule_timings = generate_insights(
+            final_df, anomalies=visible_anomalies, cache_key=filter_key
+        ) or ([], None)
         if insights:
             for i, insight in enumerate(insights, 1):
                 st.markdown(f"{i}. {insight}")
         else:
             st.info("İçgörü üretilemedi.")
 
+        if rule_timings is not None:
+            with st.expander("⏱️ Öngörü Kuralı Süreleri", expanded=False):
+                st.dataframe(
+                    rule_timings,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Süre (ms)": st.column_config.NumberColumn(format="%.1f"),
+                        "Bütçe (ms)": st.column_config.NumberColumn(format="%.0f"),
+                    },
+                )
+
+        st.markdown("---")
+        show_alert_summary(visible_alerts, visible_new_alerts)
+
     # Raporlama tabları
     with tabs_raporlama[0]:
         if st.button("📦 ZIP Raporu Oluştur"):
-            with st.spinner("Rapor oluşturuluyor..."):
-                # Excel dosyaları için mapping
-                excel_files = {
-                    'masraf_grubu': {
-                        'sheets': {
-                            'Özet': 'masraf_grubu_ozet',
-                            'Sayısal Toplam': 'masraf_grubu_toplam_sayisal',
-                            'Toplamlar': 'masraf_grubu_toplamlar',
-                            'Genel Toplam': 'masraf_grubu_toplamlar_sayisal'
-                        },
-                        'filename': 'masraf_cesidi_grubu_1_analizi.xlsx'
-                    },
-                    'ilgili1': {
-                        'sheets': {
-                            'Özet': 'ilgili1_ozet',
-                            'Sayısal Toplam': 'ilgili1_toplam_sayisal',
-                            'Toplamlar': 'ilgili1_toplamlar',
-                            'Genel Toplam': 'ilgili1_toplamlar_sayisal'
-                        },
-                        'filename': 'ilgili_1_analizi.xlsx'
-                    },
-                    'ham_veri': {
-                        'sheets': {
-                            'Ham Veri': 'ham_veri',
-                            'Sayısal Toplam': 'ham_veri_toplam_sayisal'
-                        },
-                        'filename': 'ham_veri.xlsx'
-                    }
-                }
-
-                # Görsel dosyaları için mapping
-                image_files = {
-                    'trend.png': trend_img_buffer,
-                    'kategori_analizi.png': combined_img_buffer,
-                    'karsilastirma_analizi.png': comperative_img_buffer
-                }
-
-                # ZIP oluştur
-                zip_buffer = BytesIO()
-                with zipfile.ZipFile(zip_buffer, "w") as zip_file:
-                    # Excel dosyalarını ekle
-                    for file_config in excel_files.values():
-                        excel_buffer = BytesIO()
-                        with pd.ExcelWriter(excel_buffer, engine="openpyxl") as writer:
-                            for sheet_name, state_key in file_config['sheets'].items():
-                                if state_key in st.session_state:
-                                    st.session_state[state_key].to_excel(writer, sheet_name=sheet_name, index=False)
-                        zip_file.writestr(file_config['filename'], excel_buffer.getvalue())
-
-                    # Görsel dosyalarını ekle
-                    for filename, buffer in image_files.items():
-                        if buffer:
-                            zip_file.writestr(filename, buffer.getvalue())
-
-                # ZIP'i session state'e kaydet
-                st.session_state["zip_buffer"] = zip_buffer.getvalue()
-                st.success("Rapor oluşturuldu!")
+            # Görsel dosyaları için mapping (grafikler yalnızca burada render edilir)
+            chart_specs = {
+                'trend.png': trend_spec,
+                'karsilastirma_analizi.png': comparative_spec,
+            }
+            for name, spec in (category_specs or {}).items():
+                chart_specs[f'kategori_analizi/{name}'] = spec
+
+            # ZIP oluştur (Excel sayfaları Veri sekmesinin tablolarından yazılır; oturumdaki
+            # başvurular paylaşılan tablo deposundan çözülür)
+            tables, missing_tables = resolve_tables({
+                table_key: st.session_state[table_key]
+                for sheets in ZIP_EXCEL_FILES.values()
+                for table_key in sheets.values()
+                if table_key in st.session_state
+            })
+            if missing_tables:
+                display_friendly_error(
+                    f"Bazı tablolar önbellekten çıkarıldığı için ZIP'e eklenmedi: {', '.join(missing_tables)}",
+                    "Sayfayı yenileyip raporu yeniden oluşturun."
+                )
+            progress = st.progress(0.0, text="Rapor oluşturuluyor...")
+            zip_timings = {}
+
+            def on_zip_progress(name, done, total, ms):
+                zip_timings[name] = ms
+                progress.progress(done / total, text=f"{name} hazır ({done}/{total})")
+
+            zip_bytes = build_report_zip(
+                tables,
+                {name: spec for name, spec in chart_specs.items() if spec is not None},
+                on_progress=on_zip_progress,
+            )
+            progress.empty()
+
+            # ZIP'i session state'e kaydet
+            st.session_state["zip_buffer"] = zip_bytes
+            st.success("Rapor oluşturuldu!")
+            st.caption("📦 " + " · ".join(
+                f"{name} {ms / 1000:.1f} sn" if ms else f"{name} (önbellek)"
+                for name, ms in zip_timings.items()
+            ))
 
         # ZIP indirme butonu
         if "zip_buffer" in st.session_state:
@@ -640,21 +686,44 @@ def main():
                 file_name="rapor.zip",
                 mime="application/zip"
             )
+        st.caption(format_session_memory(session_memory(st.session_state)))
 
     with tabs_raporlama[1]:
+        section_fields = [field for field in REPORT_SECTION_FIELDS if field in final_df.columns]
+        report_type = st.radio(
+            "Rapor Türü",
+            ["Özet", "Ayrıntılı (grup bazlı)"] if section_fields else ["Özet"],
+            horizontal=True,
+            key="pdf_report_type",
+        )
+        section_field = None
+        if report_type != "Özet":
+            section_field = st.selectbox("Bölüm Alanı", section_fields, key="pdf_section_field")
+
         if st.button("📄 PDF Raporu Oluştur"):
             with st.spinner("Rapor oluşturuluyor..."):
-                pdf = generate_pdf_report(
-                    total_budget,
-                    total_actual,
-                    variance,
-                    variance_pct,
-                    trend_img_buffer,
-                    comperative_img_buffer,
-                )
-                st.download_button(
-                    "⬇ İndir (PDF)", data=pdf, file_name="rapor.pdf", mime="application/pdf"
-                )
+                if section_field is None:
+                    pdf = generate_pdf_report(
+                        total_budget,
+                        total_actual,
+                        variance,
+                        variance_pct,
+                        BytesIO(render_spec(trend_spec)) if trend_spec else None,
+                        BytesIO(render_spec(comparative_spec)) if comparative_spec else None,
+                        alerts=split_anomalies(visible_alerts)[0],
+                    )
+                else:
+                    pdf = generate_section_report(
+                        final_df,
+                        section_field,
+                        selected_months,
+                        budget_color=budget_color,
+                        actual_color=actual_color,
+                    )
+                if pdf:
+                    st.download_button(
+                        "⬇ İndir (PDF)", data=pdf, file_name="rapor.pdf", mime="application/pdf"
+                    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from utils.alert_engine import BUDGET_LIMIT_PCT, build_alert_index, diff_alerts, is_overrun, match_rule
+from utils.report import generate_pdf_report
+from utils.warning_system import overused_row_styles
+
+
+def _frame(budget, actual):
+    return pd.DataFrame({
+        "Masraf Yeri": ["MY1", "MY2"],
+        "Masraf Yeri Adı": ["Yer 1", "Yer 2"],
+        "Ocak Bütçe": budget,
+        "Ocak Fiili": actual,
+    })
+
+
+def test_diff_alerts_reports_escalations_but_not_de_escalations():
+    previous = build_alert_index(_frame([100.0, 100.0], [120.0, 105.0]))  # Kritik, Aşım
+    current = build_alert_index(_frame([100.0, 100.0], [105.0, 120.0]))   # Aşım, Kritik
+
+    new = diff_alerts(previous, current)
+
+    assert list(new["Masraf Yeri Adı"]) == ["Yer 2"]
+    assert list(new["Kural"]) == ["Kritik Aşım"]
+
+
+def test_diff_alerts_ignores_unchanged_and_reports_first_breach():
+    previous = build_alert_index(_frame([100.0, 100.0], [105.0, 50.0]))
+    current = build_alert_index(_frame([100.0, 100.0], [106.0, 95.0]))
+
+    new = diff_alerts(previous, current)
+
+    assert list(new["Masraf Yeri Adı"]) == ["Yer 2"]
+    assert list(new["Kural"]) == ["Bütçeye Yaklaşma"]
+
+
+def test_table_styles_and_alert_rules_share_the_threshold():
+    usage = [99.0, 100.0, 100.5, np.inf, np.nan]
+    css = overused_row_styles(pd.DataFrame({"Kullanım (%)": usage}))
+
+    styled = [bool(row.any()) for row in (css != "")]
+    assert styled == [False, False, True, True, False]
+    assert styled == [is_overrun(value) for value in usage]
+    matched = [match_rule(value) for value in usage]
+    assert styled == [rule is not None and rule["min_usage"] >= BUDGET_LIMIT_PCT for rule in matched]
+    assert match_rule(100.0)["rule"] == "Bütçeye Yaklaşma"
+
+
+def test_pdf_formats_zero_budget_overrun_as_infinity():
+    alerts = build_alert_index(_frame([0.0, 100.0], [50.0, 120.0]))
+    assert np.isinf(alerts["Kullanım (%)"]).any()
+
+    pdf = generate_pdf_report(100.0, 170.0, -70.0, -70.0, alerts=alerts)
+    assert pdf is not None and pdf.startswith(b"%PDF")
@@ -0,0 +1,15 @@
+import numpy as np
+
+from utils.anomaly import usage_percent
+
+
+def test_usage_percent_marks_unbudgeted_spending_as_overrun():
+    budget = np.array([100.0, 0.0, 0.0, 0.0])
+    actual = np.array([90.0, 25.0, 0.0, -5.0])
+
+    usage = usage_percent(budget, actual)
+
+    assert usage[0] == 90.0
+    assert np.isposinf(usage[1])
+    assert np.isnan(usage[2])
+    assert np.isnan(usage[3])
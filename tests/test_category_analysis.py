@@ -0,0 +1,14 @@
+import pandas as pd
+
+from utils.category_analysis import load_column_cardinalities
+
+
+def test_cardinalities_are_cached_by_filter_key():
+    df = pd.DataFrame({"Grup": ["A", "B", "A"], "Tutar": [1.0, 2.0, 3.0]})
+    assert load_column_cardinalities(df, cache_key="filtre-1") == {"Grup": 2}
+
+    # Aynı filtre parmak izi çerçeve yeniden hashlenmeden önbellekten döner
+    other = pd.DataFrame({"Grup": ["A", "B", "C"], "Tutar": [1.0, 2.0, 3.0]})
+    assert load_column_cardinalities(other, cache_key="filtre-1") == {"Grup": 2}
+    assert load_column_cardinalities(other, cache_key="filtre-2") == {"Grup": 3}
+    assert load_column_cardinalities(other) == {"Grup": 3}
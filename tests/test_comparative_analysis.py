@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from utils.comparative_analysis import comparative_totals
+
+
+def test_comparative_totals_stays_numeric_with_zero_budget():
+    df = pd.DataFrame({
+        "İlgili 1": ["A", "A", "B"],
+        "Ocak Bütçe": [100.0, 50.0, 0.0],
+        "Ocak Fiili": [90.0, 60.0, 25.0],
+    })
+    result, formats = comparative_totals(df, "İlgili 1", ["Ocak"])
+
+    assert result["Kullanım (%)"].dtype == np.float64
+    by_group = result.set_index("İlgili 1")
+    assert by_group.loc["A", "Kullanım (%)"] == 100.0
+    assert np.isnan(by_group.loc["B", "Kullanım (%)"])
+    assert formats["Kullanım (%)"] == "percent"
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.formatting import format_currency_columns, format_number_array
+
+
+@pytest.mark.parametrize("decimal_places", [0, 1, 2])
+def test_format_number_array_matches_python_rounding(decimal_places):
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        np.round(rng.normal(0, 1e6, 50_000), 2),
+        rng.normal(0, 1e6, 50_000),
+        [1446267.05, 0.125, 2.675, -0.005, 0.0, -0.0, 1e20],
+    ])
+    expected = np.array([f"{value:,.{decimal_places}f}" for value in values], dtype=object)
+    assert (format_number_array(values, decimal_places) == expected).all()
+
+
+def test_format_number_array_turkish_separators_and_nan():
+    result = format_number_array(np.array([1234567.891, np.nan]), 2, thousands=".", suffix=" ₺")
+    assert result[0] == "1.234.567,89 ₺"
+    assert np.isnan(result[1])
+
+
+def test_format_currency_columns_thousands():
+    df = pd.DataFrame({"Masraf Yeri": ["A"], "Bütçe": [1234567.0]})
+    result = format_currency_columns(df, ["Masraf Yeri"], thousands=".")
+    assert result.loc[0, "Bütçe"] == "1.234.567 ₺"
+    assert df.loc[0, "Bütçe"] == 1234567.0
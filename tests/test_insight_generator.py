@@ -0,0 +1,90 @@
+import time
+
+import pandas as pd
+
+from config.constants import INSIGHT_RULE_SKIP_RUNS
+from utils.cache import DATA_FINGERPRINT_ATTR
+from utils.insight_generator import (
+    STATUS_OVER_BUDGET,
+    STATUS_SKIPPED,
+    InsightRule,
+    generate_insights,
+    reset_rule_budgets,
+    run_insight_rules,
+)
+
+# Kuralın bir sonraki çalıştırmada ne kadar süreceği (saniye)
+_delay = {"seconds": 0.0}
+
+
+def _frame(fingerprint):
+    df = pd.DataFrame({"Masraf Yeri Adı": ["A", "B"], "Kümüle Fiili": [10.0, 20.0]})
+    df.attrs[DATA_FINGERPRINT_ATTR] = fingerprint
+    return df
+
+
+def _slow_rule(aggregates):
+    time.sleep(_delay["seconds"])
+    return ["yavaş"]
+
+
+RULES = {
+    "Yavaş": InsightRule("Yavaş", {"masraf_yeri": ["Kümüle Fiili"]}, _slow_rule, budget_ms=20.0),
+}
+
+
+def _status(timings):
+    return timings.set_index("Kural").loc["Yavaş", "Durum"]
+
+
+def _run(fingerprint, seconds, skip_runs=2):
+    _delay["seconds"] = seconds
+    return run_insight_rules(_frame(fingerprint), RULES, skip_runs=skip_runs)
+
+
+def test_over_budget_rule_is_dropped_skipped_then_retried():
+    reset_rule_budgets()
+
+    insights, timings = _run("dosya-1", 0.05)
+    assert insights == []
+    assert _status(timings) == STATUS_OVER_BUDGET
+
+    for _ in range(2):
+        insights, timings = _run("dosya-1", 0.0)
+        assert insights == []
+        assert _status(timings) == STATUS_SKIPPED
+
+    insights, timings = _run("dosya-1", 0.0)
+    assert insights == ["yavaş"]
+    reset_rule_budgets()
+
+
+def test_skip_is_scoped_to_dataset():
+    reset_rule_budgets()
+    _run("dosya-1", 0.05)
+
+    # Başka veriyle çalışan oturum kuralı çalıştırır ve dosya-1'in kaydını silmez
+    insights, _ = _run("dosya-2", 0.0)
+    assert insights == ["yavaş"]
+    _, timings = _run("dosya-1", 0.0)
+    assert _status(timings) == STATUS_SKIPPED
+    reset_rule_budgets()
+
+
+def test_incomplete_insights_are_not_cached(monkeypatch):
+    reset_rule_budgets()
+    monkeypatch.setattr("utils.insight_generator.INSIGHT_RULES", RULES)
+    df = _frame("dosya-3")
+
+    _delay["seconds"] = 0.05
+    insights, _ = generate_insights(df, cache_key="filtre")
+    assert insights == []
+
+    # Kural tekrar denendiğinde aynı filtre için eksik liste önbellekten dönmez
+    _delay["seconds"] = 0.0
+    for _ in range(INSIGHT_RULE_SKIP_RUNS):
+        insights, _ = generate_insights(df, cache_key="filtre")
+        assert insights == []
+    insights, _ = generate_insights(df, cache_key="filtre")
+    assert insights == ["yavaş"]
+    reset_rule_budgets()
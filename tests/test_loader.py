@@ -0,0 +1,33 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from utils.cache import DATA_FINGERPRINT_ATTR
+from utils.loader import read_report
+
+
+def _excel_bytes(df):
+    buffer = BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def test_read_report_drops_total_row_and_sets_fingerprint():
+    data = _excel_bytes(pd.DataFrame({
+        " Masraf Yeri Adı ": ["M1", "M2", "Toplam"],
+        "Kümüle Bütçe": [10.0, 20.0, 30.0],
+        "Kümüle Fiili": [5.0, 25.0, 30.0],
+    }))
+
+    df = read_report(data)
+
+    assert df["Masraf Yeri Adı"].tolist() == ["M1", "M2"]
+    assert df.attrs[DATA_FINGERPRINT_ATTR]
+
+
+def test_read_report_raises_for_missing_columns():
+    data = _excel_bytes(pd.DataFrame({"Masraf Yeri Adı": ["M1", "Toplam"]}))
+
+    with pytest.raises(ValueError, match="Kümüle Bütçe, Kümüle Fiili"):
+        read_report(data)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.constants import PIVOT_DISTINCT_FIELD, PIVOT_HLL_PRECISION, PIVOT_QUANTILE_ACCURACY
+from utils.pivot_engine import DISTINCT_COLUMN, load_pivot
+
+VALUE_COLUMNS = ["Ocak Fiili", "Şubat Fiili"]
+
+
+def _frame(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "İlgili 1": rng.choice(list("ABCDE"), n),
+        "İlgili 2": rng.choice(np.array(["x", "y", None], dtype=object), n),
+        PIVOT_DISTINCT_FIELD: rng.integers(0, 3000, n).astype(str),
+        "Ocak Fiili": rng.lognormal(8, 1, n),
+        "Şubat Fiili": rng.lognormal(8, 1, n),
+    })
+    # Boş değerli hücreler count/mean sonucunu etkilemeli
+    df.loc[df.index[::7], "Şubat Fiili"] = np.nan
+    return df
+
+
+def _expected(df, row_fields, agg_func):
+    return pd.pivot_table(df, index=row_fields, values=VALUE_COLUMNS, aggfunc=agg_func, fill_value=0)
+
+
+@pytest.mark.parametrize("agg_func", ["sum", "mean", "min", "max", "count"])
+def test_rollup_matches_direct_pivot(agg_func):
+    df = _frame()
+    cache_key = ("rollup", agg_func)
+
+    # Önce ayrıntılı pivot hesaplanır; tek alanlı pivot ondan toplanarak türetilir
+    detailed = load_pivot(df, ["İlgili 1", "İlgili 2"], VALUE_COLUMNS, agg_func, cache_key=cache_key)
+    coarse = load_pivot(df, ["İlgili 1"], VALUE_COLUMNS, agg_func, cache_key=cache_key)
+
+    pd.testing.assert_frame_equal(
+        detailed.sort_index(), _expected(df, ["İlgili 1", "İlgili 2"], agg_func),
+        check_dtype=False, check_names=False,
+    )
+    pd.testing.assert_frame_equal(
+        coarse.sort_index(), _expected(df, ["İlgili 1"], agg_func),
+        check_dtype=False, check_names=False,
+    )
+
+
+def test_rollup_keeps_rows_with_blank_row_field():
+    df = _frame()
+    cache_key = "blank_row_field"
+
+    detailed = load_pivot(df, ["İlgili 1", "İlgili 2"], VALUE_COLUMNS, "sum", cache_key=cache_key)
+    coarse = load_pivot(df, ["İlgili 1"], VALUE_COLUMNS, "sum", cache_key=cache_key)
+
+    # Boş "İlgili 2" grupları ayrıntılı pivotta yoktur ama kaba pivotun toplamına girer
+    assert not detailed.index.get_level_values("İlgili 2").isna().any()
+    assert detailed.to_numpy().sum() < coarse.to_numpy().sum()
+    np.testing.assert_allclose(coarse.to_numpy().sum(), df[VALUE_COLUMNS].sum().sum())
+
+
+@pytest.mark.parametrize("agg_func", ["sum", "count", "median", "distinct"])
+def test_empty_frame_gives_empty_pivot(agg_func):
+    df = _frame().iloc[:0]
+    value_columns = [] if agg_func == "distinct" else VALUE_COLUMNS
+
+    pivot = load_pivot(df, ["İlgili 1"], value_columns, agg_func, cache_key=("empty", agg_func))
+
+    assert pivot.empty
+    assert list(pivot.columns) == ([DISTINCT_COLUMN] if agg_func == "distinct" else VALUE_COLUMNS)
+
+
+@pytest.mark.parametrize("agg_func, q", [("median", 0.5), ("p90", 0.9)])
+def test_quantile_within_sketch_accuracy(agg_func, q):
+    df = _frame()
+
+    pivot = load_pivot(df, ["İlgili 1"], VALUE_COLUMNS, agg_func, cache_key=("quantile", agg_func))
+    exact = df.groupby("İlgili 1")[VALUE_COLUMNS].quantile(q)
+
+    np.testing.assert_allclose(pivot.sort_index(), exact, rtol=PIVOT_QUANTILE_ACCURACY)
+
+
+def test_distinct_count_within_hll_error():
+    df = _frame(n=20000)
+
+    pivot = load_pivot(df, ["İlgili 1"], [], "distinct", cache_key="distinct")
+    exact = df.groupby("İlgili 1")[PIVOT_DISTINCT_FIELD].nunique()
+
+    errors = np.abs(pivot[DISTINCT_COLUMN].sort_index() / exact - 1)
+    standard_error = 1.04 / np.sqrt(1 << PIVOT_HLL_PRECISION)
+    assert errors.mean() <= 0.015
+    assert errors.max() <= 3 * standard_error
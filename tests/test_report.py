@@ -0,0 +1,28 @@
+import pandas as pd
+
+from utils.report import PDF, generate_pdf_report
+
+
+def _titles(monkeypatch, **kwargs):
+    titles = []
+    original = PDF.chapter_title
+
+    def record(self, title):
+        titles.append(title)
+        original(self, title)
+
+    monkeypatch.setattr(PDF, "chapter_title", record)
+    assert generate_pdf_report(100.0, 120.0, -20.0, -20.0, **kwargs)
+    return titles
+
+
+def test_sections_are_numbered_without_optional_sections(monkeypatch):
+    assert _titles(monkeypatch) == ["1. Özet", "2. Finansal Metrikler", "3. Sonuç ve Öneriler"]
+
+
+def test_conclusion_follows_alert_section(monkeypatch):
+    alerts = pd.DataFrame({
+        "Masraf Yeri Adı": ["A"], "Ay": ["Ocak"], "Kural": ["Kritik Aşım"], "Kullanım (%)": [150.0],
+    })
+    titles = _titles(monkeypatch, alerts=alerts)
+    assert titles[-2:] == ["3. Bütçe Aşım Uyarıları", "4. Sonuç ve Öneriler"]
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from utils.report_sections import CENTRE_FIELD, compute_report_sections
+
+
+def test_section_totals_include_rows_without_centre_name():
+    df = pd.DataFrame({
+        "İlgili 1": ["A", "A", "A", "B"],
+        CENTRE_FIELD: ["M1", None, "M2", None],
+        "Ocak Bütçe": [100.0, 40.0, 10.0, 5.0],
+        "Ocak Fiili": [120.0, 30.0, 5.0, 8.0],
+        "Şubat Bütçe": [100.0, 0.0, 10.0, 5.0],
+        "Şubat Fiili": [90.0, 25.0, 20.0, 1.0],
+    })
+
+    sections = compute_report_sections(df, "İlgili 1", ["Ocak", "Şubat"])
+
+    expected = df.groupby("İlgili 1")[["Ocak Bütçe", "Şubat Bütçe", "Ocak Fiili", "Şubat Fiili"]].sum()
+    assert [section.title for section in sections] == ["A", "B"]
+    for section in sections:
+        row = expected.loc[section.title]
+        np.testing.assert_allclose(section.budget, row[["Ocak Bütçe", "Şubat Bütçe"]])
+        np.testing.assert_allclose(section.actual, row[["Ocak Fiili", "Şubat Fiili"]])
+
+    # Aşım listesi masraf yeri bazındadır; adı boş satırlar listede yer almaz
+    assert sections[0].overruns[CENTRE_FIELD].tolist() == ["M1", "M2"]
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from utils.sketches import bucket_values, hll_estimate, hll_registers, quantile_buckets, sketch_quantiles
+
+ACCURACY = 0.01
+
+
+def test_bucket_value_within_relative_accuracy():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.lognormal(5, 3, 5000), -rng.lognormal(5, 3, 5000), [0.0]])
+
+    keys = quantile_buckets(values, ACCURACY)
+    approx = bucket_values(keys, ACCURACY)
+
+    np.testing.assert_allclose(approx, values, rtol=ACCURACY, atol=1e-9)
+    # Anahtarlar değer sırasını korur
+    order = np.argsort(values, kind="stable")
+    assert np.all(np.diff(keys[order]) >= 0)
+
+
+def test_sketch_quantiles_per_segment():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(6, 1, 4000)
+    segments = rng.integers(0, 4, len(values))
+
+    keys = quantile_buckets(values, ACCURACY)
+    cells, uniques = pd.factorize(segments * 100000 + keys, sort=False)
+    counts = np.bincount(cells)
+    segment, key = np.divmod(uniques, 100000)
+
+    result = sketch_quantiles(segment, key, counts, 5, 0.9, ACCURACY)
+    exact = [np.quantile(values[segments == s], 0.9) for s in range(4)]
+
+    np.testing.assert_allclose(result[:4], exact, rtol=ACCURACY)
+    assert np.isnan(result[4])
+
+
+def test_hll_estimate_within_standard_error():
+    precision = 12
+    values = pd.Series(np.arange(50000).astype(str))
+
+    registers, ranks = hll_registers(values, precision)
+    merged = pd.Series(ranks).groupby(registers).max()
+    estimate = hll_estimate(
+        np.zeros(len(merged), dtype=np.int64), merged.index.to_numpy(), merged.to_numpy(), 1, precision
+    )
+
+    assert abs(estimate[0] / len(values) - 1) <= 3 * 1.04 / np.sqrt(1 << precision)
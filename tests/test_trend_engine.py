@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from utils.trend_engine import SERIES_MONTHLY, SERIES_YOY, compute_trend_series, month_matrix
+
+
+def test_month_matrix_ignores_blank_cells():
+    df = pd.DataFrame({
+        "Ocak Fiili": [10.0, np.nan, 5.0],
+        "Şubat Fiili": [np.nan, np.nan, np.nan],
+    })
+    matrix = month_matrix(df, ["Ocak", "Şubat", "Mart"], ["Fiili"])
+
+    assert matrix[0, 0] == 15.0
+    assert matrix[0, 1] == 0.0
+    assert np.isnan(matrix[0, 2])
+
+
+def test_yoy_uses_previous_period_with_blank_cells():
+    current = pd.DataFrame({
+        "Ocak Fiili": [60.0, 60.0],
+        "Şubat Fiili": [30.0, 30.0],
+    })
+    # Önceki dönem dosyası fillna uygulanmadan gelir
+    previous = pd.DataFrame({
+        "Ocak Fiili": [100.0, np.nan],
+        "Şubat Fiili": [np.nan, np.nan],
+    })
+    series = compute_trend_series(current, ["Ocak", "Şubat"], previous_df=previous)
+
+    fiili = series["Fiili"]
+    assert fiili.loc["Ocak", SERIES_MONTHLY] == 120.0
+    assert fiili.loc["Ocak", SERIES_YOY] == 20.0
+    assert np.isnan(fiili.loc["Şubat", SERIES_YOY])
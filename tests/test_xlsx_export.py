@@ -0,0 +1,46 @@
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from utils.formatting import COLUMN_FORMATS, write_excel_sheet
+from utils.xlsx_export import WorkbookSheet, workbook_bytes
+
+
+def _frame():
+    return pd.DataFrame({
+        "Masraf Yeri Adı": ["M1", None, "=M3", "M4"],
+        "Adet": [1, 2, 3, 4],
+        "Ocak Fiili": [1.5, np.nan, np.inf, -2.0],
+        "Tarih": pd.to_datetime(["2024-01-01", None, "2024-03-01", "2024-04-01"]),
+        "Karışık": [1, "a", None, 2.5],
+    })
+
+
+def test_workbook_matches_to_excel_values():
+    df = _frame()
+    formats = {"Ocak Fiili": "currency"}
+
+    data = workbook_bytes([WorkbookSheet("Ham Veri", df, formats), WorkbookSheet("Özet", df.head(1))])
+
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        write_excel_sheet(writer, df, "Ham Veri", formats)
+    sheets = pd.read_excel(BytesIO(data), sheet_name=None)
+    assert list(sheets) == ["Ham Veri", "Özet"]
+    # Formül gibi görünen metinler metin olarak yazılır
+    expected = pd.read_excel(BytesIO(buffer.getvalue()))
+    expected.loc[2, "Masraf Yeri Adı"] = "=M3"
+    pd.testing.assert_frame_equal(sheets["Ham Veri"], expected)
+
+
+def test_workbook_applies_header_and_column_formats():
+    df = _frame()
+
+    data = workbook_bytes([WorkbookSheet("Ham Veri", df, {"Ocak Fiili": "currency"})])
+
+    sheet = openpyxl.load_workbook(BytesIO(data))["Ham Veri"]
+    assert sheet["A1"].font.b and sheet["A1"].border.left.style == "thin"
+    assert sheet["C2"].number_format == COLUMN_FORMATS["currency"]["excel"]
+    assert sheet.column_dimensions["C"].width > 15
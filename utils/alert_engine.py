@@ -0,0 +1,307 @@
+"""
+alert_engine.py - Bütçe aşım uyarılarını veri yükleme anında hesaplar.
+
+Bu modül, `ALERT_RULES` içinde tanımlı kullanım oranı kurallarını tüm masraf
+yerleri ve aylar için tek bir matris işlemiyle değerlendirir. Sonuç, arayüz,
+Otomatik Özet sekmesi ve PDF raporu tarafından sorgulanabilen uzun formatlı
+bir uyarı indeksidir.
+
+Fonksiyonlar:
+    - build_alert_index: Tüm masraf yeri x ay hücreleri için uyarı indeksini oluşturur
+    - compute_alert_index: Kural bazlı uyarıları ve anomalileri tek indekste birleştirir
+    - load_alert_index: compute_alert_index'in Streamlit önbellekli sürümü
+    - split_anomalies: Kural bazlı uyarıları ve anomalileri ayırır
+    - match_rule: Tek bir kullanım oranına uyan kuralı bulur
+    - overrun_threshold: Bütçe aşımı kurallarının en küçük eşiğini döndürür
+    - is_overrun: Kullanım oranının bütçe aşımı kuralına düşüp düşmediğini döndürür
+    - query_alerts: Uyarı indeksini filtreler
+    - diff_alerts: İki dönem arasında yeni oluşan veya ağırlaşan aşımları bulur
+    - summarize_alerts: Kural bazında uyarı sayılarını döndürür
+
+Kullanım:
+    from utils.alert_engine import load_alert_index, query_alerts
+
+    alerts = load_alert_index(df)
+    kritik = query_alerts(alerts, rules=["Kritik Aşım"], months=["Kümüle"])
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.constants import MONTHS, ALERT_RULES, ANOMALY_LEVEL
+from utils.anomaly import detect_anomalies, usage_percent
+
+# Uyarı indeksinde ayı temsil eden sütun ve kümüle değerler için kullanılan etiket
+PERIOD_COLUMN = "Ay"
+CUMULATIVE_PERIOD = "Kümüle"
+
+# Bütçe aşımı sayılan en düşük kullanım oranı (kural eşikleri gibi kesin büyüktür ile karşılaştırılır)
+BUDGET_LIMIT_PCT = 100.0
+
+# Masraf yerini tanımlayan sütunlar (veride bulunanlar kullanılır)
+ALERT_KEY_COLUMNS = ["Masraf Yeri", "Masraf Yeri Adı"]
+
+ALERT_COLUMNS = [PERIOD_COLUMN, "Kural", "Seviye", "Bütçe", "Fiili", "Kullanım (%)"]
+
+
+def _sorted_rules(rules: Sequence[Dict]) -> List[Dict]:
+    """Kuralları eşik değerine göre büyükten küçüğe sıralar."""
+    return sorted(rules, key=lambda rule: rule["min_usage"], reverse=True)
+
+
+def match_rule(usage_pct: float, rules: Sequence[Dict] = ALERT_RULES) -> Optional[Dict]:
+    """
+    Tek bir kullanım oranı için tetiklenen en yüksek eşikli kuralı döndürür.
+
+    Parameters:
+        usage_pct (float): Bütçe kullanım yüzdesi
+        rules (Sequence[Dict]): Değerlendirilecek kurallar
+
+    Returns:
+        Optional[Dict]: Eşleşen kural veya None
+    """
+    for rule in _sorted_rules(rules):
+        if usage_pct > rule["min_usage"]:
+            return rule
+    return None
+
+
+def overrun_threshold(rules: Sequence[Dict] = ALERT_RULES) -> float:
+    """
+    Bütçe aşımı kurallarının (eşiği BUDGET_LIMIT_PCT ve üzeri) en küçük eşiğini döndürür.
+
+    match_rule en yüksek eşikli eşleşmeyi seçtiğinden, kullanım oranı bu
+    eşiği aştığında eşleşen kural her zaman bir bütçe aşımı kuralıdır.
+    Tablo stilleri bu eşiği vektörel karşılaştırmada kullanır.
+
+    Parameters:
+        rules (Sequence[Dict]): Değerlendirilecek kurallar
+
+    Returns:
+        float: Eşik (yüzde); bütçe aşımı kuralı yoksa sonsuz
+    """
+    return min(
+        (rule["min_usage"] for rule in rules if rule["min_usage"] >= BUDGET_LIMIT_PCT),
+        default=np.inf,
+    )
+
+
+def is_overrun(usage_pct: float, rules: Sequence[Dict] = ALERT_RULES) -> bool:
+    """
+    Kullanım oranının bütçe aşımı kurallarından birine (eşiği BUDGET_LIMIT_PCT ve üzeri) düşüp düşmediğini döndürür.
+
+    Parameters:
+        usage_pct (float): Bütçe kullanım yüzdesi
+        rules (Sequence[Dict]): Değerlendirilecek kurallar
+
+    Returns:
+        bool: Bütçe aşılmışsa True (NaN için False)
+    """
+    return bool(usage_pct > overrun_threshold(rules))
+
+
+def build_alert_index(df: pd.DataFrame, rules: Sequence[Dict] = ALERT_RULES) -> pd.DataFrame:
+    """
+    Tüm masraf yerleri ve aylar için bütçe aşım uyarılarını hesaplar.
+
+    Bu fonksiyon:
+    1. Aylık ve kümüle bütçe/fiili sütunlarını masraf yeri bazında tek groupby ile toplar
+    2. (masraf yeri x dönem) kullanım oranı matrisini hesaplar
+    3. Kural eşiklerini tek bir np.select ile matrise uygular
+    4. Tetiklenen hücreleri uzun formatlı bir indekse dönüştürür
+
+    Parameters:
+        df (DataFrame): Yüklenen ham veri
+        rules (Sequence[Dict]): Değerlendirilecek kurallar
+
+    Returns:
+        DataFrame: Masraf yeri sütunları + Ay, Kural, Seviye, Bütçe, Fiili,
+            Kullanım (%) sütunlarından oluşan uyarı indeksi
+    """
+    key_columns = [col for col in ALERT_KEY_COLUMNS if col in df.columns]
+    periods = [
+        (month, f"{month} Bütçe", f"{month} Fiili")
+        for month in MONTHS
+        if f"{month} Bütçe" in df.columns and f"{month} Fiili" in df.columns
+    ]
+    if "Kümüle Bütçe" in df.columns and "Kümüle Fiili" in df.columns:
+        periods.append((CUMULATIVE_PERIOD, "Kümüle Bütçe", "Kümüle Fiili"))
+
+    if not key_columns or not periods or df.empty:
+        return pd.DataFrame(columns=key_columns + ALERT_COLUMNS)
+
+    budget_cols = [budget for _, budget, _ in periods]
+    actual_cols = [actual for _, _, actual in periods]
+
+    # Masraf yeri bazında tek geçişte toplama
+    grouped = df.groupby(key_columns, sort=False, dropna=False)[budget_cols + actual_cols].sum()
+    budget = grouped[budget_cols].to_numpy(dtype=np.float64)
+    actual = grouped[actual_cols].to_numpy(dtype=np.float64)
+
+    usage = usage_percent(budget, actual)
+
+    # Eşikler büyükten küçüğe: her hücre ilk eşleşen kurala düşer
+    ordered_rules = _sorted_rules(rules)
+    conditions = [usage > rule["min_usage"] for rule in ordered_rules]
+    rule_idx = np.select(conditions, np.arange(len(ordered_rules)), default=-1)
+
+    rows, cols = np.nonzero(rule_idx >= 0)
+    keys = grouped.index.to_frame(index=False).iloc[rows].reset_index(drop=True)
+    rule_names = np.array([rule["rule"] for rule in ordered_rules], dtype=object)
+    rule_levels = np.array([rule["level"] for rule in ordered_rules], dtype=object)
+    matched = rule_idx[rows, cols]
+
+    alerts = keys.assign(**{
+        PERIOD_COLUMN: np.array([period for period, _, _ in periods], dtype=object)[cols],
+        "Kural": rule_names[matched],
+        "Seviye": rule_levels[matched],
+        "Bütçe": budget[rows, cols],
+        "Fiili": actual[rows, cols],
+        "Kullanım (%)": usage[rows, cols],
+    })
+    return alerts.sort_values("Kullanım (%)", ascending=False, ignore_index=True)
+
+
+def compute_alert_index(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Kural bazlı bütçe aşımlarının ardından, Seviye = "anomaly" olan
+    istatistiksel anomalileri (Skor sütunuyla birlikte) ekler.
+
+    Parameters:
+        df (DataFrame): Yüklenen ham veri
+
+    Returns:
+        DataFrame: Uyarı indeksi
+    """
+    alerts = build_alert_index(df)
+    anomalies = detect_anomalies(df)
+    if anomalies.empty:
+        return alerts
+    return pd.concat([alerts, anomalies], ignore_index=True)
+
+
+@st.cache_data(show_spinner="Uyarılar hesaplanıyor...")
+def load_alert_index(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uyarı indeksini yükleme başına bir kez hesaplar (Streamlit önbellekli).
+
+    Parameters:
+        df (DataFrame): Yüklenen ham veri
+
+    Returns:
+        DataFrame: compute_alert_index çıktısı
+    """
+    return compute_alert_index(df)
+
+
+def split_anomalies(alerts: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Uyarı indeksini kural bazlı aşımlar ve istatistiksel anomaliler olarak ayırır.
+
+    Parameters:
+        alerts (DataFrame): Uyarı indeksi
+
+    Returns:
+        Tuple[DataFrame, DataFrame]: (kural bazlı uyarılar, anomaliler)
+    """
+    is_anomaly = (alerts["Seviye"] == ANOMALY_LEVEL).to_numpy()
+    rule_alerts = alerts[~is_anomaly]
+    if "Skor" in rule_alerts.columns:
+        rule_alerts = rule_alerts.drop(columns="Skor")
+    return rule_alerts, alerts[is_anomaly]
+
+
+def query_alerts(
+    alerts: pd.DataFrame,
+    rules: Optional[Iterable[str]] = None,
+    months: Optional[Iterable[str]] = None,
+    cost_centres: Optional[Iterable[str]] = None,
+    levels: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Uyarı indeksini kural, dönem, masraf yeri ve seviyeye göre filtreler.
+
+    Parameters:
+        alerts (DataFrame): Uyarı indeksi
+        rules (Iterable[str], optional): Kural adları
+        months (Iterable[str], optional): Aylar ("Kümüle" dahil)
+        cost_centres (Iterable[str], optional): Masraf yeri adları
+        levels (Iterable[str], optional): Seviyeler ("error", "warning")
+
+    Returns:
+        DataFrame: Filtrelenmiş uyarılar
+    """
+    mask = np.ones(len(alerts), dtype=bool)
+    if rules is not None:
+        mask &= alerts["Kural"].isin(list(rules)).to_numpy()
+    if months is not None:
+        mask &= alerts[PERIOD_COLUMN].isin(list(months)).to_numpy()
+    if cost_centres is not None and "Masraf Yeri Adı" in alerts.columns:
+        mask &= alerts["Masraf Yeri Adı"].isin(list(cost_centres)).to_numpy()
+    if levels is not None:
+        mask &= alerts["Seviye"].isin(list(levels)).to_numpy()
+    return alerts[mask]
+
+
+def diff_alerts(
+    previous: pd.DataFrame, current: pd.DataFrame, rules: Sequence[Dict] = ALERT_RULES
+) -> pd.DataFrame:
+    """
+    Önceki dönemde aynı veya daha ağır seviyede bulunmayan (yeni) aşımları döndürür.
+
+    Kural bazlı bir uyarı; masraf yeri ve ay hücresi önceki dönemde aynı veya
+    daha yüksek eşikli bir kurala düşmüyorsa yeni kabul edilir. Böylece daha
+    ağır bir kurala yükselen aşımlar listelenir, hafifleyenler (ör. Kritik
+    Aşım -> Bütçe Aşımı) listelenmez. Anomaliler masraf yeri, ay ve kural
+    üçlüsü önceki dönemde yoksa yenidir.
+
+    Parameters:
+        previous (DataFrame): Önceki dönemin uyarı indeksi
+        current (DataFrame): Güncel dönemin uyarı indeksi
+        rules (Sequence[Dict]): Kurallar (eşikleri seviye sırasını belirler)
+
+    Returns:
+        DataFrame: Yalnızca yeni aşımları içeren uyarı indeksi
+    """
+    key_columns = [col for col in ALERT_KEY_COLUMNS if col in current.columns and col in previous.columns]
+    cell_columns = key_columns + [PERIOD_COLUMN]
+    severity = {rule["rule"]: rule["min_usage"] for rule in rules}
+
+    # Önceki dönemde her hücrenin düştüğü en ağır kural
+    previous_severity = (
+        previous.assign(_onceki_seviye=previous["Kural"].map(severity))
+        .dropna(subset=["_onceki_seviye"])
+        .groupby(cell_columns, dropna=False)["_onceki_seviye"].max()
+        .reset_index()
+    )
+    merged = current.merge(previous_severity, on=cell_columns, how="left").merge(
+        previous[cell_columns + ["Kural"]].drop_duplicates(),
+        on=cell_columns + ["Kural"],
+        how="left",
+        indicator=True,
+    )
+
+    current_severity = merged["Kural"].map(severity)
+    is_rule = current_severity.notna().to_numpy()
+    escalated = ~(merged["_onceki_seviye"] >= current_severity).to_numpy()
+    unseen = (merged["_merge"] == "left_only").to_numpy()
+    is_new = np.where(is_rule, escalated, unseen)
+    return merged[is_new].drop(columns=["_onceki_seviye", "_merge"]).reset_index(drop=True)
+
+
+def summarize_alerts(alerts: pd.DataFrame, rules: Sequence[Dict] = ALERT_RULES) -> pd.Series:
+    """
+    Kural bazında uyarı sayılarını kural sırasıyla döndürür.
+
+    Parameters:
+        alerts (DataFrame): Uyarı indeksi
+        rules (Sequence[Dict]): Kurallar
+
+    Returns:
+        Series: Kural adı -> uyarı sayısı
+    """
+    order = [rule["rule"] for rule in _sorted_rules(rules)]
+    return alerts["Kural"].value_counts().reindex(order, fill_value=0)
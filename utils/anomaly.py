@@ -0,0 +1,168 @@
+"""
+anomaly.py - Masraf yeri x ay harcamalarında istatistiksel anomali tespiti.
+
+Bu modül, tüm masraf yerlerinin aylık Fiili serilerini tek bir matris
+üzerinde robust z-skoru ile tarar ve bütçeden sapma oranında aykırı değerleri
+bulur. Hesaplama masraf yeri başına döngü yerine tek bir groupby ve vektörel
+medyan/MAD işlemleriyle yapılır.
+
+Fonksiyonlar:
+    - robust_zscores: Satır bazında robust z-skorlarını hesaplar
+    - usage_percent: Bütçe kullanım oranı matrisini hesaplar (uyarı motoruyla ortak)
+    - detect_anomalies: Harcama ve bütçe sapma anomalilerini uyarı formatında döndürür
+
+Kullanım:
+    from utils.anomaly import detect_anomalies
+
+    anomalies = detect_anomalies(df)
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import median_abs_deviation
+
+from config.constants import (
+    MONTHS,
+    ANOMALY_Z_THRESHOLD,
+    ANOMALY_MIN_MONTHS,
+    ANOMALY_LEVEL,
+    ANOMALY_SPEND_RULE,
+    ANOMALY_BUDGET_RULE,
+)
+
+# MAD'i normal dağılımın standart sapmasıyla tutarlı hale getiren katsayı
+# (scipy.stats.median_abs_deviation(scale="normal") ile aynı)
+_NORMAL_SCALE = 1.482602218505602
+
+ANOMALY_KEY_COLUMNS = ["Masraf Yeri", "Masraf Yeri Adı"]
+ANOMALY_COLUMNS = ["Ay", "Kural", "Seviye", "Bütçe", "Fiili", "Kullanım (%)", "Skor"]
+
+
+def usage_percent(budget: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """
+    Bütçe kullanım oranını (%) hücre bazında hesaplar.
+
+    Bütçesi sıfır olup harcaması olan hücreler sonsuz (aşım), bütçesi ve
+    harcaması olmayan hücreler NaN olur.
+
+    Parameters:
+        budget (ndarray): Bütçe değerleri
+        actual (ndarray): Fiili değerler
+
+    Returns:
+        ndarray: Kullanım oranı (%)
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(budget != 0, actual / budget * 100, np.where(actual > 0, np.inf, np.nan))
+
+
+def robust_zscores(matrix: np.ndarray, min_count: int = ANOMALY_MIN_MONTHS) -> np.ndarray:
+    """
+    Her satır için medyan ve MAD'e dayalı robust z-skorlarını hesaplar.
+
+    NaN hücreler (ör. bütçesi ve harcaması olmayan aylar) hesaba katılmaz.
+    scipy'nin nan_policy="omit" yolu satır başına döngü yaptığı için satır
+    bazlı istatistikler np.nanmedian ile, aynı ölçek katsayısıyla hesaplanır.
+
+    Parameters:
+        matrix (ndarray): (satır x ay) değer matrisi
+        min_count (int): Skorlama için satırda gereken en az geçerli hücre sayısı
+
+    Returns:
+        ndarray: Aynı boyutta z-skoru matrisi; skorlanamayan hücreler NaN
+    """
+    valid = ~np.isnan(matrix)
+    enough = valid.sum(axis=1) >= min_count
+    scores = np.full(matrix.shape, np.nan)
+    if not enough.any():
+        return scores
+
+    rows = matrix[enough]
+    with np.errstate(invalid="ignore"):
+        median = np.nanmedian(rows, axis=1, keepdims=True)
+        mad = np.nanmedian(np.abs(rows - median), axis=1, keepdims=True) * _NORMAL_SCALE
+        # Sabit serilerde (MAD = 0) sapma ölçülemez
+        scores[enough] = np.where(mad > 0, (rows - median) / np.where(mad > 0, mad, 1), np.nan)
+    return scores
+
+
+def _month_matrices(df: pd.DataFrame, key_columns: list) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray, list]:
+    """Masraf yeri bazında (masraf yeri x ay) Bütçe ve Fiili matrislerini tek groupby ile üretir."""
+    months = [m for m in MONTHS if f"{m} Bütçe" in df.columns and f"{m} Fiili" in df.columns]
+    budget_cols = [f"{m} Bütçe" for m in months]
+    actual_cols = [f"{m} Fiili" for m in months]
+    grouped = df.groupby(key_columns, sort=False, dropna=False)[budget_cols + actual_cols].sum()
+    budget = grouped[budget_cols].to_numpy(dtype=np.float64)
+    actual = grouped[actual_cols].to_numpy(dtype=np.float64)
+    return grouped.index.to_frame(index=False), budget, actual, months
+
+
+def detect_anomalies(df: pd.DataFrame, z_threshold: float = ANOMALY_Z_THRESHOLD) -> pd.DataFrame:
+    """
+    Tüm masraf yerleri ve aylar için harcama ve bütçe sapma anomalilerini bulur.
+
+    Bu fonksiyon:
+    1. Aylık Bütçe/Fiili sütunlarını masraf yeri bazında tek groupby ile toplar
+    2. Her masraf yerinin aylık Fiili serisinde robust z-skoru hesaplar
+       (bütçesi ve harcaması olmayan aylar hariç)
+    3. Tüm hücrelerde (Fiili - Bütçe) / |Bütçe| sapma oranının genel medyan/MAD'e
+       göre robust z-skorunu hesaplar
+    4. Eşiği aşan hücreleri uyarı indeksiyle aynı uzun formatta döndürür
+
+    Parameters:
+        df (DataFrame): Yüklenen ham veri
+        z_threshold (float): |z| eşiği
+
+    Returns:
+        DataFrame: Masraf yeri sütunları + Ay, Kural, Seviye, Bütçe, Fiili,
+            Kullanım (%), Skor sütunları; |Skor| değerine göre azalan sıralı
+    """
+    key_columns = [col for col in ANOMALY_KEY_COLUMNS if col in df.columns]
+    empty = pd.DataFrame(columns=key_columns + ANOMALY_COLUMNS)
+    if not key_columns or df.empty:
+        return empty
+
+    keys, budget, actual, months = _month_matrices(df, key_columns)
+    if not months:
+        return empty
+
+    # 1) Aylık harcama serisinde sıçrama / düşüş
+    active = (budget != 0) | (actual != 0)
+    spend_scores = robust_zscores(np.where(active, actual, np.nan))
+
+    # 2) Bütçeden sapma oranında kesitsel aykırı değerler
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = np.where(budget != 0, (actual - budget) / np.abs(budget), np.nan)
+    deviation_scores = np.full(deviation.shape, np.nan)
+    valid = ~np.isnan(deviation)
+    if valid.sum() >= ANOMALY_MIN_MONTHS:
+        values = deviation[valid]
+        mad = median_abs_deviation(values, scale="normal")
+        if mad > 0:
+            deviation_scores[valid] = (values - np.median(values)) / mad
+
+    usage = usage_percent(budget, actual)
+
+    frames = []
+    for rule, scores in ((ANOMALY_SPEND_RULE, spend_scores), (ANOMALY_BUDGET_RULE, deviation_scores)):
+        with np.errstate(invalid="ignore"):
+            rows, cols = np.nonzero(np.abs(scores) > z_threshold)
+        if len(rows) == 0:
+            continue
+        frames.append(keys.iloc[rows].reset_index(drop=True).assign(**{
+            "Ay": np.array(months, dtype=object)[cols],
+            "Kural": rule,
+            "Seviye": ANOMALY_LEVEL,
+            "Bütçe": budget[rows, cols],
+            "Fiili": actual[rows, cols],
+            "Kullanım (%)": usage[rows, cols],
+            "Skor": scores[rows, cols],
+        }))
+
+    if not frames:
+        return empty
+    anomalies = pd.concat(frames, ignore_index=True)
+    order = np.argsort(-np.abs(anomalies["Skor"].to_numpy()), kind="stable")
+    return anomalies.iloc[order].reset_index(drop=True)
@@ -0,0 +1,167 @@
+"""
+cache.py - Veri parmak izi ve süreç genelinde paylaşılan sonuç önbelleği.
+
+Bu modül, hesaplama sonuçlarının Streamlit yeniden çalıştırmaları arasında
+tekrar kullanılabilmesi için veri çerçevelerinden kararlı parmak izleri
+üretir ve sınırlı boyutlu bir LRU önbellek sağlar.
+
+Fonksiyonlar:
+    - dataframe_fingerprint: Veri çerçevesinin içerik parmak izini üretir
+    - bytes_fingerprint: Yüklenen dosya baytlarının parmak izini üretir
+    - filter_fingerprint: Kaynak veri + filtre seçimlerinden parmak izi üretir
+
+Sınıflar:
+    - ResultCache: İş parçacığı güvenli, kayıt sayısı (ve istenirse bayt) sınırlı LRU önbellek
+
+Kullanım:
+    from utils.cache import ResultCache, dataframe_fingerprint
+
+    cache = ResultCache(max_entries=32)
+    key = (dataframe_fingerprint(df), "ozet")
+    result = cache.get_or_compute(key, lambda: df.sum())
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+# Yüklenen dosyanın parmak izinin veri çerçevesi üstverisinde tutulduğu anahtar
+DATA_FINGERPRINT_ATTR = "data_fingerprint"
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Veri çerçevesinin içerik parmak izini üretir.
+
+    Sütun adları, veri tipleri, indeks ve tüm hücre değerleri
+    `pd.util.hash_pandas_object` ile vektörel olarak karma değere dönüştürülür.
+
+    Parameters:
+        df (DataFrame): Parmak izi alınacak veri çerçevesi
+
+    Returns:
+        str: 40 karakterlik onaltılık parmak izi
+    """
+    digest = hashlib.sha1()
+    digest.update(repr((df.shape, list(df.columns), [str(t) for t in df.dtypes])).encode("utf-8"))
+    if len(df):
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy(dtype=np.uint64)
+        digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+
+def bytes_fingerprint(data: bytes) -> str:
+    """
+    Ham baytların (ör. yüklenen Excel dosyası) parmak izini üretir.
+
+    Parameters:
+        data (bytes): Baytlar
+
+    Returns:
+        str: 40 karakterlik onaltılık parmak izi
+    """
+    return hashlib.sha1(data).hexdigest()
+
+
+def filter_fingerprint(df: pd.DataFrame, selections: Dict[str, Any]) -> str:
+    """
+    Kaynak veri ve filtre seçimlerinden hesaplama önbellekleri için anahtar üretir.
+
+    Kaynak verinin parmak izi yükleme anında `df.attrs["data_fingerprint"]`
+    içine yazılır ve filtrelenmiş kopyalara taşınır; böylece her yeniden
+    çalıştırmada tüm hücreleri karma değere dönüştürmek gerekmez. Üstveri
+    yoksa içerik parmak izi kullanılır.
+
+    Parameters:
+        df (DataFrame): Yüklenen (filtrelenmemiş) veri çerçevesi
+        selections (Dict[str, Any]): Filtre adı -> seçilen değerler
+
+    Returns:
+        str: 40 karakterlik onaltılık parmak izi
+    """
+    source = df.attrs.get(DATA_FINGERPRINT_ATTR) or dataframe_fingerprint(df)
+    normalized = sorted((str(name), repr(value)) for name, value in selections.items())
+    return hashlib.sha1(repr((source, normalized)).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    İş parçacığı güvenli, en son kullanılanı koruyan (LRU) sonuç önbelleği.
+
+    Parameters:
+        max_entries (int): Önbellekte tutulacak en fazla kayıt sayısı
+        max_bytes (int, optional): Kayıtların toplam boyut sınırı (bayt); en yeni kayıt
+            sınırı tek başına aşsa bile tutulur
+        sizeof (Callable, optional): Kaydın boyutunu (bayt) döndüren fonksiyon;
+            max_bytes verildiğinde gereklidir
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 64,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Kaydı döndürür ve en son kullanılan olarak işaretler."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Kaydı ekler; kayıt sayısı veya boyut sınırı aşılırsa en eski kayıtları çıkarır."""
+        size = self._sizeof(value) if self._sizeof is not None else 0
+        with self._lock:
+            self.nbytes += size - self._sizes.get(key, 0)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes and len(self._entries) > 1
+            ):
+                oldest, _ = self._entries.popitem(last=False)
+                self.nbytes -= self._sizes.pop(oldest)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Kayıt yoksa `compute` ile hesaplayıp önbelleğe yazar."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        """Tüm kayıtları siler."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.nbytes = 0
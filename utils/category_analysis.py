@@ -4,9 +4,10 @@ category_analysis.py - Kategori bazlı analiz ve görselleştirme işlemlerini y
 Bu modül, finansal verilerin kategori bazlı analizlerini oluşturmak ve görselleştirmek için
 gerekli fonksiyonları içerir. Modül, aşağıdaki temel işlevleri sağlar:
 
-- Kategori bazlı pasta ve sütun grafikleri oluşturma
+- Kategori bazlı pasta ve sütun grafikleri oluşturma (build_category_figures arayüzden bağımsızdır)
 - Farklı metrikler (Bütçe, Fiili, BE) için analiz yapma
-- Grafikleri PNG formatında kaydetme ve indirme
+- Yüksek kardinaliteli gruplarda ilk N grup + "Diğer" gösterimi
+- Grafikleri istek üzerine PNG formatında kaydetme ve indirme
 - Streamlit arayüzü üzerinden interaktif analiz imkanı
 
 Kullanım:
@@ -21,7 +22,7 @@ Kullanım:
 Not:
     - Grafikler otomatik olarak optimize edilmiş boyutlarda oluşturulur
     - Hata yönetimi handle_error dekoratörü ile sağlanır
-    - Tüm grafikler PNG formatında kaydedilir ve indirilebilir
+    - Grafikler yalnızca indirme istendiğinde PNG'ye dönüştürülür ve önbelleğe alınır
 """
 
 import streamlit as st
@@ -29,9 +30,14 @@ import plotly.express as px
 import plotly.io as pio
 from io import BytesIO
 import zipfile
+import numpy as np
 import pandas as pd
-from typing import Tuple, Optional, Any
+from typing import Tuple, Optional, Any, Dict, Hashable, List
+from utils.cache import ResultCache, dataframe_fingerprint
 from utils.error_handler import handle_error, display_friendly_error
+from utils.chart_export import (
+    ChartSpec, chart_spec, render_specs, export_requested, format_render_timings
+)
 
 # Plotly ayarları
 pio.kaleido.scope.default_format = "png"
@@ -41,7 +47,143 @@ pio.kaleido.scope.default_colorway = px.colors.qualitative.Pastel
 pio.kaleido.scope.default_paper_bgcolor = "#FFFFFF"
 pio.kaleido.scope.default_plot_bgcolor = "#FFFFFF"
 
-from config.constants import MONTHS
+from config.constants import MONTHS, SUMMARY_CACHE_ENTRIES
+
+# Kategori grafiklerinin PNG boyutu
+CHART_IMAGE_SIZE = {"width": 1400, "height": 900, "scale": 2}
+
+# Kategori grafiklerinde gösterilen metrikler
+CATEGORY_METRICS = ["Bütçe", "Fiili", "BE"]
+
+# İlk N grup dışında kalanların toplandığı grup etiketi
+OTHER_LABEL = "Diğer"
+
+_category_cache = ResultCache(SUMMARY_CACHE_ENTRIES)
+
+
+def column_cardinalities(df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Metin sütunlarının farklı değer sayılarını hesaplar.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+
+    Returns:
+        Dict[str, int]: Sütun adı -> farklı değer sayısı
+    """
+    return {col: int(df[col].nunique()) for col in df.columns if df[col].dtype == "object"}
+
+
+def load_column_cardinalities(df: pd.DataFrame, cache_key: Optional[Hashable] = None) -> Dict[str, int]:
+    """
+    column_cardinalities sonucunu filtre başına bir kez hesaplar (önbellekli).
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        cache_key (Hashable, optional): df'nin satırlarını belirleyen filtre parmak izi;
+            verilmezse içerik parmak izi kullanılır
+
+    Returns:
+        Dict[str, int]: Sütun adı -> farklı değer sayısı
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    return _category_cache.get_or_compute(
+        ("cardinalities", cache_key, tuple(df.columns)), lambda: column_cardinalities(df)
+    )
+
+
+def fold_top_n(totals: pd.Series, n: int, other_label: str = OTHER_LABEL) -> pd.DataFrame:
+    """
+    En büyük n grubu sıralı olarak seçer, kalanları tek bir "Diğer" grubunda toplar.
+
+    Parameters:
+        totals (Series): Grup -> toplam değer
+        n (int): Ayrı gösterilecek grup sayısı
+        other_label (str): Kalan grupların etiketi
+
+    Returns:
+        DataFrame: [grup, değer] sütunlarından oluşan en fazla n + 1 satırlık özet
+    """
+    values = totals.to_numpy(dtype=np.float64)
+    order = top_n_order(values, n)
+    labels = totals.index[order].astype(object).tolist()
+    shown = values[order].tolist()
+
+    if len(order) < len(values):
+        rest = np.ones(len(values), dtype=bool)
+        rest[order] = False
+        labels.append(other_label)
+        shown.append(float(values[rest].sum()))
+
+    return pd.DataFrame({totals.index.name: labels, totals.name: shown})
+
+
+def top_n_order(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    En büyük n değerin indekslerini büyükten küçüğe sıralı döndürür.
+
+    Tam sıralama yerine np.argpartition ile kısmi sıralama yapılır; yalnızca
+    seçilen n eleman kendi içinde sıralanır.
+
+    Parameters:
+        values (ndarray): Değerler
+        n (int): Seçilecek eleman sayısı
+
+    Returns:
+        ndarray: Seçilen elemanların indeksleri
+    """
+    n = min(n, len(values))
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    if n < len(values):
+        candidates = np.argpartition(-values, n - 1)[:n]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(-values[candidates], kind="stable")]
+
+
+def aggregate_category_totals(
+    df: pd.DataFrame,
+    group_col: str,
+    months: List[str],
+    metrics: List[str] = CATEGORY_METRICS,
+) -> pd.DataFrame:
+    """
+    Seçilen aylar için tüm metrik toplamlarını grup bazında tek geçişte hesaplar.
+
+    Bu fonksiyon:
+    1. Seçili ayların tüm metrik sütunlarını tek bir groupby ile toplar
+    2. Her metrik için ay sütunlarını grup düzeyinde birleştirir
+    3. Veri çerçevesini kopyalamadan küçük bir özet döndürür
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_col (str): Gruplama kolonu
+        months (List[str]): Toplanacak aylar
+        metrics (List[str]): Metrik adları
+
+    Returns:
+        DataFrame: group_col indeksli, "Toplam <metrik>" sütunlarından oluşan özet;
+            veride sütunu bulunmayan metrikler dahil edilmez
+    """
+    metric_columns = {
+        metric: [f"{month} {metric}" for month in months if f"{month} {metric}" in df.columns]
+        for metric in metrics
+    }
+    metric_columns = {metric: cols for metric, cols in metric_columns.items() if cols}
+    all_columns = [col for cols in metric_columns.values() for col in cols]
+    if not all_columns:
+        return pd.DataFrame(index=pd.Index([], name=group_col))
+
+    grouped = df.groupby(group_col, sort=False)[all_columns].sum()
+    values = grouped.to_numpy(dtype=np.float64)
+
+    totals, start = {}, 0
+    for metric, cols in metric_columns.items():
+        totals[f"Toplam {metric}"] = values[:, start:start + len(cols)].sum(axis=1)
+        start += len(cols)
+    return pd.DataFrame(totals, index=grouped.index)
 
 
 @handle_error
@@ -50,7 +192,8 @@ def create_charts(df: pd.DataFrame, group_col: str, time_period: str, metric: st
     Pasta ve sütun grafiklerini oluşturur.
     
     Parameters:
-        df (DataFrame): İşlenecek veri çerçevesi
+        df (DataFrame): Grup bazında toplanmış ve sıralanmış özet
+            (aggregate_category_totals çıktısı)
         group_col (str): Gruplama kolonu
         time_period (str): Zaman periyodu (ay veya Toplam)
         metric (str): Metrik adı (Bütçe, Fiili, BE, vb.)
@@ -65,10 +208,8 @@ def create_charts(df: pd.DataFrame, group_col: str, time_period: str, metric: st
         return None, None
 
     try:
-        # Veri hazırlama
-        df_filtered = df[[group_col, col_name]].copy()
-        df_grouped = df_filtered.groupby(group_col)[col_name].sum().reset_index()
-        df_sorted = df_grouped.sort_values(col_name, ascending=False)
+        # Veri hazırlama: özet zaten grup bazında toplanmış olarak gelir
+        df_sorted = df[[group_col, col_name]]
 
         # Pasta Grafik
         fig_pie = px.pie(
@@ -138,59 +279,63 @@ def create_charts(df: pd.DataFrame, group_col: str, time_period: str, metric: st
         return None, None
 
 
-@handle_error
-def save_figure(fig: Any) -> BytesIO:
+def build_category_figures(
+    df: pd.DataFrame,
+    group_col: str,
+    selected_months: List[str],
+    top_n: int = 12,
+) -> Dict[str, Tuple[Optional[Any], Optional[Any]]]:
     """
-    Grafiği buffer'a kaydeder.
-    
+    Her metrik için ilk N grup + "Diğer" pasta ve sütun grafiklerini oluşturur.
+
+    Toplamlar tek geçişte hesaplanır; seçili aylarda sütunu bulunmayan
+    metrikler sonuçta yer almaz.
+
     Parameters:
-        fig (Figure): Kaydedilecek grafik
-        
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_col (str): Gruplama sütunu
+        selected_months (List[str]): Toplama dahil edilecek aylar
+        top_n (int): Ayrı gösterilecek grup sayısı
+
     Returns:
-        BytesIO: Grafik görüntüsü buffer'ı
+        Dict[str, Tuple[Optional[Any], Optional[Any]]]: Metrik -> (pasta, sütun) grafikleri
     """
-    img_buffer = BytesIO()
-    try:
-        pio.write_image(
-            fig,
-            img_buffer,
-            format="png",
-            width=1400,  # Render genişliğini artır
-            height=900,
-            scale=2,  # Çözünürlüğü 2x yap
-        )
-        img_buffer.seek(0)
-        return img_buffer
-    except Exception as e:
-        display_friendly_error(
-            f"Grafik kaydetme hatası: {str(e)}",
-            "Grafik kaydedilemedi."
-        )
-        # Boş bir buffer döndür
-        img_buffer.seek(0)
-        return img_buffer
+    totals = aggregate_category_totals(df, group_col, selected_months, CATEGORY_METRICS)
+    figures = {}
+    for metric in CATEGORY_METRICS:
+        col_name = f"Toplam {metric}"
+        if col_name in totals.columns:
+            figures[metric] = create_charts(fold_top_n(totals[col_name], top_n), group_col, "Toplam", metric)
+    return figures
 
 
 @handle_error
-def show_category_charts(df: pd.DataFrame) -> Optional[BytesIO]:
+def show_category_charts(
+    df: pd.DataFrame,
+    selected_months: Optional[List[str]] = None,
+    cache_key: Optional[Hashable] = None,
+) -> Optional[Dict[str, ChartSpec]]:
     """
     Kategori bazlı analiz grafiklerini gösterir ve indirebilir.
+
+    Grafikler yalnızca kullanıcı indirme istediğinde PNG'ye dönüştürülür.
     
     Parameters:
         df (DataFrame): İşlenecek veri çerçevesi
+        selected_months (List[str], optional): Kenar çubuğunda seçilen aylar; verilmezse tüm aylar
+        cache_key (Hashable, optional): df'nin satırlarını belirleyen filtre parmak izi
         
     Returns:
-        Optional[BytesIO]: Tüm grafikleri içeren ZIP buffer'ı veya None
+        Optional[Dict[str, ChartSpec]]: Dosya adı -> grafik tanımı eşlemesi veya None
     """
     with st.expander("⚙️ Analiz Ayarları", expanded=True):
         col1, col2 = st.columns(2)
 
         with col1:
-            group_options = [
-                col
-                for col in df.columns
-                if df[col].dtype == "object" and df[col].nunique() <= 30
-            ]
+            # Kardinalite filtre başına bir kez hesaplanır; yüksek kardinaliteli
+            # sütunlar da seçilebilir, fazla gruplar "Diğer" altında toplanır
+            cardinalities = load_column_cardinalities(df, cache_key=cache_key)
+            group_options = [col for col, count in cardinalities.items() if count > 0]
             if not group_options:
                 display_friendly_error(
                     "Gruplama için uygun sütun bulunamadı",
@@ -204,6 +349,7 @@ def show_category_charts(df: pd.DataFrame) -> Optional[BytesIO]:
                 index=group_options.index("Masraf Çeşidi Grubu 1")
                 if "Masraf Çeşidi Grubu 1" in group_options
                 else 0,
+                format_func=lambda col: f"{col} ({cardinalities[col]:,} grup)",
             )
 
         with col2:
@@ -215,66 +361,51 @@ def show_category_charts(df: pd.DataFrame) -> Optional[BytesIO]:
                 step=1,
             )
 
-    # Grafiklerin oluşturulması
-    metric_data = {
-        "Bütçe": {"color": "#636EFA"},
-        "Fiili": {"color": "#EF553B"},
-        "BE": {"color": "#00CC96"},
-    }
-
-    all_images = {}
+    all_specs = {}
     has_data = False
 
-    # Seçilen ayları al
-    selected_months = st.session_state.get("month_filter", ["Hepsi"])
-    if "Hepsi" in selected_months:
+    if selected_months is None:
         selected_months = MONTHS
 
     # Her metrik için toplam grafik oluştur
-    for metric in metric_data.keys():
-        # Seçilen ayların toplamını hesapla
-        total_data = []
-        for month in selected_months:
-            col_name = f"{month} {metric}"
-            if col_name in df.columns:
-                total_data.append(df[col_name])
-        
-        if total_data:
-            # Toplam veriyi oluştur
-            total_df = df.copy()
-            total_df[f"Toplam {metric}"] = sum(total_data)
-            
-            # Grafikleri oluştur
-            fig_pie, fig_bar = create_charts(total_df, selected_group, "Toplam", metric)
-
-            if fig_pie and fig_bar:
-                has_data = True
-                with st.container():
-                    st.markdown(f"### {metric} Analizi - Year to Date")
-
-                    # Pasta Grafik
-                    st.plotly_chart(fig_pie, use_container_width=True)
-
-                    # Boşluk
-                    st.write("")
-
-                    # Sütun Grafik
-                    st.plotly_chart(fig_bar, use_container_width=True)
-
-                    # Grafikleri kaydet
-                    pie_img = save_figure(fig_pie)
-                    bar_img = save_figure(fig_bar)
-                    all_images[f"{metric}_Pasta.png"] = pie_img.getvalue()
-                    all_images[f"{metric}_Sütun.png"] = bar_img.getvalue()
-
-                    # Bölüm ayracı
-                    st.markdown("---")
-            else:
-                st.info(f"{metric} verisi bulunamadı", icon="ℹ️")
+    figures = build_category_figures(df, selected_group, selected_months, top_n)
+    for metric in CATEGORY_METRICS:
+        if metric not in figures:
+            continue
+        fig_pie, fig_bar = figures[metric]
+
+        if fig_pie and fig_bar:
+            has_data = True
+            with st.container():
+                st.markdown(f"### {metric} Analizi - Year to Date")
+
+                # Pasta Grafik
+                st.plotly_chart(fig_pie, use_container_width=True)
+
+                # Boşluk
+                st.write("")
+
+                # Sütun Grafik
+                st.plotly_chart(fig_bar, use_container_width=True)
+
+                # Grafik tanımlarını sakla; PNG'ler yalnızca indirme istenince üretilir
+                all_specs[f"{metric}_Pasta.png"] = chart_spec(fig_pie, **CHART_IMAGE_SIZE)
+                all_specs[f"{metric}_Sütun.png"] = chart_spec(fig_bar, **CHART_IMAGE_SIZE)
+
+                # Bölüm ayracı
+                st.markdown("---")
+        else:
+            st.info(f"{metric} verisi bulunamadı", icon="ℹ️")
 
     # İndirme butonu
-    if all_images:
+    if all_specs:
+        fingerprint = tuple(spec.key for spec in all_specs.values())
+        if not export_requested("kategori_png", fingerprint, label="🖼️ Grafikleri Hazırla"):
+            return all_specs
         try:
+            all_images, timings = render_specs(all_specs)
+            st.caption(format_render_timings(timings))
+
             zip_buffer = BytesIO()
             with zipfile.ZipFile(zip_buffer, "w") as zip_file:
                 for name, data in all_images.items():
@@ -290,7 +421,7 @@ def show_category_charts(df: pd.DataFrame) -> Optional[BytesIO]:
                     use_container_width=True,
                     type="primary",
                 )
-            return zip_buffer
+            return all_specs
         except Exception as e:
             display_friendly_error(
                 f"ZIP oluşturma hatası: {str(e)}",
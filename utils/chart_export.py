@@ -0,0 +1,293 @@
+"""
+chart_export.py - Plotly grafiklerini sıcak Kaleido işlemleriyle PNG'ye dönüştürür.
+
+Her `pio.write_image` çağrısı tek bir Kaleido alt işlemi üzerinden sırayla
+yürür. Bu modül birden fazla Kaleido işlemini süreç boyunca açık tutar ve
+dönüştürme isteklerini bir kuyruk üzerinden bu işlemlere dağıtır; böylece
+aynı sekmedeki grafikler paralel olarak üretilir.
+
+Sekmeler grafikleri doğrudan PNG'ye çevirmek yerine ucuz bir `ChartSpec`
+(grafik JSON'u + boyut) saklar. Rasterleştirme yalnızca indirme, ZIP veya PDF
+dışa aktarımı istendiğinde yapılır ve sonuçlar (grafik JSON karması, boyut,
+ölçek) anahtarıyla önbelleğe alınır; değişmeyen grafik iki kez render edilmez.
+
+Fonksiyonlar:
+    - get_renderer_pool: Süreç genelinde paylaşılan işlem havuzunu döndürür
+    - chart_spec: Grafiği ertelenmiş dışa aktarım için ChartSpec'e dönüştürür
+    - submit_specs: ChartSpec'leri beklemeden havuza gönderir (önbellekli)
+    - render_specs: ChartSpec'leri önbellek üzerinden PNG'ye dönüştürür
+    - render_spec: Tek bir ChartSpec'i PNG'ye dönüştürür
+    - export_requested: Dışa aktarım isteğini bir düğmeyle alır ve hatırlar
+    - format_render_timings: Grafik başına süreleri okunabilir metne çevirir
+
+Sınıflar:
+    - RendererPool: Sıcak Kaleido işlemlerinden oluşan havuz
+    - ChartSpec: Render edilmemiş grafik tanımı
+
+Kullanım:
+    from utils.chart_export import chart_spec, render_specs
+
+    spec = chart_spec(fig, width=1400, height=900, scale=2)
+    images, timings = render_specs({"trend.png": spec})
+"""
+
+import atexit
+import hashlib
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import partial
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import plotly.io as pio
+import streamlit as st
+from kaleido.scopes.plotly import PlotlyScope
+
+from config.constants import CHART_RENDERER_POOL_SIZE, CHART_IMAGE_CACHE_ENTRIES
+from utils.cache import ResultCache
+
+
+class RendererPool:
+    """
+    Sıcak tutulan Kaleido işlemlerinden oluşan havuz.
+
+    Her Kaleido işlemi aynı anda tek bir dönüştürme yapabildiği için istekler
+    bir iş parçacığı havuzu tarafından kuyruktan boşta olan işleme verilir.
+
+    Parameters:
+        size (int): Açık tutulacak Kaleido işlemi sayısı
+    """
+
+    def __init__(self, size: int = CHART_RENDERER_POOL_SIZE):
+        self.size = max(1, size)
+        self._scopes: "queue.Queue[PlotlyScope]" = queue.Queue()
+        for _ in range(self.size):
+            self._scopes.put(
+                PlotlyScope(
+                    plotlyjs=pio.kaleido.scope.plotlyjs,
+                    mathjax=pio.kaleido.scope.mathjax,
+                )
+            )
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="kaleido")
+
+    def _render(self, fig: Any, format: str, width: int, height: int, scale: float) -> Tuple[bytes, float]:
+        scope = self._scopes.get()
+        try:
+            start = time.perf_counter()
+            image = scope.transform(fig, format=format, width=width, height=height, scale=scale)
+            return image, (time.perf_counter() - start) * 1000
+        finally:
+            self._scopes.put(scope)
+
+    def submit(
+        self,
+        fig: Any,
+        format: str = "png",
+        width: int = 1000,
+        height: int = 600,
+        scale: float = 1,
+    ) -> "Future[Tuple[bytes, float]]":
+        """
+        Dönüştürme isteğini kuyruğa ekler.
+
+        Returns:
+            Future: (görüntü baytları, dönüştürme süresi (ms)) sonucunu veren Future
+        """
+        return self._executor.submit(self._render, fig, format, width, height, scale)
+
+    def warm_up(self) -> None:
+        """Tüm Kaleido işlemlerini küçük bir grafikle önceden başlatır."""
+        figure = {"data": [{"type": "bar", "x": [0], "y": [0]}], "layout": {}}
+        futures = [self.submit(figure, width=10, height=10) for _ in range(self.size)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        """İş parçacıklarını ve Kaleido işlemlerini kapatır."""
+        self._executor.shutdown(wait=True)
+        while not self._scopes.empty():
+            self._scopes.get_nowait()._shutdown_kaleido()
+
+
+_pool: Optional[RendererPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_renderer_pool(size: Optional[int] = None) -> RendererPool:
+    """
+    Süreç genelinde paylaşılan Kaleido işlem havuzunu döndürür; ilk çağrıda oluşturur.
+
+    Parameters:
+        size (int, optional): İlk çağrıda oluşturulacak işlem sayısı; verilmezse
+            CHART_RENDERER_POOL_SIZE. Toplu raporlamada her işçi süreci tek işlemle
+            başlatılır; havuz oluşturulduktan sonra yok sayılır.
+
+    Returns:
+        RendererPool: Paylaşılan havuz
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = RendererPool() if size is None else RendererPool(size)
+                atexit.register(_pool.shutdown)
+    return _pool
+
+
+class ChartSpec(NamedTuple):
+    """
+    Render edilmemiş grafik tanımı.
+
+    Attributes:
+        figure_json (str): Grafiğin Plotly JSON gösterimi
+        width (int): Görüntü genişliği (piksel)
+        height (int): Görüntü yüksekliği (piksel)
+        scale (float): Çözünürlük çarpanı
+        key (Tuple): Önbellek anahtarı (JSON karması, genişlik, yükseklik, ölçek)
+    """
+
+    figure_json: str
+    width: int
+    height: int
+    scale: float
+    key: Tuple
+
+
+_image_cache = ResultCache(CHART_IMAGE_CACHE_ENTRIES)
+
+
+def chart_spec(fig: Any, width: int = 1000, height: int = 600, scale: float = 1) -> ChartSpec:
+    """
+    Grafiği ertelenmiş PNG dışa aktarımı için ChartSpec'e dönüştürür.
+
+    Çok sayıda küçük grafik üreten çağıranlar, Plotly doğrulamasına girmemek
+    için grafiği doğrudan {"data": [...], "layout": {...}} sözlüğü olarak
+    verebilir; sözlükteki değerler JSON'a çevrilebilir olmalıdır.
+
+    Parameters:
+        fig (Figure | Dict): Plotly grafiği veya grafik sözlüğü
+        width (int): Görüntü genişliği (piksel)
+        height (int): Görüntü yüksekliği (piksel)
+        scale (float): Çözünürlük çarpanı
+
+    Returns:
+        ChartSpec: Grafik tanımı
+    """
+    figure_json = json.dumps(fig) if isinstance(fig, dict) else fig.to_json()
+    digest = hashlib.sha1(figure_json.encode("utf-8")).hexdigest()
+    return ChartSpec(figure_json, width, height, scale, (digest, width, height, scale))
+
+
+def _cache_rendered(key: tuple, future: "Future[Tuple[bytes, float]]") -> None:
+    """Başarıyla tamamlanan dönüştürmenin görüntüsünü önbelleğe yazar."""
+    if future.exception() is None:
+        _image_cache.set(key, future.result()[0])
+
+
+def submit_specs(specs: Dict[str, ChartSpec]) -> Dict[str, "Future[Tuple[bytes, float]]"]:
+    """
+    ChartSpec'leri beklemeden render havuzuna gönderir; önbellekte bulunanları yeniden render etmez.
+
+    Bu fonksiyon:
+    1. Her tanımı (JSON karması, boyut, ölçek) anahtarıyla önbellekte arar
+    2. Bulunanlar için tamamlanmış, diğerleri için havuzdaki isteğin Future'ını döndürür
+    3. Yeni görüntüleri dönüştürme bittiğinde önbelleğe yazar
+
+    Parameters:
+        specs (Dict[str, ChartSpec]): Ad -> grafik tanımı eşlemesi
+
+    Returns:
+        Dict[str, Future]: Ad -> (görüntü baytları, dönüştürme süresi (ms); önbellekten
+            gelenler için 0) sonucunu veren Future
+    """
+    futures = {}
+    for name, spec in specs.items():
+        cached = _image_cache.get(spec.key)
+        if cached is not None:
+            futures[name] = Future()
+            futures[name].set_result((cached, 0.0))
+            continue
+        futures[name] = get_renderer_pool().submit(
+            json.loads(spec.figure_json),
+            width=spec.width,
+            height=spec.height,
+            scale=spec.scale,
+        )
+        futures[name].add_done_callback(partial(_cache_rendered, spec.key))
+    return futures
+
+
+def render_specs(specs: Dict[str, ChartSpec]) -> Tuple[Dict[str, bytes], Dict[str, float]]:
+    """
+    ChartSpec'leri PNG'ye dönüştürür; önbellekte bulunanları yeniden render etmez.
+
+    Tanımlar havuza tek seferde gönderilip paralel olarak render edilir
+    (bkz. `submit_specs`).
+
+    Parameters:
+        specs (Dict[str, ChartSpec]): Ad -> grafik tanımı eşlemesi
+
+    Returns:
+        Tuple[Dict[str, bytes], Dict[str, float]]: (ad -> görüntü baytları,
+            ad -> dönüştürme süresi (ms); önbellekten gelenler için 0)
+    """
+    results = {name: future.result() for name, future in submit_specs(specs).items()}
+    return (
+        {name: image for name, (image, _) in results.items()},
+        {name: ms for name, (_, ms) in results.items()},
+    )
+
+
+def render_spec(spec: ChartSpec) -> bytes:
+    """
+    Tek bir ChartSpec'i PNG'ye dönüştürür (önbellekli).
+
+    Returns:
+        bytes: Görüntü baytları
+    """
+    images, _ = render_specs({"grafik": spec})
+    return images["grafik"]
+
+
+def export_requested(key: str, fingerprint: Any, label: str = "🖼️ PNG Hazırla") -> bool:
+    """
+    Dışa aktarımın kullanıcı tarafından istenip istenmediğini döndürür.
+
+    İstek, düğmeye basıldığı andaki grafik parmak iziyle birlikte saklanır;
+    grafik değişirse düğme yeniden gösterilir ve yeni grafik kullanıcı
+    istemeden render edilmez.
+
+    Parameters:
+        key (str): Düğme ve oturum durumu anahtarı
+        fingerprint (Any): Dışa aktarılacak grafiklerin parmak izi
+        label (str): Düğme etiketi
+
+    Returns:
+        bool: Dışa aktarım isteniyorsa True
+    """
+    state_key = f"{key}_requested"
+    if st.session_state.get(state_key) == fingerprint:
+        return True
+    if st.button(label, key=key):
+        st.session_state[state_key] = fingerprint
+        return True
+    return False
+
+
+def format_render_timings(timings: Dict[str, float]) -> str:
+    """
+    Grafik başına dönüştürme sürelerini tek satırlık metne çevirir.
+
+    Parameters:
+        timings (Dict[str, float]): Ad -> süre (ms)
+
+    Returns:
+        str: Ör. "🖼️ PNG: trend.png 120 ms · kategori.png 95 ms"
+    """
+    parts = [
+        f"{name} {ms:.0f} ms" if ms else f"{name} (önbellek)"
+        for name, ms in timings.items()
+    ]
+    return "🖼️ PNG: " + " · ".join(parts)
@@ -6,10 +6,14 @@ görselleştirmek için fonksiyonlar içerir.
 
 Fonksiyonlar:
     - show_comparative_analysis: Seçilen gruplama faktörüne göre karşılaştırmalı analiz gösterir
+    - comparative_totals: Grup bazında toplam bütçe, fiili ve kullanım tablosunu hesaplar
+    - load_comparative_totals: comparative_totals'ın filtre parmak izi bazlı önbellekli sürümü
+    - build_comparative_figure: Grup sayısına göre sütun veya WebGL grafiği oluşturur
+    - format_chart_info: Grafik modu ve veri boyutu bilgisini metne çevirir
 
 Özellikler:
     - Gruplama bazlı analiz
-    - Görselleştirme desteği
+    - Görselleştirme desteği (çok sayıda grupta WebGL ve seyreltme)
     - Excel ve PNG export
     - Hata yönetimi
     - Özelleştirilebilir grafikler
@@ -24,15 +28,21 @@ Kullanım:
 """
 
 import streamlit as st
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 from io import BytesIO
 import plotly.io as pio
 import pandas as pd
-from typing import Tuple, Optional
+from typing import Any, Dict, Hashable, List, Tuple, Optional
+from utils.cache import ResultCache, dataframe_fingerprint
 from utils.error_handler import handle_error, display_friendly_error
-from utils.warning_system import style_overused_rows
-from utils.formatting import format_currency_columns
-from config.constants import MONTHS, GENERAL_COLUMNS
+from utils.chart_export import ChartSpec, chart_spec, render_specs, export_requested, format_render_timings
+from utils.warning_system import style_overused_rows, style_page
+from utils.formatting import set_column_formats, render_table, write_excel_sheet
+from config.constants import (
+    MONTHS, GENERAL_COLUMNS, COMPARATIVE_WEBGL_THRESHOLD, COMPARATIVE_MAX_POINTS, SUMMARY_CACHE_ENTRIES
+)
 
 # Grafik export ayarları
 pio.kaleido.scope.default_format = "png"
@@ -42,12 +52,193 @@ pio.kaleido.scope.default_colorway = px.colors.qualitative.Plotly
 pio.kaleido.scope.default_paper_bgcolor = "white"
 pio.kaleido.scope.default_plot_bgcolor = "white"
 
+_comparative_cache = ResultCache(SUMMARY_CACHE_ENTRIES)
+
+
+def build_comparative_figure(
+    result_df: pd.DataFrame,
+    group_by_col: str,
+    threshold: int = COMPARATIVE_WEBGL_THRESHOLD,
+    max_points: int = COMPARATIVE_MAX_POINTS,
+) -> Tuple[go.Figure, Dict[str, Any]]:
+    """
+    Karşılaştırma grafiğini grup sayısına göre uygun modda oluşturur.
+
+    Bu fonksiyon:
+    1. Grup sayısı eşiğin altındaysa gruplanmış sütun grafiği çizer
+    2. Eşik aşılırsa WebGL (Scattergl) izlerine geçer
+    3. Nokta sayısı max_points'i aşarsa Toplam Fiili'ye göre sıralı eğriden
+       eşit aralıklı seyreltme yapar (en büyük ve en küçük grup korunur)
+
+    Parameters:
+        result_df (DataFrame): Toplam Fiili'ye göre azalan sıralı grup özeti
+        group_by_col (str): Gruplama sütunu
+        threshold (int): WebGL moduna geçilen grup sayısı
+        max_points (int): WebGL modunda çizilecek en fazla grup sayısı
+
+    Returns:
+        Tuple[Figure, Dict[str, Any]]: (grafik, {"mode", "groups", "points", "threshold"})
+    """
+    n_groups = len(result_df)
+    title = f"{group_by_col} Bazında Year to Date Toplam Karşılaştırması"
+
+    if n_groups <= threshold:
+        mode, points = "bar", n_groups
+        fig = px.bar(
+            result_df,
+            x=group_by_col,
+            y=["Toplam Bütçe", "Toplam Fiili"],
+            barmode="group",
+            title=title,
+            color_discrete_sequence=["#636EFA", "#EF553B"],
+        )
+        fig.update_layout(xaxis=dict(tickangle=-45))
+    else:
+        mode = "webgl"
+        # Sıralı eğriden eşit aralıklı örnekleme: eğrinin şekli korunur
+        if n_groups > max_points:
+            positions = np.unique(np.linspace(0, n_groups - 1, max_points).round().astype(np.intp))
+        else:
+            positions = np.arange(n_groups)
+        sample = result_df.iloc[positions]
+        points = len(sample)
+        ranks = positions + 1
+        names = sample[group_by_col].astype(str).to_numpy()
+
+        fig = go.Figure()
+        for column, color in (("Toplam Bütçe", "#636EFA"), ("Toplam Fiili", "#EF553B")):
+            fig.add_trace(
+                go.Scattergl(
+                    x=ranks,
+                    y=sample[column].to_numpy(),
+                    mode="markers",
+                    name=column,
+                    marker=dict(color=color, size=5),
+                    customdata=names,
+                    hovertemplate="%{customdata}<br>Sıra: %{x}<br>%{y:,.0f} ₺<extra>" + column + "</extra>",
+                )
+            )
+        fig.update_layout(
+            title=title,
+            xaxis=dict(title=f"{group_by_col} sırası (Toplam Fiili'ye göre)"),
+        )
+
+    # Grafik stil ayarları
+    fig.update_layout(
+        template="plotly_white",
+        font=dict(color="black", size=12),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=50, r=50, t=80, b=150),
+    )
+
+    # Y ekseni değerlerini TL formatında göster
+    fig.update_yaxes(tickformat=",.0f ₺")
+
+    info = {
+        "mode": mode,
+        "groups": n_groups,
+        "points": points,
+        "threshold": threshold,
+    }
+    return fig, info
+
+
+def format_chart_info(info: Dict[str, Any], payload_bytes: int) -> str:
+    """
+    Grafik modu, eşik ve tarayıcıya gönderilen veri boyutunu tek satırlık metne çevirir.
+
+    Parameters:
+        info (Dict[str, Any]): build_comparative_figure'ın döndürdüğü bilgi
+        payload_bytes (int): Grafik tanımının JSON boyutu (ChartSpec.figure_json)
+
+    Returns:
+        str: Ör. "⚡ WebGL modu: 5,000 grup > eşik 300 · 1,000 nokta çizildi · grafik verisi 92.4 KB"
+    """
+    payload = f"grafik verisi {payload_bytes / 1024:,.1f} KB"
+    if info["mode"] == "webgl":
+        return (
+            f"⚡ WebGL modu: {info['groups']:,} grup > eşik {info['threshold']:,} · "
+            f"{info['points']:,} nokta çizildi · {payload}"
+        )
+    return f"📦 {info['groups']:,} grup (WebGL eşiği {info['threshold']:,}) · {payload}"
+
+
+def comparative_totals(
+    df: pd.DataFrame,
+    group_by_col: str,
+    selected_months: List[str],
+) -> Optional[Tuple[pd.DataFrame, Dict[str, str]]]:
+    """
+    Grup bazında toplam bütçe, fiili ve kullanım yüzdesini hesaplar (Streamlit gerektirmez).
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_by_col (str): Gruplama yapılacak sütun adı
+        selected_months (List[str]): Toplama dahil edilecek aylar
+
+    Returns:
+        Optional[Tuple[DataFrame, Dict[str, str]]]: Toplam Fiili'ye göre azalan sıralı
+            tablo ve sütun formatları; seçili aylarda bütçe/fiili sütunu yoksa None
+    """
+    # Seçilen ayların toplam bütçe ve fiili verilerini hesapla
+    total_budget_cols = [f"{month} Bütçe" for month in selected_months if f"{month} Bütçe" in df.columns]
+    total_actual_cols = [f"{month} Fiili" for month in selected_months if f"{month} Fiili" in df.columns]
+    if not total_budget_cols or not total_actual_cols:
+        return None
+
+    # Verileri gruplama ve toplama
+    grouped = df.groupby(group_by_col)[total_budget_cols + total_actual_cols].sum()
+
+    # Toplam bütçe ve fiili hesapla
+    grouped["Toplam Bütçe"] = grouped[total_budget_cols].sum(axis=1)
+    grouped["Toplam Fiili"] = grouped[total_actual_cols].sum(axis=1)
+
+    # Kullanım yüzdesi hesapla
+    grouped["Kullanım (%)"] = (grouped["Toplam Fiili"] / grouped["Toplam Bütçe"]) * 100
+
+    # NaN değerleri ve sonsuz değerleri temizle
+    grouped.replace([np.inf, -np.inf], np.nan, inplace=True)
+
+    # Sadece toplam sütunları al; tablo sayısal kalır, format bilgisi üstveride taşınır
+    result_df = grouped[["Toplam Bütçe", "Toplam Fiili", "Kullanım (%)"]].reset_index()
+    formats = {"Toplam Bütçe": "currency", "Toplam Fiili": "currency", "Kullanım (%)": "percent"}
+    set_column_formats(result_df, formats)
+    return result_df.sort_values("Toplam Fiili", ascending=False), formats
+
+
+def load_comparative_totals(
+    df: pd.DataFrame,
+    group_by_col: str,
+    selected_months: List[str],
+    cache_key: Optional[Hashable] = None,
+) -> Optional[Tuple[pd.DataFrame, Dict[str, str]]]:
+    """
+    comparative_totals'ı filtre parmak izi başına bir kez hesaplar.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_by_col (str): Gruplama yapılacak sütun adı
+        selected_months (List[str]): Toplama dahil edilecek aylar
+        cache_key (Hashable, optional): Filtre parmak izi; verilmezse içerik parmak izi
+
+    Returns:
+        Optional[Tuple[DataFrame, Dict[str, str]]]: comparative_totals çıktısı
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    return _comparative_cache.get_or_compute(
+        ("comparative", cache_key, group_by_col, tuple(selected_months)),
+        lambda: comparative_totals(df, group_by_col, selected_months),
+    )
+
 
 @handle_error
 def show_comparative_analysis(
     df: pd.DataFrame, 
-    group_by_col: str = "İlgili 1"
-) -> Tuple[Optional[BytesIO], Optional[BytesIO]]:
+    group_by_col: str = "İlgili 1",
+    selected_months: Optional[List[str]] = None,
+    cache_key: Optional[Hashable] = None,
+) -> Tuple[Optional[BytesIO], Optional[ChartSpec]]:
     """
     Seçilen gruplama faktörüne göre karşılaştırmalı analiz gösterir.
     
@@ -62,10 +253,12 @@ def show_comparative_analysis(
     Parameters:
         df (DataFrame): İşlenecek veri çerçevesi
         group_by_col (str): Gruplama yapılacak sütun adı
+        selected_months (List[str], optional): Kenar çubuğunda seçilen aylar; verilmezse tüm aylar
+        cache_key (Hashable, optional): Filtre parmak izi
         
     Returns:
-        Tuple[Optional[BytesIO], Optional[BytesIO]]: 
-            (excel_buffer, görüntü_buffer) tuple
+        Tuple[Optional[BytesIO], Optional[ChartSpec]]: 
+            (excel_buffer, grafik tanımı) tuple
             
     Hata durumunda:
     - Hata loglanır
@@ -92,16 +285,11 @@ def show_comparative_analysis(
         )
         return None, None
 
-    # Sidebar'dan seçilen ayları al
-    selected_months = st.session_state.get("month_filter", ["Hepsi"])
-    if "Hepsi" in selected_months:
+    if selected_months is None:
         selected_months = MONTHS
 
-    # Seçilen ayların toplam bütçe ve fiili verilerini hesapla
-    total_budget_cols = [f"{month} Bütçe" for month in selected_months if f"{month} Bütçe" in df.columns]
-    total_actual_cols = [f"{month} Fiili" for month in selected_months if f"{month} Fiili" in df.columns]
-
-    if not total_budget_cols or not total_actual_cols:
+    totals = load_comparative_totals(df, group_by_col, selected_months, cache_key=cache_key)
+    if totals is None:
         display_friendly_error(
             "Seçilen aylar için veri bulunamadı",
             "Farklı aylar seçin veya veri formatını kontrol edin."
@@ -109,80 +297,43 @@ def show_comparative_analysis(
         return None, None
 
     try:
-        # Verileri gruplama ve toplama
-        grouped = df.groupby(group_by_col)[total_budget_cols + total_actual_cols].sum()
-        
-        # Toplam bütçe ve fiili hesapla
-        grouped["Toplam Bütçe"] = grouped[total_budget_cols].sum(axis=1)
-        grouped["Toplam Fiili"] = grouped[total_actual_cols].sum(axis=1)
-        
-        # Kullanım yüzdesi hesapla
-        grouped["Kullanım (%)"] = (grouped["Toplam Fiili"] / grouped["Toplam Bütçe"]) * 100
-        
-        # NaN değerleri ve sonsuz değerleri temizle
-        grouped.replace([float('inf'), -float('inf')], pd.NA, inplace=True)
-        
-        # Sadece toplam sütunları al
-        result_df = grouped[["Toplam Bütçe", "Toplam Fiili", "Kullanım (%)"]].reset_index()
-        
-        # Grafik için orijinal sayısal değerleri kullan
-        graph_df = result_df.copy()
-        
-        # Tablo gösterimi için TL formatında göster
-        result_df = format_currency_columns(result_df, [group_by_col, "Kullanım (%)"])
-        
-        # Grafik oluşturma
-        fig = px.bar(
-            graph_df.sort_values("Toplam Fiili", ascending=False),
-            x=group_by_col,
-            y=["Toplam Bütçe", "Toplam Fiili"],
-            barmode="group",
-            title=f"{group_by_col} Bazında Year to Date Toplam Karşılaştırması",
-            color_discrete_sequence=["#636EFA", "#EF553B"],
-        )
-
-        # Grafik stil ayarları
-        fig.update_layout(
-            template="plotly_white",
-            font=dict(color="black", size=12),
-            xaxis=dict(tickangle=-45),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            margin=dict(l=50, r=50, t=80, b=150),
-        )
-
-        # Y ekseni değerlerini TL formatında göster
-        fig.update_yaxes(tickformat=",.0f ₺")
+        result_df, formats = totals
 
+        # Grafik oluşturma (çok sayıda grupta WebGL + seyreltilmiş nokta modu)
+        fig, chart_info = build_comparative_figure(result_df, group_by_col)
         st.plotly_chart(fig, use_container_width=True)
 
-        # Grafiği hafızada bir görüntüye kaydet
-        comperative_img_buffer = BytesIO()
-        pio.write_image(fig, comperative_img_buffer, format="png", width=800, height=600)
-        comperative_img_buffer.seek(0)  # Tamponun başına git
-
-        # Görüntü için indirme düğmesi ekle
-        st.download_button(
-            label="⬇ İndir (PNG)",
-            data=comperative_img_buffer,
-            file_name="comparative_analysis.png",
-            mime="image/png",
-            key="download_image",
-        )
+        # Grafik tanımını sakla; PNG yalnızca indirme istenince üretilir.
+        # Veri boyutu da bu tanımın JSON'undan ölçülür (ikinci serileştirme yapılmaz)
+        comparative_spec = chart_spec(fig, width=800, height=600)
+        st.caption(format_chart_info(chart_info, len(comparative_spec.figure_json.encode("utf-8"))))
+        if export_requested("karsilastirma_png", comparative_spec.key):
+            images, timings = render_specs({"comparative_analysis.png": comparative_spec})
+            st.download_button(
+                label="⬇ İndir (PNG)",
+                data=images["comparative_analysis.png"],
+                file_name="comparative_analysis.png",
+                mime="image/png",
+                key="download_image",
+            )
+            st.caption(format_render_timings(timings))
 
         st.markdown("---")
 
-        # Tablo gösterimi
-        styled_grouped = style_overused_rows(
-            result_df.sort_values("Toplam Fiili", ascending=False)
+        # Tablo gösterimi: format yalnızca ekrana basılırken, stil sayısal değerlerden uygulanır
+        display_df = render_table(result_df, formats)
+        styled_grouped, style_ms, _ = style_page(
+            style_overused_rows, result_df, display_df, page=f"karsilastirma_{group_by_col}"
         )
-        st.dataframe(styled_grouped, use_container_width=True)
+        st.dataframe(display_df if styled_grouped is None else styled_grouped, use_container_width=True)
+        if styled_grouped is not None:
+            st.caption(f"🎨 Stil süresi: {style_ms:.0f} ms")
 
         # Excel dosyası oluştur
         excel_buffer = BytesIO()
         try:
-            result_df.sort_values("Toplam Fiili", ascending=False).to_excel(
-                excel_buffer, index=False
-            )
+            with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
+                write_excel_sheet(writer, result_df, "Sheet1", formats)
             excel_buffer.seek(0)
 
             # Excel indirme butonu
@@ -198,9 +349,9 @@ def show_comparative_analysis(
                 f"Excel oluşturma hatası: {str(e)}",
                 "Excel raporu oluşturulamadı."
             )
-            return None, comperative_img_buffer
+            return None, comparative_spec
 
-        return excel_buffer, comperative_img_buffer  # ZIP için main.py'ye döndür
+        return excel_buffer, comparative_spec  # ZIP için main.py'ye döndür
         
     except Exception as e:
         display_friendly_error(
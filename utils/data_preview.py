@@ -4,10 +4,20 @@ data_preview.py - Veri önizleme ve görüntüleme işlemlerini yönetir.
 Bu modül, veri çerçevelerinin görüntülenmesi, özetlenmesi ve
 çeşitli formatlarda dışa aktarılması için fonksiyonlar içerir.
 
+Hesaplama fonksiyonları Streamlit'ten bağımsızdır; load_* sürümleri sonuçları
+filtre parmak izi başına önbelleğe alır, show_* fonksiyonları yalnızca gösterir.
+Gösterilen tablolar ZIP raporu için oturuma kopyalanmaz; süreç genelindeki
+tablo deposuna yazılır ve oturumda yalnızca başvuruları tutulur (bkz. table_store).
+
 Fonksiyonlar:
+    - prepare_table: Tabloyu gösterim ve dışa aktarım için hazırlar
+    - grouped_summary: Grup bazında sayısal sütun toplamlarını hesaplar
+    - column_totals: Sayısal sütun toplamlarını hesaplar
+    - compute_group_totals: Seçili aylar için grup bazında metrik toplamlarını hesaplar
+    - load_grouped_summary / load_column_totals / load_group_totals: Önbellekli sürümler
     - show_filtered_data: DataFrame'i gösterir ve Excel çıktısı verir
     - show_grouped_summary: Gruplandırılmış veri özetini gösterir
-    - calculate_group_totals: Grup toplamlarını hesaplar
+    - calculate_group_totals: Grup toplamlarını hesaplar, hata durumunu kullanıcıya gösterir
     - show_column_totals: Sütun toplamlarını gösterir
 
 Özellikler:
@@ -32,10 +42,235 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from io import BytesIO
-from typing import Optional, List, Callable, Union
+from typing import Dict, Hashable, Optional, List, Callable, Tuple, Union
+from utils.cache import ResultCache, dataframe_fingerprint
 from utils.error_handler import handle_error, display_friendly_error
-from utils.formatting import format_currency_columns
-from config.constants import GENERAL_COLUMNS
+from utils.formatting import get_column_formats, set_column_formats, render_table, write_excel_sheet
+from utils.table_store import load_table
+from utils.warning_system import style_page
+from config.constants import GENERAL_COLUMNS, STYLE_MAX_CELLS, SUMMARY_CACHE_ENTRIES
+
+# Kümüle sütunlardan toplanan özel metrikler
+CUMULATIVE_TOTAL_METRICS = {
+    "BE Bakiye": "Kümüle BE Bakiye",
+    "BE-Fiili Fark Bakiye": "Kümüle BE-Fiili Fark Bakiye"
+}
+
+_summary_cache = ResultCache(SUMMARY_CACHE_ENTRIES)
+
+
+def prepare_table(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Tabloyu gösterim ve Excel dışa aktarımı için hazırlar.
+
+    Bu fonksiyon:
+    1. Veri çerçevesinin kopyasını alır
+    2. Sütun formatlarını çıkarıp üstveriye yazar
+    3. Tekrarlı metin sütunlarını category tipine çevirir
+
+    Parameters:
+        df (DataFrame): Hazırlanacak veri çerçevesi
+
+    Returns:
+        Tuple[DataFrame, Dict[str, str]]: (hazırlanmış kopya, sütun formatları)
+    """
+    df = df.copy()
+    formats = get_column_formats(df, GENERAL_COLUMNS)
+    set_column_formats(df, formats)
+    for col in df.select_dtypes(include=['object']).columns:
+        if df[col].nunique() < len(df) * 0.5:  # Eğer benzersiz değer sayısı toplam satır sayısının yarısından azsa
+            df[col] = df[col].astype('category')
+    return df, formats
+
+
+def grouped_summary(
+    df: pd.DataFrame,
+    group_column: str,
+    target_columns: List[str],
+) -> Optional[pd.DataFrame]:
+    """
+    Hedef sütunlardan sayısal olanları grup bazında toplar.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_column (str): Gruplama yapılacak sütun
+        target_columns (List[str]): Özetlenecek sütunlar
+
+    Returns:
+        Optional[DataFrame]: Grup sütunu + toplamlar; grup sütunu veya hedef
+            sütunlar bulunamazsa None
+    """
+    existing_columns = [col for col in target_columns if col in df.columns]
+    if group_column not in df.columns or not existing_columns:
+        return None
+    numeric_columns = [col for col in existing_columns if pd.api.types.is_numeric_dtype(df[col])]
+    return df.groupby(group_column)[numeric_columns].sum().reset_index()
+
+
+def column_totals(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Genel sütunlar dışındaki sayısal sütunların toplamlarını tek satırlık tabloya indirger.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+
+    Returns:
+        DataFrame: "Toplam" indeksli tek satır; sayısal sütun yoksa "Bilgi" sütunlu açıklama satırı
+    """
+    numeric_columns = [
+        col for col in df.columns
+        if col not in GENERAL_COLUMNS and pd.api.types.is_numeric_dtype(df[col])
+    ]
+    if not numeric_columns:
+        return pd.DataFrame({"Bilgi": ["Sayısal sütun bulunamadı"]})
+
+    totals_df = pd.DataFrame(df[numeric_columns].sum()).T
+    totals_df.index = ["Toplam"]
+    # Toplamlar sayısal kalır; TL formatı gösterim ve dışa aktarımda uygulanır
+    set_column_formats(totals_df, get_column_formats(totals_df, GENERAL_COLUMNS))
+    return totals_df
+
+
+def group_total_columns(df: pd.DataFrame, selected_months: List[str], metrics: List[str]) -> List[str]:
+    """
+    Seçili ay ve metriklerden veride bulunan "<ay> <metrik>" sütunlarını döndürür.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        selected_months (List[str]): İşlenecek aylar
+        metrics (List[str]): Hesaplanacak metrikler
+
+    Returns:
+        List[str]: Ay sırasıyla toplanacak sütunlar
+    """
+    return [
+        f"{month} {metric}"
+        for month in selected_months
+        for metric in metrics
+        if f"{month} {metric}" in df.columns
+    ]
+
+
+def compute_group_totals(
+    df: pd.DataFrame,
+    group_column: str,
+    selected_months: List[str],
+    metrics: List[str],
+) -> pd.DataFrame:
+    """
+    Seçili aylar için grup bazında "Toplam <metrik>" sütunlarını hesaplar.
+
+    Bu fonksiyon:
+    1. Veriyi belirtilen sütuna göre gruplar
+    2. Her metriğin seçili ay sütunlarını toplar
+    3. BE Bakiye gibi kümüle metrikleri kümüle sütundan alır
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_column (str): Gruplama yapılacak sütun
+        selected_months (List[str]): İşlenecek aylar
+        metrics (List[str]): Hesaplanacak metrikler
+
+    Returns:
+        DataFrame: Grup indeksli toplamlar; toplanacak sütun yoksa boş DataFrame
+    """
+    columns_to_sum = group_total_columns(df, selected_months, metrics)
+    if not columns_to_sum:
+        return pd.DataFrame()
+
+    grouped_totals = df.groupby(group_column)[columns_to_sum].sum()
+
+    # Her metrik için toplam sütun oluştur
+    for metric in metrics:
+        # Özel metrik kontrolü
+        if metric in CUMULATIVE_TOTAL_METRICS:
+            kumule_col = CUMULATIVE_TOTAL_METRICS[metric]
+            if kumule_col in df.columns and kumule_col not in grouped_totals.columns:
+                kumule_data = df.groupby(group_column)[kumule_col].sum()
+                grouped_totals[f"Toplam {metric}"] = kumule_data
+                continue
+
+        # Normal metrik hesaplama
+        metric_cols = [
+            col for col in columns_to_sum
+            if col.split(" ", 1)[-1] == metric
+        ]
+
+        if metric_cols:
+            grouped_totals[f"Toplam {metric}"] = grouped_totals[metric_cols].sum(axis=1)
+
+    return grouped_totals[[f"Toplam {metric}" for metric in metrics if f"Toplam {metric}" in grouped_totals.columns]]
+
+
+def load_grouped_summary(
+    df: pd.DataFrame,
+    group_column: str,
+    target_columns: List[str],
+    cache_key: Optional[Hashable] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    grouped_summary'nin önbellekli sürümü.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_column (str): Gruplama yapılacak sütun
+        target_columns (List[str]): Özetlenecek sütunlar
+        cache_key (Hashable, optional): df'nin satırlarını belirleyen filtre parmak izi;
+            verilmezse içerik parmak izi kullanılır
+
+    Returns:
+        Optional[DataFrame]: grouped_summary çıktısı
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    key = ("grouped_summary", cache_key, group_column, tuple(target_columns))
+    return _summary_cache.get_or_compute(key, lambda: grouped_summary(df, group_column, target_columns))
+
+
+def load_column_totals(df: pd.DataFrame, cache_key: Optional[Hashable] = None) -> pd.DataFrame:
+    """
+    column_totals'ın önbellekli sürümü.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        cache_key (Hashable, optional): df'nin satırlarını belirleyen filtre parmak izi;
+            verilmezse içerik parmak izi kullanılır. Sütunlar anahtara ayrıca eklenir.
+
+    Returns:
+        DataFrame: column_totals çıktısı
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    key = ("column_totals", cache_key, tuple(df.columns))
+    return _summary_cache.get_or_compute(key, lambda: column_totals(df))
+
+
+def load_group_totals(
+    df: pd.DataFrame,
+    group_column: str,
+    selected_months: List[str],
+    metrics: List[str],
+    cache_key: Optional[Hashable] = None,
+) -> pd.DataFrame:
+    """
+    compute_group_totals'ın önbellekli sürümü.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_column (str): Gruplama yapılacak sütun
+        selected_months (List[str]): İşlenecek aylar
+        metrics (List[str]): Hesaplanacak metrikler
+        cache_key (Hashable, optional): Filtre parmak izi; verilmezse içerik parmak izi
+
+    Returns:
+        DataFrame: compute_group_totals çıktısı
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    key = ("group_totals", cache_key, group_column, tuple(selected_months), tuple(metrics))
+    return _summary_cache.get_or_compute(
+        key, lambda: compute_group_totals(df, group_column, selected_months, metrics)
+    )
 
 
 @handle_error
@@ -45,14 +280,19 @@ def show_filtered_data(
     style_func: Optional[Callable] = None, 
     title: Optional[str] = None,
     sticky_column: Optional[Union[str, int]] = None,
-    page_size: int = 301
+    page_size: int = 301,
+    cache_key: Optional[Hashable] = None,
 ) -> BytesIO:
     """
     DataFrame'i gösterir, istenirse stil uygular, Excel çıktısı verir.
     
+    Hazırlanmış tablo süreç genelindeki tablo deposunda tutulur; ZIP raporu
+    için oturuma yalnızca başvurusu (TableRef) dosya adından türeyen anahtarla
+    yazılır.
+    
     Bu fonksiyon:
     1. Veri çerçevesini sayfalar
-    2. Stil uygulama seçeneği sunar
+    2. Stil fonksiyonunu görünen sayfaya uygular
     3. Sütun yapılandırmasını ayarlar
     4. Sabit sütun desteği sağlar
     5. Excel çıktısı oluşturur
@@ -64,6 +304,8 @@ def show_filtered_data(
         title (str, optional): Görüntüleme başlığı
         sticky_column (Union[str, int], optional): Sabit kalacak sütun adı veya pozisyonu
         page_size (int): Sayfa başına gösterilecek satır sayısı
+        cache_key (Hashable, optional): df'yi belirleyen parmak izi (ör. filtre parmak izi);
+            verilmezse içerik parmak izi kullanılır. Sütunlar anahtara ayrıca eklenir.
         
     Returns:
         BytesIO: Excel dosyası buffer'ı
@@ -71,14 +313,17 @@ def show_filtered_data(
     if title:
         st.markdown(title)
     
-    # Veri çerçevesini kopyala ve optimize et
-    df = df.copy()
-    for col in df.select_dtypes(include=['object']).columns:
-        if df[col].nunique() < len(df) * 0.5:  # Eğer benzersiz değer sayısı toplam satır sayısının yarısından azsa
-            df[col] = df[col].astype('category')
+    # Veri çerçevesini kopyala ve optimize et (depoda varsa yeniden hazırlanmaz)
+    source = df
+    df, table_ref = load_table(
+        cache_key if cache_key is not None else dataframe_fingerprint(source),
+        ("table", tuple(source.columns)),
+        lambda: prepare_table(source)[0],
+    )
+    formats = get_column_formats(df, GENERAL_COLUMNS)
     
-    # Save DataFrame to session state based on filename
-    st.session_state[filename.replace(".xlsx", "")] = df
+    # Oturuma tablonun kendisi yerine başvurusu yazılır (ZIP raporu depodan çözer)
+    st.session_state[filename.replace(".xlsx", "")] = table_ref
     
     # Sabit sütun belirleme
     column_to_stick = None
@@ -88,23 +333,21 @@ def show_filtered_data(
         elif isinstance(sticky_column, int) and 0 <= sticky_column < len(df.columns):
             column_to_stick = df.columns[sticky_column]
     
-    # Stil uygulama seçeneği
-    apply_style = False
-    if style_func and len(df) > page_size:
-        apply_style = st.checkbox("⚠️ Stil Uygula (Performansı Etkileyebilir)", value=False)
-    
     # Sayfalama
     total_pages = (len(df) + page_size - 1) // page_size
     if total_pages > 1:
-        page = st.number_input("📄 Sayfa", min_value=1, max_value=total_pages, value=1)
+        page = st.number_input(
+            "📄 Sayfa", min_value=1, max_value=total_pages, value=1, key=f"page_{filename}"
+        )
         start_idx = (page - 1) * page_size
         end_idx = min(start_idx + page_size, len(df))
-        display_df = df.iloc[start_idx:end_idx]
+        page_df = df.iloc[start_idx:end_idx]
     else:
-        display_df = df
+        page = 1
+        page_df = df
     
-    # Sayısal sütunları TL formatında göster
-    display_df = format_currency_columns(display_df, GENERAL_COLUMNS)
+    # Sayısal sütunları yalnızca görünen sayfa için TL formatında göster
+    display_df = render_table(page_df, formats)
     
     # Sütun yapılandırması - Önceden hesapla
     column_config = {}
@@ -134,11 +377,20 @@ def show_filtered_data(
         )
     
     # Benzersiz anahtar oluştur
-    unique_key = f"data_editor_{filename}_{page if total_pages > 1 else 1}"
+    unique_key = f"data_editor_{filename}_{page}"
     
-    # Stil fonksiyonu varsa ve seçilmişse uygula
-    if style_func and apply_style:
-        styled_df = style_func(display_df.copy())
+    # Stil fonksiyonu varsa yalnızca görünen sayfaya uygula (önbellekli, hücre sınırlı)
+    styled_df = None
+    if style_func:
+        styled_df, style_ms, from_cache = style_page(style_func, page_df, display_df, page)
+        if styled_df is None:
+            st.caption(
+                f"🎨 Sayfa {page_df.size:,} hücre içeriyor; stil sınırı ({STYLE_MAX_CELLS:,}) "
+                "aşıldığı için tablo stilsiz gösteriliyor."
+            )
+        else:
+            st.caption(f"🎨 Stil süresi: {style_ms:.0f} ms{' (önbellek)' if from_cache else ''}")
+    if styled_df is not None:
         st.data_editor(
             styled_df,
             column_config=column_config,
@@ -158,8 +410,8 @@ def show_filtered_data(
     # Excel çıktısı oluştur - Paralel işleme
     excel_buffer = BytesIO()
     try:
-        with pd.ExcelWriter(excel_buffer, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False)
+        with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
+            write_excel_sheet(writer, df, "Sheet1", formats)
 
         st.download_button(
             label="⬇ İndir (Excel)",
@@ -185,7 +437,8 @@ def show_grouped_summary(
     title: Optional[str] = None, 
     style_func: Optional[Callable] = None,
     sticky_column: Optional[Union[str, int]] = None,
-    page_size: int = 301
+    page_size: int = 301,
+    cache_key: Optional[Hashable] = None,
 ) -> Optional[BytesIO]:
     """
     Gruplandırılmış veri özetini gösterir ve Excel çıktısı verir.
@@ -205,6 +458,7 @@ def show_grouped_summary(
         style_func (Callable, optional): Uygulanacak stil fonksiyonu
         sticky_column (Union[str, int], optional): Sabit kalacak sütun
         page_size (int): Sayfa başına satır sayısı
+        cache_key (Hashable, optional): df'nin satırlarını belirleyen filtre parmak izi
         
     Returns:
         Optional[BytesIO]: Excel dosyası buffer'ı veya None
@@ -226,26 +480,21 @@ def show_grouped_summary(
         ...     filename="ozet.xlsx"
         ... )
     """
-    # Gerçekten var olan kolonları filtrele
-    existing_columns = [col for col in target_columns if col in df.columns]
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    grouped_df = load_grouped_summary(df, group_column, target_columns, cache_key=cache_key)
 
-    if group_column in df.columns and existing_columns:
+    if grouped_df is not None:
         if title:
             st.markdown(title)
 
-        # Tüm sayısal sütunları topla
-        numeric_columns = [col for col in existing_columns if pd.api.types.is_numeric_dtype(df[col])]
-        grouped_df = df.groupby(group_column)[numeric_columns].sum().reset_index()
-        
-        # Save grouped DataFrame to session state
-        st.session_state[filename.replace(".xlsx", "")] = grouped_df.copy()
-        
         return show_filtered_data(
             grouped_df, 
             filename=filename, 
             style_func=style_func,
             sticky_column=sticky_column,
-            page_size=page_size
+            page_size=page_size,
+            cache_key=("grouped_summary", cache_key, group_column, tuple(target_columns)),
         )
     else:
         display_friendly_error(
@@ -260,22 +509,21 @@ def calculate_group_totals(
     df: pd.DataFrame, 
     group_column: str, 
     selected_months: List[str], 
-    metrics: List[str]
+    metrics: List[str],
+    cache_key: Optional[Hashable] = None,
 ) -> pd.DataFrame:
     """
-    Grup toplamlarını hesaplar.
+    Grup toplamlarını önbellekten veya load_group_totals ile hesaplar.
     
-    Bu fonksiyon:
-    1. Veriyi belirtilen sütuna göre gruplar
-    2. Seçili aylar için metrikleri hesaplar
-    3. Toplamları hesaplar
-    4. Sonuçları DataFrame olarak döndürür
+    Toplanacak sütun yoksa veya hesaplama hata verirse kullanıcıya mesaj
+    gösterilir; hesaplamanın kendisi compute_group_totals'tadır.
     
     Parameters:
         df (DataFrame): İşlenecek veri çerçevesi
         group_column (str): Gruplama yapılacak sütun
         selected_months (List[str]): İşlenecek aylar
         metrics (List[str]): Hesaplanacak metrikler
+        cache_key (Hashable, optional): Filtre parmak izi
         
     Returns:
         DataFrame: Hesaplanmış toplamlar
@@ -296,15 +544,7 @@ def calculate_group_totals(
         ...     metrics=["Bütçe"]
         ... )
     """
-    # Toplanacak sütunları belirle
-    columns_to_sum = []
-    for month in selected_months:
-        for metric in metrics:
-            col_name = f"{month} {metric}"
-            if col_name in df.columns:
-                columns_to_sum.append(col_name)
-
-    if not columns_to_sum:
+    if not group_total_columns(df, selected_months, metrics):
         display_friendly_error(
             "Toplanacak sütun bulunamadı",
             "Lütfen ay ve metrik seçimlerinizi kontrol edin."
@@ -313,34 +553,7 @@ def calculate_group_totals(
 
     # Gruplandırılmış toplamları hesapla
     try:
-        grouped_totals = df.groupby(group_column)[columns_to_sum].sum()
-
-        # Özel metrikler için sütun eşleştirme
-        metric_column_mapping = {
-            "BE Bakiye": "Kümüle BE Bakiye",
-            "BE-Fiili Fark Bakiye": "Kümüle BE-Fiili Fark Bakiye"
-        }
-
-        # Her metrik için toplam sütun oluştur
-        for metric in metrics:
-            # Özel metrik kontrolü
-            if metric in metric_column_mapping:
-                kumule_col = metric_column_mapping[metric]
-                if kumule_col in df.columns and kumule_col not in grouped_totals.columns:
-                    kumule_data = df.groupby(group_column)[kumule_col].sum()
-                    grouped_totals[f"Toplam {metric}"] = kumule_data
-                    continue
-
-            # Normal metrik hesaplama
-            metric_cols = [
-                col for col in columns_to_sum
-                if col.split(" ", 1)[-1] == metric
-            ]
-
-            if metric_cols:
-                grouped_totals[f"Toplam {metric}"] = grouped_totals[metric_cols].sum(axis=1)
-
-        return grouped_totals[[f"Toplam {metric}" for metric in metrics if f"Toplam {metric}" in grouped_totals.columns]]
+        return load_group_totals(df, group_column, selected_months, metrics, cache_key=cache_key)
     except Exception as e:
         display_friendly_error(
             f"Grup toplamları hesaplanırken hata oluştu: {str(e)}",
@@ -353,7 +566,8 @@ def calculate_group_totals(
 def show_column_totals(
     df: pd.DataFrame, 
     filename: str = "sutun_toplamlari.xlsx", 
-    title: Optional[str] = None
+    title: Optional[str] = None,
+    cache_key: Optional[Hashable] = None,
 ) -> BytesIO:
     """
     Sütun toplamlarını gösterir ve Excel çıktısı verir.
@@ -367,6 +581,8 @@ def show_column_totals(
         df (DataFrame): İşlenecek veri çerçevesi
         filename (str): İndirme için dosya adı
         title (str, optional): Görüntüleme başlığı
+        cache_key (Hashable, optional): df'nin satırlarını belirleyen filtre parmak izi;
+            verilmezse içerik parmak izi kullanılır
         
     Returns:
         BytesIO: Excel dosyası buffer'ı
@@ -386,34 +602,19 @@ def show_column_totals(
         ...     filename="toplamlar.xlsx"
         ... )
     """
-    from config.constants import GENERAL_COLUMNS
-    
-    # Sayısal sütunları filtreleme
-    numeric_columns = [
-        col for col in df.columns
-        if col not in GENERAL_COLUMNS and pd.api.types.is_numeric_dtype(df[col])
-    ]
-    
-    if not numeric_columns:
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    totals_df = load_column_totals(df, cache_key=cache_key)
+    if "Bilgi" in totals_df.columns:
         display_friendly_error(
             "Sayısal sütun bulunamadı",
             "Veri formatını kontrol edin."
         )
-        # Boş bir DataFrame oluştur
-        totals_df = pd.DataFrame({"Bilgi": ["Sayısal sütun bulunamadı"]})
-    else:
-        totals_df = pd.DataFrame(df[numeric_columns].sum()).T
-        totals_df.index = ["Toplam"]
-        
-        # Toplamları TL formatında göster
-        totals_df = format_currency_columns(totals_df, GENERAL_COLUMNS)
-
-    # Save totals DataFrame to session state
-    st.session_state[filename.replace(".xlsx", "")] = totals_df.copy()
 
     return show_filtered_data(
         totals_df,
         filename=filename,
-        title=title or "**Sayısal Sütunların Toplamları**"
+        title=title or "**Sayısal Sütunların Toplamları**",
+        cache_key=("column_totals", cache_key, tuple(df.columns)),
     )
 
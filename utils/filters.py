@@ -7,6 +7,9 @@ seçilen filtre kriterlerinin uygulanmasını sağlar.
 Fonksiyonlar:
     - apply_filters: Streamlit arayüzünde seçilen filtre kriterlerine göre veriyi filtreler
     - clear_filters: Tüm filtreleri temizler
+    - apply_filter_selections: Sütun -> değerler seçimlerini arayüzden bağımsız uygular
+    - apply_saved_filters: Kayıtlı filtre seçimlerini başka bir veri çerçevesine uygular
+    - saved_filter_selections: Kayıtlı filtre seçimlerini döndürür
 
 Özellikler:
     - Dinamik filtreleme
@@ -121,4 +124,62 @@ def apply_filters(df, columns, key_prefix):
 
 
 
-    return filtered_df
\ No newline at end of file
+    return filtered_df
+
+
+def apply_filter_selections(df, selections):
+    """
+    Sütun -> seçilen değerler eşlemesini veri çerçevesine uygular.
+
+    Streamlit oturumuna dokunmaz; komut satırı gibi arayüzsüz çağıranlar ve
+    kayıtlı filtrelerin ikincil veri çerçevelerine uygulanması için kullanılır.
+    Boş seçimler ve veride bulunmayan sütunlar yok sayılır.
+
+    Parameters:
+        df (DataFrame): Filtrelenecek veri çerçevesi
+        selections (dict): Sütun adı -> seçilen değerler
+
+    Returns:
+        DataFrame: Filtrelenmiş veri çerçevesi
+    """
+    mask = None
+    for col, selected in selections.items():
+        if not selected or col not in df.columns:
+            continue
+        col_mask = df[col].isin(list(selected))
+        mask = col_mask if mask is None else mask & col_mask
+    return df if mask is None else df[mask]
+
+
+def apply_saved_filters(df, key_prefix):
+    """
+    Oturumda kayıtlı filtre seçimlerini arayüz bileşeni oluşturmadan uygular.
+
+    Önceki dönem verisi gibi ikincil veri çerçevelerini, kenar çubuğunda
+    seçilen filtrelerle aynı kapsama indirmek için kullanılır.
+
+    Parameters:
+        df (DataFrame): Filtrelenecek veri çerçevesi
+        key_prefix (str): Filtre anahtar öneki (session_state anahtarları için)
+
+    Returns:
+        DataFrame: Filtrelenmiş veri çerçevesi
+    """
+    return apply_filter_selections(df, saved_filter_selections(key_prefix))
+
+
+def saved_filter_selections(key_prefix):
+    """
+    Oturumda kayıtlı filtre seçimlerini döndürür.
+
+    Parameters:
+        key_prefix (str): Filtre anahtar öneki (session_state anahtarları için)
+
+    Returns:
+        dict: Sütun adı -> seçilen değerler
+    """
+    return {
+        key[len(key_prefix) + 1:]: list(selected)
+        for key, selected in st.session_state.items()
+        if key.startswith(f"{key_prefix}_") and selected
+    }
@@ -3,13 +3,22 @@ formatting.py - Formatlama ve sunum yardımcı fonksiyonlarını içerir.
 
 Bu modül, veri formatlamak, sayıları düzenli göstermek ve
 tekrar eden formatlama kodlarını merkezileştirmek için kullanılır.
+
+Tablolar hesaplama ve önbellekleme boyunca sayısal kalır; para birimi ve
+yüzde gösterimi sütun bazlı format bilgisi (`df.attrs["column_formats"]`)
+olarak taşınır ve yalnızca ekrana basılırken (`render_table`) ya da Excel'e
+yazılırken (`write_excel_sheet`) uygulanır.
 """
 
-from typing import Union, Optional
+from typing import Union, Optional, Dict, Iterable
 import pandas as pd
 import numpy as np
 from pandas.io.formats.style import Styler
 
+# Vektörel formatlamada binlik gruplar için hazır metin tabloları
+_GROUPS = np.array([str(i) for i in range(1000)])
+_PADDED_GROUPS = np.array([f"{i:03d}" for i in range(1000)])
+
 
 def format_currency(value: Union[int, float], decimal_places: int = 0) -> str:
     """
@@ -120,23 +129,270 @@ def round_significant(value: Union[int, float], digits: int = 2) -> float:
     return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
 
 
-def format_currency_columns(df: pd.DataFrame, general_columns: list) -> pd.DataFrame:
+def format_number_array(values: Union[np.ndarray, pd.Series, pd.DataFrame],
+                        decimal_places: int = 0,
+                        thousands: str = ",",
+                        suffix: str = "") -> np.ndarray:
+    """
+    Sayısal bir bloğu tek geçişte metne dönüştürür.
+    
+    Hücre hücre Python formatlaması yapmak yerine tüm blok NumPy string
+    ufunc'ları ile formatlanır; binlik gruplar tamsayı bölmesiyle ayrılır.
+    Varsayılan ayarlarla sonuç `f"{value:,.{decimal_places}f}{suffix}"` ile
+    birebir aynıdır: ölçeklenmiş değeri yarıma çok yakın düşen (ikili
+    gösterimdeki çarpma hatasının yuvarlamayı değiştirebileceği) değerler
+    Python'un tam yuvarlamasıyla formatlanır. NaN değerler olduğu gibi bırakılır.
+    
+    Parameters:
+        values (Union[ndarray, Series, DataFrame]): Formatlanacak sayısal değerler
+        decimal_places (int): Ondalık basamak sayısı
+        thousands (str): Binlik ayırıcı (Türkçe yazım için "."; bu durumda
+            ondalık ayırıcı "," olur, "" verilirse gruplama yapılmaz)
+        suffix (str): Her değerin sonuna eklenecek metin (ör. " ₺")
+        
+    Returns:
+        ndarray: Girdi ile aynı şekilde, object tipinde formatlanmış dizi
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    shape = arr.shape
+    flat = arr.ravel()
+    result = np.empty(flat.shape, dtype=object)
+    result[:] = np.nan
+
+    scale = 10 ** decimal_places
+    # Türkçe yazımda (binlik ".") ondalık ayırıcı virgüldür
+    decimal_sep = "," if thousands == "." else "."
+    finite = np.isfinite(flat)
+    # int64 taşmasını önlemek için çok büyük değerler klasik yoldan formatlanır
+    fast = finite & (np.abs(flat) < 1e15 / scale)
+    if decimal_places > 0:
+        # abs(v) * 10^N çarpımı yuvarlanmış olduğundan, kesirli kısmı 0.5'e çarpma hatası
+        # mertebesinde yakın olan değerlerde np.rint Python'dan farklı yuvarlayabilir
+        product = np.abs(np.where(fast, flat, 0.0)) * scale
+        near_half = np.abs(product - np.floor(product) - 0.5) <= product * 1e-15 + 1e-12
+        fast &= ~near_half
+
+    if fast.any():
+        scaled = np.rint(np.abs(flat[fast]) * scale).astype(np.int64)
+        negative = np.signbit(flat[fast])
+        integer_part = scaled // scale
+
+        # Her değer için binlik grup sayısı (1 + 10^3, 10^6, ... eşiklerinin aşılma sayısı)
+        group_count = np.ones(integer_part.shape, dtype=np.int64)
+        for power in range(3, 16, 3):
+            group_count += integer_part >= 10 ** power
+
+        # Grupları en anlamlı gruptan başlayarak hazır tablolardan birleştir
+        padded_groups = np.strings.add(thousands, _PADDED_GROUPS)
+        text = np.full(integer_part.shape, "", dtype="<U1")
+        for k in range(int(group_count.max()) - 1, -1, -1):
+            group = (integer_part // 1000 ** k) % 1000
+            piece = np.where(
+                k == group_count - 1,
+                _GROUPS[group],
+                np.where(k < group_count - 1, padded_groups[group], ""),
+            )
+            text = np.strings.add(text, piece)
+
+        if decimal_places > 0:
+            fraction = scaled % scale
+            if scale <= 10000:
+                fraction_text = np.array([f"{i:0{decimal_places}d}" for i in range(scale)])[fraction]
+            else:
+                fraction_text = np.strings.zfill(fraction.astype(str), decimal_places)
+            text = np.strings.add(np.strings.add(text, decimal_sep), fraction_text)
+
+        text = np.where(negative, np.strings.add("-", text), text)
+        result[fast] = np.strings.add(text, suffix)
+
+    slow = ~np.isnan(flat) & ~fast
+    for idx in np.flatnonzero(slow):
+        formatted = f"{flat[idx]:,.{decimal_places}f}"
+        result[idx] = formatted.translate(str.maketrans({",": thousands, ".": decimal_sep})) + suffix
+
+    return result.reshape(shape)
+
+
+def format_currency_array(values: Union[np.ndarray, pd.Series, pd.DataFrame],
+                          decimal_places: int = 0,
+                          thousands: str = ",") -> np.ndarray:
+    """
+    Sayısal bir bloğu tek geçişte para birimi metnine dönüştürür.
+    
+    Sonuç `format_currency` ile birebir aynı metni üretir.
+    
+    Parameters:
+        values (Union[ndarray, Series, DataFrame]): Formatlanacak sayısal değerler
+        decimal_places (int): Ondalık basamak sayısı
+        thousands (str): Binlik ayırıcı
+        
+    Returns:
+        ndarray: Formatlanmış object dizisi
+    """
+    return format_number_array(values, decimal_places, thousands, suffix=" ₺")
+
+
+def format_currency_columns(df: pd.DataFrame, general_columns: list,
+                            decimal_places: int = 0, thousands: str = ",") -> pd.DataFrame:
     """
     GENERAL_COLUMNS dışındaki tüm sayısal sütunları TL formatında gösterir.
     
+    Girdi DataFrame değiştirilmez; sayısal sütunlar tek bir blok halinde
+    `format_currency_array` ile formatlanıp yeni bir DataFrame döndürülür.
+    
     Parameters:
         df (DataFrame): Formatlanacak DataFrame
         general_columns (list): Formatlanmayacak sütunların listesi
+        decimal_places (int): Ondalık basamak sayısı
+        thousands (str): Binlik ayırıcı (bkz. `format_number_array`)
         
     Returns:
         DataFrame: Formatlanmış DataFrame
     """
-    # Sayısal sütunları bul
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    # GENERAL_COLUMNS dışındaki sayısal sütunları bul
+    numeric_cols = [
+        col for col in df.select_dtypes(include=[np.number]).columns
+        if col not in general_columns
+    ]
+    if not numeric_cols:
+        return df.copy()
+
+    # Tüm sayısal bloğu tek seferde formatla
+    formatted = format_currency_array(
+        df[numeric_cols].to_numpy(dtype=np.float64), decimal_places, thousands
+    )
+
+    result = df.copy()
+    result[numeric_cols] = pd.DataFrame(formatted, index=df.index, columns=numeric_cols)
+    return result
+
+
+# Sütun format türleri: ekran gösterimi ve Excel sayı formatı
+COLUMN_FORMATS = {
+    "currency": {"decimal_places": 0, "thousands": ",", "suffix": " ₺", "excel": '#,##0 "₺"'},
+    "percent": {"decimal_places": 2, "thousands": "", "suffix": " %", "excel": '0.00 "%"'},
+}
+
+
+def infer_column_formats(df: pd.DataFrame, general_columns: list,
+                         percent_columns: Iterable[str] = ()) -> Dict[str, str]:
+    """
+    Sütunlar için format türlerini belirler.
     
-    # GENERAL_COLUMNS dışındaki sayısal sütunları formatla
-    for col in numeric_cols:
-        if col not in general_columns:
-            df[col] = df[col].apply(lambda x: format_currency(x) if pd.notnull(x) else x)
+    GENERAL_COLUMNS dışındaki sayısal sütunlar para birimi, `percent_columns`
+    içindekiler yüzde olarak işaretlenir.
     
-    return df 
\ No newline at end of file
+    Parameters:
+        df (DataFrame): Format bilgisi çıkarılacak DataFrame
+        general_columns (list): Formatlanmayacak sütunların listesi
+        percent_columns (Iterable[str]): Yüzde olarak gösterilecek sütunlar
+        
+    Returns:
+        Dict[str, str]: Sütun adı -> format türü eşlemesi
+    """
+    percent_columns = set(percent_columns)
+    formats = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        if col in percent_columns:
+            formats[col] = "percent"
+        elif col not in general_columns:
+            formats[col] = "currency"
+    return formats
+
+
+def set_column_formats(df: pd.DataFrame, formats: Dict[str, str]) -> pd.DataFrame:
+    """
+    Format bilgisini DataFrame'in üstverisine (attrs) yazar ve DataFrame'i döndürür.
+    
+    Parameters:
+        df (DataFrame): Format bilgisi eklenecek DataFrame
+        formats (Dict[str, str]): Sütun adı -> format türü eşlemesi
+        
+    Returns:
+        DataFrame: Aynı DataFrame
+    """
+    df.attrs["column_formats"] = dict(formats)
+    return df
+
+
+def get_column_formats(df: pd.DataFrame, general_columns: list) -> Dict[str, str]:
+    """
+    DataFrame'e ait format bilgisini döndürür.
+    
+    Üstveride format yoksa `infer_column_formats` ile çıkarılır.
+    
+    Parameters:
+        df (DataFrame): Format bilgisi okunacak DataFrame
+        general_columns (list): Formatlanmayacak sütunların listesi
+        
+    Returns:
+        Dict[str, str]: Sütun adı -> format türü eşlemesi
+    """
+    formats = df.attrs.get("column_formats")
+    if formats is None:
+        return infer_column_formats(df, general_columns)
+    return {col: kind for col, kind in formats.items() if col in df.columns}
+
+
+def render_table(df: pd.DataFrame, formats: Dict[str, str]) -> pd.DataFrame:
+    """
+    Sayısal DataFrame'in gösterim kopyasını üretir.
+    
+    Aynı format türündeki sütunlar tek blok halinde `format_number_array`
+    ile formatlanır. Girdi DataFrame değiştirilmez.
+    
+    Parameters:
+        df (DataFrame): Gösterilecek sayısal DataFrame
+        formats (Dict[str, str]): Sütun adı -> format türü eşlemesi
+        
+    Returns:
+        DataFrame: Metin olarak formatlanmış gösterim kopyası
+    """
+    result = df.copy()
+    for kind, options in COLUMN_FORMATS.items():
+        columns = [
+            col for col, col_kind in formats.items()
+            if col_kind == kind and col in df.columns and pd.api.types.is_numeric_dtype(df[col])
+        ]
+        if not columns:
+            continue
+        formatted = format_number_array(
+            df[columns].to_numpy(dtype=np.float64),
+            options["decimal_places"],
+            options["thousands"],
+            options["suffix"],
+        )
+        result[columns] = pd.DataFrame(formatted, index=df.index, columns=columns)
+    return result
+
+
+def write_excel_sheet(writer: pd.ExcelWriter, df: pd.DataFrame, sheet_name: str,
+                      formats: Optional[Dict[str, str]] = None, index: bool = False) -> None:
+    """
+    DataFrame'i sayısal değerleriyle Excel sayfasına yazar ve sütun formatlarını uygular.
+    
+    Formatlar xlsxwriter motorunda sütun düzeyinde tanımlanır; hücreler tek
+    tek dolaşılmaz. Diğer motorlarda değerler formatsız yazılır.
+    
+    Parameters:
+        writer (ExcelWriter): Hedef Excel yazıcısı
+        df (DataFrame): Yazılacak DataFrame
+        sheet_name (str): Sayfa adı
+        formats (Dict[str, str], optional): Sütun adı -> format türü eşlemesi
+        index (bool): İndeksin yazılıp yazılmayacağı
+    """
+    df.to_excel(writer, sheet_name=sheet_name, index=index)
+    if not formats or writer.engine != "xlsxwriter":
+        return
+
+    workbook = writer.book
+    worksheet = writer.sheets[sheet_name]
+    offset = df.index.nlevels if index else 0
+    cell_formats = {
+        kind: workbook.add_format({"num_format": options["excel"]})
+        for kind, options in COLUMN_FORMATS.items()
+    }
+    for position, col in enumerate(df.columns):
+        kind = formats.get(col)
+        if kind in cell_formats:
+            worksheet.set_column(position + offset, position + offset, 16, cell_formats[kind])
@@ -1,132 +1,367 @@
 """
 insight_generator.py - Veri analizine dayalı öngörü oluşturma işlemlerini yönetir.
 
-Bu modül, finansal verileri analiz ederek anlamlı öngörüler 
+Bu modül, finansal verileri analiz ederek anlamlı öngörüler
 (insights) oluşturan fonksiyonlar içerir.
 
+Öngörüler bir kural kayıt defterinden (INSIGHT_RULES) üretilir. Her kural
+ihtiyaç duyduğu ortak toplamları ve kendi süre bütçesini bildirir. Motor,
+etkin kuralların gerektirdiği toplamları bir kez hesaplar, kuralları bu
+toplamlar üzerinde çalıştırır ve her kuralın süresini raporlar. Bütçesini
+aşan kuralın çıktısı gösterilmez ve kural aynı veri için sonraki
+INSIGHT_RULE_SKIP_RUNS çalıştırmada atlanır, ardından yeniden denenir; hata
+veren kurallar loglanır. Bütçe nedeniyle eksik kalan öngörü listeleri
+önbelleğe alınmaz.
+
 Fonksiyonlar:
     - generate_insights: Finansal verilerden anlamlı öngörüler üretir
-    - analyze_spending_patterns: Harcama kalıplarını analiz eder
-    - identify_anomalies: Anomali tespiti yapar
+    - insight_rule: Öngörü kuralını kayıt defterine ekleyen dekoratör
+    - compute_aggregates: İstenen ortak toplamları hesaplar
+    - run_insight_rules: Kuralları çalıştırır, öngörüleri ve süreleri döndürür
+    - anomaly_insights: Anomali bulgularını özetler
+    - reset_rule_budgets: Bütçe aşımı nedeniyle atlanan kuralları yeniden etkinleştirir
+
+Sınıflar:
+    - InsightRule: Kayıtlı öngörü kuralı
 
 Özellikler:
     - Otomatik öngörü üretimi
     - Harcama analizi
     - Bütçe kullanım analizi
     - Anomali tespiti
+    - Kural bazında süre ölçümü ve bütçe kontrolü
     - Hata yönetimi
 
 Kullanım:
     from utils.insight_generator import generate_insights
-    
-    insights = generate_insights(df)
+
+    insights, timings = generate_insights(df)
     for insight in insights:
         print(insight)
 """
 
+import threading
+import time
 import pandas as pd
-from typing import List
-from utils.error_handler import handle_error
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+from config.constants import INSIGHT_CACHE_ENTRIES, INSIGHT_RULE_BUDGET_MS, INSIGHT_RULE_SKIP_RUNS
+from utils.cache import DATA_FINGERPRINT_ATTR, ResultCache, dataframe_fingerprint
+from utils.error_handler import handle_error, log_error
 
 
-@handle_error
-def generate_insights(df: pd.DataFrame) -> List[str]:
+# Ortak toplamlar: ad -> (gruplama sütunu, toplanan sütunlar)
+INSIGHT_AGGREGATES = {
+    "masraf_yeri": ("Masraf Yeri Adı", ["Kümüle Bütçe", "Kümüle Fiili"]),
+    "masraf_grubu": ("Masraf Çeşidi Grubu 1", ["Kümüle Fiili"]),
+}
+
+# Kural süre tablosunun sütunları
+TIMING_COLUMNS = ["Kural", "Durum", "Süre (ms)", "Bütçe (ms)"]
+
+# Kuralın bütçe nedeniyle öngörü üretmediği durumlar
+STATUS_OVER_BUDGET = "bütçe aşıldı"
+STATUS_SKIPPED = "atlandı (bütçe aşımı)"
+BUDGET_STATUSES = [STATUS_OVER_BUDGET, STATUS_SKIPPED]
+
+
+class InsightRule(NamedTuple):
     """
-    Finansal verilerden anlamlı öngörüler üretir.
-    
+    Kayıtlı öngörü kuralı.
+
+    Attributes:
+        name (str): Kural adı
+        requires (Dict[str, List[str]]): Toplam adı -> kuralın o toplamda
+            ihtiyaç duyduğu sütunlar
+        func (Callable): Toplamlar sözlüğünü alıp öngörü metinleri döndüren fonksiyon
+        budget_ms (float): Kuralın süre bütçesi (ms)
+    """
+
+    name: str
+    requires: Dict[str, List[str]]
+    func: Callable[[Dict[str, pd.DataFrame]], List[str]]
+    budget_ms: float
+
+
+INSIGHT_RULES: Dict[str, InsightRule] = {}
+
+# Bütçesini aşmış kurallar: (veri parmak izi, kural adı) -> kalan atlanacak çalıştırma sayısı.
+# Her veri kendi kaydını tutar; oturumlar birbirinin kayıtlarını silmez, eski kayıtlar LRU ile düşer
+_over_budget = ResultCache(INSIGHT_CACHE_ENTRIES)
+_over_budget_lock = threading.Lock()
+
+_insight_cache = ResultCache(INSIGHT_CACHE_ENTRIES)
+
+
+def insight_rule(
+    name: str,
+    requires: Dict[str, List[str]],
+    budget_ms: float = INSIGHT_RULE_BUDGET_MS,
+) -> Callable:
+    """
+    Öngörü kuralını kayıt defterine ekleyen dekoratör.
+
+    Parameters:
+        name (str): Kural adı
+        requires (Dict[str, List[str]]): Toplam adı -> gerekli sütunlar
+        budget_ms (float): Süre bütçesi (ms)
+
+    Returns:
+        Callable: Fonksiyonu değiştirmeden döndüren dekoratör
+    """
+    def decorator(func: Callable) -> Callable:
+        INSIGHT_RULES[name] = InsightRule(name, requires, func, budget_ms)
+        return func
+    return decorator
+
+
+def reset_rule_budgets() -> None:
+    """Bütçe aşımı nedeniyle atlanan kuralları yeniden etkinleştirir ve öngörü önbelleğini boşaltır."""
+    with _over_budget_lock:
+        _over_budget.clear()
+    _insight_cache.clear()
+
+
+def _skipped_rules(names: List[str], dataset_key: Optional[Hashable]) -> set:
+    """
+    Bu çalıştırmada atlanacak kuralları döndürür.
+
+    Atlama yalnızca kuralın bütçesini aştığı veri için geçerlidir; her atlama
+    kalan sayacı bir azaltır. Sayaç bitince kural yeniden çalıştırılır.
+    """
+    skipped = set()
+    with _over_budget_lock:
+        for name in names:
+            remaining = _over_budget.get((dataset_key, name), 0)
+            if remaining > 0:
+                _over_budget.set((dataset_key, name), remaining - 1)
+                skipped.add(name)
+    return skipped
+
+
+def compute_aggregates(df: pd.DataFrame, names: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    İstenen ortak toplamları her biri tek groupby olacak şekilde hesaplar.
+
+    NaN değerler toplamda sıfır sayılır; veri çerçevesi kopyalanmaz.
+
+    Parameters:
+        df (DataFrame): Analiz edilecek veri çerçevesi
+        names (List[str]): INSIGHT_AGGREGATES içindeki toplam adları
+
+    Returns:
+        Dict[str, DataFrame]: Toplam adı -> (grup indeksli) toplam tablosu;
+            gruplama sütunu veya tüm değer sütunları eksik olanlar dahil
+            edilmez. Gruplar verideki ilk görülme sırasındadır.
+    """
+    aggregates = {}
+    for name in names:
+        dimension, value_cols = INSIGHT_AGGREGATES[name]
+        columns = [col for col in value_cols if col in df.columns]
+        if dimension not in df.columns or not columns:
+            continue
+        aggregates[name] = df.groupby(dimension, sort=False)[columns].sum()
+    return aggregates
+
+
+def _rule_applicable(rule: InsightRule, aggregates: Dict[str, pd.DataFrame]) -> bool:
+    """Kuralın ihtiyaç duyduğu toplamlar ve sütunlar mevcut mu?"""
+    return all(
+        name in aggregates and all(col in aggregates[name].columns for col in columns)
+        for name, columns in rule.requires.items()
+    )
+
+
+def run_insight_rules(
+    df: pd.DataFrame,
+    rules: Optional[Dict[str, InsightRule]] = None,
+    skip_runs: int = INSIGHT_RULE_SKIP_RUNS,
+) -> Tuple[List[str], pd.DataFrame]:
+    """
+    Öngörü kurallarını ortak toplamlar üzerinde çalıştırır.
+
     Bu fonksiyon:
-    1. En fazla harcama yapan masraf yerini tespit eder
-    2. Bütçeyi aşan masraf yerlerini belirler
-    3. Hiç harcama yapılmayan yerleri tespit eder
-    4. En az harcama yapan aktif yerleri belirler
-    5. Bütçe kullanım oranlarını analiz eder
-    6. En çok harcama yapılan masraf grubunu tespit eder
-    
+    1. Etkin kuralların gerektirdiği toplamları belirleyip bir kez hesaplar
+    2. Her kuralı çalıştırır ve süresini ölçer
+    3. Bütçesini aşan kuralın çıktısını atar ve kuralı yüklenen veri için işaretler;
+       kural aynı veride sonraki skip_runs çalıştırmada atlanır, ardından yeniden denenir
+    4. Hata veren kuralı loglar ve diğer kurallara devam eder
+
     Parameters:
         df (DataFrame): Analiz edilecek veri çerçevesi
-        
+        rules (Dict[str, InsightRule], optional): Çalıştırılacak kurallar
+            (varsayılan: INSIGHT_RULES)
+        skip_runs (int): Bütçesini aşan kuralın atlanacağı çalıştırma sayısı
+
     Returns:
-        List[str]: Öngörü metinleri listesi
+        Tuple[List[str], DataFrame]: (öngörü metinleri, Kural/Durum/Süre (ms)/Bütçe (ms)
+            sütunlu süre tablosu; ilk satır ortak toplamların süresidir)
     """
+    rules = INSIGHT_RULES if rules is None else rules
+    # Filtrelenmiş kopyalar yüklenen dosyanın parmak izini taşır
+    dataset_key = df.attrs.get(DATA_FINGERPRINT_ATTR)
+    skipped = _skipped_rules(list(rules), dataset_key)
+    active = [rule for rule in rules.values() if rule.name not in skipped]
+
+    start = time.perf_counter()
+    required = sorted({name for rule in active for name in rule.requires})
+    aggregates = compute_aggregates(df, required)
+    timings = [("Ortak toplamlar", "tamam", (time.perf_counter() - start) * 1000, None)]
+
     insights = []
-    
-    # Veri çerçevesini optimize et
-    df = df.copy()
-    numeric_cols = df.select_dtypes(include=['number']).columns
-    df[numeric_cols] = df[numeric_cols].fillna(0)
-    
-    # Gerekli sütunları kontrol et
-    required_cols = {
-        'masraf_yeri': ['Masraf Yeri Adı', 'Kümüle Fiili'],
-        'butce': ['Masraf Yeri Adı', 'Kümüle Bütçe', 'Kümüle Fiili'],
-        'masraf_grubu': ['Masraf Çeşidi Grubu 1', 'Kümüle Fiili']
-    }
-    
-    # En fazla harcama yapan masraf yeri
-    if all(col in df.columns for col in required_cols['masraf_yeri']):
-        try:
-            masraf_sums = df.groupby("Masraf Yeri Adı")["Kümüle Fiili"].sum()
-            if not masraf_sums.empty:
-                top_yer = masraf_sums.idxmax()
-                top_val = masraf_sums.max()
-                insights.append(f"📌 En fazla harcama yapan masraf yeri: **{top_yer}** ({top_val:,.0f} ₺)")
-        except Exception:
-            pass
-
-    # Bütçe analizleri
-    if all(col in df.columns for col in required_cols['butce']):
-        try:
-            # Bütçeyi aşan masraf yerleri
-            df['Fark'] = df['Kümüle Bütçe'] - df['Kümüle Fiili']
-            sapmalar = df.groupby("Masraf Yeri Adı")['Fark'].sum()
-            if not sapmalar.empty:
-                en_cok_asan = sapmalar[sapmalar < 0]
-                if not en_cok_asan.empty:
-                    top_asan = en_cok_asan.idxmin()
-                    top_fark = en_cok_asan.min()
-                    insights.append(f"⚠️ Bütçeyi en fazla aşan masraf yeri: **{top_asan}** ({top_fark:,.0f} ₺ fark)")
-
-            # DataFrame'i parçalanmayı önlemek için kopyala
-            df = df.copy()
-            
-            # Kullanım oranını bir kez hesapla
-            df['Kullanım Oranı'] = df['Kümüle Fiili'] / df['Kümüle Bütçe'].replace(0, pd.NA)
-            
-            # Hiç harcama yapılmayan yerleri bul
-            en_az_kullanan = df[df['Kümüle Fiili'] == 0]['Masraf Yeri Adı'].dropna().unique()
-            if len(en_az_kullanan) > 0:
-                yerler_str = ", ".join(en_az_kullanan[:5])
-                insights.append(f"❗ Hiç harcama yapılmayan masraf yerleri: {yerler_str}")
-
-            # En az harcama yapan aktif yerleri bul
-            active = df[df['Kümüle Fiili'] > 0]
-            if not active.empty:
-                min_row = active.groupby("Masraf Yeri Adı")['Kümüle Fiili'].sum().nsmallest(1)
-                if not min_row.empty:
-                    insights.append(f"🔍 En az harcama yapan (aktif) masraf yeri: **{min_row.index[0]}** ({min_row.iloc[0]:,.0f} ₺)")
-
-            # Bütçesinin yarısından azını kullanan yerleri bul
-            az_kullananlar = df[df['Kullanım Oranı'] < 0.5]['Masraf Yeri Adı'].dropna().unique()
-            if len(az_kullananlar) > 0:
-                insights.append(f"🧊 Bütçesinin yarısından azını kullanan masraf yerleri: {', '.join(az_kullananlar[:5])}")
-
-            # En yüksek bütçe kullanım oranını bul
-            kullanim_df = df[df['Kümüle Bütçe'] > 0]
-            if not kullanim_df.empty:
-                max_row = kullanim_df.loc[kullanim_df['Kullanım Oranı'].idxmax()]
-                oran = max_row['Kullanım Oranı'] * 100
-                insights.append(f"🔥 En yüksek bütçe kullanım oranı: **{max_row['Masraf Yeri Adı']}** (%{oran:.1f})")
-
-        except Exception:
-            pass
-
-    # En çok harcama yapılan masraf grubu
-    if all(col in df.columns for col in required_cols['masraf_grubu']):
+    for rule in rules.values():
+        if rule.name in skipped:
+            timings.append((rule.name, STATUS_SKIPPED, None, rule.budget_ms))
+            continue
+        if not _rule_applicable(rule, aggregates):
+            timings.append((rule.name, "veri yok", None, rule.budget_ms))
+            continue
+
+        start = time.perf_counter()
         try:
-            top_grup = df.groupby("Masraf Çeşidi Grubu 1")['Kümüle Fiili'].sum().nlargest(1)
-            if not top_grup.empty:
-                insights.append(f"🏷️ En çok harcama yapılan masraf grubu: **{top_grup.index[0]}** ({top_grup.iloc[0]:,.0f} ₺)")
-        except Exception:
-            pass
+            output = rule.func(aggregates)
+            status = "tamam"
+        except Exception as e:
+            log_error(e, f"insight_rule:{rule.name}")
+            output, status = [], "hata"
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if elapsed > rule.budget_ms:
+            # Çıktı gösterilmez: hangi öngörülerin görüneceği kuralın o anki süresine bağlı kalmaz
+            output, status = [], STATUS_OVER_BUDGET
+            with _over_budget_lock:
+                _over_budget.set((dataset_key, rule.name), skip_runs)
+        insights.extend(output)
+        timings.append((rule.name, status, elapsed, rule.budget_ms))
+
+    return insights, pd.DataFrame(timings, columns=TIMING_COLUMNS)
+
+
+# --- Kurallar ---------------------------------------------------------------
+
+@insight_rule("En fazla harcama", requires={"masraf_yeri": ["Kümüle Fiili"]})
+def _top_spender(aggregates: Dict[str, pd.DataFrame]) -> List[str]:
+    actual = aggregates["masraf_yeri"]["Kümüle Fiili"]
+    if actual.empty:
+        return []
+    return [f"📌 En fazla harcama yapan masraf yeri: **{actual.idxmax()}** ({actual.max():,.0f} ₺)"]
+
+
+@insight_rule("Bütçe aşımı", requires={"masraf_yeri": ["Kümüle Bütçe", "Kümüle Fiili"]})
+def _largest_overrun(aggregates: Dict[str, pd.DataFrame]) -> List[str]:
+    centres = aggregates["masraf_yeri"]
+    fark = centres["Kümüle Bütçe"] - centres["Kümüle Fiili"]
+    asan = fark[fark < 0]
+    if asan.empty:
+        return []
+    return [f"⚠️ Bütçeyi en fazla aşan masraf yeri: **{asan.idxmin()}** ({asan.min():,.0f} ₺ fark)"]
+
+
+@insight_rule("Harcamasız masraf yerleri", requires={"masraf_yeri": ["Kümüle Fiili"]})
+def _zero_spenders(aggregates: Dict[str, pd.DataFrame]) -> List[str]:
+    actual = aggregates["masraf_yeri"]["Kümüle Fiili"]
+    zero = actual.index[actual.to_numpy() == 0]
+    if len(zero) == 0:
+        return []
+    return [f"❗ Hiç harcama yapılmayan masraf yerleri: {', '.join(map(str, zero[:5]))}"]
+
+
+@insight_rule("En az harcama (aktif)", requires={"masraf_yeri": ["Kümüle Fiili"]})
+def _lowest_active_spender(aggregates: Dict[str, pd.DataFrame]) -> List[str]:
+    actual = aggregates["masraf_yeri"]["Kümüle Fiili"]
+    active = actual[actual > 0]
+    if active.empty:
+        return []
+    return [f"🔍 En az harcama yapan (aktif) masraf yeri: **{active.idxmin()}** ({active.min():,.0f} ₺)"]
+
+
+def _usage(centres: pd.DataFrame) -> pd.Series:
+    """Bütçesi pozitif masraf yerlerinin toplamlar üzerinden kullanım oranı."""
+    positive = centres["Kümüle Bütçe"] > 0
+    return centres.loc[positive, "Kümüle Fiili"] / centres.loc[positive, "Kümüle Bütçe"]
+
+
+@insight_rule("Düşük bütçe kullanımı", requires={"masraf_yeri": ["Kümüle Bütçe", "Kümüle Fiili"]})
+def _under_users(aggregates: Dict[str, pd.DataFrame]) -> List[str]:
+    usage = _usage(aggregates["masraf_yeri"])
+    az_kullananlar = usage.index[usage.to_numpy() < 0.5]
+    if len(az_kullananlar) == 0:
+        return []
+    return [f"🧊 Bütçesinin yarısından azını kullanan masraf yerleri: {', '.join(map(str, az_kullananlar[:5]))}"]
+
+
+@insight_rule("En yüksek kullanım oranı", requires={"masraf_yeri": ["Kümüle Bütçe", "Kümüle Fiili"]})
+def _highest_usage(aggregates: Dict[str, pd.DataFrame]) -> List[str]:
+    usage = _usage(aggregates["masraf_yeri"])
+    if usage.empty:
+        return []
+    return [f"🔥 En yüksek bütçe kullanım oranı: **{usage.idxmax()}** (%{usage.max() * 100:.1f})"]
 
-    return insights
+
+@insight_rule("En çok harcanan masraf grubu", requires={"masraf_grubu": ["Kümüle Fiili"]})
+def _top_cost_group(aggregates: Dict[str, pd.DataFrame]) -> List[str]:
+    actual = aggregates["masraf_grubu"]["Kümüle Fiili"]
+    if actual.empty:
+        return []
+    return [f"🏷️ En çok harcama yapılan masraf grubu: **{actual.idxmax()}** ({actual.max():,.0f} ₺)"]
+
+
+def anomaly_insights(anomalies: Optional[pd.DataFrame]) -> List[str]:
+    """
+    Anomali dedektörünün bulgularını tek satırlık öngörüye dönüştürür.
+
+    Parameters:
+        anomalies (DataFrame, optional): |Skor| değerine göre sıralı anomali kayıtları
+
+    Returns:
+        List[str]: Öngörü metinleri listesi
+    """
+    if anomalies is None or anomalies.empty:
+        return []
+    top = anomalies.iloc[0]
+    yon = "sıçrama" if top["Skor"] > 0 else "düşüş"
+    return [
+        f"🧪 {len(anomalies):,} istatistiksel anomali bulundu; en belirgini: "
+        f"**{top['Masraf Yeri Adı']}** - {top['Ay']} ({top['Kural']}, {yon}, z={top['Skor']:.1f})"
+    ]
+
+
+@handle_error
+def generate_insights(
+    df: pd.DataFrame,
+    anomalies: Optional[pd.DataFrame] = None,
+    cache_key: Optional[Hashable] = None,
+) -> Tuple[List[str], pd.DataFrame]:
+    """
+    Finansal verilerden anlamlı öngörüler üretir.
+
+    Bu fonksiyon:
+    1. Kayıtlı kuralların gerektirdiği ortak toplamları bir kez hesaplar
+    2. En fazla harcama yapan ve bütçeyi en çok aşan masraf yerlerini bulur
+    3. Hiç harcama yapmayan ve en az harcama yapan aktif yerleri belirler
+    4. Bütçe kullanım oranlarını masraf yeri toplamları üzerinden analiz eder
+    5. En çok harcama yapılan masraf grubunu tespit eder
+    6. Anomali dedektörünün bulgularını özetler
+
+    Kural sonuçları ve süreleri filtre parmak izi başına bir kez hesaplanır.
+    Bir kural bütçe nedeniyle atlandıysa veya çıktısı atıldıysa sonuç
+    önbelleğe alınmaz; kural yeniden denendiğinde liste tamamlanır.
+
+    Parameters:
+        df (DataFrame): Analiz edilecek veri çerçevesi
+        anomalies (DataFrame, optional): Uyarı indeksinden anomali kayıtları
+        cache_key (Hashable, optional): Filtre parmak izi; verilmezse içerik
+            parmak izi kullanılır
+
+    Returns:
+        Tuple[List[str], DataFrame]: (öngörü metinleri, kural süre tablosu)
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    key = ("insights", cache_key)
+    result = _insight_cache.get(key)
+    if result is None:
+        result = run_insight_rules(df)
+        if not result[1]["Durum"].isin(BUDGET_STATUSES).any():
+            _insight_cache.set(key, result)
+    insights, timings = result
+    return list(insights) + anomaly_insights(anomalies), timings
@@ -6,7 +6,8 @@ fonksiyonları içerir. Temel olarak bütçe, fiili harcamalar, bütçe farklar
 oranların hesaplanması ve gösterilmesi işlemlerini yönetir.
 
 Ana Fonksiyonlar:
-    - calculate_kpi_metrics: Tüm KPI metriklerini hesaplar
+    - calculate_kpi_metrics: Tüm KPI metriklerini hesaplar (Streamlit gerektirmez)
+    - load_kpi_metrics: calculate_kpi_metrics'in filtre parmak izi bazlı önbellekli sürümü
     - show_kpi_panel: Hesaplanan metrikleri görsel bir panelde gösterir
     - _display_budget_warning: Bütçe kullanım durumuna göre uyarı mesajları gösterir
 
@@ -18,29 +19,33 @@ Hesaplanan Metrikler:
     - Karşılık / Fiili Oranı
 
 Kullanım:
-    >>> from utils.kpi import show_kpi_panel
-    >>> show_kpi_panel(df)  # DataFrame'de gerekli sütunlar olmalıdır
+    >>> from utils.kpi import show_kpi_panel, calculate_kpi_metrics
+    >>> show_kpi_panel(df, selected_months)  # DataFrame'de gerekli sütunlar olmalıdır
+    >>> calculate_kpi_metrics(df, ["Ocak", "Şubat"])  # Streamlit oturumu gerektirmez
 """
 
 import streamlit as st
-from typing import Dict
+from typing import Dict, Hashable, List, Optional
+from utils.cache import ResultCache, dataframe_fingerprint
 from utils.error_handler import handle_error, display_friendly_error
-from config.constants import MONTHS
+from config.constants import MONTHS, SUMMARY_CACHE_ENTRIES
+from utils.alert_engine import match_rule
 
+_kpi_cache = ResultCache(SUMMARY_CACHE_ENTRIES)
 
-def calculate_kpi_metrics(df) -> Dict[str, float]:
+
+def calculate_kpi_metrics(df, selected_months: Optional[List[str]] = None) -> Dict[str, float]:
     """
     Tüm KPI metriklerini hesaplar ve döndürür.
     
     Parameters:
         df (DataFrame): İşlenecek veri çerçevesi
+        selected_months (List[str], optional): Hesaba katılacak aylar; verilmezse tüm aylar
         
     Returns:
         Dict[str, float]: Hesaplanan metrikler
     """
-    # Sidebar'dan seçilen ayları al
-    selected_months = st.session_state.get("month_filter", ["Hepsi"])
-    if "Hepsi" in selected_months:
+    if selected_months is None:
         selected_months = MONTHS
 
     # Seçilen ayların toplam bütçe ve fiili verilerini hesapla
@@ -80,32 +85,61 @@ def calculate_kpi_metrics(df) -> Dict[str, float]:
     }
 
 
+def load_kpi_metrics(
+    df, selected_months: Optional[List[str]] = None, cache_key: Optional[Hashable] = None
+) -> Dict[str, float]:
+    """
+    KPI metriklerini filtre parmak izi başına bir kez hesaplar.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        selected_months (List[str], optional): Hesaba katılacak aylar; verilmezse tüm aylar
+        cache_key (Hashable, optional): Filtre parmak izi; verilmezse içerik parmak izi
+
+    Returns:
+        Dict[str, float]: calculate_kpi_metrics çıktısı
+    """
+    if selected_months is None:
+        selected_months = MONTHS
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    return _kpi_cache.get_or_compute(
+        ("kpi", cache_key, tuple(selected_months)),
+        lambda: calculate_kpi_metrics(df, selected_months),
+    )
+
+
 def _display_budget_warning(usage_pct: float) -> None:
     """
     Bütçe kullanım durumuna göre uyarı gösterir.
     
+    Eşikler ve mesajlar uyarı motoruyla aynı kurallardan (ALERT_RULES) gelir.
+    
     Parameters:
         usage_pct (float): Bütçe kullanım yüzdesi
     """
-    if usage_pct > 110:
-        st.error("🚨 Bütçe %110'dan fazla aşıldı! Acil müdahale gerekebilir.")
-    elif usage_pct > 90:
-        st.warning("⚠️ Bütçeye çok yaklaşıldı (%90 üzeri).")
-    else:
+    rule = match_rule(usage_pct)
+    if rule is None:
         st.success("✅ Bütçe kullanımı güvenli seviyede.")
+    elif rule["level"] == "error":
+        st.error(rule["message"])
+    else:
+        st.warning(rule["message"])
 
 
 @handle_error
-def show_kpi_panel(df) -> None:
+def show_kpi_panel(
+    df, selected_months: Optional[List[str]] = None, cache_key: Optional[Hashable] = None
+) -> None:
     """
     KPI metriklerini gösterge panelinde gösterir.
     
     Parameters:
         df (DataFrame): İşlenecek veri çerçevesi
+        selected_months (List[str], optional): Kenar çubuğunda seçilen aylar; verilmezse tüm aylar
+        cache_key (Hashable, optional): Filtre parmak izi
     """
-    # Sidebar'dan seçilen ayları al
-    selected_months = st.session_state.get("month_filter", ["Hepsi"])
-    if "Hepsi" in selected_months:
+    if selected_months is None:
         selected_months = MONTHS
 
     # Seçilen aylar için gerekli sütunların varlığını kontrol et
@@ -124,7 +158,7 @@ def show_kpi_panel(df) -> None:
         )
         return
     
-    metrics = calculate_kpi_metrics(df)
+    metrics = load_kpi_metrics(df, selected_months, cache_key=cache_key)
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -5,8 +5,8 @@ Bu modül, Excel dosyalarının yüklenmesi, doğrulanması ve işlenmesi için
 gerekli fonksiyonları içerir.
 
 Fonksiyonlar:
-    - load_data: Excel dosyasını yükler ve veri çerçevesine dönüştürür
-    - validate_data: Veri bütünlüğünü kontrol eder
+    - read_report: ZFMR0003 Excel baytlarını okur ve doğrular (Streamlit'ten bağımsız)
+    - load_data: Yüklenen dosyayı read_report ile okur (Streamlit önbellekli)
 
 Özellikler:
     - Excel dosya formatı desteği
@@ -25,9 +25,54 @@ Kullanım:
         # Hata durumu yönetilir
 """
 
+from io import BytesIO
 import pandas as pd
 import streamlit as st
 from utils.error_handler import handle_error, display_friendly_error
+from utils.cache import DATA_FINGERPRINT_ATTR, bytes_fingerprint
+
+
+# ZFMR0003 raporunda bulunması zorunlu sütunlar
+MANDATORY_COLUMNS = ["Masraf Yeri Adı", "Kümüle Bütçe", "Kümüle Fiili"]
+
+
+def read_report(data: bytes) -> pd.DataFrame:
+    """
+    ZFMR0003 Excel baytlarını okur, temizler ve doğrular.
+
+    Bu fonksiyon:
+    1. Excel dosyasını pandas DataFrame'e dönüştürür
+    2. Sütun isimlerini temizler
+    3. Son satırı (rapor toplam satırı) siler
+    4. Zorunlu sütunları kontrol eder
+
+    Hataları kullanıcıya göstermez; arayüzde load_data, komut satırında
+    batch.py yakalayıp bildirir.
+
+    Parameters:
+        data (bytes): Excel dosyasının içeriği
+
+    Returns:
+        DataFrame: Yüklenen veri
+
+    Raises:
+        ValueError: Zorunlu sütunlar eksikse
+        Exception: Dosya Excel olarak okunamazsa pandas/openpyxl hatası
+    """
+    df = pd.read_excel(BytesIO(data), engine="openpyxl")
+    # Dosya parmak izi, filtre bazlı hesaplama önbelleklerinin anahtarına girer
+    df.attrs[DATA_FINGERPRINT_ATTR] = bytes_fingerprint(data)
+    df.columns = [str(col).strip() for col in df.columns]
+
+    # Son satırı sil
+    df = df.iloc[:-1]
+
+    # Zorunlu sütun kontrolü
+    missing_columns = [col for col in MANDATORY_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Eksik sütunlar: {', '.join(missing_columns)}")
+
+    return df
 
 
 @st.cache_data(show_spinner="Veri yükleniyor...")
@@ -36,12 +81,8 @@ def load_data(uploaded_file):
     """
     Excel dosyasını yükler ve veri çerçevesine dönüştürür.
     
-    Bu fonksiyon:
-    1. Excel dosyasını pandas DataFrame'e dönüştürür
-    2. Sütun isimlerini temizler
-    3. Zorunlu sütunları kontrol eder
-    4. Veri doğrulama işlemlerini gerçekleştirir
-    5. Son satırı siler
+    Dosya içeriği read_report ile okunur ve doğrulanır; sonuç Streamlit
+    önbelleğinde tutulur.
     
     Parameters:
         uploaded_file (UploadedFile): Streamlit ile yüklenen Excel dosyası
@@ -62,21 +103,8 @@ def load_data(uploaded_file):
         ... else:
         ...     print("Veri yüklenemedi")
     """
-    df = pd.read_excel(uploaded_file, engine="openpyxl")
-    df.columns = [str(col).strip() for col in df.columns]
-
-    # Son satırı sil
-    df = df.iloc[:-1]
-
-    # Zorunlu sütun kontrolü
-    mandatory_columns = ["Masraf Yeri Adı", "Kümüle Bütçe", "Kümüle Fiili"]
-    missing_columns = [col for col in mandatory_columns if col not in df.columns]
-    if missing_columns:
-        missing_cols_str = ', '.join(missing_columns)
-        display_friendly_error(
-            f"Eksik sütunlar: {missing_cols_str}",
-            "Lütfen geçerli bir ZFMR0003 raporu yükleyin."
-        )
+    try:
+        return read_report(uploaded_file.getvalue())
+    except ValueError as e:
+        display_friendly_error(str(e), "Lütfen geçerli bir ZFMR0003 raporu yükleyin.")
         return None
-
-    return df
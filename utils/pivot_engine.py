@@ -0,0 +1,772 @@
+"""
+pivot_engine.py - Pivot tablolar için gruplama ve toplama motoru.
+
+Bu modül, satır alanlarını bir kez tamsayı kodlarına dönüştürür (factorize)
+ve seçilen tüm değer sütunları için toplam, adet, minimum ve maksimum
+istatistiklerini aynı gruplama üzerinden hesaplar. Ortalama bu
+istatistiklerden türetilir. Böylece toplama fonksiyonu değiştirildiğinde
+ham veri yeniden gruplanmaz.
+
+Motor, her filtre ve değer sütunu kümesi için ham veriden hesapladığı en
+ayrıntılı grup istatistiklerini saklar. Daha az satır alanlı (daha kaba)
+pivotlar bu istatistiklerden toplanarak (roll-up) türetilir; ham veri yalnızca
+saklanan hiçbir toplamdan türetilemeyen daha ayrıntılı bir görünüm
+istendiğinde yeniden taranır.
+
+Sütun alanı olarak ay/metrik eksenlerinden biri seçilebilir (diğer eksen
+satırlara iner) ya da GENERAL_COLUMNS içinden bir alan seçilerek çapraz tablo
+kurulabilir. Çapraz tablolar yalnızca veride bulunan (satır, sütun) çiftleri
+üzerinden toplanır ve seyrek (CSR) matris olarak tutulur; binlerce masraf
+yerinin geniş çapraz tabloları sıfırlarla dolu yoğun tablolar oluşturmaz.
+
+Medyan, p90 ve farklı değer sayısı (distinct) toplamaları birleştirilebilir
+yaklaşık özetlerle hesaplanır (bkz. utils.sketches): grup başına quantile
+kovalarının adetleri ve HyperLogLog yazmaçları saklanır. Bu özetler de aynı
+toplam deposunda tutulur ve daha kaba pivotlar için ham satırlara dönmeden
+birleştirilir (kova adetleri toplanır, yazmaçların en büyüğü alınır).
+
+Sonuçlar iki seviyede önbelleğe alınır:
+    - Grup istatistikleri ve özetler: (filtre parmak izi, değer sütunları) başına en ayrıntılı toplamlar
+    - Pivot tablolar: (filtre parmak izi, satır alanları, değer türü, toplama fonksiyonu)
+
+Fonksiyonlar:
+    - factorize_rows: Satır alanlarını tek bir grup koduna dönüştürür
+    - compute_group_stats: Grup bazında sum/count/min/max istatistiklerini hesaplar
+    - rollup_stats: İstatistikleri daha az alana toplar
+    - load_group_stats: İstatistikleri saklanan en ayrıntılı toplamdan türetir
+    - pivot_from_stats: İstatistiklerden istenen toplama fonksiyonunun pivotunu üretir
+    - compute_quantile_sketch: Grup x değer sütunu başına quantile kova adetlerini hesaplar
+    - compute_distinct_sketch: Grup başına HyperLogLog yazmaçlarını hesaplar
+    - group_values: Toplama fonksiyonuna göre grup x değer tablosunu üretir
+    - load_pivot: Önbellekli pivot tablo
+    - spread_axis: Ay veya metrik eksenini sütunlara, diğerini satırlara yayar
+    - crosstab_from_frame: (satır alanları + sütun alanı) değer tablosundan CrossTab üretir
+    - load_crosstab: Önbellekli çapraz tablo
+    - crosstab_frame: Çapraz tablonun gösterilecek kısmını yoğun tabloya çevirir
+    - crosstab_totals: Çapraz tablo satır toplamlarını metrik bazında hesaplar
+    - crosstab_long: Dolu hücreleri uzun formatta döndürür
+
+Sınıflar:
+    - CrossTab: Seyrek çapraz tablo
+
+Kullanım:
+    from utils.pivot_engine import load_pivot
+
+    pivot = load_pivot(df, ["İlgili 1"], ["Ocak Fiili", "Şubat Fiili"], "mean", cache_key=filter_key)
+"""
+
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from config.constants import (
+    PIVOT_CACHE_ENTRIES, PIVOT_AGGREGATE_MAX_RATIO, PIVOT_QUANTILE_ACCURACY,
+    PIVOT_HLL_PRECISION, PIVOT_DISTINCT_FIELD,
+)
+from utils.cache import ResultCache, dataframe_fingerprint
+from utils.sketches import quantile_buckets, sketch_quantiles, hll_registers, hll_estimate
+
+# Yaklaşık (özet tabanlı) toplama fonksiyonları
+QUANTILE_AGG_FUNCS = {"median": 0.5, "p90": 0.9}
+AGG_DISTINCT = "distinct"
+
+# Desteklenen toplama fonksiyonları
+AGG_FUNCS = ["sum", "mean", "max", "min", "count"] + list(QUANTILE_AGG_FUNCS) + [AGG_DISTINCT]
+
+# Sonucu adet olan (para birimi olarak gösterilmeyen) toplama fonksiyonları
+COUNT_AGG_FUNCS = ["count", AGG_DISTINCT]
+
+# Farklı değer sayısı sonucunun sütun adı
+DISTINCT_COLUMN = f"Farklı {PIVOT_DISTINCT_FIELD}"
+
+# Grup bazında saklanan birleştirilebilir istatistikler
+BASE_STATS = ["sum", "count", "min", "max"]
+
+# Özet tablolarının grup alanlarından sonra gelen indeks seviyeleri
+SKETCH_COLUMN_LEVEL = "Değer Sütunu"
+SKETCH_BUCKET_LEVEL = "Kova"
+SKETCH_REGISTER_LEVEL = "Yazmaç"
+
+# Sütun alanı olarak seçilebilen değer eksenleri
+AXIS_MONTH = "Ay"
+AXIS_METRIC = "Metrik"
+AXIS_FIELDS = [AXIS_MONTH, AXIS_METRIC]
+
+# Çapraz tablo sütun etiketlerinde sütun değeri ile değer sütunu arasındaki ayraç
+COLUMN_LABEL_SEPARATOR = " | "
+
+_aggregate_cache = ResultCache(PIVOT_CACHE_ENTRIES)
+_stats_cache = ResultCache(PIVOT_CACHE_ENTRIES)
+_pivot_cache = ResultCache(PIVOT_CACHE_ENTRIES)
+
+
+def factorize_rows(
+    df: pd.DataFrame,
+    row_fields: Sequence[str],
+    dropna: bool = True,
+) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Satır alanlarının değer kombinasyonlarını tek bir tamsayı grup koduna dönüştürür.
+
+    Kodlar kombinasyonların verideki ilk görülme sırasıyla verilir. dropna
+    True ise herhangi bir alanı boş (NaN) olan satırlar -1 kodunu alır; False
+    ise NaN ayrı bir değer olarak gruplanır.
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        row_fields (Sequence[str]): Satır alanları
+        dropna (bool): Boş değerli satırların dışarıda bırakılıp bırakılmayacağı
+
+    Returns:
+        Tuple[ndarray, Index]: (satır başına grup kodu, grup anahtarları);
+            birden fazla alan varsa anahtarlar MultiIndex'tir
+    """
+    combined = np.zeros(len(df), dtype=np.int64)
+    missing = np.zeros(len(df), dtype=bool)
+    for field in row_fields:
+        codes, uniques = pd.factorize(df[field], sort=False, use_na_sentinel=dropna)
+        missing |= codes < 0
+        # Her adımda yeniden sıkıştırılır; böylece birleşik kod taşmaz
+        combined, _ = pd.factorize(combined * max(len(uniques), 1) + codes, sort=False)
+
+    combined = np.where(missing, -1, combined)
+    if missing.any():
+        # NaN satırları çıkarıldıktan sonra kodları yeniden sıkıştır
+        valid = combined >= 0
+        compact, _ = pd.factorize(combined[valid], sort=False)
+        combined[valid] = compact
+
+    n_groups = int(combined.max()) + 1 if len(combined) else 0
+    first_rows = np.full(n_groups, -1, dtype=np.int64)
+    valid_rows = np.flatnonzero(combined >= 0)
+    # Ters sırayla atama: her kod için en küçük satır numarası kalır
+    first_rows[combined[valid_rows[::-1]]] = valid_rows[::-1]
+
+    keys = df[list(row_fields)].iloc[first_rows]
+    if len(row_fields) == 1:
+        index = pd.Index(keys.iloc[:, 0].to_numpy(), name=row_fields[0])
+    else:
+        index = pd.MultiIndex.from_frame(keys.reset_index(drop=True))
+    return combined, index
+
+
+def _group_keys(df: pd.DataFrame, row_fields: Sequence[str], codes: np.ndarray) -> pd.DataFrame:
+    """Her grup kodu için ilk satırın alan değerlerini (kod sırasıyla) döndürür."""
+    first_rows = np.unique(codes, return_index=True)[1]
+    return df[list(row_fields)].iloc[first_rows].reset_index(drop=True)
+
+
+def compute_group_stats(
+    df: pd.DataFrame,
+    row_fields: Sequence[str],
+    value_columns: Sequence[str],
+) -> pd.DataFrame:
+    """
+    Grup bazında tüm değer sütunları için sum/count/min/max istatistiklerini hesaplar.
+
+    Bu fonksiyon:
+    1. Satır alanlarını factorize_rows ile bir kez kodlar; boş değerler ayrı grup olur
+       ki sonuç daha az alana toplandığında o satırlar kaybolmasın
+    2. Değer sütunlarını tek bir gruplama nesnesi üzerinden toplar
+    3. İstatistikleri (istatistik, sütun) iki seviyeli sütunlarla birleştirir
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        row_fields (Sequence[str]): Satır alanları
+        value_columns (Sequence[str]): Değer sütunları
+
+    Returns:
+        DataFrame: Grup anahtarı indeksli (her zaman MultiIndex), (istatistik, sütun) sütunlu tablo
+    """
+    codes, _ = factorize_rows(df, row_fields, dropna=False)
+    grouped = df[list(value_columns)].groupby(codes, sort=True)
+
+    stats = pd.concat(
+        {
+            "sum": grouped.sum(),
+            "count": grouped.count(),
+            "min": grouped.min(),
+            "max": grouped.max(),
+        },
+        axis=1,
+    )
+    stats.index = pd.MultiIndex.from_frame(_group_keys(df, row_fields, codes))
+    return stats
+
+
+def rollup_stats(stats: pd.DataFrame, row_fields: Sequence[str]) -> pd.DataFrame:
+    """
+    Grup istatistiklerini daha az (veya aynı) alana toplar.
+
+    sum ve count toplanarak, min ve max kendi içlerinde birleştirilir; bu
+    istatistikler birleştirilebilir olduğundan sonuç ham veriden hesaplananla
+    aynıdır. Seçilen alanlarından biri boş olan gruplar pd.pivot_table gibi
+    dışarıda bırakılır. Gruplar ilk görülme sırasını korur.
+
+    Parameters:
+        stats (DataFrame): compute_group_stats çıktısı
+        row_fields (Sequence[str]): Hedef alanlar; stats indeks seviyelerinin alt kümesi
+
+    Returns:
+        DataFrame: row_fields indeksli istatistik tablosu (tek alan için Index)
+    """
+    combine = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+    return pd.concat(
+        {
+            stat: stats[stat].groupby(level=list(row_fields), sort=False, dropna=True).agg(how)
+            for stat, how in combine.items()
+        },
+        axis=1,
+    )
+
+
+def _load_aggregate(
+    key: Tuple,
+    row_fields: Sequence[str],
+    compute: Callable[[], pd.DataFrame],
+    rollup: Callable[[pd.DataFrame, Sequence[str]], pd.DataFrame],
+    max_size: float,
+) -> pd.DataFrame:
+    """
+    Toplamı saklanan en ayrıntılı toplamdan türetir; yoksa compute ile hesaplar.
+
+    Bu fonksiyon:
+    1. key için saklanan toplamlar içinde alanları row_fields'ı kapsayan en küçüğünü
+       arar ve onu rollup ile row_fields'a indirger
+    2. Uygun toplam yoksa ham veriden hesaplar ve saklar; yeni toplamın alt kümesi
+       olan eski toplamlar artık ondan türetilebildiği için bırakılır. max_size'ı
+       aşan (ham veriye yakın boyuttaki) toplamlar ham veriden daha ucuz
+       olmadığı için saklanmaz
+    3. Türetilen sonucu da saklar; aynı alanlarla farklı toplama fonksiyonu
+       istendiğinde yeniden indirgeme yapılmaz
+
+    Parameters:
+        key (Tuple): Toplam türü, filtre parmak izi ve değer sütunları
+        row_fields (Sequence[str]): Satır alanları
+        compute (Callable): row_fields için ham veriden toplam hesaplayan fonksiyon
+        rollup (Callable): (toplam, alanlar) -> daha kaba toplam
+        max_size (float): Saklanacak toplamın en fazla satır sayısı
+
+    Returns:
+        DataFrame: rollup çıktısı
+    """
+    fields = set(row_fields)
+
+    def build() -> pd.DataFrame:
+        aggregates = _aggregate_cache.get(key, [])
+        candidates = [agg for agg in aggregates if fields <= set(agg.index.names)]
+        if candidates:
+            base = min(candidates, key=len)
+        else:
+            base = compute()
+            if len(base) <= max_size:
+                aggregates = [agg for agg in aggregates if not set(agg.index.names) <= fields]
+                _aggregate_cache.set(key, aggregates + [base])
+        return rollup(base, row_fields)
+
+    return _stats_cache.get_or_compute(key + (tuple(row_fields),), build)
+
+
+def load_group_stats(
+    df: pd.DataFrame,
+    row_fields: Sequence[str],
+    value_columns: Sequence[str],
+    cache_key: Hashable,
+) -> pd.DataFrame:
+    """
+    Grup istatistiklerini saklanan en ayrıntılı toplamdan türetir.
+
+    Grup sayısı satır sayısının PIVOT_AGGREGATE_MAX_RATIO katını aşan toplamlar
+    saklanmaz (bkz. _load_aggregate).
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        row_fields (Sequence[str]): Satır alanları
+        value_columns (Sequence[str]): Değer sütunları
+        cache_key (Hashable): Filtre parmak izi
+
+    Returns:
+        DataFrame: rollup_stats çıktısı
+    """
+    return _load_aggregate(
+        ("stats", cache_key, tuple(value_columns)),
+        row_fields,
+        lambda: compute_group_stats(df, row_fields, value_columns),
+        rollup_stats,
+        PIVOT_AGGREGATE_MAX_RATIO * len(df),
+    )
+
+
+def pivot_from_stats(stats: pd.DataFrame, agg_func: str, value_columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Grup istatistiklerinden istenen toplama fonksiyonunun pivot tablosunu üretir.
+
+    Boş gruplar (hiç değeri olmayan hücreler) pd.pivot_table(fill_value=0) ile
+    aynı şekilde 0 olarak döner.
+
+    Parameters:
+        stats (DataFrame): compute_group_stats çıktısı
+        agg_func (str): AGG_FUNCS içinden toplama fonksiyonu
+        value_columns (Sequence[str]): Sütun sırası
+
+    Returns:
+        DataFrame: Grup anahtarı indeksli, value_columns sütunlu pivot tablo
+    """
+    columns = list(value_columns)
+    return pd.DataFrame(_stat_values(stats, agg_func, columns), index=stats.index, columns=columns)
+
+
+def _stat_values(stats: pd.DataFrame, agg_func: str, columns: List[str]) -> np.ndarray:
+    """İstatistik tablosundan toplama fonksiyonunun değer matrisini üretir; boş hücreler 0 olur."""
+    if agg_func == "mean":
+        sums = stats["sum"][columns].to_numpy(dtype=np.float64)
+        counts = stats["count"][columns].to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = sums / counts
+    elif agg_func in BASE_STATS:
+        values = stats[agg_func][columns].to_numpy()
+    else:
+        raise ValueError(f"Desteklenmeyen toplama fonksiyonu: {agg_func}")
+    if values.dtype.kind == "f":
+        values = np.nan_to_num(values, nan=0.0)
+    return values
+
+
+def compute_quantile_sketch(
+    df: pd.DataFrame,
+    row_fields: Sequence[str],
+    value_columns: Sequence[str],
+    accuracy: float = PIVOT_QUANTILE_ACCURACY,
+) -> pd.DataFrame:
+    """
+    Grup x değer sütunu başına quantile kova adetlerini hesaplar.
+
+    Bu fonksiyon:
+    1. Satır alanlarını kodlar (boş değerler ayrı grup olarak)
+    2. Tüm değer hücrelerini tek vektörde kova anahtarlarına dönüştürür
+    3. (grup, sütun, kova) üçlülerini tek bir tamsayı anahtarında birleştirip sayar
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        row_fields (Sequence[str]): Satır alanları
+        value_columns (Sequence[str]): Değer sütunları
+        accuracy (float): Kova göreli doğruluğu
+
+    Returns:
+        DataFrame: (row_fields..., "Değer Sütunu", "Kova") indeksli, "Adet" sütunlu özet
+    """
+    codes, _ = factorize_rows(df, row_fields, dropna=False)
+    values = df[list(value_columns)].to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+    groups = np.broadcast_to(codes[:, None], values.shape)[present]
+    columns = np.broadcast_to(np.arange(values.shape[1]), values.shape)[present]
+    buckets = quantile_buckets(values[present], accuracy).astype(np.int64)
+
+    span = 2 * int(np.abs(buckets).max(initial=0)) + 1
+    combined = (groups * values.shape[1] + columns) * span + (buckets + span // 2)
+    cells, uniques = pd.factorize(combined, sort=False)
+    counts = np.bincount(cells, minlength=len(uniques))
+
+    segment, bucket = np.divmod(uniques, span)
+    group, column = np.divmod(segment, values.shape[1])
+    keys = _group_keys(df, row_fields, codes).iloc[group].reset_index(drop=True)
+    keys[SKETCH_COLUMN_LEVEL] = np.asarray(value_columns, dtype=object)[column]
+    keys[SKETCH_BUCKET_LEVEL] = bucket - span // 2
+    return pd.DataFrame({"Adet": counts}, index=pd.MultiIndex.from_frame(keys))
+
+
+def rollup_quantile_sketch(sketch: pd.DataFrame, row_fields: Sequence[str]) -> pd.DataFrame:
+    """Quantile özetini aynı kovaların adetlerini toplayarak daha az alana indirger."""
+    levels = list(row_fields) + [SKETCH_COLUMN_LEVEL, SKETCH_BUCKET_LEVEL]
+    return sketch.groupby(level=levels, sort=False, dropna=True).sum()
+
+
+def compute_distinct_sketch(
+    df: pd.DataFrame,
+    row_fields: Sequence[str],
+    distinct_field: str = PIVOT_DISTINCT_FIELD,
+    precision: int = PIVOT_HLL_PRECISION,
+) -> pd.DataFrame:
+    """
+    Grup başına distinct_field için HyperLogLog yazmaçlarını hesaplar.
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        row_fields (Sequence[str]): Satır alanları
+        distinct_field (str): Farklı değerleri sayılacak alan
+        precision (int): Yazmaç bit sayısı
+
+    Returns:
+        DataFrame: (row_fields..., "Yazmaç") indeksli, "Sıra" sütunlu özet;
+            yalnızca dolu yazmaçları içerir
+    """
+    codes, _ = factorize_rows(df, row_fields, dropna=False)
+    valid = df[distinct_field].notna().to_numpy()
+    registers, ranks = hll_registers(df.loc[valid, distinct_field], precision)
+
+    combined = codes[valid] * (1 << precision) + registers
+    cells, uniques = pd.factorize(combined, sort=False)
+    maxima = pd.Series(ranks).groupby(cells, sort=True).max().to_numpy()
+
+    group, register = np.divmod(uniques, 1 << precision)
+    keys = _group_keys(df, row_fields, codes).iloc[group].reset_index(drop=True)
+    keys[SKETCH_REGISTER_LEVEL] = register
+    return pd.DataFrame({"Sıra": maxima}, index=pd.MultiIndex.from_frame(keys))
+
+
+def rollup_distinct_sketch(sketch: pd.DataFrame, row_fields: Sequence[str]) -> pd.DataFrame:
+    """HyperLogLog özetini aynı yazmacın en büyük değerini alarak daha az alana indirger."""
+    levels = list(row_fields) + [SKETCH_REGISTER_LEVEL]
+    return sketch.groupby(level=levels, sort=False, dropna=True).max()
+
+
+def _quantile_frame(
+    sketch: pd.DataFrame,
+    row_fields: Sequence[str],
+    value_columns: Sequence[str],
+    q: float,
+) -> pd.DataFrame:
+    """Quantile özetinden grup x değer sütunu quantile tablosunu üretir."""
+    keys = sketch.index.to_frame(index=False)
+    groups, index = factorize_rows(keys, row_fields)
+    columns = pd.Index(value_columns).get_indexer(keys[SKETCH_COLUMN_LEVEL])
+    n_columns = len(value_columns)
+    quantiles = sketch_quantiles(
+        groups * n_columns + columns,
+        keys[SKETCH_BUCKET_LEVEL].to_numpy(),
+        sketch["Adet"].to_numpy(),
+        len(index) * n_columns,
+        q,
+        PIVOT_QUANTILE_ACCURACY,
+    )
+    values = np.nan_to_num(quantiles.reshape(len(index), n_columns), nan=0.0)
+    return pd.DataFrame(values, index=index, columns=list(value_columns))
+
+
+def _distinct_frame(sketch: pd.DataFrame, row_fields: Sequence[str]) -> pd.DataFrame:
+    """HyperLogLog özetinden grup başına tahmini farklı değer sayısı tablosunu üretir."""
+    keys = sketch.index.to_frame(index=False)
+    groups, index = factorize_rows(keys, row_fields)
+    estimate = hll_estimate(
+        groups,
+        keys[SKETCH_REGISTER_LEVEL].to_numpy(),
+        sketch["Sıra"].to_numpy(),
+        len(index),
+        PIVOT_HLL_PRECISION,
+    )
+    return pd.DataFrame({DISTINCT_COLUMN: np.round(estimate).astype(np.int64)}, index=index)
+
+
+def group_values(
+    df: pd.DataFrame,
+    row_fields: Sequence[str],
+    value_columns: Sequence[str],
+    agg_func: str,
+    cache_key: Hashable,
+) -> pd.DataFrame:
+    """
+    Toplama fonksiyonuna göre grup x değer tablosunu üretir.
+
+    Bu fonksiyon:
+    1. sum/mean/max/min/count için grup istatistiklerini kullanır
+    2. median/p90 için quantile özetinden yaklaşık quantile'ları hesaplar
+       (göreli hata en fazla PIVOT_QUANTILE_ACCURACY)
+    3. distinct için HyperLogLog özetinden PIVOT_DISTINCT_FIELD alanının
+       tahmini farklı değer sayısını tek sütun olarak döndürür
+
+    Özetler de istatistikler gibi en ayrıntılı toplamdan türetilir.
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        row_fields (Sequence[str]): Satır alanları
+        value_columns (Sequence[str]): Değer sütunları
+        agg_func (str): AGG_FUNCS içinden toplama fonksiyonu
+        cache_key (Hashable): Filtre parmak izi
+
+    Returns:
+        DataFrame: Grup anahtarı indeksli tablo; boş hücreler 0
+    """
+    if agg_func in QUANTILE_AGG_FUNCS:
+        sketch = _load_aggregate(
+            ("quantile", cache_key, tuple(value_columns)),
+            row_fields,
+            lambda: compute_quantile_sketch(df, row_fields, value_columns),
+            rollup_quantile_sketch,
+            PIVOT_AGGREGATE_MAX_RATIO * len(df) * len(value_columns),
+        )
+        return _quantile_frame(sketch, row_fields, value_columns, QUANTILE_AGG_FUNCS[agg_func])
+    if agg_func == AGG_DISTINCT:
+        sketch = _load_aggregate(
+            ("distinct", cache_key, PIVOT_DISTINCT_FIELD),
+            row_fields,
+            lambda: compute_distinct_sketch(df, row_fields),
+            rollup_distinct_sketch,
+            PIVOT_AGGREGATE_MAX_RATIO * len(df),
+        )
+        return _distinct_frame(sketch, row_fields)
+
+    stats = load_group_stats(df, row_fields, value_columns, cache_key)
+    return pivot_from_stats(stats, agg_func, value_columns)
+
+
+def load_pivot(
+    df: pd.DataFrame,
+    row_fields: Sequence[str],
+    value_columns: Sequence[str],
+    agg_func: str,
+    value_type: str = "",
+    cache_key: Optional[Hashable] = None,
+) -> pd.DataFrame:
+    """
+    Pivot tabloyu önbellek üzerinden döndürür.
+
+    Grup istatistikleri toplama fonksiyonundan bağımsız önbelleğe alınır;
+    toplama fonksiyonu değiştirildiğinde yalnızca istatistiklerden yeni
+    görünüm üretilir. Satır alanı çıkarıldığında istatistikler daha ayrıntılı
+    toplamdan türetilir. distinct için sonuç tek sütunludur (DISTINCT_COLUMN).
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        row_fields (Sequence[str]): Satır alanları
+        value_columns (Sequence[str]): Değer sütunları (gösterim sırasıyla)
+        agg_func (str): Toplama fonksiyonu
+        value_type (str): Değer türü etiketi (ör. "Aylık Değerler")
+        cache_key (Hashable, optional): Filtre parmak izi
+
+    Returns:
+        DataFrame: Pivot tablo
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    rows, columns = tuple(row_fields), tuple(value_columns)
+
+    def build() -> pd.DataFrame:
+        return group_values(df, rows, columns, agg_func, cache_key)
+
+    return _pivot_cache.get_or_compute((cache_key, rows, value_type, columns, agg_func), build)
+
+
+def spread_axis(
+    pivot: pd.DataFrame,
+    column_axes: Sequence[Tuple[str, str]],
+    col_field: str,
+) -> pd.DataFrame:
+    """
+    Ay x metrik sütunlarından birini sütunlara, diğerini satırlara yayar.
+
+    Bu fonksiyon:
+    1. Her değer sütununu (ay, metrik) hücresine yerleştirerek (grup x ay x metrik) küpü kurar
+    2. col_field ekseni sütunlarda kalacak, diğer eksen satır indeksine son seviye olarak eklenecek şekilde küpü döndürür
+    3. Veride olmayan (ay, metrik) hücrelerini 0 ile doldurur
+
+    Parameters:
+        pivot (DataFrame): load_pivot çıktısı
+        column_axes (Sequence[Tuple[str, str]]): Her değer sütunu için (ay, metrik) etiketi;
+            kümüle değerlerde ay etiketi "Kümüle" olur
+        col_field (str): AXIS_MONTH veya AXIS_METRIC
+
+    Returns:
+        DataFrame: (satır alanları + diğer eksen) indeksli, col_field değerleri sütunlu tablo
+    """
+    months = list(dict.fromkeys(month for month, _ in column_axes))
+    metrics = list(dict.fromkeys(metric for _, metric in column_axes))
+    month_pos = {month: i for i, month in enumerate(months)}
+    metric_pos = {metric: i for i, metric in enumerate(metrics)}
+
+    cube = np.zeros((len(pivot), len(months), len(metrics)), dtype=np.float64)
+    for j, (month, metric) in enumerate(column_axes):
+        cube[:, month_pos[month], metric_pos[metric]] = pivot.iloc[:, j].to_numpy(dtype=np.float64)
+
+    if col_field == AXIS_MONTH:
+        inner_name, inner_labels, columns = AXIS_METRIC, metrics, months
+        cube = cube.transpose(0, 2, 1)
+    else:
+        inner_name, inner_labels, columns = AXIS_MONTH, months, metrics
+
+    keys = pivot.index.repeat(len(inner_labels)).to_frame(index=False)
+    keys[inner_name] = np.tile(inner_labels, len(pivot))
+    index = pd.MultiIndex.from_frame(keys)
+    return pd.DataFrame(cube.reshape(-1, len(columns)), index=index, columns=columns)
+
+
+class CrossTab(NamedTuple):
+    """
+    Seyrek çapraz tablo.
+
+    Attributes:
+        matrix (csr_matrix): (satır grubu) x (sütun değeri x değer sütunu) matrisi
+        index (Index): Satır grubu anahtarları
+        col_index (Index): Sütun alanı değerleri
+        value_columns (List[str]): Her sütun değeri altındaki değer sütunları
+    """
+
+    matrix: sparse.csr_matrix
+    index: pd.Index
+    col_index: pd.Index
+    value_columns: List[str]
+
+
+def crosstab_from_frame(
+    values: pd.DataFrame,
+    row_fields: Sequence[str],
+    col_field: str,
+) -> CrossTab:
+    """
+    (Satır alanları + sütun alanı) indeksli değer tablosundan çapraz tablo üretir.
+
+    Değer tablosu yalnızca veride bulunan (satır grubu, sütun değeri) çiftlerini
+    içerdiği için matris de yalnızca bu hücreler üzerinden kurulur; boyutu
+    dolu hücre sayısıyla orantılıdır, satır x sütun çarpımıyla değil.
+
+    Parameters:
+        values (DataFrame): group_values(row_fields + [col_field]) çıktısı
+        row_fields (Sequence[str]): Satır alanları
+        col_field (str): Sütun alanı
+
+    Returns:
+        CrossTab: Sıfır olmayan hücreleri içeren CSR matrisli çapraz tablo
+    """
+    columns = list(values.columns)
+    keys = values.index.to_frame(index=False)
+    row_codes, row_index = factorize_rows(keys, row_fields)
+    col_codes, col_index = factorize_rows(keys, [col_field])
+    n_values = len(columns)
+
+    rows = np.repeat(row_codes, n_values)
+    cols = (col_codes[:, None] * n_values + np.arange(n_values)).ravel()
+    matrix = sparse.csr_matrix(
+        (values.to_numpy(dtype=np.float64).ravel(), (rows, cols)),
+        shape=(len(row_index), len(col_index) * n_values),
+    )
+    matrix.eliminate_zeros()
+    return CrossTab(matrix, row_index, col_index, columns)
+
+
+def load_crosstab(
+    df: pd.DataFrame,
+    row_fields: Sequence[str],
+    col_field: str,
+    value_columns: Sequence[str],
+    agg_func: str,
+    value_type: str = "",
+    cache_key: Optional[Hashable] = None,
+) -> CrossTab:
+    """
+    Çapraz tabloyu önbellek üzerinden döndürür.
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        row_fields (Sequence[str]): Satır alanları
+        col_field (str): Sütun alanı
+        value_columns (Sequence[str]): Değer sütunları
+        agg_func (str): Toplama fonksiyonu
+        value_type (str): Değer türü etiketi
+        cache_key (Hashable, optional): Filtre parmak izi
+
+    Returns:
+        CrossTab: Çapraz tablo
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    rows, columns = tuple(row_fields), tuple(value_columns)
+
+    def build() -> CrossTab:
+        # Çapraz tablo istatistikleri de aynı toplam deposunu kullanır; sütun alanı
+        # yalnızca ek bir gruplama seviyesidir ve satır pivotları bundan türetilebilir
+        values = group_values(df, rows + (col_field,), columns, agg_func, cache_key)
+        return crosstab_from_frame(values, rows, col_field)
+
+    return _pivot_cache.get_or_compute((cache_key, rows, col_field, value_type, columns, agg_func), build)
+
+
+def crosstab_labels(crosstab: CrossTab, positions: Sequence[int]) -> List[str]:
+    """
+    Matris sütun numaralarının "<sütun değeri> | <değer sütunu>" etiketlerini döndürür.
+    """
+    n_values = len(crosstab.value_columns)
+    return [
+        f"{crosstab.col_index[pos // n_values]}{COLUMN_LABEL_SEPARATOR}{crosstab.value_columns[pos % n_values]}"
+        for pos in positions
+    ]
+
+
+def crosstab_frame(
+    crosstab: CrossTab,
+    max_cells: Optional[int] = None,
+    max_columns: Optional[int] = None,
+) -> Tuple[pd.DataFrame, bool]:
+    """
+    Çapraz tabloyu yoğun DataFrame'e çevirir; sınır verilirse yalnızca baştaki kısmı.
+
+    Parameters:
+        crosstab (CrossTab): Çapraz tablo
+        max_cells (int, optional): En fazla hücre sayısı
+        max_columns (int, optional): En fazla sütun sayısı
+
+    Returns:
+        Tuple[DataFrame, bool]: (yoğun tablo, tablo kırpıldıysa True)
+    """
+    n_rows, n_cols = crosstab.matrix.shape
+    rows, cols = n_rows, min(n_cols, max_columns or n_cols)
+    if max_cells is not None and n_rows * cols > max_cells:
+        cols = min(cols, max(1, max_cells // max(n_rows, 1)))
+        rows = min(n_rows, max(1, max_cells // cols))
+
+    dense = crosstab.matrix[:rows, :cols].toarray()
+    frame = pd.DataFrame(dense, index=crosstab.index[:rows], columns=crosstab_labels(crosstab, range(cols)))
+    return frame, (rows, cols) != (n_rows, n_cols)
+
+
+def crosstab_totals(crosstab: CrossTab, metric_columns: Dict[str, List[str]]) -> pd.DataFrame:
+    """
+    Her metrik için tüm sütun değerleri ve aylar üzerinden satır toplamlarını hesaplar.
+
+    Toplamlar seyrek matrisin (değer sütunu -> metrik) gösterge matrisiyle
+    çarpımıdır; yoğun tablo oluşturulmaz.
+
+    Parameters:
+        crosstab (CrossTab): Çapraz tablo
+        metric_columns (Dict[str, List[str]]): Metrik -> değer sütunları
+
+    Returns:
+        DataFrame: Satır grubu indeksli, "Toplam <metrik>" sütunlu tablo
+    """
+    metrics = [metric for metric, columns in metric_columns.items() if columns]
+    value_metric = {
+        col: i for i, metric in enumerate(metrics) for col in metric_columns[metric]
+    }
+    n_values = len(crosstab.value_columns)
+    positions = [
+        (pos, value_metric[col])
+        for pos in range(crosstab.matrix.shape[1])
+        for col in [crosstab.value_columns[pos % n_values]]
+        if col in value_metric
+    ]
+    rows, cols = zip(*positions) if positions else ((), ())
+    indicator = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(crosstab.matrix.shape[1], len(metrics))
+    )
+    totals = np.asarray((crosstab.matrix @ indicator).todense())
+    return pd.DataFrame(totals, index=crosstab.index, columns=[f"Toplam {metric}" for metric in metrics])
+
+
+def crosstab_long(crosstab: CrossTab, col_field: str) -> pd.DataFrame:
+    """
+    Çapraz tablonun dolu hücrelerini uzun formatta döndürür.
+
+    Parameters:
+        crosstab (CrossTab): Çapraz tablo
+        col_field (str): Sütun alanı adı
+
+    Returns:
+        DataFrame: [satır alanları..., col_field, "Değer Sütunu", "Değer"] sütunlu tablo
+    """
+    coo = crosstab.matrix.tocoo()
+    n_values = len(crosstab.value_columns)
+    long = crosstab.index[coo.row].to_frame(index=False)
+    long[col_field] = crosstab.col_index[coo.col // n_values].to_numpy()
+    long["Değer Sütunu"] = np.asarray(crosstab.value_columns, dtype=object)[coo.col % n_values]
+    long["Değer"] = coo.data
+    return long
@@ -4,7 +4,9 @@ pivot_table.py
 Bu modül, kullanıcıların etkileşimli bir arayüz üzerinden dinamik pivot tablolar oluşturmasını ve bu tabloları 
 görselleştirerek dışa aktarmasını sağlar. Streamlit arayüzü kullanılarak kolayca:
 - Satır alanları seçilebilir
-- Sayısal değerler için özet fonksiyonları uygulanabilir (toplam, ortalama, maksimum, minimum, adet)
+- İsteğe bağlı bir sütun alanıyla (ay, metrik veya genel bir sütun) iki boyutlu pivot kurulabilir
+- Sayısal değerler için özet fonksiyonları uygulanabilir (toplam, ortalama, maksimum, minimum, adet,
+  yaklaşık medyan/p90 ve farklı masraf çeşidi sayısı)
 - Oluşturulan tablo hem Excel hem de PNG formatında indirilebilir
 
 Ana Özellikler:
@@ -14,6 +16,7 @@ Ana Özellikler:
 - Görselleştirilebilir tablo çıktısı (Plotly ile)
 - PNG formatında grafik çıktısı ve Excel formatında veri çıktısı
 - Verilerin orijinal sırasını koruma ve ayların kronolojik sırada gösterimi
+- Arayüzden bağımsız hesaplama: build_pivot / pivot_excel_bytes Streamlit oturumu gerektirmez
 
 Kütüphaneler:
 -------------
@@ -21,9 +24,9 @@ Kütüphaneler:
 - pandas: Veri işleme ve pivot tablo oluşturma
 - plotly.express: Görselleştirme
 - io.BytesIO: Bellek içi dosya nesneleriyle çalışma
-- openpyxl: Excel yazımı
+- xlsxwriter: Excel yazımı
 - utils.error_handler: Hata yakalama ve kullanıcı dostu hata gösterimi
-- utils.formatting: Para birimi formatı işlemleri
+- utils.formatting: Para birimi formatı (gösterim ve Excel dışa aktarımında) işlemleri
 - config.constants: Sabit değerler
 """
 
@@ -33,12 +36,20 @@ import pandas as pd
 import plotly.express as px
 from io import BytesIO
 import plotly.io as pio
-from typing import Tuple, Optional
+from typing import Dict, Hashable, List, NamedTuple, Tuple, Optional
 
-from utils.data_preview import show_column_totals
 from utils.error_handler import handle_error, display_friendly_error
-from utils.formatting import format_currency_columns
-from config.constants import FIXED_METRICS, MONTHS, CUMULATIVE_COLUMNS, GENERAL_COLUMNS
+from utils.formatting import infer_column_formats, set_column_formats, render_table, write_excel_sheet
+from utils.pivot_engine import (
+    AGG_FUNCS, AGG_DISTINCT, COUNT_AGG_FUNCS, QUANTILE_AGG_FUNCS, AXIS_FIELDS, AXIS_MONTH,
+    load_pivot, spread_axis,
+    load_crosstab, crosstab_frame, crosstab_totals, crosstab_long,
+)
+from config.constants import (
+    FIXED_METRICS, MONTHS, CUMULATIVE_COLUMNS, GENERAL_COLUMNS,
+    PIVOT_DISPLAY_MAX_CELLS, PIVOT_DISPLAY_MAX_COLUMNS, PIVOT_EXCEL_MAX_CELLS,
+    PIVOT_QUANTILE_ACCURACY, PIVOT_HLL_PRECISION, PIVOT_DISTINCT_FIELD,
+)
 
 # Grafik export ayarları
 pio.kaleido.scope.default_format = "png"
@@ -48,214 +59,424 @@ pio.kaleido.scope.default_colorway = px.colors.qualitative.Plotly
 pio.kaleido.scope.default_paper_bgcolor = "white"
 pio.kaleido.scope.default_plot_bgcolor = "white"
 
+# Sütun alanı seçilmediğinde gösterilen seçenek
+NO_COLUMN_FIELD = "(Yok)"
+
+# Excel sayfasındaki en fazla sütun sayısı
+EXCEL_MAX_COLUMNS = 16384
+
+# Değer türleri
+VALUE_TYPE_MONTHLY = "Aylık Değerler"
+VALUE_TYPE_CUMULATIVE = "Kümüle Değerler"
+
+# Yaklaşık toplama fonksiyonlarının seçim kutusundaki etiketleri
+AGG_LABELS = {
+    "median": "median (yaklaşık)",
+    "p90": "p90 (yaklaşık)",
+    AGG_DISTINCT: f"distinct ({PIVOT_DISTINCT_FIELD}, yaklaşık)",
+}
+
+
+def _axis_pivot(
+    df: pd.DataFrame,
+    row_col: List[str],
+    value_columns: List[str],
+    column_axes: List[Tuple[str, str]],
+    metric_columns: Dict[str, List[str]],
+    agg_func: str,
+    value_type: str,
+    col_field: str,
+    cache_key: Optional[Hashable],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Ay veya metrik eksenini sütunlara yayan pivot tabloyu ve satır toplamlarını üretir.
+
+    Ay sütunlarda ise her (satır, metrik) satırı için aylar toplanır. Metrik
+    sütunlarda ise farklı metrikler toplanamayacağı için satır toplamları
+    satır alanları bazında, aylar üzerinden hesaplanır.
+
+    Returns:
+        Tuple[DataFrame, DataFrame]: (toplamlı pivot tablo, satır toplamları)
+    """
+    pivot = load_pivot(df, row_col, value_columns, agg_func, value_type, cache_key=cache_key)
+    spread = spread_axis(pivot, column_axes, col_field)
+    if col_field == AXIS_MONTH:
+        row_totals_df = pd.DataFrame({"Toplam": spread.sum(axis=1)}, index=spread.index)
+        return pd.concat([spread, row_totals_df], axis=1), row_totals_df
+
+    totals_dict = {
+        f"Toplam {val_col}": pivot[columns].sum(axis=1)
+        for val_col, columns in metric_columns.items()
+        if columns
+    }
+    return spread, pd.DataFrame(totals_dict, index=pivot.index)
+
+
+def _cross_pivot(
+    df: pd.DataFrame,
+    row_col: List[str],
+    col_field: str,
+    value_columns: List[str],
+    metric_columns: Dict[str, List[str]],
+    agg_func: str,
+    value_type: str,
+    cache_key: Optional[Hashable],
+    notes: List[str],
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Genel bir sütun alanıyla seyrek çapraz pivot tablo üretir.
+
+    Bu fonksiyon:
+    1. Çapraz tabloyu seyrek matris olarak önbellekten alır
+    2. Ekranda yalnızca gösterim sınırlarına sığan kısmı yoğun tabloya çevirir
+    3. Satır toplamlarını seyrek matris üzerinden hesaplar
+    4. Excel için tablo PIVOT_EXCEL_MAX_CELLS hücreye sığıyorsa geniş, sığmıyorsa
+       dolu hücrelerin uzun listesini hazırlar
+
+    Boyut ve kırpma bilgileri notes listesine eklenir.
+
+    Returns:
+        Tuple[DataFrame, DataFrame, DataFrame]: (gösterilecek toplamlı tablo,
+            satır toplamları, Excel'e yazılacak tablo)
+    """
+    crosstab = load_crosstab(df, row_col, col_field, value_columns, agg_func, value_type, cache_key=cache_key)
+    n_rows, n_cols = crosstab.matrix.shape
+    row_totals_df = crosstab_totals(crosstab, metric_columns)
+
+    display_df, truncated = crosstab_frame(
+        crosstab, PIVOT_DISPLAY_MAX_CELLS, PIVOT_DISPLAY_MAX_COLUMNS
+    )
+    if agg_func in COUNT_AGG_FUNCS:
+        display_df = display_df.astype("int64")
+    pivot_with_totals = pd.concat([display_df, row_totals_df.loc[display_df.index]], axis=1)
+
+    density = crosstab.matrix.nnz / max(n_rows * n_cols, 1) * 100
+    notes.append(
+        f"↔️ {n_rows:,} satır x {n_cols:,} sütun · {crosstab.matrix.nnz:,} dolu hücre (%{density:.1f})"
+    )
+    if truncated:
+        notes.append(
+            f"Tabloda ilk {len(display_df):,} satır ve {display_df.shape[1]:,} sütun gösteriliyor; "
+            "tamamı Excel dosyasındadır."
+        )
+
+    excel_columns = len(row_col) + n_cols + len(row_totals_df.columns)
+    if n_rows * n_cols <= PIVOT_EXCEL_MAX_CELLS and excel_columns <= EXCEL_MAX_COLUMNS:
+        full_df, _ = crosstab_frame(crosstab)
+        if agg_func in COUNT_AGG_FUNCS:
+            full_df = full_df.astype("int64")
+        excel_pivot = pd.concat([full_df, row_totals_df], axis=1)
+    else:
+        excel_pivot = crosstab_long(crosstab, col_field).set_index(row_col + [col_field, "Değer Sütunu"])
+    return pivot_with_totals, row_totals_df, excel_pivot
+
+
+class PivotResult(NamedTuple):
+    """
+    build_pivot çıktısı.
+
+    Attributes:
+        table (DataFrame): Gösterilecek toplamlı pivot tablo (çapraz pivotta gösterim sınırına kırpılmış)
+        row_totals (DataFrame): Satır toplamları (boş olabilir)
+        excel_table (DataFrame): Excel'e yazılacak tam tablo
+        formats (Dict[str, str]): table sütun formatları
+        totals_formats (Dict[str, str]): row_totals sütun formatları
+        excel_formats (Dict[str, str]): excel_table sütun formatları
+        notes (List[str]): Tablo altında gösterilecek açıklamalar
+    """
+
+    table: pd.DataFrame
+    row_totals: pd.DataFrame
+    excel_table: pd.DataFrame
+    formats: Dict[str, str]
+    totals_formats: Dict[str, str]
+    excel_formats: Dict[str, str]
+    notes: List[str]
+
+
+def pivot_value_options(
+    df: pd.DataFrame,
+    value_type: str,
+    selected_months: List[str],
+    selected_report_bases: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Seçili aylar ve veri türleri için pivotlanabilecek metrikleri döndürür.
+
+    Parameters:
+        df (DataFrame): Veri çerçevesi
+        value_type (str): VALUE_TYPE_MONTHLY veya VALUE_TYPE_CUMULATIVE
+        selected_months (List[str]): Seçili aylar
+        selected_report_bases (List[str], optional): Seçili veri türleri; verilmezse tümü
+
+    Returns:
+        List[str]: FIXED_METRICS sırasıyla metrikler
+    """
+    allowed_metrics = [
+        metric for metric in FIXED_METRICS
+        if selected_report_bases is None or any(metric in base for base in selected_report_bases)
+    ]
+    if value_type == VALUE_TYPE_MONTHLY:
+        # Seçilen aylardan en az birinde bu değer varsa ekle
+        return [
+            metric for metric in allowed_metrics
+            if any(f"{month} {metric}" in df.columns for month in selected_months)
+        ]
+    return [metric for metric in allowed_metrics if f"Kümüle {metric}" in df.columns]
+
+
+def build_pivot(
+    df: pd.DataFrame,
+    row_col: List[str],
+    agg_func: str = "sum",
+    col_field: str = NO_COLUMN_FIELD,
+    value_type: str = VALUE_TYPE_MONTHLY,
+    selected_months: Optional[List[str]] = None,
+    selected_report_bases: Optional[List[str]] = None,
+    cache_key: Optional[Hashable] = None,
+) -> Optional[PivotResult]:
+    """
+    Pivot tabloyu arayüzden bağımsız olarak hesaplar.
+
+    Bu fonksiyon:
+    1. Seçili ay ve veri türlerinden değer sütunlarını belirler; her metriğin
+       sütunları oluşturulurken kaydedilir, toplamlar için ad taraması gerekmez
+    2. Sütun alanına göre düz, ay/metrik eksenli veya seyrek çapraz pivotu kurar
+    3. Satır toplamlarını ve gösterim/Excel formatlarını hazırlar
+
+    Parameters:
+        df (DataFrame): Pivot tabloya dönüştürülecek veri çerçevesi
+        row_col (List[str]): Satır alanları
+        agg_func (str): Toplama fonksiyonu (AGG_FUNCS)
+        col_field (str): Sütun alanı; NO_COLUMN_FIELD, AXIS_FIELDS veya genel bir sütun
+        value_type (str): VALUE_TYPE_MONTHLY veya VALUE_TYPE_CUMULATIVE
+        selected_months (List[str], optional): Seçili aylar; verilmezse tüm aylar
+        selected_report_bases (List[str], optional): Seçili veri türleri; verilmezse tümü
+        cache_key (Hashable, optional): Filtre parmak izi; pivot önbelleğinin anahtarı
+
+    Returns:
+        Optional[PivotResult]: Pivot sonucu veya değer sütunu bulunamazsa None
+    """
+    if selected_months is None:
+        selected_months = MONTHS
+    val_cols = pivot_value_options(df, value_type, selected_months, selected_report_bases)
+
+    value_columns = []
+    metric_columns = {val_col: [] for val_col in val_cols}
+    column_axes = []
+    if value_type == VALUE_TYPE_MONTHLY:
+        # Ayları MONTHS listesindeki sıraya göre sırala
+        for month in MONTHS:
+            for val_col in val_cols:
+                col_name = f"{month} {val_col}"
+                if col_name in df.columns and month in selected_months:
+                    value_columns.append(col_name)
+                    metric_columns[val_col].append(col_name)
+                    column_axes.append((month, val_col))
+    else:
+        for val_col in val_cols:
+            col_name = f"Kümüle {val_col}"
+            if col_name in df.columns:
+                value_columns.append(col_name)
+                metric_columns[val_col].append(col_name)
+                column_axes.append(("Kümüle", val_col))
+
+    if not row_col or not value_columns:
+        return None
+
+    notes = []
+    if agg_func == AGG_DISTINCT:
+        # Farklı değer sayısı tek sütundur; metrik toplamı ve ay/metrik yayılımı anlamsızdır
+        metric_columns = {}
+        if col_field in AXIS_FIELDS:
+            notes.append("Farklı değer sayısı ay/metrik eksenine yayılamaz; sütun alanı yok sayıldı.")
+            col_field = NO_COLUMN_FIELD
+
+    excel_pivot = None
+    if col_field in AXIS_FIELDS:
+        pivot_with_totals, row_totals_df = _axis_pivot(
+            df, row_col, value_columns, column_axes, metric_columns,
+            agg_func, value_type, col_field, cache_key,
+        )
+    elif col_field != NO_COLUMN_FIELD:
+        pivot_with_totals, row_totals_df, excel_pivot = _cross_pivot(
+            df, row_col, col_field, value_columns, metric_columns,
+            agg_func, value_type, cache_key, notes,
+        )
+    else:
+        # Pivot tablo: satır alanları bir kez kodlanır, toplama fonksiyonu
+        # değiştirildiğinde önbellekteki grup istatistikleri kullanılır
+        pivot = load_pivot(df, row_col, value_columns, agg_func, value_type, cache_key=cache_key)
+
+        # Satır toplamlarını hesapla
+        totals_dict = {
+            f"Toplam {val_col}": pivot[columns].sum(axis=1)
+            for val_col, columns in metric_columns.items()
+            if columns
+        }
+
+        # Toplamları DataFrame'e dönüştür ve pivot tabloya ekle (değerler sayısal kalır)
+        row_totals_df = pd.DataFrame(totals_dict, index=pivot.index)
+        pivot_with_totals = pd.concat([pivot, row_totals_df], axis=1)
+
+    # Adet dışındaki toplama fonksiyonları TL formatında gösterilir
+    pivot_formats = {} if agg_func in COUNT_AGG_FUNCS else infer_column_formats(pivot_with_totals, [])
+    totals_formats = {col: kind for col, kind in pivot_formats.items() if col in row_totals_df.columns}
+    set_column_formats(pivot_with_totals, pivot_formats)
+    set_column_formats(row_totals_df, totals_formats)
+    if excel_pivot is None:
+        excel_pivot, excel_formats = pivot_with_totals, pivot_formats
+    else:
+        excel_formats = {} if agg_func in COUNT_AGG_FUNCS else infer_column_formats(excel_pivot, [])
+
+    if agg_func in QUANTILE_AGG_FUNCS:
+        notes.append(
+            f"≈ {agg_func} değerleri grup bazında birleştirilebilir quantile özetlerinden "
+            f"hesaplanır; göreli hata en fazla %{PIVOT_QUANTILE_ACCURACY * 100:g}."
+        )
+    elif agg_func == AGG_DISTINCT:
+        notes.append(
+            f"≈ Farklı {PIVOT_DISTINCT_FIELD} sayısı HyperLogLog ile tahmin edilir; "
+            f"tipik hata %{104 / 2 ** (PIVOT_HLL_PRECISION / 2):.1f}."
+        )
+
+    return PivotResult(
+        pivot_with_totals, row_totals_df, excel_pivot,
+        pivot_formats, totals_formats, excel_formats, notes,
+    )
+
+
+def pivot_excel_bytes(result: PivotResult) -> bytes:
+    """
+    Pivot sonucunu "Pivot Tablo" ve (varsa) "Satır Toplamları" sayfalarıyla Excel'e yazar.
+
+    Parameters:
+        result (PivotResult): build_pivot çıktısı
+
+    Returns:
+        bytes: Excel dosyası içeriği
+    """
+    excel_buffer = BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
+        write_excel_sheet(writer, result.excel_table, "Pivot Tablo", result.excel_formats, index=True)
+        if not result.row_totals.empty:
+            write_excel_sheet(writer, result.row_totals, "Satır Toplamları", result.totals_formats, index=True)
+    return excel_buffer.getvalue()
+
 
 @handle_error
-def show_pivot_table(df: pd.DataFrame) -> Tuple[Optional[BytesIO], Optional[BytesIO]]:
+def show_pivot_table(
+    df: pd.DataFrame,
+    selected_months: Optional[List[str]] = None,
+    selected_report_bases: Optional[List[str]] = None,
+    cache_key: Optional[Hashable] = None,
+) -> Optional[bytes]:
     """
     Verilen bir DataFrame'den dinamik bir pivot tablo oluşturur ve görselleştirir.
-    Ayrıca oluşturulan pivot tabloyu Excel ve PNG formatlarında indirme seçenekleri sunar.
+    Ayrıca oluşturulan pivot tabloyu Excel formatında indirme seçeneği sunar.
 
     Kullanıcı arayüzü üzerinden:
     - Satır alanları (kategorik değişkenler)
-    - Değer alanı (FIXED_METRICS değerleri)
-    - Toplama fonksiyonu (sum, mean, max, min, count)
+    - Değer türü (aylık veya kümüle)
+    - Toplama fonksiyonu (sum, mean, max, min, count; yaklaşık median, p90, distinct)
+    - Sütun alanı (ay/metrik ekseni veya genel bir sütun; isteğe bağlı)
 
-    seçilerek pivot tablo oluşturulur.
+    seçilir; hesaplama build_pivot ile arayüzden bağımsız yapılır.
 
     Parametreler:
         df (pd.DataFrame): Pivot tabloya dönüştürülecek veri çerçevesi.
+        selected_months (List[str], optional): Kenar çubuğunda seçilen aylar; verilmezse tüm aylar.
+        selected_report_bases (List[str], optional): Kenar çubuğunda seçilen veri türleri; verilmezse tümü.
+        cache_key (Hashable, optional): Filtre parmak izi; pivot önbelleğinin anahtarı.
 
     Döndürür:
-        Tuple[Optional[BytesIO], Optional[BytesIO]]:
-            - `excel_buffer`: Oluşturulan pivot tablonun Excel dosyası olarak bellekteki temsili.
-            - `pivot_buffer`: Pivot tablonun PNG görseli olarak bellekteki temsili (görselleştirme mümkünse).
-              Görselleştirme yapılamazsa `None` döner.
+        Optional[bytes]: Pivot tablonun Excel dosyası içeriği veya tablo oluşturulamadıysa None.
 
     Notlar:
         - Eğer sayısal sütun yoksa veya gerekli seçimler yapılmadıysa, işlem gerçekleştirilmez.
-        - Görselleştirme, maksimum 15 sütunla sınırlıdır.
         - Hatalar kullanıcı dostu şekilde arayüzde gösterilir.
         - Veriler orijinal sırasını korur, aylar kronolojik sırada gösterilir.
+        - Grup istatistikleri önbelleğe alınır; toplama fonksiyonu değişince veri yeniden gruplanmaz.
     """
 
     st.subheader("📊 Dinamik Pivot Tablo Oluşturucu")
 
+    if selected_months is None:
+        selected_months = MONTHS
+
     # Sütunları numerik ve kategorik olarak ayır
     non_numeric_cols = [col for col in df.columns if col not in df.select_dtypes(include="number").columns]
 
     # Kullanıcı seçimleri
     row_col = st.multiselect("🧱 Satır Alanları", non_numeric_cols)
-    
-    # Sidebar'dan seçilen ayları al
-    selected_months = st.session_state.get("month_filter", ["Hepsi"])
-    if "Hepsi" in selected_months:
-        selected_months = MONTHS
 
     # Değer türü seçimi
     value_type = st.radio(
         "📊 Değer Türü",
-        ["Aylık Değerler", "Kümüle Değerler"],
+        [VALUE_TYPE_MONTHLY, VALUE_TYPE_CUMULATIVE],
         horizontal=True
     )
 
-    # Sidebar'dan seçilen report base'leri al
-    selected_report_bases = st.session_state.get("report_base_filter", ["Hepsi"])
-    if "Hepsi" in selected_report_bases:
-        selected_report_bases = FIXED_METRICS
-
-    # İzin verilen metrikleri filtrele
-    allowed_metrics = [
-        metric for metric in FIXED_METRICS
-        if "Hepsi" in selected_report_bases or
-           any(metric in base for base in selected_report_bases)
-    ]
-
-    # Değer alanı seçimi
-    value_options = []
-    if value_type == "Aylık Değerler":
-        for metric in allowed_metrics:
-            # Seçilen aylardan en az birinde bu değer varsa ekle
-            for month in selected_months:
-                col_name = f"{month} {metric}"
-                if col_name in df.columns:
-                    value_options.append(metric)
-                    break
-    else:  # Kümüle Değerler
-        for metric in allowed_metrics:
-            col_name = f"Kümüle {metric}"
-            if col_name in df.columns:
-                value_options.append(metric)
-
-    if not value_options:
+    if not pivot_value_options(df, value_type, selected_months, selected_report_bases):
         display_friendly_error(
             f"Seçilen tür için değerler bulunamadı",
             "Farklı bir değer türü seçin veya veri formatını kontrol edin."
         )
-        return None, None
-
-    # Otomatik olarak tüm izin verilen metrikleri seç
-    val_cols = value_options
+        return None
 
+    agg_options = [
+        func for func in AGG_FUNCS
+        if func != AGG_DISTINCT or PIVOT_DISTINCT_FIELD in df.columns
+    ]
     agg_func = st.selectbox(
-        "🔧 Toplama Fonksiyonu", ["sum", "mean", "max", "min", "count"]
+        "🔧 Toplama Fonksiyonu", agg_options,
+        format_func=lambda func: AGG_LABELS.get(func, func),
     )
 
-    if row_col and val_cols:
-        try:
-            # Seçilen değerler için veri sütunlarını belirle
-            value_columns = []
-            if value_type == "Aylık Değerler":
-                # Ayları MONTHS listesindeki sıraya göre sırala
-                for month in MONTHS:
-                    for val_col in val_cols:
-                        col_name = f"{month} {val_col}"
-                        if col_name in df.columns and month in selected_months:
-                            value_columns.append(col_name)
-            else:  # Kümüle Değerler
-                for val_col in val_cols:
-                    col_name = f"Kümüle {val_col}"
-                    if col_name in df.columns:
-                        value_columns.append(col_name)
-            
-            if not value_columns:
-                display_friendly_error(
-                    f"Seçilen değerler için veri bulunamadı",
-                    "Farklı değerler seçin veya veri formatını kontrol edin."
-                )
-                return None, None
-
-            # Pivot tablo oluştur
-            pivot = pd.pivot_table(
-                df,
-                index=row_col,
-                values=value_columns,
-                aggfunc=agg_func,
-                fill_value=0,
-                sort=False  # Sıralamayı devre dışı bırak
-            )
-                
-            # Aylık değerler için sütunları MONTHS sırasına göre düzenle
-            if value_type == "Aylık Değerler":
-                # Mevcut sütun isimlerini al
-                current_columns = pivot.columns.tolist()
-                # MONTHS sırasına göre sırala
-                ordered_columns = []
-                for month in MONTHS:
-                    for col in current_columns:
-                        if col.startswith(month):
-                            ordered_columns.append(col)
-                # Sütunları yeniden sırala
-                pivot = pivot[ordered_columns]
-
-            # Pivot tabloyu TL formatında göster
-            display_pivot = format_currency_columns(pivot.copy(), [row_col])
-
-            # Satır toplamlarını hesapla ve göster
-            if value_type == "Aylık Değerler":
-                # Her bir değer alanı için ayrı toplam hesapla
-                totals_dict = {}
-                for val_col in val_cols:
-                    # İlgili değer alanına ait sütunları bul
-                    val_columns = [col for col in pivot.columns if col.endswith(f" {val_col}")]
-                    if val_columns:
-                        # Bu değer alanı için toplam hesapla
-                        totals_dict[f"Toplam {val_col}"] = pivot[val_columns].sum(axis=1)
-
-                # Toplamları DataFrame'e dönüştür
-                row_totals_df = pd.DataFrame(totals_dict)
-
-                # Toplamları TL formatında düzenle
-                formatted_totals = format_currency_columns(row_totals_df.copy(), [])
-
-                # Formatlanmış toplamları pivot tabloya ekle
-                for col_name in formatted_totals.columns:
-                    display_pivot[col_name] = formatted_totals[col_name]
-            else:  # Kümüle Değerler
-                # Her bir değer alanı için ayrı toplam hesapla
-                totals_dict = {}
-                for val_col in val_cols:
-                    # İlgili değer alanına ait sütunları bul
-                    val_columns = [col for col in pivot.columns if col.startswith(f"Kümüle {val_col}")]
-                    if val_columns:
-                        # Bu değer alanı için toplam hesapla
-                        totals_dict[f"Toplam {val_col}"] = pivot[val_columns].sum(axis=1)
-
-                # Toplamları DataFrame'e dönüştür
-                row_totals_df = pd.DataFrame(totals_dict)
-
-                # Toplamları TL formatında düzenle
-                formatted_totals = format_currency_columns(row_totals_df.copy(), [])
-
-                # Formatlanmış toplamları pivot tabloya ekle
-                for col_name in formatted_totals.columns:
-                    display_pivot[col_name] = formatted_totals[col_name]
-
-            st.dataframe(display_pivot, use_container_width=True)
-
-            # Satır toplamlarını TL formatında göster
-            display_totals = format_currency_columns(row_totals_df.copy(), [])
-            st.markdown("#### ➕ Satır Toplamları")
-            st.dataframe(display_totals, use_container_width=True)
-
-            # Excel export
-            excel_buffer = BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine="openpyxl") as writer:
-                display_pivot.to_excel(writer, sheet_name="Pivot Tablo")
-                display_totals.to_excel(writer, sheet_name="Satır Toplamları")
-            st.download_button(
-                label="⬇ İndir (Excel)",
-                data=excel_buffer.getvalue(),
-                file_name="pivot_tablo.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-            return excel_buffer
+    # Sütun alanı: ay/metrik eksenlerinden biri veya satırlarda kullanılmayan bir genel sütun
+    column_options = [NO_COLUMN_FIELD] + AXIS_FIELDS + [
+        col for col in non_numeric_cols if col in GENERAL_COLUMNS and col not in row_col
+    ]
+    col_field = st.selectbox("↔️ Sütun Alanı", column_options)
 
-        except Exception as e:
+    if not row_col:
+        st.info("Lütfen satır ve değer alanlarını seçin.")
+        return None
+
+    try:
+        result = build_pivot(
+            df, row_col, agg_func, col_field, value_type,
+            selected_months, selected_report_bases, cache_key=cache_key,
+        )
+        if result is None:
             display_friendly_error(
-                f"Pivot tablo oluşturma hatası: {str(e)}",
-                "Veri setinin yapısını kontrol edin veya farklı sütunlar seçin."
+                f"Seçilen değerler için veri bulunamadı",
+                "Farklı değerler seçin veya veri formatını kontrol edin."
             )
-            return None, None
-    else:
-        st.info("Lütfen satır ve değer alanlarını seçin.")
-        return None, None
+            return None
+
+        st.dataframe(render_table(result.table, result.formats), use_container_width=True)
+        for note in result.notes:
+            st.caption(note)
+
+        # Satır toplamlarını TL formatında göster
+        if not result.row_totals.empty:
+            st.markdown("#### ➕ Satır Toplamları")
+            st.dataframe(render_table(result.row_totals, result.totals_formats), use_container_width=True)
+
+        # Excel export
+        excel_bytes = pivot_excel_bytes(result)
+        st.download_button(
+            label="⬇ İndir (Excel)",
+            data=excel_bytes,
+            file_name="pivot_tablo.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+        return excel_bytes
+
+    except Exception as e:
+        display_friendly_error(
+            f"Pivot tablo oluşturma hatası: {str(e)}",
+            "Veri setinin yapısını kontrol edin veya farklı sütunlar seçin."
+        )
+        return None
@@ -6,15 +6,17 @@ raporlar oluşturur.
 
 Fonksiyonlar:
     - generate_pdf_report: Finansal performans raporu PDF dosyası oluşturur
-    - add_chart_to_pdf: PDF'e grafik ekler
-    - format_currency: Para birimini formatlar
+    - load_image_info: PNG görüntüsünü bellekte fpdf görüntü kaydına dönüştürür
+    - prepare_image_info: PNG görüntüsünü önbelleksiz olarak fpdf görüntü kaydına dönüştürür
+    - image_name: Görüntü baytları için fpdf görüntü tablosu adını döndürür
 
 Özellikler:
     - Özelleştirilebilir rapor şablonları
-    - Grafik entegrasyonu
+    - Grafik entegrasyonu (görüntüler diske yazılmadan bellekten gömülür)
     - Çoklu dil desteği
     - Hata yönetimi
-    - Geçici dosya yönetimi
+    - Font ölçüleri süreç başına bir kez yüklenir
+    - Binlerce satırlık tablolar satır bazında sayfalanır, başlık her sayfada tekrarlanır
 
 Kullanım:
     from utils.report import generate_pdf_report
@@ -33,13 +35,144 @@ Kullanım:
 """
 
 from fpdf import FPDF
+import hashlib
 import os
-import tempfile
-from typing import Optional
+import struct
+import threading
+from typing import Any, Dict, Optional, Tuple
 from io import BytesIO
+import numpy as np
+import pandas as pd
 from datetime import datetime
+from PIL import Image
+from config.constants import PDF_IMAGE_CACHE_ENTRIES, PDF_IMAGE_COMPRESSION_LEVEL
+from utils.cache import ResultCache
 from utils.error_handler import handle_error, display_friendly_error
 
+FONT_PATH_REGULAR = "utils/fonts/DejaVuSans.ttf"
+FONT_PATH_BOLD = "utils/fonts/DejaVuSans-Bold.ttf"
+
+_font_entries: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+_font_lock = threading.Lock()
+_image_info_cache = ResultCache(PDF_IMAGE_CACHE_ENTRIES)
+
+
+class GlyphSubset(list):
+    """
+    fpdf'in kullanılan glif listesi için tekrarsız, küme destekli liste.
+
+    fpdf 1.7.2 yazılan her karakteri listeye tekrar kontrolü yapmadan ekler ve
+    çıktı sırasında 65 bin karakterin her biri için `cid in subset` araması
+    yapar; uzun tablolarda bu arama saniyeler sürer. Bu sınıf ekleme sırasını
+    korur, tekrarları atlar ve üyelik aramasını kümeden yapar.
+    """
+
+    def __init__(self, values=()):
+        unique = list(dict.fromkeys(values))
+        super().__init__(unique)
+        self._seen = set(unique)
+
+    def append(self, value):
+        if value not in self._seen:
+            self._seen.add(value)
+            super().append(value)
+
+    def __contains__(self, value):
+        return value in self._seen
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._seen = set(self)
+
+
+def _load_font_entries() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    DejaVu fontlarını süreç başına bir kez yükler ve fpdf font kayıtlarını döndürür.
+
+    Returns:
+        Tuple[Dict, Dict]: (fonts, font_files) kayıtları; her PDF bunların kopyasını kullanır
+    """
+    global _font_entries
+    if _font_entries is None:
+        with _font_lock:
+            if _font_entries is None:
+                loader = FPDF()
+                loader.add_font("DejaVu", "", FONT_PATH_REGULAR, uni=True)
+                loader.add_font("DejaVu", "B", FONT_PATH_BOLD, uni=True)
+                _font_entries = (loader.fonts, loader.font_files)
+    return _font_entries
+
+
+def _png_idat(data: bytes) -> bytes:
+    """PNG baytlarından birleştirilmiş IDAT (zlib) akışını çıkarır."""
+    chunks = []
+    pos = 8  # PNG imzası
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        if kind == b"IDAT":
+            chunks.append(data[pos + 8:pos + 8 + length])
+        elif kind == b"IEND":
+            break
+        pos += 12 + length
+    return b"".join(chunks)
+
+
+def image_name(data: bytes) -> str:
+    """Görüntü baytları için fpdf görüntü tablosunda kullanılan adı döndürür."""
+    return f"bellek:{hashlib.sha1(data).hexdigest()}"
+
+
+def prepare_image_info(data: bytes) -> Dict[str, Any]:
+    """
+    PNG görüntüsünü fpdf'in görüntü kaydı biçimine dönüştürür (önbelleksiz).
+
+    fpdf 1.7.2 görüntüleri dosya yolundan okur ve alfa kanallı PNG'leri saf
+    Python ile ayrıştırır; yüksek çözünürlüklü bir grafik saniyeler sürer.
+    Bu fonksiyon görüntüyü Pillow ile beyaz zemine düzleştirip yeniden PNG
+    olarak kodlar ve IDAT akışını PNG öngörücü parametreleriyle doğrudan
+    gömer. Süreç havuzunda çalışabilmesi için modül durumuna dokunmaz.
+
+    Parameters:
+        data (bytes): PNG baytları
+
+    Returns:
+        Dict: fpdf görüntü kaydı (w, h, cs, bpc, f, dp, data)
+    """
+    image = Image.open(BytesIO(data))
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        flat = Image.new("RGB", image.size, (255, 255, 255))
+        flat.paste(image, mask=image.getchannel("A"))
+        image = flat
+    elif image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    colors = 1 if image.mode == "L" else 3
+    encoded = BytesIO()
+    image.save(encoded, format="PNG", compress_level=PDF_IMAGE_COMPRESSION_LEVEL)
+    return {
+        "w": image.width,
+        "h": image.height,
+        "cs": "DeviceGray" if colors == 1 else "DeviceRGB",
+        "bpc": 8,
+        "f": "FlateDecode",
+        "dp": f"/Predictor 15 /Colors {colors} /BitsPerComponent 8 /Columns {image.width}",
+        "data": _png_idat(encoded.getvalue()),
+    }
+
+
+def load_image_info(data: bytes) -> Dict[str, Any]:
+    """
+    prepare_image_info'nun içerik karması ile önbelleğe alınan sürümü.
+
+    Parameters:
+        data (bytes): PNG baytları
+
+    Returns:
+        Dict: fpdf görüntü kaydı
+    """
+    key = hashlib.sha1(data).hexdigest()
+    return _image_info_cache.get_or_compute(key, lambda: prepare_image_info(data))
+
 
 class PDF(FPDF):
     def __init__(self):
@@ -49,8 +182,8 @@ class PDF(FPDF):
         self.set_auto_page_break(True, margin=20)
         
         # Font paths for the DejaVu fonts
-        self.font_path_regular = "utils/fonts/DejaVuSans.ttf"
-        self.font_path_bold = "utils/fonts/DejaVuSans-Bold.ttf"
+        self.font_path_regular = FONT_PATH_REGULAR
+        self.font_path_bold = FONT_PATH_BOLD
 
         # Check if font files exist
         if not os.path.exists(self.font_path_regular) or not os.path.exists(self.font_path_bold):
@@ -61,9 +194,13 @@ class PDF(FPDF):
             return
 
         try:
-            # Add fonts with the correct paths
-            self.add_font("DejaVu", "", self.font_path_regular, uni=True)
-            self.add_font("DejaVu", "B", self.font_path_bold, uni=True)
+            # Font ölçüleri süreç başına bir kez yüklenir; her belge kendi
+            # alt küme (subset) listesiyle kayıtların kopyasını kullanır
+            fonts, font_files = _load_font_entries()
+            for key, entry in fonts.items():
+                self.fonts[key] = dict(entry, subset=GlyphSubset(entry["subset"]))
+            for key, entry in font_files.items():
+                self.font_files[key] = dict(entry)
         except Exception as e:
             display_friendly_error(
                 f"Font yükleme hatası: {str(e)}",
@@ -102,21 +239,65 @@ class PDF(FPDF):
         self.multi_cell(0, 6, body)
         self.ln()
 
-    def add_table(self, headers, data, col_widths):
+    def add_table(self, headers, data, col_widths, row_height=10, font_size=10, aligns=None):
+        """
+        Tabloyu satır bazında sayfalayarak yazar.
+
+        Sayfa sonu her satırdan önce bir kez denetlenir; satırlar sayfalar
+        arasında bölünmez ve her yeni sayfada başlık satırı tekrarlanır.
+
+        Parameters:
+            headers (list): Sütun başlıkları
+            data (Iterable[list]): Satırlar
+            col_widths (list): Sütun genişlikleri (mm)
+            row_height (float): Satır yüksekliği (mm)
+            font_size (int): İçerik yazı boyutu
+            aligns (list, optional): Sütun hizalamaları ("L", "C", "R"); varsayılan ortalı
+        """
+        aligns = aligns or ["C"] * len(headers)
+
+        def write_header():
+            self.set_font('DejaVu', 'B', 11)
+            self.set_fill_color(240, 240, 240)
+            for width, header in zip(col_widths, headers):
+                self.cell(width, 10, header, 1, 0, 'C', True)
+            self.ln()
+            self.set_font('DejaVu', '', font_size)
+
         # Tablo başlığı
-        self.set_font('DejaVu', 'B', 11)
-        self.set_fill_color(240, 240, 240)
-        for i, header in enumerate(headers):
-            self.cell(col_widths[i], 10, header, 1, 0, 'C', True)
-        self.ln()
-        
+        if self.y + 10 + row_height > self.page_break_trigger:
+            self.add_page()
+        write_header()
+
         # Tablo içeriği
-        self.set_font('DejaVu', '', 10)
         for row in data:
-            for i, cell in enumerate(row):
-                self.cell(col_widths[i], 10, str(cell), 1, 0, 'C')
+            if self.y + row_height > self.page_break_trigger:
+                self.add_page()
+                write_header()
+            for width, cell, align in zip(col_widths, row, aligns):
+                self.cell(width, row_height, str(cell), 1, 0, align)
             self.ln()
 
+    def add_image_info(self, name: str, info: Dict[str, Any], w: float = 0, h: float = 0):
+        """
+        Önceden hazırlanmış görüntü kaydını (prepare_image_info çıktısı) sayfaya ekler.
+
+        Kayıt fpdf'in görüntü tablosuna yazılır; fpdf aynı adı gördüğünde dosya okumaz.
+        """
+        if name not in self.images:
+            info = dict(info)
+            info["i"] = len(self.images) + 1
+            self.images[name] = info
+        self.image(name, w=w, h=h, type="png")
+
+    def add_image_bytes(self, data: bytes, w: float = 0, h: float = 0):
+        """PNG görüntüsünü diske yazmadan sayfaya ekler (görüntü kaydı önbellekli)."""
+        name = image_name(data)
+        if name in self.images:
+            self.image(name, w=w, h=h, type="png")
+        else:
+            self.add_image_info(name, load_image_info(data), w=w, h=h)
+
     def add_metric_card(self, title, value, change=None):
         self.set_font('DejaVu', 'B', 11)
         self.cell(0, 10, title, 0, 1, 'L')
@@ -137,6 +318,7 @@ def generate_pdf_report(
     variance_pct: float,
     img_buffer: Optional[BytesIO] = None,
     comparative_img_buffer: Optional[BytesIO] = None,
+    alerts: Optional[pd.DataFrame] = None,
 ) -> Optional[bytes]:
     """
     Finansal performans raporu PDF dosyası oluşturur.
@@ -148,6 +330,7 @@ def generate_pdf_report(
         variance_pct (float): Fark yüzdesi değeri
         img_buffer (BytesIO, optional): Trend grafik görüntüsü
         comparative_img_buffer (BytesIO, optional): Karşılaştırma grafik görüntüsü
+        alerts (DataFrame, optional): Uyarı motorundan sorgulanmış bütçe aşımları
         
     Returns:
         Optional[bytes]: PDF içeriği byte cinsinden veya None
@@ -155,8 +338,11 @@ def generate_pdf_report(
     pdf = PDF()
     pdf.add_page()
 
-    # 1. Özet Bölümü
-    pdf.chapter_title("1. Özet")
+    # Grafik ve uyarı bölümleri isteğe bağlı olduğundan bölümler sırayla numaralandırılır
+    section = 1
+
+    # Özet Bölümü
+    pdf.chapter_title(f"{section}. Özet")
     summary = f"""
     Bu rapor, şirketin finansal performansını detaylı bir şekilde analiz etmektedir. 
     Rapor, bütçe ve fiili harcamalar arasındaki farkları, trend analizlerini ve 
@@ -173,8 +359,9 @@ def generate_pdf_report(
     """
     pdf.chapter_body(summary)
 
-    # 2. Finansal Metrikler
-    pdf.chapter_title("2. Finansal Metrikler")
+    # Finansal Metrikler
+    section += 1
+    pdf.chapter_title(f"{section}. Finansal Metrikler")
     
     # Metrikler tablosu
     headers = ["Metrik", "Değer", "Değişim"]
@@ -201,9 +388,10 @@ def generate_pdf_report(
     """
     pdf.chapter_body(metrics_explanation)
 
-    # 3. Trend Analizi
+    # Trend Analizi
     if img_buffer:
-        pdf.chapter_title("3. Trend Analizi")
+        section += 1
+        pdf.chapter_title(f"{section}. Trend Analizi")
         trend_explanation = """
         Trend analizi, finansal performansın zaman içindeki değişimini gösterir. 
         Bu analiz, harcama kalıplarını ve bütçe sapmalarının nedenlerini anlamak 
@@ -214,20 +402,17 @@ def generate_pdf_report(
         pdf.chapter_body(trend_explanation)
         
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_img:
-                tmp_img.write(img_buffer.getvalue())
-                tmp_img.flush()
-                pdf.image(tmp_img.name, w=pdf.w - 40)
-            os.unlink(tmp_img.name)
+            pdf.add_image_bytes(img_buffer.getvalue(), w=pdf.w - 40)
         except Exception as e:
             display_friendly_error(
                 f"Trend grafiği PDF'e eklenemedi: {str(e)}",
                 "Grafik verilerini kontrol edin."
             )
 
-    # 4. Karşılaştırmalı Analiz
+    # Karşılaştırmalı Analiz
     if comparative_img_buffer:
-        pdf.chapter_title("4. Karşılaştırmalı Analiz")
+        section += 1
+        pdf.chapter_title(f"{section}. Karşılaştırmalı Analiz")
         comparative_explanation = """
         Karşılaştırmalı analiz, farklı kategoriler veya dönemler arasındaki 
         finansal performansı karşılaştırır. Bu analiz, en iyi ve en kötü 
@@ -239,19 +424,39 @@ def generate_pdf_report(
         pdf.chapter_body(comparative_explanation)
         
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_img:
-                tmp_img.write(comparative_img_buffer.getvalue())
-                tmp_img.flush()
-                pdf.image(tmp_img.name, w=pdf.w - 40)
-            os.unlink(tmp_img.name)
+            pdf.add_image_bytes(comparative_img_buffer.getvalue(), w=pdf.w - 40)
         except Exception as e:
             display_friendly_error(
                 f"Karşılaştırmalı analiz grafiği PDF'e eklenemedi: {str(e)}",
                 "Grafik verilerini kontrol edin."
             )
 
-    # 5. Sonuç ve Öneriler
-    pdf.chapter_title("5. Sonuç ve Öneriler")
+    # Bütçe Aşım Uyarıları
+    if alerts is not None and not alerts.empty:
+        section += 1
+        pdf.chapter_title(f"{section}. Bütçe Aşım Uyarıları")
+        counts = alerts["Kural"].value_counts()
+        pdf.chapter_body(
+            "Uyarı motoru tarafından tespit edilen aşımlar: "
+            + ", ".join(f"{rule}: {count}" for rule, count in counts.items())
+        )
+        top_alerts = alerts.head(15)
+        alert_rows = [
+            [
+                str(row["Masraf Yeri Adı"])[:28],
+                row["Ay"],
+                row["Kural"],
+                # Bütçesi sıfır olup harcama yapılan hücrelerin kullanımı sonsuzdur
+                "∞" if np.isinf(row["Kullanım (%)"]) else f"{row['Kullanım (%)']:.1f} %",
+            ]
+            for _, row in top_alerts.iterrows()
+        ]
+        pdf.add_table(["Masraf Yeri", "Ay", "Kural", "Kullanım"], alert_rows, [70, 30, 40, 30])
+        pdf.ln(5)
+
+    # Sonuç ve Öneriler
+    section += 1
+    pdf.chapter_title(f"{section}. Sonuç ve Öneriler")
     conclusion = f"""
     Finansal performans analizi sonucunda elde edilen bulgular ve öneriler:
     
@@ -0,0 +1,568 @@
+"""
+report_bundle.py - ZIP ve PDF rapor dosyalarını Streamlit oturumundan bağımsız üretir.
+
+Panelin "⬇ İndir (ZIP)" ve "📄 PDF Raporu" sekmelerinin ürettiği dosyalar
+açık girdilerden (filtre ve ön ayar tanımı) hesaplanır. Komut satırı toplu
+raporlama aracı (batch.py) ve panelin ZIP sekmesi aynı yardımcıları kullanır.
+
+Fonksiyonlar:
+    - load_report_spec: JSON rapor tanımını veya adlandırılmış ön ayarını okur
+    - prepare_final_dataframe: Seçili ay, veri türü ve kümüle sütunlarıyla son veri çerçevesini hazırlar
+    - build_report_tables: ZIP'teki Excel sayfalarının tablolarını hesaplar
+    - build_chart_specs: ZIP ve özet PDF grafiklerinin tanımlarını oluşturur
+    - report_workbooks: Tabloları ZIP'teki Excel dosyalarının sayfalarına dağıtır
+    - build_report_zip: Excel dosyalarını ve grafikleri paralel üretip ZIP arşivine akıtır
+    - run_report: Tek bir veri çerçevesi için tüm rapor dosyalarını üretir
+
+Rapor tanımı (JSON):
+    {
+        "filters": {"İlgili 1": ["Satış"]},
+        "months": ["Ocak", "Şubat"],
+        "pdf": "Özet",
+        "split_by": "Masraf Yeri Adı",
+        "pivot": {"rows": ["İlgili 1"], "agg": "sum"}
+    }
+
+    Verilmeyen alanlar panelin varsayılanlarını ("Hepsi") kullanır. Birden fazla
+    tanım {"presets": {"ad": {...}}} biçiminde tek dosyada tutulabilir.
+
+Kullanım:
+    from utils.report_bundle import load_report_spec, run_report
+
+    run = run_report(df, load_report_spec("rapor.json", preset="aylik"))
+    open("rapor.zip", "wb").write(run.files[ZIP_FILENAME])
+"""
+
+import atexit
+import json
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.constants import (
+    MONTHS,
+    GENERAL_COLUMNS,
+    REPORT_BASE_COLUMNS,
+    CUMULATIVE_COLUMNS,
+    FIXED_METRICS,
+    REPORT_ZIP_COMPRESSION_LEVEL,
+    REPORT_ZIP_WORKERS,
+)
+from utils.alert_engine import compute_alert_index, query_alerts, split_anomalies, CUMULATIVE_PERIOD
+from utils.cache import filter_fingerprint
+from utils.category_analysis import CHART_IMAGE_SIZE, build_category_figures
+from utils.chart_export import ChartSpec, chart_spec, render_specs, submit_specs
+from utils.comparative_analysis import build_comparative_figure, comparative_totals
+from utils.data_preview import column_totals, compute_group_totals, grouped_summary
+from utils.filters import apply_filter_selections
+from utils.formatting import get_column_formats
+from utils.kpi import calculate_kpi_metrics
+from utils.metrics import calculate_metrics
+from utils.pivot_table import NO_COLUMN_FIELD, VALUE_TYPE_MONTHLY, build_pivot, pivot_excel_bytes
+from utils.report import generate_pdf_report
+from utils.report_sections import generate_section_report
+from utils.trend_analysis import build_trend_figure
+from utils.trend_engine import TREND_METRICS, load_trend_series
+from utils.xlsx_export import WorkbookSheet, timed_workbook_bytes
+
+# Çıktı dosya adları (panelin indirme adlarıyla aynı)
+ZIP_FILENAME = "rapor.zip"
+PDF_FILENAME = "rapor.pdf"
+PIVOT_FILENAME = "pivot_tablo.xlsx"
+
+# Özet PDF türü; diğer değerler ayrıntılı raporun bölüm alanıdır
+PDF_SUMMARY = "Özet"
+
+# ZIP'teki grafik dosyaları
+TREND_IMAGE = "trend.png"
+COMPARATIVE_IMAGE = "karsilastirma_analizi.png"
+CATEGORY_IMAGE_DIR = "kategori_analizi"
+
+# ZIP'teki Excel dosyaları: dosya adı -> sayfa adı -> tablo anahtarı
+# (tablo anahtarları paneldeki session_state anahtarlarıyla aynıdır)
+ZIP_EXCEL_FILES = {
+    "masraf_cesidi_grubu_1_analizi.xlsx": {
+        "Özet": "masraf_grubu_ozet",
+        "Sayısal Toplam": "masraf_grubu_toplam_sayisal",
+        "Toplamlar": "masraf_grubu_toplamlar",
+        "Genel Toplam": "masraf_grubu_toplamlar_sayisal",
+    },
+    "ilgili_1_analizi.xlsx": {
+        "Özet": "ilgili1_ozet",
+        "Sayısal Toplam": "ilgili1_toplam_sayisal",
+        "Toplamlar": "ilgili1_toplamlar",
+        "Genel Toplam": "ilgili1_toplamlar_sayisal",
+    },
+    "ham_veri.xlsx": {
+        "Ham Veri": "ham_veri",
+        "Sayısal Toplam": "ham_veri_toplam_sayisal",
+    },
+}
+
+# Veri sekmesindeki grup tabloları: tablo anahtarı öneki -> grup sütunu
+TABLE_GROUPS = {
+    "masraf_grubu": "Masraf Çeşidi Grubu 1",
+    "ilgili1": "İlgili 1",
+}
+
+
+class ReportSpec(NamedTuple):
+    """
+    Panel seçimlerinin arayüzsüz karşılığı.
+
+    Listelerde None veya "Hepsi" tüm seçenekler anlamına gelir.
+
+    Attributes:
+        filters (Dict[str, List[str]], optional): Kenar çubuğu filtreleri (sütun -> değerler)
+        months (List[str], optional): Kenar çubuğu ayları
+        report_bases (List[str], optional): Veri türleri
+        cumulative (List[str], optional): Kümülatif sütunlar ("Kümüle ..." adlarıyla)
+        table_months (List[str], optional): Veri sekmesi tablolarının ayları
+        show_cumulative (bool): Veri sekmesi tablolarında kümüle sütunlar
+        comparative_group (str): Karşılaştırmalı analiz gruplama kriteri
+        category_group (str): Kategori analizi gruplama kriteri
+        category_top_n (int): Kategori grafiklerinde ayrı gösterilen grup sayısı
+        pdf (str, optional): PDF_SUMMARY, ayrıntılı rapor bölüm alanı veya PDF istenmiyorsa None
+        split_by (str, optional): Toplu çalıştırmada her değer için ayrı rapor üretilecek sütun
+        pivot (Dict[str, Any], optional): Pivot tablo ({"rows", "agg", "columns", "values"})
+    """
+
+    filters: Optional[Dict[str, List[str]]] = None
+    months: Optional[List[str]] = None
+    report_bases: Optional[List[str]] = None
+    cumulative: Optional[List[str]] = None
+    table_months: Optional[List[str]] = None
+    show_cumulative: bool = False
+    comparative_group: str = GENERAL_COLUMNS[0]
+    category_group: str = "Masraf Çeşidi Grubu 1"
+    category_top_n: int = 12
+    pdf: Optional[str] = PDF_SUMMARY
+    split_by: Optional[str] = None
+    pivot: Optional[Dict[str, Any]] = None
+
+
+class ReportRun(NamedTuple):
+    """
+    run_report çıktısı.
+
+    Attributes:
+        files (Dict[str, bytes]): Dosya adı -> içerik
+        kpi (Dict[str, float]): calculate_kpi_metrics çıktısı
+        rows (int): Filtrelenmiş satır sayısı
+    """
+
+    files: Dict[str, bytes]
+    kpi: Dict[str, float]
+    rows: int
+
+
+def load_report_spec(path: Optional[str] = None, preset: Optional[str] = None) -> ReportSpec:
+    """
+    JSON rapor tanımını okur.
+
+    Dosya tek bir tanım veya {"presets": {ad: tanım}} biçiminde ön ayarlar
+    içerebilir; ön ayar dosyasında preset zorunludur.
+
+    Parameters:
+        path (str, optional): JSON dosyası; verilmezse varsayılan tanım
+        preset (str, optional): Ön ayar adı
+
+    Returns:
+        ReportSpec: Rapor tanımı
+
+    Raises:
+        ValueError: Ön ayar bulunamazsa veya bilinmeyen alan varsa
+    """
+    if path is None:
+        if preset is not None:
+            raise ValueError("Ön ayar için bir rapor tanımı dosyası verilmelidir.")
+        return ReportSpec()
+
+    with open(path, encoding="utf-8") as spec_file:
+        data = json.load(spec_file)
+
+    if "presets" in data:
+        presets = data["presets"]
+        if preset not in presets:
+            raise ValueError(f"Ön ayar bulunamadı: {preset}. Mevcut ön ayarlar: {', '.join(presets)}")
+        data = presets[preset]
+    elif preset is not None:
+        raise ValueError(f"{path} ön ayar içermiyor.")
+
+    unknown = sorted(set(data) - set(ReportSpec._fields))
+    if unknown:
+        raise ValueError(f"Bilinmeyen rapor tanımı alanları: {', '.join(unknown)}")
+    return ReportSpec(**data)
+
+
+def _resolve(selected: Optional[Sequence[str]], options: Sequence[str]) -> List[str]:
+    """None veya "Hepsi" içeren seçimleri tüm seçeneklere çevirir."""
+    if selected is None or "Hepsi" in selected:
+        return list(options)
+    return list(selected)
+
+
+def prepare_final_dataframe(df, filtered_df, selected_months, selected_report_bases, selected_cumulative):
+    """
+    Son veri çerçevesini hazırlar.
+    """
+    # Veri çerçevesini optimize et
+    filtered_df = filtered_df.copy()
+    numeric_cols = filtered_df.select_dtypes(include=[np.number]).columns
+    filtered_df[numeric_cols] = filtered_df[numeric_cols].fillna(0)
+
+    # Sütun seçimi için mapping oluştur
+    column_mapping = {
+        'general': GENERAL_COLUMNS.copy(),
+        'monthly': [
+            f"{month} {base_col}"
+            for month in selected_months
+            for base_col in selected_report_bases
+            if f"{month} {base_col}" in filtered_df.columns
+        ],
+        'cumulative': [
+            cum_col for cum_col in selected_cumulative
+            if cum_col in filtered_df.columns
+        ]
+    }
+
+    # Tüm sütunları birleştir
+    selected_columns = (
+        column_mapping['general'] +
+        column_mapping['monthly'] +
+        column_mapping['cumulative']
+    )
+
+    return filtered_df[selected_columns]
+
+
+def build_report_tables(
+    filtered_df: pd.DataFrame,
+    final_df: pd.DataFrame,
+    selected_months: List[str],
+    selected_report_bases: List[str],
+    table_months: List[str],
+    show_cumulative: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Veri sekmesindeki tabloları panelin session_state anahtarlarıyla hesaplar.
+
+    Bu fonksiyon:
+    1. Her grup için ay bazlı özet ve sayısal sütun toplamlarını hesaplar
+    2. Seçili aylar için grup toplamlarını ve genel toplamı hesaplar
+    3. Ham veriyi ve sayısal toplamlarını ekler
+
+    Parameters:
+        filtered_df (DataFrame): Kenar çubuğu filtreleri uygulanmış veri (sayısal boşluklar 0)
+        final_df (DataFrame): prepare_final_dataframe çıktısı
+        selected_months (List[str]): Kenar çubuğu ayları
+        selected_report_bases (List[str]): Veri türleri
+        table_months (List[str]): Özet tablolarının ayları
+        show_cumulative (bool): Özet tablolarında kümüle sütunlar
+
+    Returns:
+        Dict[str, DataFrame]: Tablo anahtarı -> tablo (ZIP_EXCEL_FILES anahtarları)
+    """
+    allowed_metrics = [
+        metric for metric in FIXED_METRICS
+        if any(metric in base for base in selected_report_bases)
+    ]
+    target_columns = [
+        f"{month} {metric}"
+        for month in table_months
+        for metric in allowed_metrics
+        if f"{month} {metric}" in filtered_df.columns
+    ] + [
+        f"Kümüle {metric}"
+        for metric in allowed_metrics
+        if show_cumulative and f"Kümüle {metric}" in filtered_df.columns
+    ]
+    table_df = filtered_df[GENERAL_COLUMNS + target_columns]
+    total_metrics = [
+        metric for metric in FIXED_METRICS[:-1]
+        if any(metric in base for base in selected_report_bases)
+    ]
+
+    tables = {}
+    for prefix, group_column in TABLE_GROUPS.items():
+        summary = grouped_summary(table_df, group_column, target_columns)
+        if summary is not None:
+            tables[f"{prefix}_ozet"] = summary
+        tables[f"{prefix}_toplam_sayisal"] = column_totals(table_df)
+
+        totals = compute_group_totals(final_df, group_column, selected_months, total_metrics)
+        tables[f"{prefix}_toplamlar"] = totals
+        tables[f"{prefix}_toplamlar_sayisal"] = column_totals(totals)
+
+    tables["ham_veri"] = final_df
+    tables["ham_veri_toplam_sayisal"] = column_totals(final_df)
+    return tables
+
+
+def build_chart_specs(
+    final_df: pd.DataFrame,
+    selected_months: List[str],
+    spec: ReportSpec,
+    cache_key: Optional[str] = None,
+) -> Dict[str, ChartSpec]:
+    """
+    ZIP'e girecek grafiklerin tanımlarını panelin varsayılan görünümleriyle oluşturur.
+
+    Parameters:
+        final_df (DataFrame): prepare_final_dataframe çıktısı
+        selected_months (List[str]): Kenar çubuğu ayları
+        spec (ReportSpec): Rapor tanımı (gruplama kriterleri)
+        cache_key (str, optional): Filtre parmak izi
+
+    Returns:
+        Dict[str, ChartSpec]: ZIP içindeki dosya adı -> grafik tanımı
+    """
+    specs = {}
+
+    trend = load_trend_series(final_df, selected_months, cache_key=cache_key)
+    if any(metric in trend for metric in TREND_METRICS):
+        specs[TREND_IMAGE] = chart_spec(build_trend_figure(trend), width=1000, height=600)
+
+    if spec.comparative_group in final_df.columns:
+        totals = comparative_totals(final_df, spec.comparative_group, selected_months)
+        if totals is not None:
+            fig, _ = build_comparative_figure(totals[0], spec.comparative_group)
+            specs[COMPARATIVE_IMAGE] = chart_spec(fig, width=800, height=600)
+
+    if spec.category_group in final_df.columns:
+        figures = build_category_figures(final_df, spec.category_group, selected_months, spec.category_top_n)
+        for metric, (fig_pie, fig_bar) in figures.items():
+            if fig_pie and fig_bar:
+                specs[f"{CATEGORY_IMAGE_DIR}/{metric}_Pasta.png"] = chart_spec(fig_pie, **CHART_IMAGE_SIZE)
+                specs[f"{CATEGORY_IMAGE_DIR}/{metric}_Sütun.png"] = chart_spec(fig_bar, **CHART_IMAGE_SIZE)
+
+    return specs
+
+
+_workbook_pool: Optional[ProcessPoolExecutor] = None
+_workbook_lock = threading.Lock()
+
+
+def _get_workbook_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Excel dosyalarının üretimi için süreç genelinde paylaşılan havuzu döndürür.
+
+    Streamlit süreci iş parçacıkları (Kaleido havuzu vb.) barındırdığı için
+    alt süreçler "spawn" ile başlatılır; havuz açık tutulur ve başlatma
+    maliyeti süreç başına bir kez ödenir.
+    """
+    global _workbook_pool
+    if _workbook_pool is None:
+        with _workbook_lock:
+            if _workbook_pool is None:
+                _workbook_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                atexit.register(_workbook_pool.shutdown)
+    return _workbook_pool
+
+
+def report_workbooks(tables: Dict[str, pd.DataFrame]) -> Dict[str, List[WorkbookSheet]]:
+    """
+    Tabloları ZIP_EXCEL_FILES düzeninde Excel dosyalarının sayfalarına dağıtır.
+
+    Parameters:
+        tables (Dict[str, DataFrame]): Tablo anahtarı -> tablo; eksik anahtarların sayfası yazılmaz
+
+    Returns:
+        Dict[str, List[WorkbookSheet]]: Dosya adı -> sayfalar (hiç sayfası olmayan dosyalar atlanır)
+    """
+    workbooks = {}
+    for filename, sheets in ZIP_EXCEL_FILES.items():
+        workbook = [
+            WorkbookSheet(sheet_name, tables[table_key], get_column_formats(tables[table_key], GENERAL_COLUMNS))
+            for sheet_name, table_key in sheets.items()
+            if table_key in tables
+        ]
+        if workbook:
+            workbooks[filename] = workbook
+    return workbooks
+
+
+def _zip_entries(
+    workbooks: Dict[str, List[WorkbookSheet]],
+    chart_specs: Dict[str, ChartSpec],
+    workers: int,
+) -> Iterator[Tuple[str, bytes, float]]:
+    """
+    ZIP girdilerini hazır oldukları sırayla üretir.
+
+    Grafikler Kaleido havuzuna, Excel dosyaları (birden fazla işlemci varsa)
+    süreç havuzuna aynı anda gönderilir. Tek işlemcide Excel dosyaları bu iş
+    parçacığında üretilirken grafikler Kaleido işlemlerinde render edilir.
+
+    Returns:
+        Iterator[Tuple[str, bytes, float]]: (dosya adı, içerik, süre (ms))
+    """
+    global _workbook_pool
+    pending = {future: name for name, future in submit_specs(chart_specs).items()}
+    if workers > 1 and len(workbooks) > 1:
+        pool = _get_workbook_pool(workers)
+        for filename, sheets in workbooks.items():
+            pending[pool.submit(timed_workbook_bytes, sheets)] = filename
+    else:
+        for filename, sheets in workbooks.items():
+            yield (filename, *timed_workbook_bytes(sheets))
+
+    for future in as_completed(pending):
+        name = pending[future]
+        try:
+            data, ms = future.result()
+        except BrokenProcessPool:
+            # Havuz çöktüyse bir sonraki raporda yeniden kurulur; bu dosya burada üretilir
+            _workbook_pool = None
+            data, ms = timed_workbook_bytes(workbooks[name])
+        yield name, data, ms
+
+
+def build_report_zip(
+    tables: Dict[str, pd.DataFrame],
+    chart_specs: Dict[str, ChartSpec],
+    compression_level: int = REPORT_ZIP_COMPRESSION_LEVEL,
+    workers: Optional[int] = None,
+    on_progress: Optional[Callable[[str, int, int, float], None]] = None,
+) -> bytes:
+    """
+    Tabloları ZIP_EXCEL_FILES düzeninde Excel dosyalarına, grafikleri PNG'ye dönüştürüp ZIP'e yazar.
+
+    Bu fonksiyon:
+    1. Excel dosyalarını süreç havuzunda, grafikleri Kaleido havuzunda aynı anda üretir
+    2. Her dosyayı hazır olur olmaz ZIP'e yazar (Excel ve PNG zaten sıkıştırılmış
+       olduğundan varsayılan olarak ZIP'te yeniden sıkıştırılmaz)
+    3. Her dosyadan sonra ilerleme bildirir
+
+    Parameters:
+        tables (Dict[str, DataFrame]): Tablo anahtarı -> tablo; eksik anahtarların sayfası yazılmaz
+        chart_specs (Dict[str, ChartSpec]): ZIP içindeki dosya adı -> grafik tanımı
+        compression_level (int): Arşivin sıkıştırma seviyesi (0: sıkıştırmadan sakla, 1-9: deflate)
+        workers (int, optional): Excel süreç sayısı; varsayılan min(REPORT_ZIP_WORKERS, işlemci sayısı)
+        on_progress (Callable, optional): (dosya adı, tamamlanan, toplam, süre (ms)) ile çağrılır
+
+    Returns:
+        bytes: ZIP arşivi
+    """
+    if workers is None:
+        workers = min(REPORT_ZIP_WORKERS, os.cpu_count() or 1)
+    workbooks = report_workbooks(tables)
+    total = len(workbooks) + len(chart_specs)
+
+    zip_buffer = BytesIO()
+    compression = zipfile.ZIP_DEFLATED if compression_level > 0 else zipfile.ZIP_STORED
+    with zipfile.ZipFile(zip_buffer, "w", compression, compresslevel=compression_level or None) as zip_file:
+        entries = _zip_entries(workbooks, chart_specs, workers)
+        for done, (name, data, ms) in enumerate(entries, 1):
+            zip_file.writestr(name, data)
+            if on_progress is not None:
+                on_progress(name, done, total, ms)
+    return zip_buffer.getvalue()
+
+
+def run_report(
+    df: pd.DataFrame,
+    spec: ReportSpec,
+    alerts: Optional[pd.DataFrame] = None,
+) -> ReportRun:
+    """
+    Tek bir veri çerçevesi için ZIP, PDF ve (istenirse) pivot tablo dosyalarını üretir.
+
+    Bu fonksiyon:
+    1. Filtreleri ve ay/veri türü/kümüle seçimlerini uygular
+    2. Veri sekmesi tablolarını ve grafikleri hesaplar, grafikleri Kaleido havuzunda dönüştürür
+    3. ZIP arşivini, özet veya ayrıntılı PDF raporunu ve pivot tabloyu oluşturur
+
+    Parameters:
+        df (DataFrame): read_report ile okunmuş veri
+        spec (ReportSpec): Rapor tanımı
+        alerts (DataFrame, optional): Dosyanın tamamı için uyarı indeksi; verilmezse df
+            üzerinden hesaplanır (anomali skorları tüm masraf yerlerine göre hesaplandığı
+            için toplu çalıştırmalarda dosya başına bir kez hesaplanıp verilmelidir)
+
+    Returns:
+        ReportRun: Dosyalar, KPI metrikleri ve satır sayısı
+    """
+    selected_months = _resolve(spec.months, MONTHS)
+    selected_report_bases = _resolve(spec.report_bases, REPORT_BASE_COLUMNS)
+    selected_cumulative = _resolve(spec.cumulative, ["Kümüle " + col for col in CUMULATIVE_COLUMNS])
+    filters = spec.filters or {}
+
+    # Kenar çubuğundaki gibi: sayısal boşluklar 0, ardından filtreler
+    base_df = df.copy()
+    numeric_cols = base_df.select_dtypes(include=[np.number]).columns
+    base_df[numeric_cols] = base_df[numeric_cols].fillna(0)
+    filtered_df = apply_filter_selections(base_df, filters)
+
+    final_df = prepare_final_dataframe(
+        df, filtered_df, selected_months, selected_report_bases, selected_cumulative
+    )
+    cache_key = filter_fingerprint(df, {
+        "filters": filters,
+        "months": selected_months,
+        "report_bases": selected_report_bases,
+        "cumulative": selected_cumulative,
+    })
+
+    tables = build_report_tables(
+        filtered_df, final_df, selected_months, selected_report_bases,
+        _resolve(spec.table_months, MONTHS), spec.show_cumulative,
+    )
+    chart_specs = build_chart_specs(final_df, selected_months, spec, cache_key=cache_key)
+    files = {ZIP_FILENAME: build_report_zip(tables, chart_specs)}
+
+    if spec.pdf == PDF_SUMMARY:
+        if alerts is None:
+            alerts = compute_alert_index(df)
+        visible_alerts = query_alerts(
+            alerts,
+            months=list(selected_months) + [CUMULATIVE_PERIOD],
+            cost_centres=final_df["Masraf Yeri Adı"].dropna().unique(),
+        )
+        # ZIP için render edilen grafikler önbellekten gelir
+        images, _ = render_specs(
+            {name: chart_specs[name] for name in (TREND_IMAGE, COMPARATIVE_IMAGE) if name in chart_specs}
+        )
+        total_budget, total_actual, variance, variance_pct = calculate_metrics(final_df)
+        pdf = generate_pdf_report(
+            total_budget,
+            total_actual,
+            variance,
+            variance_pct,
+            BytesIO(images[TREND_IMAGE]) if TREND_IMAGE in images else None,
+            BytesIO(images[COMPARATIVE_IMAGE]) if COMPARATIVE_IMAGE in images else None,
+            alerts=split_anomalies(visible_alerts)[0],
+        )
+    elif spec.pdf is not None:
+        pdf = generate_section_report(final_df, spec.pdf, selected_months)
+    else:
+        pdf = None
+    if pdf:
+        files[PDF_FILENAME] = pdf
+
+    if spec.pivot:
+        pivot = build_pivot(
+            final_df,
+            list(spec.pivot["rows"]),
+            spec.pivot.get("agg", "sum"),
+            spec.pivot.get("columns", NO_COLUMN_FIELD),
+            spec.pivot.get("values", VALUE_TYPE_MONTHLY),
+            selected_months,
+            # Tüm veri türleri seçiliyse panelde olduğu gibi tüm metrikler pivotlanır
+            None if selected_report_bases == REPORT_BASE_COLUMNS else selected_report_bases,
+            cache_key=cache_key,
+        )
+        if pivot is not None:
+            files[PIVOT_FILENAME] = pivot_excel_bytes(pivot)
+
+    return ReportRun(files, calculate_kpi_metrics(final_df, selected_months), len(final_df))
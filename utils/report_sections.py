@@ -0,0 +1,423 @@
+"""
+report_sections.py - Grup bazlı ayrıntılı PDF raporunu üretir.
+
+Rapor, seçilen alanın ("Masraf Çeşidi Grubu 1" veya "İlgili 1") her değeri
+için bir bölüm içerir: KPI tablosu, aylık Bütçe/Fiili grafiği ve en büyük
+bütçe aşımları. Üretim üç aşamada yürür:
+
+    1. Bölüm toplamları grup bazında, aşım listeleri (grup x masraf yeri)
+       bazında gruplanmış indirgemelerle hesaplanır
+    2. Bölüm grafikleri sıcak Kaleido işlem havuzunda paralel rasterleştirilir
+    3. Görüntülerin PDF kaydına dönüştürülmesi ve tablo hücrelerinin
+       biçimlendirilmesi bir süreç havuzunda bölüm başına yapılır
+
+fpdf belgesi sıralı yazıldığı için sayfaların belgeye eklenmesi ana süreçte
+kalır; bu adım hazırlanmış kayıtları yalnızca yerleştirir.
+
+Fonksiyonlar:
+    - compute_report_sections: Bölüm verilerini hesaplar
+    - section_figure: Bölümün aylık trend grafiğini sözlük olarak oluşturur
+    - prepare_section: Bölümün görüntü kaydını ve tablo satırlarını hazırlar
+    - prepare_sections: Bölümleri süreç havuzunda (veya sırayla) hazırlar
+    - generate_section_report: Grup bazlı ayrıntılı PDF raporunu oluşturur
+
+Sınıflar:
+    - ReportSection: Bir bölümün ham verileri
+    - PreparedSection: PDF'e yerleştirilmeye hazır bölüm
+
+Kullanım:
+    from utils.report_sections import generate_section_report
+
+    pdf_bytes = generate_section_report(final_df, "İlgili 1", selected_months)
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.constants import (
+    MONTHS,
+    REPORT_LAYOUT_WORKERS,
+    REPORT_MAX_SECTIONS,
+    REPORT_PARALLEL_MIN_SECTIONS,
+    REPORT_TOP_OVERRUNS,
+)
+from utils.chart_export import chart_spec, render_specs
+from utils.error_handler import handle_error, display_friendly_error
+from utils.formatting import format_currency
+from utils.report import PDF, image_name, prepare_image_info
+
+# Aşımların listelendiği masraf yeri alanı
+CENTRE_FIELD = "Masraf Yeri Adı"
+
+# Bölüm grafiği boyutu (piksel) ve çözünürlük çarpanı; PDF'te sayfa genişliğinde basılır
+SECTION_CHART_WIDTH = 900
+SECTION_CHART_HEIGHT = 360
+SECTION_CHART_SCALE = 1.5
+
+OVERRUN_COLUMNS = [CENTRE_FIELD, "Bütçe", "Fiili", "Aşım", "Kullanım (%)"]
+
+
+class ReportSection(NamedTuple):
+    """
+    Bir rapor bölümünün ham verileri.
+
+    Attributes:
+        title (str): Grup değeri
+        months (List[str]): Aylar (takvim sırasıyla)
+        budget (ndarray): Aylık bütçe toplamları
+        actual (ndarray): Aylık fiili toplamları
+        overruns (DataFrame): En büyük aşımlar (OVERRUN_COLUMNS)
+    """
+
+    title: str
+    months: List[str]
+    budget: np.ndarray
+    actual: np.ndarray
+    overruns: pd.DataFrame
+
+
+class PreparedSection(NamedTuple):
+    """
+    PDF'e yerleştirilmeye hazır bölüm.
+
+    Attributes:
+        title (str): Bölüm başlığı
+        kpi_rows (List[List[str]]): KPI tablosu satırları
+        overrun_rows (List[List[str]]): Aşım tablosu satırları
+        image_name (str): fpdf görüntü tablosu adı
+        image_info (Dict): fpdf görüntü kaydı
+    """
+
+    title: str
+    kpi_rows: List[List[str]]
+    overrun_rows: List[List[str]]
+    image_name: str
+    image_info: Dict[str, Any]
+
+
+def _usage_text(actual: float, budget: float) -> str:
+    if budget == 0:
+        return "-"
+    return f"{actual / budget * 100:.1f} %"
+
+
+def compute_report_sections(
+    df: pd.DataFrame,
+    group_col: str,
+    months: Sequence[str],
+    max_sections: int = REPORT_MAX_SECTIONS,
+    top_n: int = REPORT_TOP_OVERRUNS,
+) -> List[ReportSection]:
+    """
+    Grup bazlı rapor bölümlerini gruplanmış indirgemelerle hesaplar.
+
+    Bu fonksiyon:
+    1. Seçili ayların Bütçe/Fiili sütunlarını grup bazında toplar ve grupları
+       fiili toplamına göre sıralar; masraf yeri adı boş satırlar da toplama girer
+    2. Aynı sütunları (grup x masraf yeri) bazında toplar
+    3. Fiilisi bütçesini aşan masraf yerlerinden her grubun en büyük top_n aşımını seçer
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_col (str): Bölümleri belirleyen alan
+        months (Sequence[str]): Seçili aylar
+        max_sections (int): En fazla bölüm sayısı
+        top_n (int): Bölüm başına listelenecek en fazla aşım
+
+    Returns:
+        List[ReportSection]: Fiili toplamına göre büyükten küçüğe bölümler
+    """
+    ordered_months = [
+        month for month in MONTHS
+        if month in set(months) and f"{month} Bütçe" in df.columns and f"{month} Fiili" in df.columns
+    ]
+    if group_col not in df.columns or not ordered_months or df.empty:
+        return []
+
+    budget_cols = [f"{month} Bütçe" for month in ordered_months]
+    actual_cols = [f"{month} Fiili" for month in ordered_months]
+    keys = [group_col]
+    if CENTRE_FIELD in df.columns and CENTRE_FIELD != group_col:
+        keys.append(CENTRE_FIELD)
+
+    # Bölüm toplamları masraf yeri düzeyinden türetilmez: groupby adı boş
+    # masraf yerlerini dışarıda bırakır ve bu satırlar toplamdan düşerdi
+    totals = df.groupby(group_col, sort=False)[budget_cols + actual_cols].sum()
+    if totals.empty:
+        return []
+    budget = totals[budget_cols].to_numpy(dtype=np.float64)
+    actual = totals[actual_cols].to_numpy(dtype=np.float64)
+    order = np.argsort(-actual.sum(axis=1), kind="stable")[:max_sections]
+
+    overruns: Dict[Any, pd.DataFrame] = {}
+    if len(keys) > 1:
+        grouped = df.groupby(keys, sort=False)[budget_cols + actual_cols].sum()
+        centre_budget = grouped[budget_cols].to_numpy(dtype=np.float64).sum(axis=1)
+        centre_actual = grouped[actual_cols].to_numpy(dtype=np.float64).sum(axis=1)
+        excess = centre_actual - centre_budget
+        over = excess > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            usage = np.where(centre_budget != 0, centre_actual / centre_budget * 100, np.nan)
+        candidates = pd.DataFrame({
+            group_col: grouped.index.get_level_values(0)[over],
+            CENTRE_FIELD: grouped.index.get_level_values(1)[over],
+            "Bütçe": centre_budget[over],
+            "Fiili": centre_actual[over],
+            "Aşım": excess[over],
+            "Kullanım (%)": usage[over],
+        })
+        top = candidates.sort_values("Aşım", ascending=False, kind="stable").groupby(
+            group_col, sort=False
+        ).head(top_n)
+        overruns = {
+            group: part[OVERRUN_COLUMNS].reset_index(drop=True)
+            for group, part in top.groupby(group_col, sort=False)
+        }
+
+    empty = pd.DataFrame(columns=OVERRUN_COLUMNS)
+    return [
+        ReportSection(
+            title=str(totals.index[i]),
+            months=ordered_months,
+            budget=budget[i],
+            actual=actual[i],
+            overruns=overruns.get(totals.index[i], empty),
+        )
+        for i in order
+    ]
+
+
+def section_figure(section: ReportSection, budget_color: str = "#636EFA",
+                   actual_color: str = "#EF553B") -> Dict[str, Any]:
+    """
+    Bölümün aylık Bütçe/Fiili grafiğini Plotly sözlüğü olarak oluşturur.
+
+    Yüzlerce bölümde Plotly doğrulamasına girmemek için grafik nesnesi yerine
+    doğrudan JSON'a çevrilebilir sözlük döndürülür (bkz. chart_spec).
+
+    Parameters:
+        section (ReportSection): Bölüm
+        budget_color (str): Bütçe çizgisi rengi
+        actual_color (str): Fiili çubuk rengi
+
+    Returns:
+        Dict: {"data": [...], "layout": {...}} grafik sözlüğü
+    """
+    return {
+        "data": [
+            {
+                "type": "bar",
+                "x": section.months,
+                "y": np.nan_to_num(section.actual).tolist(),
+                "name": "Fiili",
+                "marker": {"color": actual_color},
+            },
+            {
+                "type": "scatter",
+                "mode": "lines+markers",
+                "x": section.months,
+                "y": np.nan_to_num(section.budget).tolist(),
+                "name": "Bütçe",
+                "line": {"color": budget_color, "width": 2},
+            },
+        ],
+        "layout": {
+            "margin": {"t": 30, "b": 40, "l": 60, "r": 20},
+            "legend": {"orientation": "h", "yanchor": "bottom", "y": 1.02, "xanchor": "right", "x": 1},
+            "yaxis": {"tickformat": "~s", "gridcolor": "#e5e5e5"},
+            "plot_bgcolor": "white",
+            "paper_bgcolor": "white",
+            "font": {"size": 12},
+        },
+    }
+
+
+def prepare_section(section: ReportSection, image: bytes) -> PreparedSection:
+    """
+    Bölümün görüntü kaydını ve tablo satırlarını hazırlar (süreç havuzunda çalışır).
+
+    Parameters:
+        section (ReportSection): Bölüm
+        image (bytes): Bölüm grafiğinin PNG baytları
+
+    Returns:
+        PreparedSection: PDF'e yerleştirilmeye hazır bölüm
+    """
+    total_budget = float(np.nansum(section.budget))
+    total_actual = float(np.nansum(section.actual))
+    kpi_rows = [
+        ["Toplam Bütçe", format_currency(total_budget)],
+        ["Toplam Fiili", format_currency(total_actual)],
+        ["Fark (Bütçe - Fiili)", format_currency(total_budget - total_actual)],
+        ["Kullanım Oranı", _usage_text(total_actual, total_budget)],
+    ]
+    overrun_rows = [
+        [
+            str(centre)[:32],
+            format_currency(budget),
+            format_currency(actual),
+            format_currency(excess),
+            _usage_text(actual, budget),
+        ]
+        for centre, budget, actual, excess, _ in section.overruns.itertuples(index=False)
+    ]
+    return PreparedSection(
+        title=section.title,
+        kpi_rows=kpi_rows,
+        overrun_rows=overrun_rows,
+        image_name=image_name(image),
+        image_info=prepare_image_info(image),
+    )
+
+
+_layout_pool: Optional[ProcessPoolExecutor] = None
+_layout_lock = threading.Lock()
+
+
+def _get_layout_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Bölüm hazırlığı için süreç genelinde paylaşılan havuzu döndürür.
+
+    Streamlit süreci iş parçacıkları (Kaleido havuzu vb.) barındırdığı için
+    alt süreçler "fork" yerine "spawn" ile başlatılır; havuz açık tutulur ve
+    başlatma maliyeti süreç başına bir kez ödenir.
+    """
+    global _layout_pool
+    if _layout_pool is None:
+        with _layout_lock:
+            if _layout_pool is None:
+                _layout_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                atexit.register(_layout_pool.shutdown)
+    return _layout_pool
+
+
+def prepare_sections(
+    sections: Sequence[ReportSection],
+    images: Sequence[bytes],
+    workers: Optional[int] = None,
+) -> List[PreparedSection]:
+    """
+    Bölümleri hazırlar; yeterli bölüm ve işlemci varsa süreç havuzunu kullanır.
+
+    Parameters:
+        sections (Sequence[ReportSection]): Bölümler
+        images (Sequence[bytes]): Bölüm grafikleri (aynı sırayla)
+        workers (int, optional): Süreç sayısı; varsayılan min(REPORT_LAYOUT_WORKERS, işlemci sayısı)
+
+    Returns:
+        List[PreparedSection]: Hazırlanmış bölümler (aynı sırayla)
+    """
+    global _layout_pool
+    if workers is None:
+        workers = min(REPORT_LAYOUT_WORKERS, os.cpu_count() or 1)
+    if workers > 1 and len(sections) >= REPORT_PARALLEL_MIN_SECTIONS:
+        chunksize = max(1, len(sections) // (workers * 4))
+        try:
+            return list(_get_layout_pool(workers).map(prepare_section, sections, images, chunksize=chunksize))
+        except BrokenProcessPool:
+            # Havuz çöktüyse bir sonraki raporda yeniden kurulur; bu rapor sırayla hazırlanır
+            _layout_pool = None
+    return [prepare_section(section, image) for section, image in zip(sections, images)]
+
+
+@handle_error
+def generate_section_report(
+    df: pd.DataFrame,
+    group_col: str,
+    months: Sequence[str],
+    budget_color: str = "#636EFA",
+    actual_color: str = "#EF553B",
+    max_sections: int = REPORT_MAX_SECTIONS,
+) -> Optional[bytes]:
+    """
+    Grup bazlı ayrıntılı PDF raporu oluşturur.
+
+    Bu fonksiyon:
+    1. Bölüm verilerini hesaplar (compute_report_sections)
+    2. Bölüm grafiklerini Kaleido havuzunda tek seferde rasterleştirir
+    3. Görüntü kayıtlarını ve tablo satırlarını süreç havuzunda hazırlar
+    4. Genel bakış tablosunu ve bölüm sayfalarını belgeye yerleştirir
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_col (str): Bölümleri belirleyen alan
+        months (Sequence[str]): Seçili aylar
+        budget_color (str): Grafiklerde bütçe rengi
+        actual_color (str): Grafiklerde fiili rengi
+        max_sections (int): En fazla bölüm sayısı
+
+    Returns:
+        Optional[bytes]: PDF içeriği byte cinsinden veya None
+    """
+    sections = compute_report_sections(df, group_col, months, max_sections)
+    if not sections:
+        display_friendly_error(
+            "Ayrıntılı rapor için bölüm oluşturulamadı",
+            f"Verinin '{group_col}' alanını ve seçili aylar için Bütçe/Fiili sütunlarını içerdiğinden emin olun.",
+        )
+        return None
+
+    specs = {
+        str(number): chart_spec(
+            section_figure(section, budget_color, actual_color),
+            width=SECTION_CHART_WIDTH, height=SECTION_CHART_HEIGHT, scale=SECTION_CHART_SCALE,
+        )
+        for number, section in enumerate(sections)
+    }
+    images, _ = render_specs(specs)
+    prepared = prepare_sections(sections, [images[str(number)] for number in range(len(sections))])
+
+    pdf = PDF()
+    pdf.add_page()
+    pdf.chapter_title(f"{group_col} Bazlı Ayrıntılı Rapor")
+    pdf.chapter_body(
+        f"Bu rapor, {group_col} alanının fiili harcaması en yüksek {len(sections)} değeri için "
+        f"{sections[0].months[0]} - {sections[0].months[-1]} dönemine ait bütçe performansını, "
+        f"aylık trendi ve en büyük bütçe aşımlarını içermektedir."
+    )
+    overview_rows = [
+        [
+            str(number),
+            section.title[:40],
+            format_currency(float(np.nansum(section.budget))),
+            format_currency(float(np.nansum(section.actual))),
+            _usage_text(float(np.nansum(section.actual)), float(np.nansum(section.budget))),
+        ]
+        for number, section in enumerate(sections, 1)
+    ]
+    pdf.add_table(
+        ["#", group_col, "Bütçe", "Fiili", "Kullanım"], overview_rows, [12, 68, 35, 35, 20],
+        row_height=7, font_size=8, aligns=["C", "L", "R", "R", "R"],
+    )
+
+    for number, section in enumerate(prepared, 1):
+        pdf.add_page()
+        pdf.chapter_title(f"{number}. {section.title}"[:70])
+        pdf.add_table(["Metrik", "Değer"], section.kpi_rows, [85, 85], row_height=8, aligns=["L", "R"])
+        pdf.ln(4)
+        pdf.add_image_info(section.image_name, section.image_info, w=pdf.w - 40)
+        pdf.ln(4)
+        if section.overrun_rows:
+            pdf.set_font("DejaVu", "B", 11)
+            pdf.cell(0, 8, "En Büyük Bütçe Aşımları", 0, 1, "L")
+            pdf.add_table(
+                [CENTRE_FIELD, "Bütçe", "Fiili", "Aşım", "Kullanım"], section.overrun_rows,
+                [58, 30, 30, 30, 22], row_height=7, font_size=8, aligns=["L", "R", "R", "R", "R"],
+            )
+        else:
+            pdf.chapter_body("Bu bölümde bütçesini aşan masraf yeri bulunmamaktadır.")
+
+    pdf_data = pdf.output(dest="S")
+    if isinstance(pdf_data, str):
+        return pdf_data.encode("latin-1")
+    return pdf_data
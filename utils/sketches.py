@@ -0,0 +1,187 @@
+"""
+sketches.py - Birleştirilebilir yaklaşık özetler (quantile ve farklı değer sayısı).
+
+Bu modül, grup bazında önceden hesaplanıp ham satırlara dönmeden
+birleştirilebilen iki özet yapısının vektörel numpy uygulamasını içerir:
+
+    - Quantile özeti (DDSketch benzeri): Değerler logaritmik kovalara
+      yerleştirilir; iki özet aynı kovanın adetleri toplanarak birleştirilir.
+      Kova temsilcisi, gerçek değere göre en fazla `accuracy` oranında
+      göreli hata verir.
+    - HyperLogLog: Değerlerin 64 bitlik karmaları 2^precision yazmaca
+      dağıtılır; iki özet aynı yazmacın en büyük değeri alınarak birleştirilir.
+
+Kova anahtarları değer sırasını korur (negatifler < 0 < pozitifler), bu
+yüzden anahtar sırasına göre biriken adetler doğrudan quantile verir.
+
+Fonksiyonlar:
+    - quantile_buckets: Değerleri sıralı kova anahtarlarına dönüştürür
+    - bucket_values: Kova anahtarlarının temsilci değerlerini döndürür
+    - sketch_quantiles: Segment bazında (grup x sütun) quantile hesaplar
+    - hll_registers: Değerleri (yazmaç, sıra) çiftlerine dönüştürür
+    - hll_estimate: Grup bazında yazmaçlardan farklı değer sayısını tahmin eder
+
+Kullanım:
+    from utils.sketches import quantile_buckets, sketch_quantiles
+
+    keys = quantile_buckets(values, accuracy=0.01)
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Bu değerden küçük mutlak değerler sıfır kovasına düşer
+MIN_INDEXED_VALUE = 1e-9
+
+
+def _gamma(accuracy: float) -> float:
+    return (1 + accuracy) / (1 - accuracy)
+
+
+def _key_offset(accuracy: float) -> int:
+    """Pozitif kova indekslerini 1'den başlatan kaydırma miktarı."""
+    return int(-np.ceil(np.log(MIN_INDEXED_VALUE) / np.log(_gamma(accuracy)))) + 1
+
+
+def quantile_buckets(values: np.ndarray, accuracy: float) -> np.ndarray:
+    """
+    Değerleri sıralı, işaretli kova anahtarlarına dönüştürür.
+
+    Parameters:
+        values (ndarray): Sonlu değerler (NaN içermemeli)
+        accuracy (float): Göreli doğruluk (ör. 0.01 = %1)
+
+    Returns:
+        ndarray: int32 kova anahtarları; 0 sıfır kovasıdır, negatif değerlerin
+            anahtarları negatiftir ve değer sırası korunur
+    """
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.abs(values)
+    indexed = magnitude >= MIN_INDEXED_VALUE
+    keys = np.zeros(len(values), dtype=np.int32)
+    log_gamma = np.log(_gamma(accuracy))
+    keys[indexed] = (
+        np.ceil(np.log(magnitude[indexed]) / log_gamma).astype(np.int32) + _key_offset(accuracy)
+    )
+    return np.where(values < 0, -keys, keys)
+
+
+def bucket_values(keys: np.ndarray, accuracy: float) -> np.ndarray:
+    """
+    Kova anahtarlarının temsilci değerlerini döndürür.
+
+    Parameters:
+        keys (ndarray): quantile_buckets çıktısı
+        accuracy (float): quantile_buckets ile aynı doğruluk
+
+    Returns:
+        ndarray: Temsilci değerler (kova sınırlarının göreli orta noktası)
+    """
+    gamma = _gamma(accuracy)
+    index = np.abs(keys).astype(np.float64) - _key_offset(accuracy)
+    magnitude = 2 * np.power(gamma, index) / (gamma + 1)
+    return np.where(keys == 0, 0.0, np.sign(keys) * magnitude)
+
+
+def sketch_quantiles(
+    segments: np.ndarray,
+    keys: np.ndarray,
+    counts: np.ndarray,
+    n_segments: int,
+    q: float,
+    accuracy: float,
+) -> np.ndarray:
+    """
+    Her segment için q quantile'ını kova adetlerinden hesaplar.
+
+    Bu fonksiyon:
+    1. Kayıtları (segment, kova anahtarı) sırasına dizer
+    2. Adetlerin kümülatif toplamında her segmentin q * (n - 1) sırasının alt ve
+       üst tam sayı komşularını içeren kovaları ikili aramayla bulur
+    3. İki kovanın temsilci değerleri arasında doğrusal ara değer alır
+       (numpy/pandas'ın varsayılan "linear" quantile yöntemi gibi)
+
+    Parameters:
+        segments (ndarray): Her kaydın segment numarası (0..n_segments-1)
+        keys (ndarray): Her kaydın kova anahtarı
+        counts (ndarray): Her kaydın adedi
+        n_segments (int): Segment sayısı
+        q (float): Quantile (0-1)
+        accuracy (float): Kova doğruluğu
+
+    Returns:
+        ndarray: Segment başına quantile; boş segmentler NaN
+    """
+    order = np.lexsort((keys, segments))
+    segments, keys, counts = segments[order], keys[order], counts[order].astype(np.float64)
+    totals = np.bincount(segments, weights=counts, minlength=n_segments)
+    cumulative = np.cumsum(counts)
+    starts = np.concatenate(([0.0], np.cumsum(totals)[:-1]))
+
+    result = np.full(n_segments, np.nan)
+    present = totals > 0
+    ranks = q * (totals[present] - 1)
+    lower, upper = np.floor(ranks), np.ceil(ranks)
+    lower_values = bucket_values(
+        keys[np.searchsorted(cumulative, starts[present] + lower, side="right")], accuracy
+    )
+    upper_values = bucket_values(
+        keys[np.searchsorted(cumulative, starts[present] + upper, side="right")], accuracy
+    )
+    result[present] = lower_values + (ranks - lower) * (upper_values - lower_values)
+    return result
+
+
+def hll_registers(values: pd.Series, precision: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Değerleri HyperLogLog (yazmaç, sıra) çiftlerine dönüştürür.
+
+    Parameters:
+        values (Series): Farklılığı sayılacak değerler (NaN içermemeli)
+        precision (int): Yazmaç bit sayısı; yazmaç sayısı 2^precision
+
+    Returns:
+        Tuple[ndarray, ndarray]: (yazmaç numarası, ilk 1 bitinin sırası)
+    """
+    hashes = pd.util.hash_array(np.asarray(values, dtype=object))
+    width = 64 - precision
+    registers = (hashes >> np.uint64(width)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << width) - 1)
+    # remainder < 2^53 olduğu için float64'e kayıpsız çevrilir; frexp üssü bit uzunluğudur
+    _, bit_length = np.frexp(remainder.astype(np.float64))
+    ranks = (width - bit_length + 1).astype(np.int8)
+    return registers, ranks
+
+
+def hll_estimate(groups: np.ndarray, registers: np.ndarray, ranks: np.ndarray,
+                 n_groups: int, precision: int) -> np.ndarray:
+    """
+    Grup bazında yazmaç değerlerinden farklı değer sayısını tahmin eder.
+
+    Her (grup, yazmaç) çifti en fazla bir kez verilmelidir (birleştirilmiş
+    özet). Küçük sayılarda doğrusal sayım düzeltmesi uygulanır.
+
+    Parameters:
+        groups (ndarray): Her kaydın grup numarası
+        registers (ndarray): Yazmaç numarası
+        ranks (ndarray): Yazmaç değeri
+        n_groups (int): Grup sayısı
+        precision (int): hll_registers ile aynı hassasiyet
+
+    Returns:
+        ndarray: Grup başına tahmini farklı değer sayısı
+    """
+    m = 1 << precision
+    alpha = 0.7213 / (1 + 1.079 / m)
+    filled = np.bincount(groups, minlength=n_groups)
+    # Boş yazmaçlar 2^0 = 1 katkı yapar
+    harmonic = np.bincount(groups, weights=np.power(2.0, -ranks.astype(np.float64)), minlength=n_groups)
+    harmonic += m - filled
+    estimate = alpha * m * m / harmonic
+
+    empty = m - filled
+    small = (estimate <= 2.5 * m) & (empty > 0)
+    estimate[small] = m * np.log(m / empty[small])
+    return estimate
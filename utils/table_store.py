@@ -0,0 +1,207 @@
+"""
+table_store.py - Veri sekmesi tablolarını oturum yerine süreç genelinde paylaşılan depoda tutar.
+
+Panelin ZIP raporu, Veri sekmesinde gösterilen tabloları dosya adından
+türeyen anahtarlarla (ör. "ham_veri") bulur. Tabloların kopyaları her
+yeniden çalıştırmada `st.session_state`'e yazılsaydı, her oturum yüklenen
+verinin birkaç kopyasını taşırdı. Bunun yerine tablolar (parmak izi, tarif)
+anahtarıyla kayıt sayısı ve bayt sınırlı tek bir LRU depoya yazılır ve
+oturumda yalnızca küçük bir `TableRef` saklanır. Aynı veri ve filtrelerle
+çalışan oturumlar aynı kaydı paylaşır.
+
+    - Parmak izi: Tablonun türetildiği satırları belirleyen filtre parmak izi
+      (veya içerik parmak izi) ile türetme adımı, ör. ("grouped_summary", anahtar, grup, sütunlar)
+    - Tarif: Parmak izinin belirlediği veriden tablonun nasıl alındığı, ör. ("table", sütunlar)
+
+Fonksiyonlar:
+    - load_table: Tabloyu depodan döndürür, yoksa hesaplayıp yazar; başvurusunu üretir
+    - resolve_table / resolve_tables: Başvuruları depodaki tablolara çözer
+    - session_memory: Oturumun sakladığı verilerin boyutunu ölçer
+    - format_session_memory: Bellek raporunu tek satırlık metne çevirir
+
+Sınıflar:
+    - TableRef: Oturumda tablo yerine saklanan başvuru
+    - SessionMemory: Oturum bellek raporu
+
+Kullanım:
+    from utils.table_store import load_table, resolve_tables
+
+    df, ref = load_table(filter_key, ("table", tuple(columns)), lambda: prepare(df))
+    st.session_state["ham_veri"] = ref
+    tables, missing = resolve_tables({"ham_veri": st.session_state["ham_veri"]})
+"""
+
+import sys
+from operator import itemgetter
+from typing import Any, Callable, Dict, Hashable, List, Mapping, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from config.constants import TABLE_STORE_ENTRIES, TABLE_STORE_MAX_MB
+from utils.cache import ResultCache
+
+# Kayıtlar (tablo, bayt) çiftleridir; boyut tablo yazılırken bir kez ölçülür
+_table_store = ResultCache(
+    TABLE_STORE_ENTRIES,
+    max_bytes=TABLE_STORE_MAX_MB * 1024 * 1024,
+    sizeof=itemgetter(1),
+)
+
+
+class TableRef(NamedTuple):
+    """
+    Oturumda tablo yerine saklanan başvuru.
+
+    Attributes:
+        fingerprint (Hashable): Tablonun türetildiği veriyi belirleyen parmak izi
+        recipe (Tuple): Tablonun bu veriden nasıl alındığı
+        rows (int): Satır sayısı
+        nbytes (int): Depodaki tablonun boyutu (bayt)
+    """
+
+    fingerprint: Hashable
+    recipe: Tuple
+    rows: int
+    nbytes: int
+
+    @property
+    def key(self) -> Tuple[Hashable, Tuple]:
+        return self.fingerprint, self.recipe
+
+
+class SessionMemory(NamedTuple):
+    """
+    Oturum bellek raporu.
+
+    Attributes:
+        refs (int): Oturumdaki tablo başvurusu sayısı
+        ref_bytes (int): Başvuruların oturumdaki boyutu
+        shared_bytes (int): Başvuruların gösterdiği (oturumlar arasında paylaşılan) tabloların boyutu
+        session_bytes (int): Oturumda doğrudan tutulan veri çerçevesi ve dosyaların boyutu
+        store_entries (int): Depodaki toplam kayıt sayısı (tüm oturumlar)
+        store_bytes (int): Deponun toplam boyutu (tüm oturumlar)
+    """
+
+    refs: int
+    ref_bytes: int
+    shared_bytes: int
+    session_bytes: int
+    store_entries: int
+    store_bytes: int
+
+
+def table_nbytes(df: pd.DataFrame) -> int:
+    """Tablonun bellek kullanımını (metin ve kategori değerleri dahil) döndürür."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def load_table(
+    fingerprint: Hashable,
+    recipe: Tuple,
+    compute: Callable[[], pd.DataFrame],
+) -> Tuple[pd.DataFrame, TableRef]:
+    """
+    Tabloyu depodan döndürür; yoksa hesaplayıp yazar.
+
+    Dönen tablo oturumlar arasında paylaşılır ve değiştirilmemelidir.
+
+    Parameters:
+        fingerprint (Hashable): Tablonun türetildiği veriyi belirleyen parmak izi
+        recipe (Tuple): Tablonun bu veriden nasıl alındığı
+        compute (Callable): Depoda yoksa tabloyu üreten fonksiyon
+
+    Returns:
+        Tuple[DataFrame, TableRef]: (tablo, oturumda saklanacak başvuru)
+    """
+    def compute_entry():
+        df = compute()
+        return df, table_nbytes(df)
+
+    df, nbytes = _table_store.get_or_compute((fingerprint, recipe), compute_entry)
+    return df, TableRef(fingerprint, recipe, len(df), nbytes)
+
+
+def resolve_table(ref: TableRef) -> Optional[pd.DataFrame]:
+    """
+    Başvuruyu depodaki tabloya çözer.
+
+    Returns:
+        Optional[DataFrame]: Tablo; kayıt depodan çıkarıldıysa None
+    """
+    entry = _table_store.get(ref.key)
+    return None if entry is None else entry[0]
+
+
+def resolve_tables(refs: Mapping[str, TableRef]) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+    """
+    Başvuruları depodaki tablolara çözer.
+
+    Parameters:
+        refs (Mapping[str, TableRef]): Tablo anahtarı -> başvuru
+
+    Returns:
+        Tuple[Dict[str, DataFrame], List[str]]: (anahtar -> tablo, depodan çıkarılmış
+            olduğu için çözülemeyen anahtarlar)
+    """
+    tables, missing = {}, []
+    for name, ref in refs.items():
+        df = resolve_table(ref)
+        if df is None:
+            missing.append(name)
+        else:
+            tables[name] = df
+    return tables, missing
+
+
+def session_memory(state: Mapping[str, Any]) -> SessionMemory:
+    """
+    Oturumun sakladığı verilerin boyutunu ölçer.
+
+    Tablo başvuruları ve gösterdikleri paylaşılan tablolar ayrı sayılır;
+    oturumda doğrudan tutulan veri çerçeveleri ve dosya baytları (ZIP, PDF)
+    oturuma ait bellek olarak raporlanır.
+
+    Parameters:
+        state (Mapping[str, Any]): st.session_state
+
+    Returns:
+        SessionMemory: Bellek raporu
+    """
+    refs = ref_bytes = shared_bytes = session_bytes = 0
+    for value in state.values():
+        if isinstance(value, TableRef):
+            refs += 1
+            ref_bytes += sys.getsizeof(value)
+            shared_bytes += value.nbytes
+        elif isinstance(value, pd.DataFrame):
+            session_bytes += table_nbytes(value)
+        elif isinstance(value, (bytes, bytearray)):
+            session_bytes += len(value)
+    return SessionMemory(
+        refs, ref_bytes, shared_bytes, session_bytes, len(_table_store), _table_store.nbytes
+    )
+
+
+def _format_bytes(nbytes: int) -> str:
+    if nbytes >= 1024 * 1024:
+        return f"{nbytes / 1024 / 1024:.1f} MB"
+    return f"{nbytes / 1024:.1f} KB"
+
+
+def format_session_memory(memory: SessionMemory) -> str:
+    """
+    Bellek raporunu tek satırlık metne çevirir.
+
+    Parameters:
+        memory (SessionMemory): session_memory çıktısı
+
+    Returns:
+        str: Ör. "🧠 Oturum: 10 tablo başvurusu 0.6 KB · oturum verisi 1.2 MB ·
+            paylaşılan tablolar 4.1 MB (depo 12 kayıt, 9.8 MB)"
+    """
+    return (
+        f"🧠 Oturum: {memory.refs} tablo başvurusu {_format_bytes(memory.ref_bytes)} · "
+        f"oturum verisi {_format_bytes(memory.session_bytes)} · "
+        f"paylaşılan tablolar {_format_bytes(memory.shared_bytes)} "
+        f"(depo {memory.store_entries} kayıt, {_format_bytes(memory.store_bytes)})"
+    )
@@ -7,9 +7,11 @@ aradaki farkları aynı grafik üzerinde görüntüleyebilir, ayrıca bu grafikl
 
 Ana Özellikler:
 ---------------
-- Seçilen aylar için toplam bütçe ve fiili değerlerin hesaplanması
+- Seçilen aylar için Bütçe, Fiili ve BE serilerinin trend motorunda tek geçişte hesaplanması
+- Aylık, kümüle (YTD), 3 aylık hareketli ortalama ve önceki döneme göre değişim görünümleri
 - Bütçe ve fiili değerlerin çubuk grafikle, farkların ise çizgi grafikle gösterimi
-- Grafiklerin PNG formatında dışa aktarılabilmesi
+- Grup bazında küçük çoklu (small multiples) trend görünümü
+- Grafiklerin istek üzerine PNG formatında dışa aktarılabilmesi
 - Hata yönetimi ve kullanıcı dostu uyarılar
 
 Kütüphaneler:
@@ -17,19 +19,96 @@ Kütüphaneler:
 - streamlit: Kullanıcı arayüzü için
 - pandas: Veri işleme ve tablo oluşturma
 - plotly.graph_objects: Gelişmiş grafik oluşturma
-- io.BytesIO: Grafik çıktısını bellekte tutma ve indirme işlemleri
+- utils.chart_export: Ertelenmiş ve önbellekli PNG dışa aktarımı
+- utils.trend_engine: Filtre parmak izi bazlı önbellekli trend serileri
 - datetime: Dosya adlarında zaman damgası kullanımı
 - utils.error_handler: Hata yakalama ve kullanıcıya dostça gösterme
 """
 
 
+import math
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from io import BytesIO
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Hashable, Optional, List
 from utils.error_handler import handle_error, display_friendly_error
+from utils.chart_export import ChartSpec, chart_spec, render_specs, export_requested, format_render_timings
+from config.constants import GENERAL_COLUMNS
+from utils.trend_engine import (
+    load_trend_series, load_group_trends, TREND_METRICS,
+    SERIES_MONTHLY, SERIES_CUMULATIVE, SERIES_ROLLING, SERIES_YOY,
+)
+
+# BE serisinin rengi
+BE_COLOR = "#AB63FA"
+
+
+def build_trend_figure(
+    trend: Dict[str, pd.DataFrame],
+    view: str = SERIES_MONTHLY,
+    shown_metrics: Optional[List[str]] = None,
+    budget_color: str = "#636EFA",
+    actual_color: str = "#EF553B",
+    difference_color: str = "#00CC96",
+) -> go.Figure:
+    """
+    Trend serilerinden grafiği oluşturur (Streamlit gerektirmez).
+
+    Parameters:
+        trend (Dict[str, DataFrame]): load_trend_series çıktısı
+        view (str): Seri görünümü (SERIES_MONTHLY, SERIES_CUMULATIVE, SERIES_ROLLING, SERIES_YOY)
+        shown_metrics (List[str], optional): Gösterilecek metrikler; verilmezse panelin
+            varsayılanı (Bütçe ve Fiili, yoksa ilk mevcut metrik)
+        budget_color (str): Bütçe çubuklarının rengi
+        actual_color (str): Fiili çubuklarının rengi
+        difference_color (str): Fark çizgisinin rengi
+
+    Returns:
+        Figure: Trend grafiği
+    """
+    if shown_metrics is None:
+        metrics = [metric for metric in TREND_METRICS if metric in trend]
+        shown_metrics = [metric for metric in ["Bütçe", "Fiili"] if metric in metrics] or metrics[:1]
+    colors = {"Bütçe": budget_color, "Fiili": actual_color, "BE": BE_COLOR}
+
+    fig = go.Figure()
+    for metric in shown_metrics:
+        series = trend[metric][view]
+        if view == SERIES_MONTHLY or view == SERIES_YOY:
+            fig.add_bar(
+                x=series.index, y=series.to_numpy(), name=metric, marker_color=colors[metric]
+            )
+        else:
+            fig.add_trace(
+                go.Scatter(
+                    x=series.index,
+                    y=series.to_numpy(),
+                    name=metric,
+                    mode="lines+markers",
+                    line=dict(color=colors[metric]),
+                )
+            )
+
+    # Bütçe - Fiili farkı (yüzde değişim görünümünde anlamlı olmadığı için gösterilmez)
+    if view != SERIES_YOY and "Fark" in trend and {"Bütçe", "Fiili"} <= set(shown_metrics):
+        fig.add_trace(
+            go.Scatter(
+                x=trend["Fark"].index,
+                y=trend["Fark"][view].to_numpy(),
+                name="Fark",
+                line=dict(color=difference_color),
+            )
+        )
+
+    # Grafik düzenleme
+    fig.update_layout(
+        legend=dict(orientation="h", yanchor="top", y=1.1, xanchor="center", x=0.5),
+        margin=dict(t=30, b=0, l=0, r=0)
+    )
+    if view == SERIES_YOY:
+        fig.update_yaxes(ticksuffix=" %")
+    return fig
 
 
 @handle_error
@@ -38,10 +117,16 @@ def show_trend_analysis(
     selected_months: List[str], 
     budget_color: str = "#636EFA", 
     actual_color: str = "#EF553B", 
-    difference_color: str = "#00CC96"
-) -> Optional[BytesIO]:
+    difference_color: str = "#00CC96",
+    previous_df: Optional[pd.DataFrame] = None,
+    cache_key: Optional[Hashable] = None,
+) -> Optional[ChartSpec]:
     """
     Aylık finansal trendleri görselleştirir.
+
+    Seriler trend motorunda filtre parmak izi başına bir kez hesaplanır;
+    görünüm (aylık, kümüle, hareketli ortalama, yıllık değişim) değiştirmek
+    yeniden hesaplama gerektirmez.
     
     Parameters:
         df (DataFrame): İşlenecek veri çerçevesi
@@ -49,74 +134,53 @@ def show_trend_analysis(
         budget_color (str): Bütçe çubuklarının rengi
         actual_color (str): Fiili çubuklarının rengi
         difference_color (str): Fark çizgisinin rengi
+        previous_df (DataFrame, optional): Yıllık değişim için önceki dönem verisi
+        cache_key (Hashable, optional): Filtre parmak izi
         
     Returns:
-        Optional[BytesIO]: Grafik görüntüsü buffer'ı veya None
+        Optional[ChartSpec]: Dışa aktarım için grafik tanımı veya None
     """
     st.subheader("📈 Aylık Trend Analizi")
 
-    trend_data = []
-    for month in selected_months:
-        b_col, a_col = f"{month} Bütçe", f"{month} Fiili"
-        if b_col in df.columns and a_col in df.columns:
-            budget_val = df[b_col].sum()
-            actual_val = df[a_col].sum()
-            trend_data.append(
-                {
-                    "Ay": month,
-                    "Bütçe": budget_val,
-                    "Fiili": actual_val,
-                    "Fark": budget_val - actual_val,
-                }
-            )
+    trend = load_trend_series(df, selected_months, previous_df, cache_key=cache_key)
+    metrics = [metric for metric in TREND_METRICS if metric in trend]
 
-    if not trend_data:
+    if not metrics:
         display_friendly_error(
             "Trend analizi için yeterli veri yok.",
             "Lütfen farklı aylar veya veri türleri seçin."
         )
         return None
 
-    df_trend = pd.DataFrame(trend_data)
-    
+    views = [SERIES_MONTHLY, SERIES_CUMULATIVE, SERIES_ROLLING]
+    if SERIES_YOY in trend[metrics[0]].columns:
+        views.append(SERIES_YOY)
+
+    col_view, col_metrics = st.columns([0.6, 0.4])
+    with col_view:
+        view = st.radio("Seri", views, horizontal=True, key="trend_view")
+    with col_metrics:
+        default_metrics = [metric for metric in ["Bütçe", "Fiili"] if metric in metrics] or metrics[:1]
+        shown_metrics = st.multiselect("Metrikler", metrics, default=default_metrics, key="trend_metrics")
+
     try:
-        fig = go.Figure()
-        fig.add_bar(
-            x=df_trend["Ay"], y=df_trend["Bütçe"], name="Bütçe", marker_color=budget_color
-        )
-        fig.add_bar(
-            x=df_trend["Ay"], y=df_trend["Fiili"], name="Fiili", marker_color=actual_color
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=df_trend["Ay"],
-                y=df_trend["Fark"],
-                name="Fark",
-                line=dict(color=difference_color),
-            )
-        )
-        
-        # Grafik düzenleme
-        fig.update_layout(
-            legend=dict(orientation="h", yanchor="top", y=1.1, xanchor="center", x=0.5),
-            margin=dict(t=30, b=0, l=0, r=0)
-        )
-        
+        fig = build_trend_figure(trend, view, shown_metrics, budget_color, actual_color, difference_color)
         st.plotly_chart(fig, use_container_width=True)
 
-        # PNG export
-        img_buffer = BytesIO()
-        fig.write_image(img_buffer, format="png")
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        st.download_button(
-            "⬇ İndir (PNG)",
-            data=img_buffer.getvalue(),
-            file_name=f"trend_analizi_{timestamp}.png",
-            mime="image/png",
-        )
+        # PNG yalnızca istendiğinde render edilir; sekme grafiğin tanımını döndürür
+        spec = chart_spec(fig, width=1000, height=600)
+        if export_requested("trend_png", spec.key):
+            images, timings = render_specs({"trend_analizi.png": spec})
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            st.download_button(
+                "⬇ İndir (PNG)",
+                data=images["trend_analizi.png"],
+                file_name=f"trend_analizi_{timestamp}.png",
+                mime="image/png",
+            )
+            st.caption(format_render_timings(timings))
 
-        return img_buffer
+        return spec
         
     except Exception as e:
         display_friendly_error(
@@ -124,3 +188,143 @@ def show_trend_analysis(
             "Veri setini kontrol edin ve tekrar deneyin."
         )
         return None
+
+
+def build_small_multiples(
+    group_trends: pd.DataFrame,
+    group_col: str,
+    colors: Dict[str, str],
+    columns: int = 5,
+    panel_height: int = 180,
+) -> go.Figure:
+    """
+    Grup bazlı trend tablosundan küçük çoklu (facet) grafik oluşturur.
+
+    Paneller, eksen alanları doğrudan hesaplanarak tek bir yerleşimde kurulur;
+    make_subplots/px facet yoluna göre 100 grupta yaklaşık 10 kat daha hızlıdır.
+
+    Parameters:
+        group_trends (DataFrame): compute_group_trends çıktısı
+        group_col (str): Gruplama sütunu
+        colors (Dict[str, str]): Metrik -> renk
+        columns (int): Satır başına panel sayısı
+        panel_height (int): Panel yüksekliği (piksel)
+
+    Returns:
+        Figure: Küçük çoklu trend grafiği
+    """
+    groups = pd.unique(group_trends[group_col])
+    metrics = pd.unique(group_trends["Metrik"])
+    months = pd.unique(group_trends["Ay"]).tolist()
+    values = group_trends["Tutar"].to_numpy().reshape(len(groups), len(metrics), len(months))
+
+    rows = max(1, math.ceil(len(groups) / columns))
+    h_space, v_space = 0.02, min(0.04, 0.5 / rows)
+    width = (1 - h_space * (columns - 1)) / columns
+    height = (1 - v_space * (rows - 1)) / rows
+
+    data, annotations = [], []
+    layout = {
+        "height": rows * panel_height,
+        "margin": dict(t=40, b=20, l=20, r=20),
+        "legend": dict(orientation="h", yanchor="bottom", y=1.0, xanchor="center", x=0.5),
+        "showlegend": True,
+    }
+    for k, group in enumerate(groups):
+        row, col = divmod(k, columns)
+        suffix = "" if k == 0 else str(k + 1)
+        x0 = col * (width + h_space)
+        y1 = 1 - row * (height + v_space)
+        # Kayan nokta hataları alanı [0, 1] dışına taşımasın
+        layout[f"xaxis{suffix}"] = dict(
+            domain=[max(0.0, x0), min(1.0, x0 + width)], anchor=f"y{suffix}", showticklabels=False
+        )
+        layout[f"yaxis{suffix}"] = dict(
+            domain=[max(0.0, y1 - height), min(1.0, y1)],
+            anchor=f"x{suffix}",
+            tickformat="~s",
+            tickfont=dict(size=8),
+        )
+        annotations.append(dict(
+            text=str(group)[:30], x=x0 + width / 2, y=y1, xref="paper", yref="paper",
+            showarrow=False, yanchor="bottom", font=dict(size=10),
+        ))
+        for m, metric in enumerate(metrics):
+            data.append(dict(
+                type="scatter",
+                mode="lines",
+                x=months,
+                y=values[k, m],
+                xaxis=f"x{suffix}",
+                yaxis=f"y{suffix}",
+                name=metric,
+                legendgroup=metric,
+                showlegend=k == 0,
+                line=dict(color=colors.get(metric), width=1.5),
+                hovertemplate=f"{group}<br>%{{x}}: %{{y:,.0f}} ₺<extra>{metric}</extra>",
+            ))
+    layout["annotations"] = annotations
+    return go.Figure(data=data, layout=layout)
+
+
+@handle_error
+def show_group_trends(
+    df: pd.DataFrame,
+    selected_months: List[str],
+    budget_color: str = "#636EFA",
+    actual_color: str = "#EF553B",
+    cache_key: Optional[Hashable] = None,
+) -> None:
+    """
+    Seçilen gruplama sütununun her değeri için aylık trendi yan yana gösterir.
+
+    Bu fonksiyon:
+    1. Gruplama sütunu, metrikler ve grup sayısını kullanıcıdan alır
+    2. (grup x metrik x ay) matrisini tek groupby ile hesaplar (önbellekli)
+    3. Sonucu küçük çoklu grafik olarak çizer
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        selected_months (List[str]): Gösterilecek aylar
+        budget_color (str): Bütçe çizgisinin rengi
+        actual_color (str): Fiili çizgisinin rengi
+        cache_key (Hashable, optional): Filtre parmak izi
+    """
+    group_options = [col for col in GENERAL_COLUMNS if col in df.columns]
+    if not group_options:
+        return
+
+    col_group, col_metrics, col_count = st.columns([0.4, 0.35, 0.25])
+    with col_group:
+        group_col = st.selectbox(
+            "Gruplama Kriteri",
+            group_options,
+            index=group_options.index("Masraf Çeşidi Grubu 1") if "Masraf Çeşidi Grubu 1" in group_options else 0,
+            key="group_trend_column",
+        )
+    with col_metrics:
+        metrics = st.multiselect(
+            "Metrikler", TREND_METRICS, default=["Bütçe", "Fiili"], key="group_trend_metrics"
+        )
+    with col_count:
+        max_groups = st.slider(
+            "En Fazla Grup", min_value=5, max_value=100, value=30, step=5, key="group_trend_count"
+        )
+
+    if not metrics:
+        st.info("En az bir metrik seçin.", icon="ℹ️")
+        return
+
+    group_trends = load_group_trends(
+        df, group_col, selected_months, metrics, max_groups, cache_key=cache_key
+    )
+    if group_trends.empty:
+        display_friendly_error(
+            "Grup bazlı trend için yeterli veri yok.",
+            "Lütfen farklı aylar veya veri türleri seçin."
+        )
+        return
+
+    colors = {"Bütçe": budget_color, "Fiili": actual_color, "BE": BE_COLOR}
+    fig = build_small_multiples(group_trends, group_col, colors)
+    st.plotly_chart(fig, use_container_width=True)
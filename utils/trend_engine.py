@@ -0,0 +1,260 @@
+"""
+trend_engine.py - Aylık trend serilerini tek bir vektörel indirgemeyle hesaplar.
+
+Bu modül, seçili ayların Bütçe/Fiili/BE sütunlarını (metrik x ay) matrisine
+indirger ve bu matristen aylık, kümüle (YTD), 3 aylık hareketli ortalama ve
+önceki dönem yüklendiyse yıllık değişim (YoY) serilerini türetir. Sonuçlar
+filtre parmak izi başına önbelleğe alınır; grafikte seri değiştirmek yeniden
+hesaplama gerektirmez.
+
+Fonksiyonlar:
+    - month_matrix: Veri çerçevesini (metrik x ay) toplam matrisine indirger
+    - compute_trend_series: Tüm trend serilerini hesaplar
+    - load_trend_series: compute_trend_series'in filtre parmak izi bazlı önbellekli sürümü
+    - compute_group_trends: (grup x metrik x ay) trend küpünü tek groupby ile hesaplar
+    - load_group_trends: compute_group_trends'in önbellekli sürümü
+
+Kullanım:
+    from utils.trend_engine import load_trend_series
+
+    trend = load_trend_series(final_df, selected_months, cache_key=filter_key)
+    trend["Fiili"]["Kümüle"]
+"""
+
+from typing import Dict, Hashable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.constants import MONTHS, TREND_CACHE_ENTRIES
+from utils.cache import ResultCache, dataframe_fingerprint, filter_fingerprint
+
+# Trend motorunun hesapladığı metrikler
+TREND_METRICS = ["Bütçe", "Fiili", "BE"]
+
+# Seri adları (grafikte seçilebilir görünümler)
+SERIES_MONTHLY = "Aylık"
+SERIES_CUMULATIVE = "Kümüle"
+SERIES_ROLLING = "3 Aylık Ort."
+SERIES_YOY = "Önceki Döneme Göre (%)"
+
+# Hareketli ortalama penceresi (ay)
+ROLLING_WINDOW = 3
+
+_trend_cache = ResultCache(TREND_CACHE_ENTRIES)
+
+
+def month_matrix(df: pd.DataFrame, months: Sequence[str], metrics: Sequence[str]) -> np.ndarray:
+    """
+    Veri çerçevesini (metrik x ay) toplam matrisine indirger.
+
+    Mevcut tüm "<ay> <metrik>" sütunları tek bir sütun toplamıyla indirgenir;
+    veride bulunmayan hücreler NaN olarak kalır. Boş (NaN) değerler toplamda
+    yok sayılır; önceki dönem verisi doldurulmadan verilebilir.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        months (Sequence[str]): Aylar (sütun sırası)
+        metrics (Sequence[str]): Metrikler (satır sırası)
+
+    Returns:
+        ndarray: (len(metrics), len(months)) boyutlu toplam matrisi
+    """
+    matrix = np.full((len(metrics), len(months)), np.nan)
+    positions, columns = [], []
+    for i, metric in enumerate(metrics):
+        for j, month in enumerate(months):
+            col = f"{month} {metric}"
+            if col in df.columns:
+                positions.append((i, j))
+                columns.append(col)
+    if columns:
+        totals = np.nansum(df[columns].to_numpy(dtype=np.float64), axis=0)
+        rows, cols = zip(*positions)
+        matrix[list(rows), list(cols)] = totals
+    return matrix
+
+
+def _rolling_mean(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Satır bazında, ilk aylarda mevcut ay sayısıyla bölünen hareketli ortalama."""
+    filled = np.nan_to_num(matrix)
+    cumulative = np.cumsum(filled, axis=1)
+    shifted = np.zeros_like(cumulative)
+    shifted[:, window:] = cumulative[:, :-window]
+    counts = np.minimum(np.arange(1, matrix.shape[1] + 1), window)
+    return (cumulative - shifted) / counts
+
+
+def compute_trend_series(
+    df: pd.DataFrame,
+    months: Sequence[str],
+    previous_df: Optional[pd.DataFrame] = None,
+    metrics: Sequence[str] = TREND_METRICS,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Aylık, kümüle, hareketli ortalama ve yıllık değişim serilerini hesaplar.
+
+    Bu fonksiyon:
+    1. Seçili ayları takvim sırasına dizer
+    2. Veriyi tek geçişte (metrik x ay) matrisine indirger
+    3. Kümüle ve 3 aylık hareketli ortalama serilerini matris üzerinde türetir
+    4. Önceki dönem verilmişse aynı matrisi onun için hesaplayıp yüzde değişimi bulur
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        months (Sequence[str]): Seçili aylar
+        previous_df (DataFrame, optional): Aynı filtrelerle daraltılmış önceki dönem verisi
+        metrics (Sequence[str]): Metrikler
+
+    Returns:
+        Dict[str, DataFrame]: Metrik -> (Ay indeksli, seri sütunlu) tablo; veride
+            hiç sütunu olmayan metrikler dahil edilmez. "Fark" anahtarı
+            Bütçe - Fiili aylık farkını içerir.
+    """
+    ordered_months = [month for month in MONTHS if month in set(months)]
+    matrix = month_matrix(df, ordered_months, metrics)
+    cumulative = np.cumsum(np.nan_to_num(matrix), axis=1)
+    rolling = _rolling_mean(matrix, ROLLING_WINDOW)
+
+    yoy = None
+    if previous_df is not None:
+        previous = month_matrix(previous_df, ordered_months, metrics)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            yoy = np.where(previous != 0, (matrix - previous) / np.abs(previous) * 100, np.nan)
+
+    index = pd.Index(ordered_months, name="Ay")
+    series = {}
+    for i, metric in enumerate(metrics):
+        if np.isnan(matrix[i]).all():
+            continue
+        columns = {
+            SERIES_MONTHLY: matrix[i],
+            SERIES_CUMULATIVE: cumulative[i],
+            SERIES_ROLLING: rolling[i],
+        }
+        if yoy is not None:
+            columns[SERIES_YOY] = yoy[i]
+        series[metric] = pd.DataFrame(columns, index=index)
+
+    if "Bütçe" in series and "Fiili" in series:
+        level_series = [SERIES_MONTHLY, SERIES_CUMULATIVE, SERIES_ROLLING]
+        series["Fark"] = series["Bütçe"][level_series] - series["Fiili"][level_series]
+    return series
+
+
+def load_trend_series(
+    df: pd.DataFrame,
+    months: Sequence[str],
+    previous_df: Optional[pd.DataFrame] = None,
+    cache_key: Optional[Hashable] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Trend serilerini filtre parmak izi başına bir kez hesaplar.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        months (Sequence[str]): Seçili aylar
+        previous_df (DataFrame, optional): Önceki dönem verisi
+        cache_key (Hashable, optional): Filtre parmak izi; verilmezse veri
+            çerçevelerinin içerik parmak izi kullanılır
+
+    Returns:
+        Dict[str, DataFrame]: compute_trend_series çıktısı
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    # Önceki dönem aynı filtrelerle daraltıldığı için kaynak dosyasının parmak izi yeterlidir
+    previous_key = filter_fingerprint(previous_df, {}) if previous_df is not None else None
+    key = ("trend", cache_key, tuple(months), previous_key)
+    return _trend_cache.get_or_compute(key, lambda: compute_trend_series(df, months, previous_df))
+
+
+def compute_group_trends(
+    df: pd.DataFrame,
+    group_col: str,
+    months: Sequence[str],
+    metrics: Sequence[str] = ("Bütçe", "Fiili"),
+    max_groups: int = 100,
+    rank_metric: str = "Fiili",
+) -> pd.DataFrame:
+    """
+    Her grup için aylık trendleri tek bir gruplanmış indirgemeyle hesaplar.
+
+    Bu fonksiyon:
+    1. Seçili ayların tüm metrik sütunlarını grup bazında tek groupby ile toplar
+    2. Sonucu (grup x metrik x ay) küpüne dönüştürür
+    3. rank_metric toplamına göre en büyük max_groups grubu seçer
+    4. Küçük çoklu grafik için uzun formatlı tablo döndürür
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_col (str): Gruplama sütunu
+        months (Sequence[str]): Seçili aylar
+        metrics (Sequence[str]): Metrikler
+        max_groups (int): En fazla grup sayısı
+        rank_metric (str): Grupları sıralamada kullanılan metrik
+
+    Returns:
+        DataFrame: [group_col, "Ay", "Metrik", "Tutar"] sütunlu uzun tablo;
+            gruplar toplam büyüklüğe göre sıralıdır
+    """
+    ordered_months = [month for month in MONTHS if month in set(months)]
+    metrics = [
+        metric for metric in metrics
+        if any(f"{month} {metric}" in df.columns for month in ordered_months)
+    ]
+    empty = pd.DataFrame(columns=[group_col, "Ay", "Metrik", "Tutar"])
+    if group_col not in df.columns or not metrics or not ordered_months:
+        return empty
+
+    # Eksik sütunlar sıfır yerine NaN kalsın diye tam (metrik x ay) sütun ızgarası kurulur
+    grid = [f"{month} {metric}" for metric in metrics for month in ordered_months]
+    present = [col for col in grid if col in df.columns]
+    grouped = df.groupby(group_col, sort=False)[present].sum().reindex(columns=grid)
+    if grouped.empty:
+        return empty
+
+    cube = grouped.to_numpy(dtype=np.float64).reshape(len(grouped), len(metrics), len(ordered_months))
+    rank_idx = metrics.index(rank_metric) if rank_metric in metrics else 0
+    ranking = np.nan_to_num(cube[:, rank_idx, :]).sum(axis=1)
+    order = np.argsort(-ranking, kind="stable")[:max_groups]
+    cube = cube[order]
+    groups = grouped.index[order]
+
+    n_groups, n_metrics, n_months = cube.shape
+    return pd.DataFrame({
+        group_col: np.repeat(groups.to_numpy(), n_metrics * n_months),
+        "Ay": np.tile(ordered_months, n_groups * n_metrics),
+        "Metrik": np.tile(np.repeat(metrics, n_months), n_groups),
+        "Tutar": cube.reshape(-1),
+    })
+
+
+def load_group_trends(
+    df: pd.DataFrame,
+    group_col: str,
+    months: Sequence[str],
+    metrics: Sequence[str] = ("Bütçe", "Fiili"),
+    max_groups: int = 100,
+    cache_key: Optional[Hashable] = None,
+) -> pd.DataFrame:
+    """
+    Grup bazlı trend tablosunu filtre parmak izi başına bir kez hesaplar.
+
+    Parameters:
+        df (DataFrame): İşlenecek veri çerçevesi
+        group_col (str): Gruplama sütunu
+        months (Sequence[str]): Seçili aylar
+        metrics (Sequence[str]): Metrikler
+        max_groups (int): En fazla grup sayısı
+        cache_key (Hashable, optional): Filtre parmak izi
+
+    Returns:
+        DataFrame: compute_group_trends çıktısı
+    """
+    if cache_key is None:
+        cache_key = dataframe_fingerprint(df)
+    key = ("group_trend", cache_key, group_col, tuple(months), tuple(metrics), max_groups)
+    return _trend_cache.get_or_compute(
+        key, lambda: compute_group_trends(df, group_col, months, metrics, max_groups)
+    )
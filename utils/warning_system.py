@@ -8,6 +8,10 @@ Fonksiyonlar:
     - style_warning_rows: Uyarı gerektiren satırları stillendirir
     - style_negatives_red: Negatif değerleri kırmızı renkle stillendirir
     - style_overused_rows: Bütçesi aşılan satırları stillendirir
+    - warning_row_styles / negative_styles / overused_row_styles:
+      Aynı kuralların CSS matrislerini NumPy karşılaştırmalarıyla hesaplar
+    - style_page: Görünen sayfayı önbellekli ve hücre sınırlı olarak stillendirir
+    - show_alert_summary: Uyarı indeksinden bütçe aşım özetini gösterir
 
 Özellikler:
     - Koşullu stilleme
@@ -23,16 +27,145 @@ Kullanım:
     display(styled_df)
 """
 
+import time
+
+import numpy as np
 import pandas as pd
+import streamlit as st
 
+from typing import Callable, Optional, Tuple, Hashable
 from pandas.io.formats.style import Styler
 
-from config.constants import MONTHS
+from config.constants import MONTHS, STYLE_MAX_CELLS, STYLE_CACHE_ENTRIES
+from utils.alert_engine import overrun_threshold, summarize_alerts, split_anomalies
+from utils.cache import ResultCache, dataframe_fingerprint
+from utils.formatting import render_table
 from utils.error_handler import handle_error
 
+# Stil tanımları
+WARNING_CSS = "background-color: #ffcccc"
+NEGATIVE_CSS = "color: red"
+
+
+def _numeric_block(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """
+    Sütunları tek bir float matrisine dönüştürür; sayısal olmayan değerler NaN olur.
+    """
+    if not columns:
+        return np.empty((len(df), 0), dtype=np.float64)
+    block = df[columns]
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+        return block.to_numpy(dtype=np.float64)
+    return block.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _empty_css(df: pd.DataFrame) -> np.ndarray:
+    """
+    Veri çerçevesi boyutunda boş bir CSS matrisi oluşturur.
+    """
+    return np.full(df.shape, "", dtype=object)
+
+
+def _css_styler(css: np.ndarray, df: pd.DataFrame, display_df: Optional[pd.DataFrame]) -> Styler:
+    """
+    Hazır CSS matrisini tek adımda Styler'a uygular.
+    
+    Maskeler sayısal `df` üzerinden hesaplanır; `display_df` verilirse (ör.
+    TL formatlı gösterim kopyası) stil onun üzerine uygulanır.
+    """
+    target = df if display_df is None else display_df
+    return target.style.apply(lambda _: css, axis=None)
+
+
+def warning_row_styles(df: pd.DataFrame) -> np.ndarray:
+    """
+    Bütçe aşımı uyarılarının CSS matrisini sütun bazlı karşılaştırmalarla hesaplar.
+    
+    Kümüle fiili kümüle bütçeyi aşan satırlarda kümüle alanlar ve masraf
+    bilgileri, bu satırlarda da fiilinin bütçeyi aştığı aylık sütun çiftleri
+    işaretlenir. Tüm aylar tek bir matris karşılaştırmasıyla değerlendirilir.
+    
+    Parameters:
+        df (DataFrame): Sayısal veri çerçevesi
+        
+    Returns:
+        ndarray: df ile aynı boyutta CSS matrisi
+    """
+    css = _empty_css(df)
+    positions = {col: i for i, col in enumerate(df.columns)}
+
+    if "Kümüle Bütçe" not in positions or "Kümüle Fiili" not in positions:
+        return css
+
+    cumulative = _numeric_block(df, ["Kümüle Bütçe", "Kümüle Fiili"])
+    overrun = cumulative[:, 1] > cumulative[:, 0]
+    if not overrun.any():
+        return css
+
+    # Kümüle alanları ve masraf bilgilerini boyama
+    for col in ["Kümüle Bütçe", "Kümüle Fiili", "Masraf Yeri", "Masraf Çeşidi"]:
+        if col in positions:
+            css[overrun, positions[col]] = WARNING_CSS
+
+    # Aylık bazda fiili > bütçe karşılaştırması (tüm aylar tek matris işlemi)
+    pairs = [
+        (positions[f"{month} Bütçe"], positions[f"{month} Fiili"])
+        for month in MONTHS
+        if f"{month} Bütçe" in positions and f"{month} Fiili" in positions
+    ]
+    if pairs:
+        budget_idx = [b for b, _ in pairs]
+        actual_idx = [a for _, a in pairs]
+        budget = _numeric_block(df, [df.columns[i] for i in budget_idx])
+        actual = _numeric_block(df, [df.columns[i] for i in actual_idx])
+        monthly_overrun = (actual > budget) & overrun[:, None]
+        rows, month_pos = np.nonzero(monthly_overrun)
+        css[rows, np.asarray(budget_idx)[month_pos]] = WARNING_CSS
+        css[rows, np.asarray(actual_idx)[month_pos]] = WARNING_CSS
+
+    return css
+
+
+def negative_styles(df: pd.DataFrame) -> np.ndarray:
+    """
+    Fark bakiye sütunlarındaki negatif değerlerin CSS matrisini hesaplar.
+    
+    Parameters:
+        df (DataFrame): Sayısal veri çerçevesi
+        
+    Returns:
+        ndarray: df ile aynı boyutta CSS matrisi
+    """
+    css = _empty_css(df)
+    columns = [col for col in df.columns if "Fark Bakiye" in col]
+    if columns:
+        col_idx = np.asarray([df.columns.get_loc(col) for col in columns])
+        rows, pos = np.nonzero(_numeric_block(df, columns) < 0)
+        css[rows, col_idx[pos]] = NEGATIVE_CSS
+    return css
+
+
+def overused_row_styles(df: pd.DataFrame) -> np.ndarray:
+    """
+    Kullanım yüzdesi bütçe aşımı kuralına düşen (%100'ün üzerindeki) satırların CSS matrisini hesaplar.
+    
+    Eşik uyarı motoruyla aynıdır (`overrun_threshold`); boş (NaN) kullanım işaretlenmez.
+    
+    Parameters:
+        df (DataFrame): Sayısal veri çerçevesi
+        
+    Returns:
+        ndarray: df ile aynı boyutta CSS matrisi
+    """
+    css = _empty_css(df)
+    if "Kullanım (%)" in df.columns:
+        usage = _numeric_block(df, ["Kullanım (%)"])[:, 0]
+        css[usage > overrun_threshold(), :] = WARNING_CSS
+    return css
+
 
 @handle_error
-def style_warning_rows(df: pd.DataFrame) -> Styler:
+def style_warning_rows(df: pd.DataFrame, display_df: Optional[pd.DataFrame] = None) -> Styler:
     """
     Uyarı gerektiren satırları stillendirir.
     
@@ -42,8 +175,11 @@ def style_warning_rows(df: pd.DataFrame) -> Styler:
     3. İlgili hücreleri renklendirir
     4. Aylık bazda kontroller yapar
     
+    Maskeler `warning_row_styles` ile tek geçişte hesaplanır.
+    
     Parameters:
-        df (DataFrame): Stillendirilecek veri çerçevesi
+        df (DataFrame): Stillendirilecek (sayısal) veri çerçevesi
+        display_df (DataFrame, optional): Stilin uygulanacağı gösterim kopyası
         
     Returns:
         Styler: Stillendirilmiş veri çerçevesi
@@ -60,57 +196,11 @@ def style_warning_rows(df: pd.DataFrame) -> Styler:
         >>> styled_df = style_warning_rows(df)
         >>> display(styled_df)
     """
-    def apply_style(row):
-        style = [""] * len(row)
-
-        # Kümüle kontrolü
-        if "Kümüle Bütçe" in row and "Kümüle Fiili" in row:
-            try:
-                budget = row["Kümüle Bütçe"]
-                actual = row["Kümüle Fiili"]
-
-                if actual > budget:
-                    # Kümüle alanları boyama (kırmızı)
-                    for col in ["Kümüle Bütçe", "Kümüle Fiili"]:
-                        if col in row.index:
-                            style[row.index.get_loc(col)] = "background-color: #ffcccc"
-
-                    # Masraf bilgilerini boyama (kırmızı)
-                    if "Masraf Yeri" in row.index:
-                        style[
-                            row.index.get_loc("Masraf Yeri")
-                        ] = "background-color: #ffcccc"
-                    if "Masraf Çeşidi" in row.index:
-                        style[
-                            row.index.get_loc("Masraf Çeşidi")
-                        ] = "background-color: #ffcccc"
-
-                    # Aylık bazda fiili > bütçe ise mavi renkle boyama
-                    for month in MONTHS:
-                        b_col = f"{month} Bütçe"
-                        a_col = f"{month} Fiili"
-                        if b_col in row.index and a_col in row.index:
-                            try:
-                                if row[a_col] > row[b_col]:
-                                    style[
-                                        row.index.get_loc(b_col)
-                                    ] = "background-color: #ffcccc"
-                                    style[
-                                        row.index.get_loc(a_col)
-                                    ] = "background-color: #ffcccc"
-                            except:
-                                continue
-
-            except:
-                pass
-
-        return style
-
-    return df.style.apply(apply_style, axis=1)
+    return _css_styler(warning_row_styles(df), df, display_df)
 
 
 @handle_error
-def style_negatives_red(df: pd.DataFrame) -> Styler:
+def style_negatives_red(df: pd.DataFrame, display_df: Optional[pd.DataFrame] = None) -> Styler:
     """
     Negatif değerleri kırmızı renkle stillendirir.
     
@@ -120,7 +210,8 @@ def style_negatives_red(df: pd.DataFrame) -> Styler:
     3. Kırmızı renkle işaretler
     
     Parameters:
-        df (DataFrame): Stillendirilecek veri çerçevesi
+        df (DataFrame): Stillendirilecek (sayısal) veri çerçevesi
+        display_df (DataFrame, optional): Stilin uygulanacağı gösterim kopyası
         
     Returns:
         Styler: Stillendirilmiş veri çerçevesi
@@ -136,24 +227,22 @@ def style_negatives_red(df: pd.DataFrame) -> Styler:
         >>> styled_df = style_negatives_red(df)
         >>> display(styled_df)
     """
-    return df.style.map(
-        lambda x: "color: red" if isinstance(x, (int, float)) and x < 0 else "",
-        subset=[col for col in df.columns if "Fark Bakiye" in col],
-    )
+    return _css_styler(negative_styles(df), df, display_df)
 
 
 @handle_error
-def style_overused_rows(df: pd.DataFrame) -> Styler:
+def style_overused_rows(df: pd.DataFrame, display_df: Optional[pd.DataFrame] = None) -> Styler:
     """
     Bütçesi aşılan satırları stillendirir.
     
     Bu fonksiyon:
     1. Kullanım yüzdesini kontrol eder
-    2. %100 ve üzeri değerleri tespit eder
+    2. Bütçe aşımı kuralına düşen (%100'ün üzerindeki) değerleri tespit eder
     3. İlgili satırları renklendirir
     
     Parameters:
-        df (DataFrame): Stillendirilecek veri çerçevesi
+        df (DataFrame): Stillendirilecek (sayısal) veri çerçevesi
+        display_df (DataFrame, optional): Stilin uygulanacağı gösterim kopyası
         
     Returns:
         Styler: Stillendirilmiş veri çerçevesi
@@ -169,13 +258,128 @@ def style_overused_rows(df: pd.DataFrame) -> Styler:
         >>> styled_df = style_overused_rows(df)
         >>> display(styled_df)
     """
-    def apply_style(row):
-        if "Kullanım (%)" in row and pd.notnull(row["Kullanım (%)"]):
-            try:
-                if row["Kullanım (%)"] >= 100:
-                    return ["background-color: #ffcccc"] * len(row)
-            except:
-                pass
-        return [""] * len(row)
+    return _css_styler(overused_row_styles(df), df, display_df)
+
+
+# Stil fonksiyonu adı -> CSS matrisi hesaplayan fonksiyon
+_CSS_FUNCTIONS = {
+    "style_warning_rows": warning_row_styles,
+    "style_negatives_red": negative_styles,
+    "style_overused_rows": overused_row_styles,
+}
+
+# (sayfa parmak izi, sayfa, stil fonksiyonu) -> CSS matrisi
+_style_cache = ResultCache(max_entries=STYLE_CACHE_ENTRIES)
+
+
+def style_page(
+    style_func: Callable,
+    page_df: pd.DataFrame,
+    display_df: Optional[pd.DataFrame] = None,
+    page: Hashable = 1,
+    max_cells: int = STYLE_MAX_CELLS,
+) -> Tuple[Optional[Styler], float, bool]:
+    """
+    Yalnızca görünen sayfayı stillendirir; CSS matrisini önbellekten kullanır.
+    
+    Bu fonksiyon:
+    1. Sayfa hücre sayısı `max_cells` sınırını aşıyorsa stil uygulamaz
+    2. CSS matrisini (sayfa parmak izi, sayfa, stil fonksiyonu) anahtarıyla önbellekte arar
+    3. Bulamazsa vektörel olarak hesaplayıp önbelleğe yazar
+    4. Stil süresini ölçer
+    
+    Bu modüldeki stil fonksiyonları dışında verilen fonksiyonlar önbelleğe
+    alınmadan doğrudan çağrılır.
+    
+    Parameters:
+        style_func (Callable): Uygulanacak stil fonksiyonu
+        page_df (DataFrame): Görünen sayfanın sayısal verisi
+        display_df (DataFrame, optional): Stilin uygulanacağı gösterim kopyası
+        page (Hashable): Sayfa numarası
+        max_cells (int): Stil uygulanacak en fazla hücre sayısı
+        
+    Returns:
+        Tuple[Optional[Styler], float, bool]: (Styler veya sınır aşıldıysa None,
+            stil süresi (ms), önbellekten gelip gelmediği)
+    """
+    start = time.perf_counter()
+    if page_df.size > max_cells:
+        return None, 0.0, False
+
+    css_func = _CSS_FUNCTIONS.get(getattr(style_func, "__name__", ""))
+    if css_func is None:
+        styler = style_func(page_df, display_df=display_df)
+        return styler, (time.perf_counter() - start) * 1000, False
+
+    key = (dataframe_fingerprint(page_df), page, style_func.__name__)
+    from_cache = key in _style_cache
+    css = _style_cache.get_or_compute(key, lambda: css_func(page_df))
+    styler = _css_styler(css, page_df, display_df)
+    return styler, (time.perf_counter() - start) * 1000, from_cache
+
+
+@handle_error
+def show_alert_summary(
+    alerts: pd.DataFrame,
+    new_alerts: Optional[pd.DataFrame] = None,
+    top_n: int = 10,
+) -> None:
+    """
+    Uyarı indeksinden bütçe aşım özetini gösterir.
+    
+    Bu fonksiyon:
+    1. Kural bazında uyarı sayılarını metrik olarak gösterir
+    2. En yüksek kullanım oranına sahip aşımları listeler
+    3. Önceki dönem verilmişse yalnızca yeni oluşan aşımları listeler
+    4. İstatistiksel anomalileri skor büyüklüğüne göre listeler
+    
+    Parameters:
+        alerts (DataFrame): Sorgulanmış uyarı indeksi
+        new_alerts (DataFrame, optional): Önceki döneme göre yeni aşımlar
+        top_n (int): Listelenecek en fazla uyarı sayısı
+    """
+    formats = {"Bütçe": "currency", "Fiili": "currency", "Kullanım (%)": "percent"}
+    alerts, anomalies = split_anomalies(alerts)
+    if new_alerts is not None:
+        new_alerts, _ = split_anomalies(new_alerts)
+
+    st.markdown("#### 🚨 Bütçe Aşım Uyarıları")
+    if alerts.empty:
+        st.success("✅ Seçili masraf yerlerinde bütçe aşımı bulunmuyor.")
+    else:
+        counts = summarize_alerts(alerts)
+        columns = st.columns(len(counts))
+        for column, (rule, count) in zip(columns, counts.items()):
+            column.metric(rule, f"{count:,}")
+
+        st.dataframe(
+            render_table(alerts.head(top_n).drop(columns="Seviye"), formats),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    if new_alerts is not None:
+        st.markdown("#### 🆕 Önceki Döneme Göre Yeni Aşımlar")
+        if new_alerts.empty:
+            st.info("Önceki döneme göre yeni bir aşım yok.")
+        else:
+            st.dataframe(
+                render_table(new_alerts.head(top_n).drop(columns="Seviye"), formats),
+                use_container_width=True,
+                hide_index=True,
+            )
 
-    return df.style.apply(apply_style, axis=1)
+    st.markdown("#### 🧪 İstatistiksel Anomaliler")
+    if anomalies.empty:
+        st.info("Aylık harcamalarda istatistiksel anomali bulunmadı.")
+    else:
+        counts = anomalies["Kural"].value_counts()
+        columns = st.columns(len(counts))
+        for column, (rule, count) in zip(columns, counts.items()):
+            column.metric(rule, f"{count:,}")
+        st.dataframe(
+            render_table(anomalies.head(top_n).drop(columns="Seviye"), formats),
+            use_container_width=True,
+            hide_index=True,
+            column_config={"Skor": st.column_config.NumberColumn("Robust z", format="%.1f")},
+        )
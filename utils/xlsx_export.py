@@ -0,0 +1,184 @@
+"""
+xlsx_export.py - Büyük tabloları xlsxwriter'ın sabit bellek modunda Excel dosyasına yazar.
+
+`pd.DataFrame.to_excel` her hücreyi pandas'ın hücre nesnelerine dönüştürüp
+biçim sözlükleriyle birlikte xlsxwriter'a verir; 20 bin satır x 165 sütunluk
+"Ham Veri" sayfası bu yüzden dakikalar sürer. Bu modül değerleri sütun
+bazında vektörel olarak Python değerlerine çevirir ve satırları xlsxwriter'ın
+`write_row` çağrısıyla `constant_memory` modunda yazar: her satır yazıldıktan
+sonra diske aktarılır, sayfa bellekte tutulmaz.
+
+Dosya `write_excel_sheet` ile aynı görünümdedir:
+    - Başlık satırı kalın ve kenarlıklıdır (pandas ile aynı)
+    - Sayısal sütunlar sayı olarak, COLUMN_FORMATS["excel"] formatları ve 16 genişlikle yazılır
+    - Boş değerler boş hücre, sonsuzlar pandas gibi "inf"/"-inf" metni olarak yazılır
+    - Metinler formül veya bağlantıya çevrilmeden metin olarak yazılır
+    - İndeks yazılmaz (`write_excel_sheet(..., index=False)` gibi)
+
+Fonksiyonlar:
+    - workbook_bytes: Sayfaları tek bir xlsx dosyası olarak üretir
+    - timed_workbook_bytes: workbook_bytes'ı üretim süresiyle birlikte döndürür
+
+Sınıflar:
+    - WorkbookSheet: Çalışma kitabına yazılacak sayfa
+
+Kullanım:
+    from utils.xlsx_export import WorkbookSheet, workbook_bytes
+
+    data = workbook_bytes([WorkbookSheet("Ham Veri", df, {"Bütçe": "currency"})])
+"""
+
+import time
+from io import BytesIO
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from utils.formatting import COLUMN_FORMATS
+
+# Değerleri Python nesnelerine tek seferde çevrilen satır bloğu
+ROWS_PER_CHUNK = 2_000
+
+# pandas'ın to_excel başlık ve tarih biçimleri
+_HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+_DATE_FORMAT = "yyyy-mm-dd hh:mm:ss"
+
+_WORKBOOK_OPTIONS = {
+    # Satırlar yazıldıkça diske aktarılır; satırlar sırayla yazılmalıdır
+    "constant_memory": True,
+    "default_date_format": _DATE_FORMAT,
+    "strings_to_formulas": False,
+    "strings_to_urls": False,
+}
+
+
+class WorkbookSheet(NamedTuple):
+    """
+    Çalışma kitabına yazılacak sayfa.
+
+    Attributes:
+        name (str): Sayfa adı
+        df (DataFrame): Yazılacak tablo
+        formats (Dict[str, str], optional): Sütun adı -> format türü (COLUMN_FORMATS anahtarı)
+    """
+
+    name: str
+    df: pd.DataFrame
+    formats: Optional[Dict[str, str]] = None
+
+
+def _cell_value(value: Any) -> Any:
+    """Nesne sütunundaki boş olmayan tek bir değeri yazılacak Python değerine çevirir."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.number)):
+        if np.isfinite(value):
+            return value.item() if isinstance(value, np.number) else value
+        return "inf" if value > 0 else "-inf"
+    return str(value)
+
+
+def _column_values(series: pd.Series) -> List[Any]:
+    """
+    Sütunun değerlerini write_row'un yazacağı Python değerlerine vektörel olarak çevirir.
+
+    Sayısal sütunlar NumPy ile listeye çevrilir; diğer sütunlarda her farklı
+    değer bir kez dönüştürülür ve satırlara kodları üzerinden dağıtılır.
+
+    Parameters:
+        series (Series): Sütun
+
+    Returns:
+        List[Any]: Satır başına değer (boş hücreler için None)
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if getattr(series.dt, "tz", None) is not None:
+            series = series.dt.tz_localize(None)
+        values = series.astype(object).to_numpy()
+        values[series.isna().to_numpy()] = None
+        return values.tolist()
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy()
+        if values.dtype.kind in "iu":
+            return values.tolist()
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        finite = np.isfinite(values)
+        if finite.all():
+            return values.tolist()
+        cells = values.astype(object)
+        cells[np.isnan(values)] = None
+        cells[np.isposinf(values)] = "inf"
+        cells[np.isneginf(values)] = "-inf"
+        return cells.tolist()
+
+    codes, uniques = pd.factorize(series)
+    encoded = np.array([_cell_value(value) for value in uniques] + [None], dtype=object)
+    return encoded[codes].tolist()
+
+
+def _write_sheet(workbook: xlsxwriter.Workbook, sheet: WorkbookSheet, formats: Dict[str, Any]) -> None:
+    """
+    Sayfayı başlık, sütun formatları ve satır blokları halinde yazar.
+
+    Parameters:
+        workbook (Workbook): Hedef çalışma kitabı (constant_memory modunda)
+        sheet (WorkbookSheet): Sayfa
+        formats (Dict[str, Any]): "header" ve COLUMN_FORMATS türleri -> xlsxwriter biçimi
+    """
+    df = sheet.df
+    column_formats = sheet.formats or {}
+    worksheet = workbook.add_worksheet(sheet.name)
+
+    # Sütun biçimleri satırlardan önce tanımlanır; biçimsiz hücreler sütun biçimini alır
+    for position, col in enumerate(df.columns):
+        kind = column_formats.get(col)
+        if kind in COLUMN_FORMATS:
+            worksheet.set_column(position, position, 16, formats[kind])
+
+    header = [" ".join(map(str, col)) if isinstance(col, tuple) else str(col) for col in df.columns]
+    worksheet.write_row(0, 0, header, formats["header"])
+
+    for start in range(0, len(df), ROWS_PER_CHUNK):
+        chunk = df.iloc[start:start + ROWS_PER_CHUNK]
+        columns = [_column_values(chunk.iloc[:, n]) for n in range(chunk.shape[1])]
+        for row, values in enumerate(zip(*columns), start + 1):
+            worksheet.write_row(row, 0, values)
+
+
+def workbook_bytes(sheets: Sequence[WorkbookSheet]) -> bytes:
+    """
+    Sayfaları tek bir xlsx dosyası olarak üretir.
+
+    Bu fonksiyon:
+    1. Çalışma kitabını constant_memory modunda açar ve başlık/sütun biçimlerini tanımlar
+    2. Her sayfanın değerlerini satır blokları halinde Python değerlerine çevirip write_row ile yazar
+
+    Parameters:
+        sheets (Sequence[WorkbookSheet]): Sayfalar (yazılma sırasıyla)
+
+    Returns:
+        bytes: xlsx dosyasının içeriği
+    """
+    buffer = BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, _WORKBOOK_OPTIONS)
+    formats = {"header": workbook.add_format(_HEADER_FORMAT)}
+    for kind, options in COLUMN_FORMATS.items():
+        formats[kind] = workbook.add_format({"num_format": options["excel"]})
+    for sheet in sheets:
+        _write_sheet(workbook, sheet, formats)
+    workbook.close()
+    return buffer.getvalue()
+
+
+def timed_workbook_bytes(sheets: Sequence[WorkbookSheet]) -> Tuple[bytes, float]:
+    """
+    workbook_bytes'ı çalıştırır ve üretim süresini de döndürür (süreç havuzunda ölçülür).
+
+    Returns:
+        Tuple[bytes, float]: (xlsx içeriği, süre (ms))
+    """
+    start = time.perf_counter()
+    data = workbook_bytes(sheets)
+    return data, (time.perf_counter() - start) * 1000